@@ -19,26 +19,15 @@ import argparse
 
 sys.path.insert(0, '.')
 from pipeline.config import call_gpt5_api, extract_json_from_response
+from assertion_analyzer.prompt_registry import PromptRegistry
 
 # =============================================================================
 # LOAD PROMPTS FROM EXTERNAL FILE (for easy fine-tuning)
 # =============================================================================
 PROMPTS_FILE = os.path.join(os.path.dirname(__file__), "prompts.json")
 
-def load_prompts():
-    """Load prompts from prompts.json file."""
-    try:
-        with open(PROMPTS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"⚠️ Warning: {PROMPTS_FILE} not found, using built-in prompts")
-        return {}
-    except json.JSONDecodeError as e:
-        print(f"⚠️ Warning: Error parsing {PROMPTS_FILE}: {e}")
-        return {}
-
-# Load prompts at module import time
-PROMPTS = load_prompts()
+# Load prompts once at module import time (same registry as assertion_analyzer)
+PROMPTS = PromptRegistry(prompts_file=PROMPTS_FILE, prompts_dir=None).load()
 
 # =============================================================================
 # S → G MAPPING (which grounding dimensions apply to each structural dimension)
@@ -287,8 +276,8 @@ DIMENSION_SPEC = {
 # =============================================================================
 
 def get_prompt(key: str, fallback: str = "") -> str:
-    """Get a prompt from the loaded PROMPTS dict with fallback."""
-    return PROMPTS.get(key, fallback)
+    """Get a prompt from the loaded PROMPTS registry with fallback."""
+    return PROMPTS.text(key, fallback)
 
 # System prompt for assertion classification
 SYSTEM_PROMPT = get_prompt("system_prompt", '''You are an expert at classifying assertions according to the Mira 2.0 WBP (Workback Plan) framework.
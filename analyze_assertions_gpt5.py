@@ -27,6 +27,9 @@ from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from collections import Counter, defaultdict
 
+from pipeline.config import get_mock_llm_url, resolve_substrate_endpoint, MOCK_LLM_TOKEN
+from pipeline.telemetry import track_call
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Configuration
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -57,6 +60,9 @@ def get_substrate_token():
     """Get authentication token for Substrate API using MSAL broker."""
     global _jj_token_cache
     
+    if get_mock_llm_url():
+        return MOCK_LLM_TOKEN
+    
     if _jj_token_cache:
         return _jj_token_cache
     
@@ -120,26 +126,31 @@ def call_gpt5_api(prompt: str, temperature: float = 0.3, max_tokens: int = 4000,
         "max_tokens": max_tokens,
     }
     
-    for attempt in range(max_retries):
-        response = requests.post(
-            SUBSTRATE_ENDPOINT,
-            headers=headers,
-            json=payload,
-            timeout=180
-        )
+    with track_call("substrate", model=JJ_MODEL, prompt=prompt) as call:
+        for attempt in range(max_retries):
+            call.attempt()
+            response = requests.post(
+                resolve_substrate_endpoint(SUBSTRATE_ENDPOINT),
+                headers=headers,
+                json=payload,
+                timeout=180
+            )
         
-        if response.status_code == 200:
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
-        elif response.status_code == 429:
-            wait_time = (attempt + 1) * 15
-            print(f"      Rate limited, waiting {wait_time}s...", end="", flush=True)
-            time.sleep(wait_time)
-            print(" retrying")
-        else:
-            raise Exception(f"GPT-5 API error {response.status_code}: {response.text[:200]}")
+            if response.status_code == 200:
+                result = response.json()
+                text = result["choices"][0]["message"]["content"]
+                call.usage(result.get("usage"), completion=text)
+                return text
+            elif response.status_code == 429:
+                call.rate_limited()
+                wait_time = (attempt + 1) * 15
+                print(f"      Rate limited, waiting {wait_time}s...", end="", flush=True)
+                time.sleep(wait_time)
+                print(" retrying")
+            else:
+                raise Exception(f"GPT-5 API error {response.status_code}: {response.text[:200]}")
     
-    raise Exception(f"GPT-5 API rate limited after {max_retries} retries")
+        raise Exception(f"GPT-5 API rate limited after {max_retries} retries")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,225 @@
+"""
+Streaming export of annotated data.
+
+Walks the assertions JSONL one meeting at a time, reads that meeting's rows
+from the annotation store (indexed by judge and utterance), and writes the
+merged record straight away, so memory stays flat however large the dataset
+is. Records have the same shape as Mira's export: the original item plus
+annotations, response_annotations, judge and annotation_stats.
+
+The output is written to a temporary file and moved into place at the end, so
+a reader never sees a half-written export. Filters:
+
+- all       every meeting
+- judged    meetings with at least one judged assertion
+- changed   meetings the judge changed since their last export (any filter);
+            the first export of a judge includes every meeting
+
+Usage:
+    from annotation_export import export_annotated
+
+    counts = export_annotated(iter_jsonl("docs/11_25_output.jsonl"), store, "alice",
+                              filtered_export_path("docs/annotated_output.jsonl", "judged"), only="judged")
+
+    # Headless
+    python annotation_export.py docs/11_25_output.jsonl docs/annotations.db docs/annotated_output.jsonl --judge alice --only changed
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from annotation_store import ANNOTATION_DEFAULTS, AnnotationStore
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+EXPORT_FILTERS = ("all", "judged", "changed")
+
+
+def filtered_export_path(path: str, only: str) -> str:
+    """Where a filtered export goes: the full export's path with the filter before the extension."""
+    if only == "all":
+        return path
+    base, ext = os.path.splitext(path)
+    return f"{base}.{only}{ext}"
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Items of a JSONL file, one at a time (unparseable lines are skipped, as in Mira's load_data)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+# =============================================================================
+# MERGE
+# =============================================================================
+
+def merge_record(item: Dict[str, Any], annotations: Dict[str, Dict[str, Any]],
+                 new_assertions: List[Dict[str, Any]], response_notes: Optional[Dict[str, str]],
+                 judge: str) -> Dict[str, Any]:
+    """
+    One output item with its annotations, in Kening's annotated-output format.
+
+    Args:
+        item: Output item (utterance, response, assertions, ...)
+        annotations: The meeting's annotations as {assertion_idx: {...}}
+        new_assertions: Assertions the judge added to the meeting
+        response_notes: The meeting's response notes as {section_key: note}, if any
+        judge: Judge name
+
+    Returns:
+        Copy of item with annotations, response_annotations, judge and annotation_stats
+    """
+    record = item.copy()
+    entries = []
+    for i, assertion in enumerate(item.get('assertions', [])):
+        ann = {**ANNOTATION_DEFAULTS, **annotations.get(str(i), {})}
+        entry = {
+            "assertion_index": i,
+            "original_text": assertion.get('text', ''),
+            "is_good": ann['is_good'],
+            "is_confident": ann['is_confident'],
+            "is_judged": ann['is_judged'],
+        }
+        if ann.get('revision'):
+            entry["revised_text"] = ann['revision']
+        if ann.get('note'):
+            entry["note"] = ann['note']
+        entries.append(entry)
+
+    for new_assert in new_assertions:
+        entries.append({
+            "is_new": True,
+            "text": new_assert.get('text', ''),
+            "level": new_assert.get('level', 'expected'),
+            "justification": new_assert.get('justification', {}),
+            "is_good": True,
+            "is_confident": True,
+            "is_judged": True  # New assertions are considered judged
+        })
+
+    record['annotations'] = entries
+    if response_notes is not None:
+        record['response_annotations'] = response_notes
+    record['judge'] = judge
+
+    good_count = sum(1 for a in entries if a.get('is_good', True))
+    confident_count = sum(1 for a in entries if a.get('is_confident', True))
+    judged_count = sum(1 for a in entries if a.get('is_judged', False))
+    total_count = len(entries)
+    record['annotation_stats'] = {
+        "total": total_count,
+        "good": good_count,
+        "not_good": total_count - good_count,
+        "confident": confident_count,
+        "not_confident": total_count - confident_count,
+        "judged": judged_count,
+        "not_judged": total_count - judged_count,
+        "revised": sum(1 for a in entries if a.get('revised_text')),
+        "new_added": len(new_assertions)
+    }
+    return record
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+def export_annotated(items: Iterable[Dict[str, Any]], store: AnnotationStore, judge: str, out_path: str,
+                     only: str = "all", progress: Optional[Callable[[int], None]] = None) -> Dict[str, int]:
+    """
+    Write a judge's annotated records for items to out_path, one meeting at a time.
+
+    Args:
+        items: Output items, e.g. iter_jsonl(path)
+        store: Annotation store to read the judge's annotations from
+        judge: Judge name
+        out_path: JSONL file to (re)write
+        only: One of EXPORT_FILTERS
+        progress: Called with the number of items processed so far
+
+    Returns:
+        Counts of records written and items skipped by the filter
+    """
+    if only not in EXPORT_FILTERS:
+        raise ValueError(f"Unknown export filter {only!r}; expected one of {', '.join(EXPORT_FILTERS)}")
+    # Changes made while the export runs are picked up by the next "changed" export
+    started_at = datetime.now().isoformat()
+    wanted = None
+    if only == "judged":
+        wanted = {u for u, counts in store.load_progress(judge).items() if counts["judged"]}
+    elif only == "changed":
+        since = store.last_export(judge)
+        wanted = store.changed_utterances(judge, since) if since else None
+
+    counts = {"written": 0, "skipped": 0}
+    directory = os.path.dirname(out_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".export_", suffix=".jsonl")
+    os.chmod(tmp_path, 0o644)  # mkstemp creates it private; exports are shared
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for processed, item in enumerate(items, 1):
+                utterance = item.get('utterance', '')
+                if wanted is not None and utterance not in wanted:
+                    counts["skipped"] += 1
+                else:
+                    record = merge_record(
+                        item,
+                        store.load_annotations(judge, utterance).get(utterance, {}),
+                        store.load_new_assertions(judge, utterance).get(utterance, []),
+                        store.load_response_annotations(judge, utterance).get(utterance),
+                        judge,
+                    )
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    counts["written"] += 1
+                if progress:
+                    progress(processed)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    store.record_export(judge, started_at)
+    return counts
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export annotated data (streaming)")
+    parser.add_argument("output_path", help="Assertions file, e.g. docs/11_25_output.jsonl")
+    parser.add_argument("db_path", help="Annotation store, e.g. docs/annotations.db")
+    parser.add_argument("export_path", help="JSONL file to write, e.g. docs/annotated_output.jsonl")
+    parser.add_argument("--judge", default=os.environ.get('USERNAME', os.environ.get('USER', '')),
+                        help="Judge whose annotations to export")
+    parser.add_argument("--only", choices=EXPORT_FILTERS, default="all", help="Which meetings to export")
+    args = parser.parse_args(argv)
+
+    for path in (args.output_path, args.db_path):
+        if not os.path.exists(path):
+            print(f"File not found: {path}")
+            return 1
+    store = AnnotationStore(args.db_path)
+    counts = export_annotated(iter_jsonl(args.output_path), store, args.judge, args.export_path, only=args.only)
+    print(f"Exported {counts['written']} meetings for {args.judge or '(unnamed)'} to {args.export_path} "
+          f"({counts['skipped']} skipped by --only {args.only})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,588 @@
+"""
+SQLite-backed annotation store for Mira.
+
+Replaces the whole-file JSON rewrite (annotations_temp.json) with one row per
+annotation, so every change is a single-row upsert and several judges can work
+against the same database without clobbering each other:
+
+- assertion_annotations   (judge, utterance, assertion_idx) -> verdict fields
+- response_annotations    (judge, utterance, section_key)   -> note
+- new_assertions          judge-added assertions, in creation order
+- meeting_progress        (judge, utterance) -> judged/confident/not_good counts,
+                          kept in step with assertion_annotations so progress
+                          views never rescan every annotation
+- work_items              meetings to hand out: size, priority, judges wanted
+- leases                  (utterance, judge) -> expiry of a meeting handed to a judge
+- exports                 judge -> time of their last export (for "changed since" exports)
+
+Work assignment: lease_next() gives a judge the most useful meeting nobody
+else holds, in one short write transaction, so judges never duplicate effort
+and adding judges adds throughput. A judge's unfinished meetings come first,
+then meetings no judge has finished, by priority (e.g. GPT-5 failures), then
+the agreement sample: a fixed, hash-chosen fraction of meetings (the overlap
+rate) wanted from two judges. Leases expire unless renewed, so a closed tab
+frees its meeting.
+
+The database runs in WAL mode, so readers never block the writer and a write is
+one small transaction. Upserts only touch the columns that changed, so two
+sessions editing different fields of one annotation both keep their change.
+
+The first time a store sees a legacy JSON file it imports it (attributed to the
+file's judge_name) without overwriting rows that already exist.
+
+Usage:
+    store = AnnotationStore(os.path.join("docs", "annotations.db"))
+    store.migrate_json(os.path.join("docs", "annotations_temp.json"), default_judge="alice")
+    store.upsert_annotation("alice", utterance, 3, is_judged=True)
+    annotations = store.load_annotations("alice")   # {utterance: {"3": {...}}}
+
+    store.register_work_items([(utterance, num_assertions, priority), ...], overlap_rate=0.1)
+    utterance = store.lease_next("alice")           # None when nothing is left
+    store.renew_lease("alice", utterance)            # while the judge works on it
+
+    # Import a legacy file from the command line
+    python annotation_store.py migrate docs/annotations_temp.json docs/annotations.db
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+import time
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# =============================================================================
+# SCHEMA
+# =============================================================================
+
+# Defaults of a fresh assertion annotation (same as Mira's set_annotation)
+ANNOTATION_DEFAULTS = {
+    "is_good": True,
+    "revision": "",
+    "original": "",
+    "note": "",
+    "is_confident": True,
+    "is_judged": False,
+    "gpt5_verification": {},
+}
+BOOL_FIELDS = ("is_good", "is_confident", "is_judged")
+JSON_FIELDS = ("gpt5_verification",)
+PROGRESS_FIELDS = ("judged", "confident", "not_confident", "not_good")
+
+DEFAULT_LEASE_SECONDS = 20 * 60  # A lease outlives a few minutes without a rerun
+DEFAULT_OVERLAP_RATE = 0.1  # Fraction of meetings judged twice, for agreement
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assertion_annotations (
+    judge TEXT NOT NULL,
+    utterance TEXT NOT NULL,
+    assertion_idx TEXT NOT NULL,
+    is_good INTEGER NOT NULL DEFAULT 1,
+    revision TEXT NOT NULL DEFAULT '',
+    original TEXT NOT NULL DEFAULT '',
+    note TEXT NOT NULL DEFAULT '',
+    is_confident INTEGER NOT NULL DEFAULT 1,
+    is_judged INTEGER NOT NULL DEFAULT 0,
+    gpt5_verification TEXT NOT NULL DEFAULT '{}',
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (judge, utterance, assertion_idx)
+);
+CREATE TABLE IF NOT EXISTS response_annotations (
+    judge TEXT NOT NULL,
+    utterance TEXT NOT NULL,
+    section_key TEXT NOT NULL,
+    note TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (judge, utterance, section_key)
+);
+CREATE TABLE IF NOT EXISTS new_assertions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    judge TEXT NOT NULL,
+    utterance TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_new_assertions_judge ON new_assertions (judge, utterance);
+CREATE TABLE IF NOT EXISTS meeting_progress (
+    judge TEXT NOT NULL,
+    utterance TEXT NOT NULL,
+    judged INTEGER NOT NULL DEFAULT 0,
+    confident INTEGER NOT NULL DEFAULT 0,
+    not_confident INTEGER NOT NULL DEFAULT 0,
+    not_good INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (judge, utterance)
+);
+CREATE TABLE IF NOT EXISTS work_items (
+    utterance TEXT PRIMARY KEY,
+    assertions INTEGER NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    target_judges INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS leases (
+    utterance TEXT NOT NULL,
+    judge TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (utterance, judge)
+);
+CREATE INDEX IF NOT EXISTS idx_leases_judge ON leases (judge);
+CREATE TABLE IF NOT EXISTS exports (
+    judge TEXT PRIMARY KEY,
+    exported_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS migrations (
+    source TEXT PRIMARY KEY,
+    judge TEXT NOT NULL,
+    migrated_at TEXT NOT NULL
+);
+"""
+
+
+# Recompute meeting_progress rows from the annotations matching {where}
+# (confidence only counts for judged assertions, as in Mira's progress panel)
+REFRESH_PROGRESS = """
+INSERT OR REPLACE INTO meeting_progress (judge, utterance, judged, confident, not_confident, not_good)
+SELECT judge, utterance, SUM(is_judged), SUM(is_judged AND is_confident),
+       SUM(is_judged AND NOT is_confident), SUM(NOT is_good)
+FROM assertion_annotations WHERE {where} GROUP BY judge, utterance
+"""
+
+
+# Meetings judge :judge may take, best first: ones they started, then ones with
+# the fewest finished or leased judges, then by priority. Each other judge who
+# finished the meeting or holds a live lease on it (counted once if both) uses
+# up one of the meeting's target_judges.
+NEXT_WORK_ITEM = """
+WITH coverage AS (
+    SELECT w.utterance, w.priority, w.target_judges,
+           COALESCE(own.judged, 0) AS own_judged,
+           (SELECT COUNT(*) FROM (
+                SELECT p.judge FROM meeting_progress p
+                WHERE p.utterance = w.utterance AND p.judge != :judge AND p.judged >= w.assertions
+                UNION
+                SELECT l.judge FROM leases l
+                WHERE l.utterance = w.utterance AND l.judge != :judge)) AS taken
+    FROM work_items w
+    LEFT JOIN meeting_progress own ON own.judge = :judge AND own.utterance = w.utterance
+    WHERE COALESCE(own.judged, 0) < w.assertions
+)
+SELECT utterance FROM coverage
+WHERE taken < target_judges
+ORDER BY own_judged > 0 DESC, taken, priority DESC, utterance
+LIMIT 1
+"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def _judge_filter(judge: str, utterance: Optional[str] = None) -> Tuple[str, Tuple[str, ...]]:
+    """WHERE clause and parameters for a judge's rows, optionally of one meeting."""
+    if utterance is None:
+        return "judge = ?", (judge,)
+    return "judge = ? AND utterance = ?", (judge, utterance)
+
+
+def overlap_sample(utterance: str) -> float:
+    """Stable position of a meeting in [0, 1), so every process picks the same agreement sample."""
+    return int(hashlib.sha1((utterance or "").encode("utf-8")).hexdigest()[:8], 16) / 0x100000000
+
+
+def _to_db(field: str, value: Any) -> Any:
+    if field in BOOL_FIELDS:
+        return int(bool(value))
+    if field in JSON_FIELDS:
+        return json.dumps(value or {}, ensure_ascii=False)
+    return value if value is not None else ""
+
+
+def _from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    annotation = {}
+    for field in ANNOTATION_DEFAULTS:
+        value = row[field]
+        if field in BOOL_FIELDS:
+            value = bool(value)
+        elif field in JSON_FIELDS:
+            value = json.loads(value) if value else {}
+        annotation[field] = value
+    return annotation
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class AnnotationStore:
+    """Per-judge annotations in one SQLite (WAL) database, safe across threads and processes."""
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        # Databases created before meeting_progress existed: build it once
+        if not conn.execute("SELECT 1 FROM meeting_progress LIMIT 1").fetchone():
+            conn.execute(REFRESH_PROGRESS.format(where="1"))
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not shareable across threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+            self._local.conn = conn
+        return conn
+
+    # ---- Assertion annotations ----
+
+    def upsert_annotation(self, judge: str, utterance: str, assertion_idx, **fields: Any) -> None:
+        """
+        Create or update one annotation, changing only the given fields.
+
+        The meeting's progress row is refreshed in the same transaction.
+
+        Args:
+            judge: Judge name
+            utterance: Meeting utterance (the meeting key)
+            assertion_idx: Assertion index within the meeting
+            **fields: Any of ANNOTATION_DEFAULTS' keys; None values are ignored
+        """
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._upsert(conn, judge, utterance, assertion_idx, fields)
+            conn.execute(REFRESH_PROGRESS.format(where="judge = ? AND utterance = ?"), (judge, utterance))
+
+    def upsert_annotations(self, judge: str, changes: Iterable[Dict[str, Any]]) -> int:
+        """
+        Apply a batch of annotation changes in one transaction.
+
+        Args:
+            judge: Judge name
+            changes: {"utterance", "assertion_idx", **fields} per change, applied in order
+
+        Returns:
+            Number of changes applied
+        """
+        applied, utterances = 0, set()
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for change in changes:
+                fields = {k: v for k, v in change.items() if k not in ("utterance", "assertion_idx")}
+                self._upsert(conn, judge, change["utterance"], change["assertion_idx"], fields)
+                utterances.add(change["utterance"])
+                applied += 1
+            for utterance in utterances:
+                conn.execute(REFRESH_PROGRESS.format(where="judge = ? AND utterance = ?"), (judge, utterance))
+        return applied
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, judge: str, utterance: str, assertion_idx, fields: Dict[str, Any]) -> None:
+        """Insert or update one annotation row inside the caller's transaction."""
+        fields = {k: v for k, v in fields.items() if v is not None and k in ANNOTATION_DEFAULTS}
+        row = {**ANNOTATION_DEFAULTS, **fields}
+        columns = list(ANNOTATION_DEFAULTS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in fields) or "judge = judge"
+        conn.execute(
+            f"INSERT INTO assertion_annotations (judge, utterance, assertion_idx, {', '.join(columns)}, updated_at) "
+            f"VALUES (?, ?, ?, {', '.join('?' for _ in columns)}, ?) "
+            f"ON CONFLICT (judge, utterance, assertion_idx) DO UPDATE SET {updates}, updated_at = excluded.updated_at",
+            [judge, utterance, str(assertion_idx)] + [_to_db(c, row[c]) for c in columns] + [_now()],
+        )
+
+    def load_annotations(self, judge: str, utterance: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """A judge's annotations (all, or one meeting's) as {utterance: {assertion_idx: {...}}}."""
+        annotations: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        where, params = _judge_filter(judge, utterance)
+        rows = self._conn().execute(
+            f"SELECT * FROM assertion_annotations WHERE {where}", params
+        )
+        for row in rows:
+            annotations.setdefault(row["utterance"], {})[row["assertion_idx"]] = _from_row(row)
+        return annotations
+
+    def load_progress(self, judge: str) -> Dict[str, Dict[str, int]]:
+        """A judge's per-meeting counts as {utterance: {judged, confident, not_confident, not_good}}."""
+        rows = self._conn().execute(
+            "SELECT * FROM meeting_progress WHERE judge = ?", (judge,)
+        )
+        return {row["utterance"]: {field: row[field] for field in PROGRESS_FIELDS} for row in rows}
+
+    # ---- Response annotations ----
+
+    def set_response_annotation(self, judge: str, utterance: str, section_key: str, note: str) -> None:
+        self._conn().execute(
+            "INSERT INTO response_annotations (judge, utterance, section_key, note, updated_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (judge, utterance, section_key) DO UPDATE SET note = excluded.note, updated_at = excluded.updated_at",
+            (judge, utterance, section_key, note or "", _now()),
+        )
+
+    def load_response_annotations(self, judge: str, utterance: Optional[str] = None) -> Dict[str, Dict[str, str]]:
+        """A judge's response notes (all, or one meeting's) as {utterance: {section_key: note}}."""
+        notes: Dict[str, Dict[str, str]] = {}
+        where, params = _judge_filter(judge, utterance)
+        rows = self._conn().execute(
+            f"SELECT utterance, section_key, note FROM response_annotations WHERE {where}", params
+        )
+        for row in rows:
+            notes.setdefault(row["utterance"], {})[row["section_key"]] = row["note"]
+        return notes
+
+    # ---- New assertions ----
+
+    def add_new_assertion(self, judge: str, utterance: str, assertion_data: Dict[str, Any]) -> None:
+        self._conn().execute(
+            "INSERT INTO new_assertions (judge, utterance, data, created_at) VALUES (?, ?, ?, ?)",
+            (judge, utterance, json.dumps(assertion_data, ensure_ascii=False), _now()),
+        )
+
+    def load_new_assertions(self, judge: str, utterance: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """A judge's added assertions (all, or one meeting's) as {utterance: [assertion, ...]} in creation order."""
+        new_assertions: Dict[str, List[Dict[str, Any]]] = {}
+        where, params = _judge_filter(judge, utterance)
+        rows = self._conn().execute(
+            f"SELECT utterance, data FROM new_assertions WHERE {where} ORDER BY id", params
+        )
+        for row in rows:
+            new_assertions.setdefault(row["utterance"], []).append(json.loads(row["data"]))
+        return new_assertions
+
+    # ---- Reset ----
+
+    def delete_annotations(self, judge: str, utterance: Optional[str] = None) -> None:
+        """Remove a judge's assertion annotations and added assertions (one meeting, or all)."""
+        where, params = _judge_filter(judge, utterance)
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(f"DELETE FROM assertion_annotations WHERE {where}", params)
+            conn.execute(f"DELETE FROM new_assertions WHERE {where}", params)
+            conn.execute(f"DELETE FROM meeting_progress WHERE {where}", params)
+
+    # ---- Work assignment ----
+
+    def register_work_items(self, items: Iterable[Tuple[str, int, float]],
+                            overlap_rate: float = DEFAULT_OVERLAP_RATE) -> None:
+        """
+        Set the meetings to hand out, replacing the previous set.
+
+        Args:
+            items: (utterance, number of assertions, priority) per meeting; higher priority goes first
+            overlap_rate: Fraction of meetings wanted from two judges
+        """
+        rows = [(utterance, assertions, priority, 2 if overlap_sample(utterance) < overlap_rate else 1)
+                for utterance, assertions, priority in items if assertions > 0]
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM work_items")
+            conn.executemany(
+                "INSERT OR REPLACE INTO work_items (utterance, assertions, priority, target_judges) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def lease_next(self, judge: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[str]:
+        """
+        Lease a meeting to a judge: their current one if still open, else the best available.
+
+        Returns:
+            The leased meeting's utterance, or None if nothing is left for this judge
+        """
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM leases WHERE expires_at <= ?", (now,))
+            row = conn.execute(
+                "SELECT l.utterance FROM leases l JOIN work_items w ON w.utterance = l.utterance "
+                "LEFT JOIN meeting_progress p ON p.judge = l.judge AND p.utterance = l.utterance "
+                "WHERE l.judge = ? AND COALESCE(p.judged, 0) < w.assertions LIMIT 1",
+                (judge,),
+            ).fetchone() or conn.execute(NEXT_WORK_ITEM, {"judge": judge}).fetchone()
+            conn.execute("DELETE FROM leases WHERE judge = ?", (judge,))
+            if row is None:
+                return None
+            conn.execute(
+                "INSERT INTO leases (utterance, judge, expires_at) VALUES (?, ?, ?)",
+                (row["utterance"], judge, now + lease_seconds),
+            )
+        return row["utterance"]
+
+    def renew_lease(self, judge: str, utterance: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Extend a judge's live lease; False if it expired (the meeting may be someone else's now)."""
+        now = time.time()
+        cursor = self._conn().execute(
+            "UPDATE leases SET expires_at = ? WHERE judge = ? AND utterance = ? AND expires_at > ?",
+            (now + lease_seconds, judge, utterance, now),
+        )
+        return cursor.rowcount > 0
+
+    def release_lease(self, judge: str) -> None:
+        """Give back a judge's lease (e.g. once the meeting is fully judged)."""
+        self._conn().execute("DELETE FROM leases WHERE judge = ?", (judge,))
+
+    def assignment_status(self) -> Dict[str, int]:
+        """Counts of meetings to do, finished by at least one judge, agreement pairs done, and live leases."""
+        row = self._conn().execute(
+            "SELECT COUNT(*) AS meetings, "
+            "COALESCE(SUM(finished >= 1), 0) AS covered, "
+            "COALESCE(SUM(target_judges > 1), 0) AS overlap, "
+            "COALESCE(SUM(target_judges > 1 AND finished >= target_judges), 0) AS overlap_done, "
+            "(SELECT COUNT(*) FROM leases WHERE expires_at > ?) AS leased "
+            "FROM (SELECT w.target_judges, "
+            "      (SELECT COUNT(*) FROM meeting_progress p WHERE p.utterance = w.utterance "
+            "       AND p.judged >= w.assertions) AS finished "
+            "      FROM work_items w)",
+            (time.time(),),
+        ).fetchone()
+        return dict(row)
+
+    # ---- Exports ----
+
+    def changed_utterances(self, judge: str, since: str) -> Set[str]:
+        """Meetings where the judge changed an annotation, note or added assertion after since (ISO time)."""
+        rows = self._conn().execute(
+            "SELECT utterance FROM assertion_annotations WHERE judge = ? AND updated_at > ? "
+            "UNION SELECT utterance FROM response_annotations WHERE judge = ? AND updated_at > ? "
+            "UNION SELECT utterance FROM new_assertions WHERE judge = ? AND created_at > ?",
+            (judge, since) * 3,
+        )
+        return {row["utterance"] for row in rows}
+
+    def last_export(self, judge: str) -> Optional[str]:
+        """When the judge last exported (ISO time), or None."""
+        row = self._conn().execute("SELECT exported_at FROM exports WHERE judge = ?", (judge,)).fetchone()
+        return row["exported_at"] if row else None
+
+    def record_export(self, judge: str, exported_at: str) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO exports (judge, exported_at) VALUES (?, ?)", (judge, exported_at)
+        )
+
+    def migration_judge(self, json_path: str) -> Optional[str]:
+        """Judge a legacy JSON file was attributed to, or None if it was never imported."""
+        row = self._conn().execute(
+            "SELECT judge FROM migrations WHERE source = ?", (os.path.abspath(json_path),)
+        ).fetchone()
+        return row["judge"] if row else None
+
+    def judges(self) -> List[str]:
+        rows = self._conn().execute(
+            "SELECT judge FROM assertion_annotations UNION SELECT judge FROM response_annotations "
+            "UNION SELECT judge FROM new_assertions ORDER BY judge"
+        )
+        return [row["judge"] for row in rows]
+
+    # ---- Migration ----
+
+    def migrate_json(self, json_path: str, default_judge: str = "") -> Optional[Dict[str, int]]:
+        """
+        Import a legacy annotations JSON file once.
+
+        Existing rows win (the file is older than anything written to the store).
+
+        Args:
+            json_path: Path of the annotations_temp.json-style file
+            default_judge: Judge to attribute the file to if it has no judge_name
+
+        Returns:
+            Imported row counts, or None if the file is missing or already imported
+        """
+        if not os.path.exists(json_path):
+            return None
+        source = os.path.abspath(json_path)
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM migrations WHERE source = ?", (source,)).fetchone():
+            return None
+
+        with open(json_path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        judge = saved.get("judge_name") or default_judge
+        counts = {"annotations": 0, "response_annotations": 0, "new_assertions": 0}
+        columns = list(ANNOTATION_DEFAULTS)
+        now = _now()
+
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Another process may have migrated while we read the file
+            if conn.execute("SELECT 1 FROM migrations WHERE source = ?", (source,)).fetchone():
+                return None
+            for utterance, by_idx in (saved.get("annotations") or {}).items():
+                for assertion_idx, ann in by_idx.items():
+                    row = {**ANNOTATION_DEFAULTS, **{k: v for k, v in ann.items() if k in ANNOTATION_DEFAULTS}}
+                    cursor = conn.execute(
+                        f"INSERT OR IGNORE INTO assertion_annotations "
+                        f"(judge, utterance, assertion_idx, {', '.join(columns)}, updated_at) "
+                        f"VALUES (?, ?, ?, {', '.join('?' for _ in columns)}, ?)",
+                        [judge, utterance, str(assertion_idx)] + [_to_db(c, row[c]) for c in columns] + [now],
+                    )
+                    counts["annotations"] += cursor.rowcount
+            for utterance, notes in (saved.get("response_annotations") or {}).items():
+                for section_key, note in notes.items():
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO response_annotations (judge, utterance, section_key, note, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (judge, utterance, str(section_key), note or "", now),
+                    )
+                    counts["response_annotations"] += cursor.rowcount
+            for utterance, items in (saved.get("new_assertions") or {}).items():
+                for assertion_data in items:
+                    conn.execute(
+                        "INSERT INTO new_assertions (judge, utterance, data, created_at) VALUES (?, ?, ?, ?)",
+                        (judge, utterance, json.dumps(assertion_data, ensure_ascii=False), now),
+                    )
+                    counts["new_assertions"] += 1
+            conn.execute(REFRESH_PROGRESS.format(where="judge = ?"), (judge,))
+            conn.execute(
+                "INSERT INTO migrations (source, judge, migrated_at) VALUES (?, ?, ?)", (source, judge, now)
+            )
+        return counts
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mira annotation store (SQLite)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate = subparsers.add_parser("migrate", help="Import a legacy annotations JSON file")
+    migrate.add_argument("json_path", help="e.g. docs/annotations_temp.json")
+    migrate.add_argument("db_path", help="e.g. docs/annotations.db")
+    migrate.add_argument("--judge", default=os.environ.get('USERNAME', os.environ.get('USER', '')),
+                         help="Judge to attribute the file to if it has no judge_name")
+    judges = subparsers.add_parser("judges", help="List judges in a store")
+    judges.add_argument("db_path")
+    args = parser.parse_args(argv)
+
+    store = AnnotationStore(args.db_path)
+    if args.command == "judges":
+        for judge in store.judges():
+            annotations = store.load_annotations(judge)
+            print(f"{judge or '(unnamed)'}: {sum(len(v) for v in annotations.values())} annotations "
+                  f"in {len(annotations)} meetings")
+        return 0
+
+    counts = store.migrate_json(args.json_path, args.judge)
+    if counts is None:
+        print(f"Nothing to import: {args.json_path} is missing or was already imported")
+    else:
+        print(f"Imported {counts['annotations']} annotations, {counts['response_annotations']} response notes, "
+              f"{counts['new_assertions']} new assertions into {args.db_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
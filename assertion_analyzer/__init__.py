@@ -35,6 +35,12 @@ from .config import (
     get_substrate_token,
 )
 
+from .prompt_registry import (
+    CompiledPrompt,
+    PromptRegistry,
+    get_registry,
+)
+
 from .dimensions import (
     S_TO_G_MAP,
     G_RATIONALE_FOR_S,
@@ -54,6 +60,9 @@ __all__ = [
     "call_gpt5_api",
     "extract_json_from_response",
     "get_substrate_token",
+    "CompiledPrompt",
+    "PromptRegistry",
+    "get_registry",
     "S_TO_G_MAP",
     "G_RATIONALE_FOR_S",
     "DIMENSION_NAMES",
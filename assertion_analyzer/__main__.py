@@ -5,6 +5,10 @@ Command-line interface for the Assertion Analyzer package.
 Usage:
     python -m assertion_analyzer "Your assertion text here"
     python -m assertion_analyzer --batch input.txt --output-dir ./results
+    python -m assertion_analyzer --batch input.txt --workers 8
+    python -m assertion_analyzer --batch input.txt --plan
+    python -m assertion_analyzer serve        # warm service; single-assertion runs forward to it
+    python -m assertion_analyzer train        # (re)train the local fast-path classifier
     python -m assertion_analyzer --help
 """
 
@@ -13,15 +17,24 @@ import os
 import json
 import argparse
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 from .analyzer import (
     analyze_assertion,
     generate_sg_assertions,
     generate_report,
+    estimate_assertion_calls,
     AssertionAnalyzer,
 )
 from .config import get_substrate_token
+from .prompt_registry import get_registry
+
+# Run planning lives in the repo's pipeline package (absent from the standalone zip)
+try:
+    from pipeline.estimate import RunEstimate
+except ImportError:
+    RunEstimate = None
 
 
 def print_results(assertions: list):
@@ -52,6 +65,18 @@ def print_results(assertions: list):
     print(f"Total: {len(assertions)} assertions ({s_count} S + {g_count} G)")
 
 
+def _show_result(result: dict, quiet: bool = False, json_output: bool = False,
+                 no_report: bool = False):
+    """Print a successful result the way the CLI always has."""
+    if not no_report:
+        if not quiet and not json_output:
+            print(result.get('summary_table', ''))
+    elif json_output:
+        print(json.dumps(result['assertions'], indent=2, ensure_ascii=False))
+    else:
+        print_results(result['assertions'])
+
+
 def process_single_assertion(assertion: str, index: int, context: str = None, 
                              output_dir: str = None, no_examples: bool = False,
                              quiet: bool = False, json_output: bool = False,
@@ -114,12 +139,8 @@ def process_single_assertion(assertion: str, index: int, context: str = None,
         if not no_report:
             report_result = generate_report(assertions, assertion, output_dir, assertion_id)
             result['file_path'] = report_result.get('json_file_path')
-            if not quiet and not json_output:
-                print(report_result['summary_table'])
-        elif json_output:
-            print(json.dumps(assertions, indent=2, ensure_ascii=False))
-        else:
-            print_results(assertions)
+            result['summary_table'] = report_result['summary_table']
+        _show_result(result, quiet, json_output, no_report)
         
         result['success'] = True
         
@@ -130,37 +151,27 @@ def process_single_assertion(assertion: str, index: int, context: str = None,
 
 
 def run_batch_mode(input_file: str, output_dir: str = None, context: str = None,
-                   no_examples: bool = False, quiet: bool = False) -> int:
+                   no_examples: bool = False, quiet: bool = False, workers: int = 1) -> int:
     """
     Process multiple assertions from a file.
     
+    With workers > 1, assertions run concurrently. IDs still follow input order
+    (A0000 = first line), per-assertion files are written as each one finishes,
+    and the batch summary is written in input order.
+    
     Args:
         input_file: Path to text file with one assertion per line
         output_dir: Directory to save results (default: ./batch_results_YYYYMMDD_HHMMSS)
         context: Optional context for all assertions
         no_examples: Skip WBP example generation
         quiet: Reduce verbosity
+        workers: Number of assertions processed concurrently
         
     Returns:
         Exit code (0 = success, 1 = some failures, 2 = all failures)
     """
-    # Read assertions from file
-    if not os.path.exists(input_file):
-        print(f"Error: Input file not found: {input_file}")
-        return 2
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    # Filter empty lines and comments
-    assertions = []
-    for line in lines:
-        line = line.strip()
-        if line and not line.startswith('#'):
-            assertions.append(line)
-    
+    assertions = _read_batch_assertions(input_file)
     if not assertions:
-        print("Error: No assertions found in input file")
         return 2
     
     total = len(assertions)
@@ -178,6 +189,8 @@ def run_batch_mode(input_file: str, output_dir: str = None, context: str = None,
     print(f"Input file:  {input_file}")
     print(f"Output dir:  {output_dir}")
     print(f"Assertions:  {total}")
+    if workers > 1:
+        print(f"Workers:     {workers}")
     if context:
         print(f"Context:     {context}")
     print("=" * 70)
@@ -210,50 +223,16 @@ def run_batch_mode(input_file: str, output_dir: str = None, context: str = None,
     print()
     
     # Process each assertion
-    results = []
-    success_count = 0
-    fail_count = 0
+    results = [None] * total
     start_time = time.time()
     
-    for i, assertion in enumerate(assertions):
-        # Generate assertion ID
-        assertion_id = f"A{i:04d}"
-        
-        # Progress indicator
-        progress = f"[{i+1}/{total}]"
-        elapsed = time.time() - start_time
-        if i > 0:
-            eta = (elapsed / i) * (total - i)
-            eta_str = f" | ETA: {int(eta)}s"
-        else:
-            eta_str = ""
-        
-        # Truncate assertion for display
-        display_text = assertion[:45] + "..." if len(assertion) > 45 else assertion
-        print(f"\n{progress} {assertion_id}: \"{display_text}\"{eta_str}")
-        print("-" * 70)
-        
-        # Process
-        result = process_single_assertion(
-            assertion=assertion,
-            index=i,
-            context=context,
-            output_dir=output_dir,
-            no_examples=no_examples,
-            quiet=quiet,
-            json_output=False,
-            no_report=False,
-            assertion_id=assertion_id
-        )
-        
-        results.append(result)
-        
-        if result['success']:
-            success_count += 1
-            print(f"   [OK] Saved to: {result['file_path']}")
-        else:
-            fail_count += 1
-            print(f"   [FAIL] {result['error']}")
+    if workers > 1:
+        _run_batch_parallel(assertions, results, workers, context, output_dir, no_examples, start_time)
+    else:
+        _run_batch_sequential(assertions, results, context, output_dir, no_examples, quiet, start_time)
+    
+    success_count = sum(1 for r in results if r['success'])
+    fail_count = total - success_count
     
     # Summary
     total_time = time.time() - start_time
@@ -276,7 +255,9 @@ def run_batch_mode(input_file: str, output_dir: str = None, context: str = None,
         "total": total,
         "success": success_count,
         "failed": fail_count,
+        "workers": workers,
         "time_seconds": round(total_time, 2),
+        "prompts": get_registry().manifest(),
         "results": [
             {
                 "assertion_id": r['assertion_id'],
@@ -309,6 +290,141 @@ def run_batch_mode(input_file: str, output_dir: str = None, context: str = None,
         return 1
 
 
+def _run_batch_sequential(assertions: list, results: list, context: str, output_dir: str,
+                          no_examples: bool, quiet: bool, start_time: float) -> None:
+    """Process assertions one at a time, filling results[i] for assertion i."""
+    total = len(assertions)
+    for i, assertion in enumerate(assertions):
+        # Generate assertion ID
+        assertion_id = f"A{i:04d}"
+        
+        # Progress indicator
+        progress = f"[{i+1}/{total}]"
+        elapsed = time.time() - start_time
+        if i > 0:
+            eta = (elapsed / i) * (total - i)
+            eta_str = f" | ETA: {int(eta)}s"
+        else:
+            eta_str = ""
+        
+        # Truncate assertion for display
+        display_text = assertion[:45] + "..." if len(assertion) > 45 else assertion
+        print(f"\n{progress} {assertion_id}: \"{display_text}\"{eta_str}")
+        print("-" * 70)
+        
+        # Process
+        result = process_single_assertion(
+            assertion=assertion,
+            index=i,
+            context=context,
+            output_dir=output_dir,
+            no_examples=no_examples,
+            quiet=quiet,
+            json_output=False,
+            no_report=False,
+            assertion_id=assertion_id
+        )
+        
+        results[i] = result
+        
+        if result['success']:
+            print(f"   [OK] Saved to: {result['file_path']}")
+        else:
+            print(f"   [FAIL] {result['error']}")
+
+
+def _run_batch_parallel(assertions: list, results: list, workers: int, context: str,
+                        output_dir: str, no_examples: bool, start_time: float) -> None:
+    """
+    Process assertions on a thread pool, filling results[i] for assertion i.
+    
+    Each assertion's report files are written by its worker as soon as it
+    finishes; progress is printed in completion order.
+    """
+    total = len(assertions)
+    print(f"Running {workers} assertions at a time; progress is shown as each one finishes.")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                process_single_assertion,
+                assertion=assertion,
+                index=i,
+                context=context,
+                output_dir=output_dir,
+                no_examples=no_examples,
+                quiet=True,
+                json_output=False,
+                no_report=False,
+                assertion_id=f"A{i:04d}"
+            ): i
+            for i, assertion in enumerate(assertions)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results[futures[future]] = result
+            
+            elapsed = time.time() - start_time
+            eta = (elapsed / done) * (total - done)
+            assertion = result['assertion']
+            display_text = assertion[:45] + "..." if len(assertion) > 45 else assertion
+            print(f"\n[{done}/{total}] {result['assertion_id']}: \"{display_text}\" | ETA: {int(eta)}s")
+            if result['success']:
+                print(f"   [OK] Saved to: {result['file_path']}")
+            else:
+                print(f"   [FAIL] {result['error']}")
+
+
+def _read_batch_assertions(input_file: str) -> list:
+    """Read one assertion per line, skipping blank lines and # comments."""
+    if not os.path.exists(input_file):
+        print(f"Error: Input file not found: {input_file}")
+        return []
+    
+    with open(input_file, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    
+    # Filter empty lines and comments
+    assertions = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            assertions.append(line)
+    
+    if not assertions:
+        print("Error: No assertions found in input file")
+    return assertions
+
+
+def plan_batch_mode(input_file: str, context: str = None, no_examples: bool = False,
+                    workers: int = 1) -> int:
+    """
+    Print projected calls, tokens and duration of a batch run without calling GPT-5.
+    
+    Args:
+        input_file: Path to text file with one assertion per line
+        context: Optional context for all assertions
+        no_examples: Skip WBP example generation
+        workers: Number of assertions processed concurrently
+        
+    Returns:
+        Exit code (0 = success, 2 = error)
+    """
+    if RunEstimate is None:
+        print("Error: --plan needs the pipeline package (run from the repository root)")
+        return 2
+    
+    assertions = _read_batch_assertions(input_file)
+    if not assertions:
+        return 2
+    
+    estimate = RunEstimate(f"assertion_analyzer --batch {input_file}", concurrency=workers)
+    for assertion in assertions:
+        estimate.add_units("assertions")
+        estimate_assertion_calls(estimate, assertion, context, generate_examples=not no_examples)
+    estimate.print_plan()
+    return 0
+
+
 def _generate_batch_markdown_report(summary: dict, results: list, output_dir: str) -> str:
     """
     Generate a comprehensive markdown report for batch processing results.
@@ -496,6 +612,16 @@ def _generate_batch_markdown_report(summary: dict, results: list, output_dir: st
 
 
 def main():
+    # `serve` subcommand: warm local service (see server.py)
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from .server import main as serve_main
+        return serve_main(sys.argv[2:])
+    
+    # `train` subcommand: local fast-path classifier (see local_classifier.py)
+    if len(sys.argv) > 1 and sys.argv[1] == "train":
+        from .local_classifier import main as classifier_main
+        return classifier_main(sys.argv[1:])
+    
     parser = argparse.ArgumentParser(
         description="Analyze and convert assertions using GPT-5 and the WBP framework",
         prog="python -m assertion_analyzer"
@@ -545,6 +671,23 @@ def main():
         action="store_true",
         help="Skip WBP example generation (faster, classify only)"
     )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="Batch mode: number of assertions to process concurrently (default: 1)"
+    )
+    parser.add_argument(
+        "--plan", "--dry-run-estimate",
+        dest="plan",
+        action="store_true",
+        help="Batch mode: print projected calls, tokens and duration without calling GPT-5"
+    )
+    parser.add_argument(
+        "--no-server",
+        action="store_true",
+        help="Always analyze in this process, even if `serve` is running"
+    )
     parser.add_argument(
         "--quiet",
         "-q",
@@ -555,13 +698,17 @@ def main():
     args = parser.parse_args()
     
     # Batch mode
+    if args.batch and args.plan:
+        return plan_batch_mode(args.batch, context=args.context, no_examples=args.no_examples,
+                               workers=args.workers)
     if args.batch:
         return run_batch_mode(
             input_file=args.batch,
             output_dir=args.output_dir,
             context=args.context,
             no_examples=args.no_examples,
-            quiet=args.quiet
+            quiet=args.quiet,
+            workers=max(1, args.workers)
         )
     
     # Single assertion mode
@@ -578,16 +725,32 @@ def main():
             print(f"Context: {args.context}")
         print()
     
-    result = process_single_assertion(
-        assertion=assertion,
-        index=args.index,
-        context=args.context,
-        output_dir=args.output_dir,
-        no_examples=args.no_examples,
-        quiet=args.quiet,
-        json_output=args.json,
-        no_report=args.no_report
-    )
+    # Forward to the warm service when it is running
+    result = None
+    if not args.no_server:
+        from .server import forward_analysis
+        result = forward_analysis({
+            "assertion": assertion,
+            "context": args.context,
+            "index": args.index,
+            "output_dir": os.path.abspath(args.output_dir or os.getcwd()),
+            "no_examples": args.no_examples,
+            "no_report": args.no_report,
+        })
+        if result is not None and result['success']:
+            _show_result(result, args.quiet, args.json, args.no_report)
+    
+    if result is None:
+        result = process_single_assertion(
+            assertion=assertion,
+            index=args.index,
+            context=args.context,
+            output_dir=args.output_dir,
+            no_examples=args.no_examples,
+            quiet=args.quiet,
+            json_output=args.json,
+            no_report=args.no_report
+        )
     
     if not result['success']:
         print(f"Error: {result['error']}")
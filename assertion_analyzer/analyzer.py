@@ -12,9 +12,13 @@ import os
 import re
 import json
 import datetime
-from typing import Dict, List, Optional, Any
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
-from .config import call_gpt5_api, extract_json_from_response, save_json
+from .config import call_gpt5_api, extract_json_from_response, save_json, telemetry_context, track_call
+from .local_classifier import classify_locally
+from .prompt_registry import CompiledPrompt, REPLACE, get_registry
 from .dimensions import (
     S_TO_G_MAP, 
     G_RATIONALE_FOR_S, 
@@ -29,26 +33,10 @@ from .dimensions import (
 # LOAD PROMPTS FROM EXTERNAL FILE
 # ═══════════════════════════════════════════════════════════════════════════════
 
-PROMPTS_FILE = os.path.join(os.path.dirname(__file__), "prompts.json")
-
-def _load_prompts() -> Dict[str, str]:
-    """Load prompts from prompts.json file."""
-    try:
-        with open(PROMPTS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print(f"Warning: {PROMPTS_FILE} not found, using built-in prompts")
-        return {}
-    except json.JSONDecodeError as e:
-        print(f"Warning: Error parsing {PROMPTS_FILE}: {e}")
-        return {}
-
-# Load prompts at module import time
-_PROMPTS = _load_prompts()
-
+# prompts.json and prompts/*.json are loaded once per process by the registry
 def get_prompt(key: str, fallback: str = "") -> str:
-    """Get a prompt from the loaded PROMPTS dict with fallback."""
-    return _PROMPTS.get(key, fallback)
+    """Get a prompt from prompts.json with fallback."""
+    return get_registry().text(key, fallback)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -412,6 +400,59 @@ def _align_table(table_lines: list) -> list:
     return result
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# STEP GRAPH
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Steps of generate_sg_assertions() after classification -> steps they depend on.
+# G selection and scenario generation are independent, so they overlap.
+SG_STEP_GRAPH = {
+    "g_selection": [],
+    "scenario": [],
+    "wbp": ["g_selection", "scenario"],
+    "verification": ["g_selection", "scenario", "wbp"],
+}
+
+
+def run_step_graph(steps: Dict[str, Tuple[Callable[[dict], Any], List[str]]]) -> Dict[str, Any]:
+    """
+    Run steps as soon as their dependencies finish, overlapping independent ones.
+    
+    Args:
+        steps: name -> (fn, dependency names); fn receives a dict of its
+               dependencies' results
+        
+    Returns:
+        dict of step name -> result
+        
+    Raises:
+        ValueError: If a dependency is missing or the graph has a cycle
+        Exception: The first exception raised by a step
+    """
+    for name, (_, deps) in steps.items():
+        missing = [d for d in deps if d not in steps]
+        if missing:
+            raise ValueError(f"Step '{name}' depends on unknown step(s): {', '.join(missing)}")
+    
+    results: Dict[str, Any] = {}
+    pending = dict(steps)
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(steps))) as executor:
+        while pending or running:
+            for name, (fn, deps) in list(pending.items()):
+                if all(d in results for d in deps):
+                    # Each step keeps the caller's telemetry context
+                    ctx = contextvars.copy_context()
+                    running[executor.submit(ctx.run, fn, {d: results[d] for d in deps})] = name
+                    del pending[name]
+            if not running:
+                raise ValueError(f"Step graph has a cycle: {', '.join(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+    return results
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # CORE FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -459,11 +500,12 @@ def select_relevant_g_dimensions(
     if verbose:
         print(f"   Selecting relevant G dimensions for {dimension_id}...")
     
-    result_text = call_gpt5_api(
-        prompt,
-        system_prompt="You analyze assertions to determine which grounding dimensions are relevant for verification.",
-        temperature=0.2
-    )
+    with telemetry_context(stage="analyzer.select_g_dimensions", dimension=dimension_id):
+        result_text = call_gpt5_api(
+            prompt,
+            system_prompt="You analyze assertions to determine which grounding dimensions are relevant for verification.",
+            temperature=0.2
+        )
     
     try:
         result = extract_json_from_response(result_text)
@@ -494,12 +536,13 @@ def generate_scenario_for_assertion(assertion_text: str) -> dict:
     """
     prompt = SCENARIO_GENERATION_PROMPT.format(assertion_text=assertion_text)
     
-    result_text = call_gpt5_api(
-        prompt,
-        system_prompt=get_prompt("scenario_generation_system", 
-                                 "You generate realistic meeting scenarios for assertion testing."),
-        temperature=0.5
-    )
+    with telemetry_context(stage="analyzer.scenario"):
+        result_text = call_gpt5_api(
+            prompt,
+            system_prompt=get_prompt("scenario_generation_system", 
+                                     "You generate realistic meeting scenarios for assertion testing."),
+            temperature=0.5
+        )
     
     try:
         result = extract_json_from_response(result_text)
@@ -564,12 +607,13 @@ def generate_wbp_with_scenario(
         discussion_points=scenario.get('discussion_points', [])
     )
     
-    result_text = call_gpt5_api(
-        prompt,
-        system_prompt=get_prompt("wbp_generation_system",
-                                 "You generate workback plans based on meeting scenarios."),
-        temperature=0.4
-    )
+    with telemetry_context(stage="analyzer.wbp_generation"):
+        result_text = call_gpt5_api(
+            prompt,
+            system_prompt=get_prompt("wbp_generation_system",
+                                     "You generate workback plans based on meeting scenarios."),
+            temperature=0.4
+        )
     
     try:
         result = extract_json_from_response(result_text)
@@ -615,12 +659,13 @@ def verify_wbp_against_scenario(
         wbp_content=wbp_content
     )
     
-    result_text = call_gpt5_api(
-        prompt,
-        system_prompt=get_prompt("wbp_verification_system",
-                                 "You verify workback plans against scenarios and assertions."),
-        temperature=0.2
-    )
+    with telemetry_context(stage="analyzer.wbp_verification"):
+        result_text = call_gpt5_api(
+            prompt,
+            system_prompt=get_prompt("wbp_verification_system",
+                                     "You verify workback plans against scenarios and assertions."),
+            temperature=0.2
+        )
     
     try:
         result = extract_json_from_response(result_text)
@@ -646,9 +691,29 @@ def analyze_assertion(assertion_text: str, context: Optional[str] = None) -> dic
     Returns:
         dict with primary assertion and generated grounding assertions
     """
+    prompt = build_analysis_prompt(assertion_text, context)
+
+    print("Calling GPT-5 for analysis...")
+    with telemetry_context(stage="analyzer.analyze"):
+        result_text = call_gpt5_api(prompt, system_prompt=SYSTEM_PROMPT, temperature=0.2)
+    
+    try:
+        result = extract_json_from_response(result_text)
+    except:
+        json_match = re.search(r'\{[^{}]*\}', result_text, re.DOTALL)
+        if json_match:
+            result = json.loads(json_match.group())
+        else:
+            result = {"error": "Failed to parse GPT-5 response", "raw": result_text}
+    
+    return result
+
+
+def build_analysis_prompt(assertion_text: str, context: Optional[str] = None) -> str:
+    """Build the classification prompt sent by analyze_assertion()."""
     context_str = f"\nContext: {context}" if context else ""
     
-    prompt = f'''Analyze this assertion and classify it according to the WBP framework.
+    return f'''Analyze this assertion and classify it according to the WBP framework.
 
 Assertion: "{assertion_text}"{context_str}
 
@@ -663,65 +728,63 @@ Provide your analysis as JSON with these fields:
 Return ONLY valid JSON, no other text.
 '''
 
-    print("Calling GPT-5 for analysis...")
-    result_text = call_gpt5_api(prompt, system_prompt=SYSTEM_PROMPT, temperature=0.2)
-    
-    try:
-        result = extract_json_from_response(result_text)
-    except:
-        json_match = re.search(r'\{[^{}]*\}', result_text, re.DOTALL)
-        if json_match:
-            result = json.loads(json_match.group())
-        else:
-            result = {"error": "Failed to parse GPT-5 response", "raw": result_text}
-    
-    return result
-
 
-def classify_assertion(assertion_text: str, verbose: bool = False) -> dict:
+def classify_assertion(assertion_text: str, verbose: bool = False, use_local: bool = True) -> dict:
     """
     Lightweight classification of an assertion - classification only, no WBP generation.
     
     This is faster than analyze_assertion() as it only classifies the assertion
     into a dimension without generating scenarios, WBPs, or verification.
+    When a local classifier is trained (see local_classifier.py), confident
+    predictions are returned without calling GPT-5.
     
     Args:
         assertion_text: The assertion to classify
         verbose: Whether to print progress messages
+        use_local: Try the local fast-path classifier before GPT-5
         
     Returns:
         dict with:
         - dimension: The classified dimension ID (e.g., "S5", "G3", or "UNKNOWN")
         - dimension_name: Full name of the dimension
         - layer: "structural" or "grounding"  
-        - level: "critical", "expected", or "aspirational"
+        - level: "critical", "expected", or "aspirational" (None from the local
+          fast path, which only predicts the dimension)
         - rationale: Why this dimension was chosen
         - linked_g_dims: List of grounding dimensions that apply (for S dimensions)
+        - source: "local" (fast path) or "gpt5"
     """
-    # Load optimized prompt from file
-    prompt_file = os.path.join(os.path.dirname(__file__), "prompts", "classification_prompt.json")
-    try:
-        with open(prompt_file, 'r', encoding='utf-8') as f:
-            prompt_config = json.load(f)
-        prompt_template = prompt_config.get("user_prompt_template", "")
-        system_prompt = prompt_config.get("system_prompt", SYSTEM_PROMPT)
-        temperature = prompt_config.get("temperature", 0.2)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+    if use_local:
+        local_result = classify_locally(assertion_text)
+        if local_result is not None:
+            with telemetry_context(stage="analyzer.classify"):
+                with track_call("local", model="tfidf-linear") as call:
+                    call.hit_cache()
+            if verbose:
+                print(f"Classified locally: {local_result['dimension']} "
+                      f"(confidence {local_result['confidence']:.2f})")
+            return local_result
+    
+    # Optimized prompt from prompts/classification_prompt.json (compiled once)
+    prompt_config = get_registry().get("classification")
+    if prompt_config is None:
         if verbose:
-            print(f"Warning: Could not load classification_prompt.json: {e}, using fallback")
+            print("Warning: Could not load classification_prompt.json, using fallback")
         # Fallback prompt
-        prompt_template = '''Classify this assertion into WBP framework dimension (S1-S20 or G1-G9).
+        prompt_config = CompiledPrompt("classification", '''Classify this assertion into WBP framework dimension (S1-S20 or G1-G9).
 Assertion: "{assertion_text}"
-Return JSON: {{"dimension_id": "S5", "dimension_name": "...", "layer": "structural", "level": "critical", "rationale": "..."}}'''
-        system_prompt = SYSTEM_PROMPT
-        temperature = 0.2
+Return JSON: {{"dimension_id": "S5", "dimension_name": "...", "layer": "structural", "level": "critical", "rationale": "..."}}''',
+                                       REPLACE, system_prompt=SYSTEM_PROMPT, temperature=0.2)
+    system_prompt = prompt_config.system_prompt or SYSTEM_PROMPT
+    temperature = prompt_config.temperature if prompt_config.temperature is not None else 0.2
     
-    prompt = prompt_template.replace("{assertion_text}", assertion_text)
+    prompt = prompt_config.render(assertion_text=assertion_text)
 
     if verbose:
         print(f"Classifying: {assertion_text[:50]}...")
     
-    result_text = call_gpt5_api(prompt, system_prompt=system_prompt, temperature=temperature)
+    with telemetry_context(stage="analyzer.classify", prompt=prompt_config.hash):
+        result_text = call_gpt5_api(prompt, system_prompt=system_prompt, temperature=temperature)
     
     try:
         result = extract_json_from_response(result_text)
@@ -748,10 +811,67 @@ Return JSON: {{"dimension_id": "S5", "dimension_name": "...", "layer": "structur
         "layer": result.get("layer", "unknown"),
         "level": result.get("level", "expected"),
         "rationale": result.get("rationale", ""),
-        "linked_g_dims": S_TO_G_MAP.get(dimension_id, []) if dimension_id.startswith("S") else []
+        "linked_g_dims": S_TO_G_MAP.get(dimension_id, []) if dimension_id.startswith("S") else [],
+        "source": "gpt5"
     }
 
 
+def _build_g_assertions(
+    selected_g_dims: list,
+    primary: dict,
+    assertion_text: str,
+    assertion_index: int
+) -> list:
+    """Turn GPT-5's selected G dimensions into grounding assertions linked to the primary S."""
+    dimension_id = primary["dimension_id"]
+    dimension_name = primary["dimension_name"]
+    primary_assertion_id = primary["assertion_id"]
+    g_assertions = []
+    for g_idx, g_info in enumerate(selected_g_dims):
+        g_dim = g_info.get("dimension_id", "")
+        g_spec = DIMENSION_SPEC.get(g_dim, {})
+        if not g_spec:
+            continue
+        
+        g_assertion_id = f"A{assertion_index:04d}_{g_dim}_{g_idx}"
+        
+        # Use GPT-5's relevance reason if available, otherwise fall back to mapping
+        g_rationale = g_info.get(
+            "relevance_reason",
+            G_RATIONALE_FOR_S.get(
+                (dimension_id, g_dim),
+                f"Generated from {dimension_id}: {g_spec.get('name', '')} grounds {dimension_name}"
+            )
+        )
+        
+        # Use GPT-5's grounding text if available, otherwise use template
+        grounding_text = g_info.get("grounding_text", g_spec.get('template', ''))
+        
+        g_assertion = {
+            "assertion_id": g_assertion_id,
+            "parent_assertion_id": primary_assertion_id,
+            "text": grounding_text,
+            "original_text": assertion_text,
+            "dimension_id": g_dim,
+            "dimension_name": g_info.get("dimension_name", g_spec.get('name', 'Unknown')),
+            "layer": "grounding",
+            "level": "critical",
+            "weight": g_spec.get('weight', 3),
+            "rationale": {
+                "mapping_reason": g_rationale,
+                "parent_dimension": dimension_id,
+                "parent_dimension_name": dimension_name,
+                "conversion_method": "gpt5_g_selection"
+            },
+            "quality_assessment": {
+                "is_well_formed": True,
+                "is_testable": True
+            }
+        }
+        g_assertions.append(g_assertion)
+    return g_assertions
+
+
 def generate_sg_assertions(
     gpt5_result: dict, 
     assertion_text: str, 
@@ -804,11 +924,15 @@ def generate_sg_assertions(
         }
     }
     
-    # Build grounding assertions list (for S dimensions only)
-    # Use GPT-5 to select ONLY the G dimensions that are relevant to this specific assertion
-    g_assertions = []
-    if dimension_id.startswith("S") and dimension_id in S_TO_G_MAP:
-        # Call GPT-5 to intelligently select relevant G dimensions
+    # Steps after classification, run as a dependency graph (see SG_STEP_GRAPH):
+    # G selection and scenario generation overlap; WBP generation waits for both.
+    is_structural = dimension_id.startswith("S") and dimension_id in S_TO_G_MAP
+    with_examples = generate_examples and (dimension_id.startswith("S") or dimension_id.startswith("G"))
+    
+    def select_g(deps: dict) -> list:
+        # Use GPT-5 to select ONLY the G dimensions that are relevant to this specific assertion
+        if not is_structural:
+            return []
         selected_g_dims = select_relevant_g_dimensions(
             assertion_text=assertion_text,
             dimension_id=dimension_id,
@@ -816,127 +940,65 @@ def generate_sg_assertions(
             rationale=rationale,
             verbose=verbose
         )
-        
-        for g_idx, g_info in enumerate(selected_g_dims):
-            g_dim = g_info.get("dimension_id", "")
-            g_spec = DIMENSION_SPEC.get(g_dim, {})
-            if not g_spec:
-                continue
-            
-            g_assertion_id = f"A{assertion_index:04d}_{g_dim}_{g_idx}"
-            
-            # Use GPT-5's relevance reason if available, otherwise fall back to mapping
-            g_rationale = g_info.get(
-                "relevance_reason",
-                G_RATIONALE_FOR_S.get(
-                    (dimension_id, g_dim),
-                    f"Generated from {dimension_id}: {g_spec.get('name', '')} grounds {dimension_name}"
-                )
-            )
-            
-            # Use GPT-5's grounding text if available, otherwise use template
-            grounding_text = g_info.get("grounding_text", g_spec.get('template', ''))
-            
-            g_assertion = {
-                "assertion_id": g_assertion_id,
-                "parent_assertion_id": primary_assertion_id,
-                "text": grounding_text,
-                "original_text": assertion_text,
-                "dimension_id": g_dim,
-                "dimension_name": g_info.get("dimension_name", g_spec.get('name', 'Unknown')),
-                "layer": "grounding",
-                "level": "critical",
-                "weight": g_spec.get('weight', 3),
-                "rationale": {
-                    "mapping_reason": g_rationale,
-                    "parent_dimension": dimension_id,
-                    "parent_dimension_name": dimension_name,
-                    "conversion_method": "gpt5_g_selection"
-                },
-                "quality_assessment": {
-                    "is_well_formed": True,
-                    "is_testable": True
-                }
-            }
-            g_assertions.append(g_assertion)
+        return _build_g_assertions(selected_g_dims, primary, assertion_text, assertion_index)
     
-    # Generate scenario + WBP
-    if generate_examples and dimension_id.startswith("S"):
+    def scenario(deps: dict) -> dict:
         if verbose:
             print(f"   Generating scenario for assertion context...")
-        scenario = generate_scenario_for_assertion(assertion_text)
-        
+        return generate_scenario_for_assertion(assertion_text)
+    
+    def wbp(deps: dict) -> str:
         if verbose:
-            print(f"   Generating WBP for {dimension_id} + {len(g_assertions)} grounding assertions...")
-        wbp_content = generate_wbp_with_scenario(
-            scenario=scenario,
+            print(f"   Generating WBP for {dimension_id} + {len(deps['g_selection'])} grounding assertions...")
+        return generate_wbp_with_scenario(
+            scenario=deps["scenario"],
             original_utterance=assertion_text,
             s_assertion=primary,
-            g_assertions=g_assertions
+            g_assertions=deps["g_selection"]
         )
-        
+    
+    def verification(deps: dict) -> dict:
         if verbose:
             print(f"   Verifying WBP against scenario...")
-        all_assertions = [primary] + g_assertions
-        verification = verify_wbp_against_scenario(
-            scenario=scenario,
-            wbp_content=wbp_content,
-            all_assertions=all_assertions
+        return verify_wbp_against_scenario(
+            scenario=deps["scenario"],
+            wbp_content=deps["wbp"],
+            all_assertions=[primary] + deps["g_selection"]
         )
+    
+    step_fns = {"g_selection": select_g, "scenario": scenario, "wbp": wbp, "verification": verification}
+    active = step_fns if with_examples else {"g_selection": select_g}
+    outputs = run_step_graph({name: (fn, SG_STEP_GRAPH[name]) for name, fn in active.items()})
+    g_assertions = outputs["g_selection"]
+    
+    if with_examples:
+        scenario_data = outputs["scenario"]
+        wbp_content = outputs["wbp"]
+        verification_result = outputs["verification"]
         
-        shared_success_example = {
-            "scenario": scenario,
+        primary["success_example"] = {
+            "scenario": scenario_data,
             "workback_plan": wbp_content,
-            "overall_verified": verification.get("overall_passes", False),
-            "assertion_results": verification.get("assertion_results", [])
+            "overall_verified": verification_result.get("overall_passes", False),
+            "assertion_results": verification_result.get("assertion_results", [])
         }
         
-        primary["success_example"] = shared_success_example
-        
         assertion_results_map = {
             r.get("assertion_id"): r 
-            for r in verification.get("assertion_results", [])
+            for r in verification_result.get("assertion_results", [])
         }
         
         for g_assertion in g_assertions:
             g_id = g_assertion["assertion_id"]
             g_verification = assertion_results_map.get(g_id, {})
             g_assertion["success_example"] = {
-                "scenario": scenario,
+                "scenario": scenario_data,
                 "workback_plan": wbp_content,
                 "evidence": g_verification.get("evidence", ""),
                 "ground_truth_check": g_verification.get("ground_truth_check", ""),
                 "verification": g_verification.get("reasoning", ""),
                 "verified": g_verification.get("passes", False)
             }
-    elif generate_examples and dimension_id.startswith("G"):
-        if verbose:
-            print(f"   Generating scenario for standalone {dimension_id}...")
-        scenario = generate_scenario_for_assertion(assertion_text)
-        
-        if verbose:
-            print(f"   Generating WBP for standalone {dimension_id}...")
-        wbp_content = generate_wbp_with_scenario(
-            scenario=scenario,
-            original_utterance=assertion_text,
-            s_assertion=primary,
-            g_assertions=[]
-        )
-        
-        if verbose:
-            print(f"   Verifying WBP against scenario...")
-        verification = verify_wbp_against_scenario(
-            scenario=scenario,
-            wbp_content=wbp_content,
-            all_assertions=[primary]
-        )
-        
-        primary["success_example"] = {
-            "scenario": scenario,
-            "workback_plan": wbp_content,
-            "overall_verified": verification.get("overall_passes", False),
-            "assertion_results": verification.get("assertion_results", [])
-        }
     else:
         primary["success_example"] = {
             "scenario": {}, "workback_plan": "", "overall_verified": False, "assertion_results": []
@@ -953,6 +1015,59 @@ def generate_sg_assertions(
     return results
 
 
+def estimate_assertion_calls(
+    estimate,
+    assertion_text: str,
+    context: Optional[str] = None,
+    generate_examples: bool = True
+) -> None:
+    """
+    Add the GPT-5 calls one assertion would make to a run estimate.
+    
+    The classification and scenario prompts are built exactly; the G selection,
+    WBP generation and verification prompts depend on earlier responses, so only
+    their static parts are counted (prior telemetry fills in the rest).
+    
+    Args:
+        estimate: pipeline.estimate.RunEstimate to add the calls to
+        assertion_text: The assertion to analyze
+        context: Optional context about the meeting/response
+        generate_examples: Whether WBP examples would be generated
+    """
+    estimate.add_call("analyzer.analyze", build_analysis_prompt(assertion_text, context),
+                      system_prompt=SYSTEM_PROMPT)
+    
+    # Only S classifications select G dimensions
+    g_prompt = G_SELECTION_PROMPT.format(
+        assertion_text=assertion_text, dimension_id="", dimension_name="",
+        rationale="", available_g_dims=""
+    )
+    estimate.add_call(
+        "analyzer.select_g_dimensions", g_prompt,
+        weight=estimate.history.call_ratio("analyzer.select_g_dimensions", "analyzer.analyze"),
+        partial_prompt=True
+    )
+    
+    if not generate_examples:
+        return
+    estimate.add_call(
+        "analyzer.scenario", SCENARIO_GENERATION_PROMPT.format(assertion_text=assertion_text),
+        system_prompt=get_prompt("scenario_generation_system", "")
+    )
+    wbp_prompt = WBP_GENERATION_PROMPT.format(
+        scenario_json="", original_utterance=assertion_text, s_dimension_id="",
+        s_dimension_name="", s_assertion_text=assertion_text, s_mapping_reason="",
+        g_assertions_text="", attendees=[], meeting_date="", artifacts=[], discussion_points=[]
+    )
+    estimate.add_call("analyzer.wbp_generation", wbp_prompt,
+                      system_prompt=get_prompt("wbp_generation_system", ""), partial_prompt=True)
+    verify_prompt = WBP_VERIFICATION_PROMPT.format(
+        scenario_json="", assertions_to_verify=assertion_text, wbp_content=""
+    )
+    estimate.add_call("analyzer.wbp_verification", verify_prompt,
+                      system_prompt=get_prompt("wbp_verification_system", ""), partial_prompt=True)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # REPORT GENERATION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -8,12 +8,40 @@ This module provides:
 """
 
 import os
+import sys
 import json
 import time
 import ctypes
 import re
+import threading
+from contextlib import contextmanager
 from typing import Dict, Any, Optional
 
+# Per-call telemetry, request hedging and the shared token provider live in the
+# pipeline package; the analyzer also ships standalone, in which case calls are
+# simply not recorded or hedged and tokens come from MSAL directly.
+try:
+    from pipeline.telemetry import track_call, telemetry_context
+    from pipeline.hedging import hedged_request
+    from pipeline.auth import get_token_provider
+except ImportError:
+    get_token_provider = None
+
+    def hedged_request(send, key="default", call=None):
+        return send()
+
+    class _UntrackedCall:
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+    @contextmanager
+    def track_call(*args, **kwargs):
+        yield _UntrackedCall()
+
+    @contextmanager
+    def telemetry_context(**fields):
+        yield
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # API Configuration
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -31,6 +59,29 @@ MAX_RETRIES = 3
 # Global token cache
 _jj_token_cache = None
 
+# Shared HTTP session (keep-alive connection pool across calls and threads)
+HTTP_POOL_SIZE = 32
+_http_session = None
+_http_session_lock = threading.Lock()
+
+# Offline mock server (tools/mock_llm_server.py). When MIRA_LLM_MOCK_URL is set
+# (e.g. http://127.0.0.1:8765), API calls go to the local stand-in instead of
+# Substrate and MSAL authentication is skipped.
+MOCK_LLM_URL_ENV = "MIRA_LLM_MOCK_URL"
+MOCK_LLM_TOKEN = "mock-token"
+
+
+def get_mock_llm_url() -> Optional[str]:
+    """Get the mock LLM server base URL from the environment, or None."""
+    url = os.environ.get(MOCK_LLM_URL_ENV, "").strip()
+    return url.rstrip("/") or None
+
+
+def resolve_substrate_endpoint(endpoint: str = SUBSTRATE_ENDPOINT) -> str:
+    """Return the chat completions URL to call (mock server if configured)."""
+    mock_url = get_mock_llm_url()
+    return f"{mock_url}/chat/completions" if mock_url else endpoint
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # Authentication
@@ -38,7 +89,10 @@ _jj_token_cache = None
 
 def get_substrate_token() -> str:
     """
-    Get authentication token for Substrate API using MSAL broker.
+    Get authentication token for Substrate API.
+    
+    Uses the pipeline's shared token provider when available (env/file tokens,
+    persisted MSAL cache, refresh before expiry), else MSAL broker directly.
     
     Returns:
         Access token string
@@ -49,6 +103,12 @@ def get_substrate_token() -> str:
     """
     global _jj_token_cache
     
+    if get_mock_llm_url():
+        return MOCK_LLM_TOKEN
+    
+    if get_token_provider is not None:
+        return get_token_provider(CLIENT_ID, TENANT_ID, SUBSTRATE_RESOURCE).get_token()
+    
     if _jj_token_cache:
         return _jj_token_cache
     
@@ -75,16 +135,16 @@ def get_substrate_token() -> str:
             _jj_token_cache = result["access_token"]
             return _jj_token_cache
     
-    # Fall back to interactive
+    # Fall back to interactive (console window handle for the broker on Windows)
     print("Authenticating with Microsoft (browser may open)...")
     
-    kernel32 = ctypes.windll.kernel32
-    hwnd = kernel32.GetConsoleWindow()
-    
-    result = app.acquire_token_interactive(
-        scopes,
-        parent_window_handle=hwnd,
-    )
+    if sys.platform == "win32":
+        result = app.acquire_token_interactive(
+            scopes,
+            parent_window_handle=ctypes.windll.kernel32.GetConsoleWindow(),
+        )
+    else:
+        result = app.acquire_token_interactive(scopes)
     
     if "access_token" in result:
         _jj_token_cache = result["access_token"]
@@ -97,12 +157,35 @@ def clear_token_cache():
     """Clear the cached authentication token."""
     global _jj_token_cache
     _jj_token_cache = None
+    if get_token_provider is not None:
+        get_token_provider(CLIENT_ID, TENANT_ID, SUBSTRATE_RESOURCE).invalidate()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # API Helpers
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def get_http_session():
+    """
+    Get the shared requests.Session used for API calls.
+    
+    Reusing one session keeps TLS connections to the endpoint alive between
+    calls, which matters for batch workers and the `serve` process.
+    """
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=HTTP_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+    return _http_session
+
+
 def call_gpt5_api(
     prompt: str,
     system_prompt: Optional[str] = None,
@@ -152,30 +235,42 @@ def call_gpt5_api(
         "max_tokens": max_tokens
     }
     
-    for attempt in range(max_retries):
-        try:
-            response = requests.post(
-                SUBSTRATE_ENDPOINT,
-                headers=headers,
-                json=payload,
-                timeout=120
-            )
+    with track_call("substrate", model=JJ_MODEL, prompt=prompt, system_prompt=system_prompt) as call:
+        for attempt in range(max_retries):
+            call.attempt()
+            try:
+                response = hedged_request(
+                    lambda: get_http_session().post(
+                        resolve_substrate_endpoint(),
+                        headers=headers,
+                        json=payload,
+                        timeout=120
+                    ),
+                    key=JJ_MODEL,
+                    call=call
+                )
             
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
-            elif response.status_code == 429:
-                wait_time = (attempt + 1) * 10
-                print(f"  Rate limited, waiting {wait_time}s...")
-                time.sleep(wait_time)
-            else:
-                raise Exception(f"GPT-5 API error {response.status_code}: {response.text[:200]}")
+                if response.status_code == 200:
+                    result = response.json()
+                    text = result["choices"][0]["message"]["content"]
+                    call.usage(result.get("usage"), completion=text)
+                    return text
+                elif response.status_code == 401 and attempt + 1 < max_retries:
+                    clear_token_cache()
+                    headers["Authorization"] = f"Bearer {get_substrate_token()}"
+                elif response.status_code == 429:
+                    call.rate_limited()
+                    wait_time = (attempt + 1) * 10
+                    print(f"  Rate limited, waiting {wait_time}s...")
+                    time.sleep(wait_time)
+                else:
+                    raise Exception(f"GPT-5 API error {response.status_code}: {response.text[:200]}")
                 
-        except requests.exceptions.Timeout:
-            print(f"  Request timeout, retrying...")
-            time.sleep(5)
+            except requests.exceptions.Timeout:
+                print(f"  Request timeout, retrying...")
+                time.sleep(5)
     
-    raise Exception(f"GPT-5 API failed after {max_retries} retries")
+        raise Exception(f"GPT-5 API failed after {max_retries} retries")
 
 
 def extract_json_from_response(response: str) -> Dict[str, Any]:
@@ -0,0 +1,535 @@
+"""
+Local fast-path dimension classifier.
+
+A TF-IDF + multinomial logistic regression model (NumPy only) trained on
+assertions GPT-5 has already labeled. classify_assertion() consults it first:
+predictions whose calibrated confidence clears the model's threshold are
+returned without an API call; everything else escalates to GPT-5.
+
+Confidence is calibrated by temperature scaling on a held-out split, and the
+threshold is the lowest confidence at which held-out precision still meets the
+target (default 95%), so the cascade trades coverage for accuracy explicitly.
+
+Training data (any mix; duplicates are dropped, first label wins):
+- assertions_converted_gpt5*.jsonl   {"assertions": [{"original_text", "dimension"}]}
+- assertion_evaluation_gpt5.json     {"meetings": [{"assertion_evaluations": [...]}]}
+- convert_kening_assertions_v2 output (*.jsonl) or its sg_classification_report*.json
+  (follows output_file / stage_files)
+
+Usage:
+    python -m assertion_analyzer train                              # default sources
+    python -m assertion_analyzer train docs/ChinYew/*.jsonl --target-precision 0.97
+    python -m assertion_analyzer.local_classifier evaluate
+    python -m assertion_analyzer.local_classifier predict "Each task should have an owner"
+
+Environment:
+    MIRA_LOCAL_CLASSIFIER   Model path, or "off" to always call GPT-5
+                            (default: assertion_analyzer/models/dimension_classifier.npz)
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import argparse
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .dimensions import DIMENSION_NAMES, S_TO_G_MAP
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+MODEL_ENV = "MIRA_LOCAL_CLASSIFIER"
+MODEL_FILE = os.path.join(os.path.dirname(__file__), "models", "dimension_classifier.npz")
+
+DEFAULT_SOURCES = [
+    "docs/ChinYew/assertions_converted_gpt5*.jsonl",
+    "docs/ChinYew/assertion_evaluation_gpt5.json",
+    "docs/ChinYew/sg_classification_report*.json",
+]
+
+TARGET_PRECISION = 0.95
+HOLDOUT_FRACTION = 0.2
+MIN_DF = 2            # drop n-grams seen in fewer training examples
+EPOCHS = 300
+LEARNING_RATE = 0.05
+L2 = 1e-4
+MIN_CLASS_EXAMPLES = 3  # rarer labels are left to GPT-5
+
+_TOKEN_PATTERN = re.compile(r"[a-z]+|\d+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word unigrams + bigrams; numbers collapse to <num>."""
+    words = ["<num>" if w.isdigit() else w for w in _TOKEN_PATTERN.findall(text.lower())]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Training Data
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _clean_text(text: str) -> str:
+    # assertions_converted_gpt5 truncates original_text to ~100 chars + "..."
+    text = (text or "").strip()
+    return text[:-3].rstrip() if text.endswith("...") else text
+
+
+def _examples_from_record(record: Dict) -> Iterator[Tuple[str, str]]:
+    """(text, dimension) pairs from any of the supported record shapes."""
+    # convert_kening_assertions_v2 report: follow the combined output, else its stages
+    if "stage_files" in record:
+        paths = [p.replace("\\", "/") for p in [record.get("output_file") or ""] + record["stage_files"]]
+        existing = [p for p in paths if p.endswith(".jsonl") and os.path.exists(p)]
+        for path in existing[:1] if existing and existing[0] == paths[0] else existing:
+            yield from _examples_from_file(path)
+        return
+
+    # Meeting records with an assertions list (assertions_converted_gpt5*.jsonl)
+    for assertion in record.get("assertions") or []:
+        if isinstance(assertion, dict) and assertion.get("dimension"):
+            yield _clean_text(assertion.get("original_text") or assertion.get("text")), assertion["dimension"]
+
+    # Evaluation results (assertion_evaluation_gpt5.json)
+    for meeting in record.get("meetings") or []:
+        for evaluation in meeting.get("assertion_evaluations") or []:
+            if evaluation.get("mapped_dimension"):
+                yield _clean_text(evaluation.get("assertion_text")), evaluation["mapped_dimension"]
+
+    # convert_kening_assertions_v2 units (one per S, first unit labels the original)
+    if record.get("original_assertion"):
+        dimension = record.get("s_dimension") or record.get("dimension")
+        if dimension:
+            yield _clean_text(record["original_assertion"]), dimension
+
+
+def _examples_from_file(path: str) -> Iterator[Tuple[str, str]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield from _examples_from_record(json.loads(line))
+        else:
+            data = json.load(f)
+            for record in (data if isinstance(data, list) else [data]):
+                yield from _examples_from_record(record)
+
+
+def load_labeled_examples(sources: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+    """
+    Collect GPT-5-labeled (assertion text, dimension) pairs.
+
+    Args:
+        sources: Files or glob patterns (default: DEFAULT_SOURCES)
+
+    Returns:
+        Unique-by-text examples with a known dimension label
+    """
+    seen = set()
+    examples = []
+    for pattern in sources or DEFAULT_SOURCES:
+        for path in sorted(glob.glob(pattern)) or ([pattern] if os.path.exists(pattern) else []):
+            for text, dimension in _examples_from_file(path):
+                key = " ".join(text.lower().split())
+                if not key or key in seen or dimension not in DIMENSION_NAMES:
+                    continue
+                seen.add(key)
+                examples.append((text, dimension))
+    return examples
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Model
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _softmax(logits: "np.ndarray") -> "np.ndarray":
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class DimensionClassifier:
+    """TF-IDF features, linear softmax layer, temperature-calibrated confidence."""
+
+    def __init__(self, vocabulary: List[str], idf: "np.ndarray", weights: "np.ndarray",
+                 bias: "np.ndarray", labels: List[str], temperature: float = 1.0,
+                 threshold: float = 1.0, metadata: Optional[Dict] = None):
+        self.vocabulary = list(vocabulary)
+        self.index = {term: i for i, term in enumerate(self.vocabulary)}
+        self.idf = idf.astype(np.float32)
+        self.weights = weights.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+        self.labels = list(labels)
+        self.temperature = float(temperature)
+        self.threshold = float(threshold)
+        self.metadata = metadata or {}
+
+    # ─── Features ─────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def build_vocabulary(texts: List[str], min_df: int = MIN_DF) -> Tuple[List[str], "np.ndarray"]:
+        """Terms kept by document frequency, with smoothed IDF weights."""
+        df: Dict[str, int] = {}
+        for text in texts:
+            for term in set(tokenize(text)):
+                df[term] = df.get(term, 0) + 1
+        vocabulary = sorted(term for term, count in df.items() if count >= min_df)
+        counts = np.array([df[term] for term in vocabulary], dtype=np.float32)
+        idf = np.log((1 + len(texts)) / (1 + counts)) + 1
+        return vocabulary, idf
+
+    def features(self, texts: List[str]) -> "np.ndarray":
+        """L2-normalized sublinear TF-IDF rows."""
+        matrix = np.zeros((len(texts), len(self.vocabulary)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for term in tokenize(text):
+                column = self.index.get(term)
+                if column is not None:
+                    matrix[row, column] += 1
+        np.log1p(matrix, out=matrix)
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    # ─── Prediction ───────────────────────────────────────────────────────────
+
+    def logits(self, texts: List[str]) -> "np.ndarray":
+        return self.features(texts) @ self.weights + self.bias
+
+    def predict_proba(self, texts: List[str]) -> "np.ndarray":
+        """Calibrated class probabilities, one row per text."""
+        return _softmax(self.logits(texts) / self.temperature)
+
+    def predict(self, text: str) -> Dict:
+        """Top dimension with its calibrated confidence."""
+        probabilities = self.predict_proba([text])[0]
+        best = int(probabilities.argmax())
+        return {
+            "dimension": self.labels[best],
+            "confidence": float(probabilities[best]),
+            "confident": bool(probabilities[best] >= self.threshold),
+        }
+
+    # ─── Training ─────────────────────────────────────────────────────────────
+
+    @classmethod
+    def fit(cls, texts: List[str], labels: List[str], epochs: int = EPOCHS,
+            learning_rate: float = LEARNING_RATE, l2: float = L2, min_df: int = MIN_DF,
+            seed: int = 0) -> "DimensionClassifier":
+        """Fit TF-IDF and the softmax layer (full-batch Adam on cross-entropy + L2)."""
+        classes = sorted(set(labels))
+        vocabulary, idf = cls.build_vocabulary(texts, min_df)
+        rng = np.random.default_rng(seed)
+        model = cls(vocabulary, idf,
+                    rng.normal(0, 0.01, (len(vocabulary), len(classes))).astype(np.float32),
+                    np.zeros(len(classes), dtype=np.float32), classes)
+        X = model.features(texts)
+        Y = np.zeros((len(texts), len(classes)), dtype=np.float32)
+        Y[np.arange(len(texts)), [classes.index(label) for label in labels]] = 1
+
+        params = [model.weights, model.bias]
+        moments = [(np.zeros_like(p), np.zeros_like(p)) for p in params]
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        for step in range(1, epochs + 1):
+            error = (_softmax(X @ model.weights + model.bias) - Y) / len(texts)
+            grads = [X.T @ error + l2 * model.weights, error.sum(axis=0)]
+            for param, grad, (m, v) in zip(params, grads, moments):
+                m *= beta1
+                m += (1 - beta1) * grad
+                v *= beta2
+                v += (1 - beta2) * grad * grad
+                param -= learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+        return model
+
+    def calibrate(self, texts: List[str], labels: List[str],
+                  target_precision: float = TARGET_PRECISION) -> Dict:
+        """
+        Fit the temperature and pick the cascade threshold on held-out data.
+
+        Returns:
+            Held-out metrics: accuracy, ECE before/after, threshold, coverage and
+            precision of the confident slice
+        """
+        logits = self.logits(texts)
+        known = [i for i, label in enumerate(labels) if label in self.labels]
+        logits = logits[known]
+        truth = np.array([self.labels.index(labels[i]) for i in known])
+
+        def nll(temperature: float) -> float:
+            probabilities = _softmax(logits / temperature)
+            return float(-np.log(probabilities[np.arange(len(truth)), truth] + 1e-12).mean())
+
+        before = _softmax(logits)
+        self.temperature = min(np.exp(np.linspace(np.log(0.05), np.log(5.0), 200)), key=nll)
+        probabilities = _softmax(logits / self.temperature)
+        confidence = probabilities.max(axis=1)
+        correct = probabilities.argmax(axis=1) == truth
+
+        # Lowest threshold whose confident slice still meets the precision target
+        self.threshold = 1.0
+        order = np.argsort(-confidence)
+        hits = np.cumsum(correct[order])
+        for rank in range(len(order) - 1, -1, -1):
+            if hits[rank] / (rank + 1) >= target_precision:
+                self.threshold = float(confidence[order[rank]])
+                break
+        confident = confidence >= self.threshold
+
+        return {
+            "holdout_examples": int(len(truth)),
+            "accuracy": round(float(correct.mean()), 4) if len(truth) else None,
+            "ece_uncalibrated": round(_expected_calibration_error(before, truth), 4),
+            "ece_calibrated": round(_expected_calibration_error(probabilities, truth), 4),
+            "temperature": round(self.temperature, 4),
+            "target_precision": target_precision,
+            "threshold": round(self.threshold, 4),
+            "coverage": round(float(confident.mean()), 4) if len(truth) else 0.0,
+            "precision": round(float(correct[confident].mean()), 4) if confident.any() else None,
+        }
+
+    # ─── Persistence ──────────────────────────────────────────────────────────
+
+    def save(self, path: str = MODEL_FILE) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            vocabulary=np.array(self.vocabulary),
+            idf=self.idf,
+            weights=self.weights,
+            bias=self.bias,
+            labels=np.array(self.labels),
+            temperature=np.array(self.temperature),
+            threshold=np.array(self.threshold),
+            metadata=np.array(json.dumps(self.metadata)),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: str = MODEL_FILE) -> "DimensionClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["vocabulary"].tolist(), data["idf"], data["weights"], data["bias"],
+                data["labels"].tolist(), float(data["temperature"]), float(data["threshold"]),
+                json.loads(str(data["metadata"])),
+            )
+
+
+def _expected_calibration_error(probabilities: "np.ndarray", truth: "np.ndarray", bins: int = 10) -> float:
+    if not len(truth):
+        return 0.0
+    confidence = probabilities.max(axis=1)
+    correct = probabilities.argmax(axis=1) == truth
+    edges = np.linspace(0, 1, bins + 1)
+    error = 0.0
+    for low, high in zip(edges[:-1], edges[1:]):
+        in_bin = (confidence > low) & (confidence <= high)
+        if in_bin.any():
+            error += in_bin.mean() * abs(correct[in_bin].mean() - confidence[in_bin].mean())
+    return float(error)
+
+
+def train_classifier(examples: List[Tuple[str, str]], target_precision: float = TARGET_PRECISION,
+                     holdout: float = HOLDOUT_FRACTION, epochs: int = EPOCHS,
+                     seed: int = 0) -> Tuple[DimensionClassifier, Dict]:
+    """
+    Train, calibrate on a stratified held-out split, then refit on all data.
+
+    The refit model keeps the held-out temperature and threshold.
+
+    Returns:
+        (model, report) where report holds the held-out metrics
+    """
+    counts: Dict[str, int] = {}
+    for _, label in examples:
+        counts[label] = counts.get(label, 0) + 1
+    examples = [(t, l) for t, l in examples if counts[l] >= MIN_CLASS_EXAMPLES]
+    if len({l for _, l in examples}) < 2:
+        raise ValueError(f"Need at least 2 dimensions with {MIN_CLASS_EXAMPLES}+ examples to train")
+
+    rng = np.random.default_rng(seed)
+    train_idx, holdout_idx = [], []
+    for label in sorted({l for _, l in examples}):
+        members = [i for i, (_, l) in enumerate(examples) if l == label]
+        rng.shuffle(members)
+        cut = max(1, int(round(len(members) * holdout)))
+        holdout_idx += members[:cut]
+        train_idx += members[cut:]
+
+    texts = [t for t, _ in examples]
+    labels = [l for _, l in examples]
+    model = DimensionClassifier.fit([texts[i] for i in train_idx], [labels[i] for i in train_idx],
+                                    epochs=epochs, seed=seed)
+    report = model.calibrate([texts[i] for i in holdout_idx], [labels[i] for i in holdout_idx],
+                             target_precision)
+
+    final = DimensionClassifier.fit(texts, labels, epochs=epochs, seed=seed)
+    final.temperature, final.threshold = model.temperature, model.threshold
+    report.update({
+        "examples": len(examples),
+        "dimensions": {label: counts[label] for label in final.labels},
+        "vocabulary": len(final.vocabulary),
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    })
+    final.metadata = report
+    return final, report
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Cascade
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_model: Optional[DimensionClassifier] = None
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+def get_model_path() -> Optional[str]:
+    """Model file to use, or None when the local fast path is disabled."""
+    value = os.environ.get(MODEL_ENV, "").strip()
+    if value.lower() in ("off", "0", "false", "none"):
+        return None
+    return value or MODEL_FILE
+
+
+def get_local_classifier() -> Optional[DimensionClassifier]:
+    """The trained model, loaded once; None without NumPy, a model file, or when disabled."""
+    global _model, _model_loaded
+    if not _model_loaded:
+        with _model_lock:
+            if not _model_loaded:
+                path = get_model_path()
+                if np is not None and path and os.path.exists(path):
+                    try:
+                        _model = DimensionClassifier.load(path)
+                    except (OSError, ValueError, KeyError) as e:
+                        print(f"Warning: Could not load local classifier {path}: {e}")
+                _model_loaded = True
+    return _model
+
+
+def classify_locally(assertion_text: str) -> Optional[Dict]:
+    """
+    Confident local classification in classify_assertion()'s result format.
+
+    The model only predicts the dimension: level is None (callers keep the
+    assertion's own level), and layer and linked_g_dims follow from the dimension.
+
+    Returns:
+        The classification dict (source="local"), or None when there is no
+        model or its confidence is below threshold (the caller asks GPT-5)
+    """
+    model = get_local_classifier()
+    if model is None:
+        return None
+    prediction = model.predict(assertion_text)
+    if not prediction["confident"]:
+        return None
+    dimension_id = prediction["dimension"]
+    return {
+        "dimension": dimension_id,
+        "dimension_name": DIMENSION_NAMES.get(dimension_id, "Unknown"),
+        "layer": "structural" if dimension_id.startswith("S") else "grounding",
+        "level": None,
+        "rationale": f"Local classifier (confidence {prediction['confidence']:.2f} >= {model.threshold:.2f})",
+        "linked_g_dims": S_TO_G_MAP.get(dimension_id, []) if dimension_id.startswith("S") else [],
+        "source": "local",
+        "confidence": round(prediction["confidence"], 4),
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Main
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _print_report(report: Dict) -> None:
+    print(f"  Examples:        {report.get('examples', report['holdout_examples'])}")
+    print(f"  Held-out:        {report['holdout_examples']} (accuracy {report['accuracy']})")
+    print(f"  Calibration ECE: {report['ece_uncalibrated']} -> {report['ece_calibrated']} "
+          f"(temperature {report['temperature']})")
+    print(f"  Threshold:       {report['threshold']} for {report['target_precision']:.0%} precision")
+    print(f"  Local coverage:  {report['coverage']:.1%} of assertions skip GPT-5 "
+          f"(precision {report['precision']})")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Train and inspect the local fast-path dimension classifier",
+        prog="python -m assertion_analyzer.local_classifier"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = commands.add_parser("train", help="Train from GPT-5-labeled assertions")
+    train_parser.add_argument("sources", nargs="*", help="Labeled files or globs (default: docs/ChinYew outputs)")
+    train_parser.add_argument("-o", "--output", default=None, help="Model file (default: MIRA_LOCAL_CLASSIFIER or bundled path)")
+    train_parser.add_argument("--target-precision", type=float, default=TARGET_PRECISION,
+                              help=f"Held-out precision the confident slice must meet (default: {TARGET_PRECISION})")
+    train_parser.add_argument("--holdout", type=float, default=HOLDOUT_FRACTION,
+                              help=f"Fraction held out for calibration (default: {HOLDOUT_FRACTION})")
+    train_parser.add_argument("--epochs", type=int, default=EPOCHS, help=f"Training epochs (default: {EPOCHS})")
+
+    eval_parser = commands.add_parser("evaluate", help="Score an existing model on labeled data")
+    eval_parser.add_argument("sources", nargs="*", help="Labeled files or globs (default: docs/ChinYew outputs)")
+    eval_parser.add_argument("-m", "--model", default=None, help="Model file")
+
+    predict_parser = commands.add_parser("predict", help="Classify one assertion locally")
+    predict_parser.add_argument("assertion", help="Assertion text")
+    predict_parser.add_argument("-m", "--model", default=None, help="Model file")
+
+    args = parser.parse_args(argv)
+    if np is None:
+        print("[FAIL] NumPy is required: pip install numpy")
+        return 2
+
+    if args.command == "train":
+        examples = load_labeled_examples(args.sources)
+        print(f"Training on {len(examples)} labeled assertions...")
+        try:
+            model, report = train_classifier(examples, args.target_precision, args.holdout, args.epochs)
+        except ValueError as e:
+            print(f"[FAIL] {e}")
+            return 1
+        path = model.save(args.output or get_model_path() or MODEL_FILE)
+        _print_report(report)
+        print(f"[OK] Model saved to {path}")
+        return 0
+
+    path = args.model or get_model_path() or MODEL_FILE
+    if not os.path.exists(path):
+        print(f"[FAIL] No model at {path}; run: python -m assertion_analyzer train")
+        return 1
+    model = DimensionClassifier.load(path)
+
+    if args.command == "evaluate":
+        examples = [(t, l) for t, l in load_labeled_examples(args.sources) if l in model.labels]
+        if not examples:
+            print("[FAIL] No labeled assertions with dimensions this model knows")
+            return 1
+        probabilities = model.predict_proba([t for t, _ in examples])
+        confidence = probabilities.max(axis=1)
+        correct = np.array([model.labels[int(row.argmax())] == label
+                            for row, (_, label) in zip(probabilities, examples)])
+        confident = confidence >= model.threshold
+        print(f"  Examples:        {len(examples)} (accuracy {correct.mean():.4f})")
+        print(f"  Threshold:       {model.threshold:.4f}")
+        print(f"  Local coverage:  {confident.mean():.1%} of assertions skip GPT-5 (precision "
+              f"{correct[confident].mean() if confident.any() else float('nan'):.4f})")
+        return 0
+
+    prediction = model.predict(args.assertion)
+    prediction["dimension_name"] = DIMENSION_NAMES.get(prediction["dimension"], "Unknown")
+    prediction["threshold"] = round(model.threshold, 4)
+    print(json.dumps(prediction, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
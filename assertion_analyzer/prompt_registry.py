@@ -0,0 +1,253 @@
+"""
+Compiled prompt registry for the Assertion Analyzer.
+
+All prompt files are read once per process:
+- prompts.json            analysis prompts (filled with str.format)
+- prompts/*_prompt.json   classification, decomposition and IE slot extraction
+                          (user_prompt_template filled by {slot} replacement)
+
+Each template is pre-split into its static prefix and variable slots, so
+rendering is a join instead of a scan, and every prompt carries a content hash
+of its version (template + system prompt + settings). The hashes identify the
+exact prompt behind a cached response or a run.
+
+Usage:
+    from assertion_analyzer.prompt_registry import get_registry
+
+    prompt = get_registry().get("classification")
+    text = prompt.render(assertion_text="Tasks have owners")
+    prompt.system_prompt, prompt.temperature, prompt.hash
+
+    get_registry().manifest()   # {name: {version, hash, source, slots}}
+"""
+
+import os
+import json
+import hashlib
+import re
+import string
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+PROMPTS_FILE = os.path.join(os.path.dirname(__file__), "prompts.json")
+PROMPTS_DIR = os.path.join(os.path.dirname(__file__), "prompts")
+
+HASH_LENGTH = 12
+
+# Fill styles
+FORMAT = "format"     # str.format semantics ({{ and }} are literal braces)
+REPLACE = "replace"   # only {slot} is substituted; every other brace is kept
+
+_SLOT_PATTERN = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+def content_hash(payload: Any) -> str:
+    """Stable short hash of a JSON-serializable value."""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Compiled Prompt
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class CompiledPrompt:
+    """A prompt template split into literal text and slots, with its version hash."""
+
+    def __init__(self, name: str, template: str, style: str = FORMAT, system_prompt: str = "",
+                 temperature: Optional[float] = None, version: Optional[str] = None,
+                 source: Optional[str] = None, config: Optional[Dict] = None):
+        self.name = name
+        self.template = template
+        self.style = style
+        self.system_prompt = system_prompt or ""
+        self.temperature = temperature
+        self.version = version
+        self.source = source
+        self.config = config or {}
+        self._parts = self._compile(template, style)
+        self.slots = tuple(dict.fromkeys(field for _, field, _, _ in self._parts if field is not None))
+        self.prefix = self._parts[0][0] if self._parts else ""
+        self.hash = content_hash({
+            "template": template,
+            "style": style,
+            "system_prompt": self.system_prompt,
+            "temperature": temperature,
+            "config": self.config,
+        })
+
+    @property
+    def fingerprint(self) -> str:
+        """name@version#hash, for logs and manifests."""
+        return f"{self.name}@{self.version or '-'}#{self.hash}"
+
+    @staticmethod
+    def _compile(template: str, style: str) -> List[Tuple[str, Optional[str], str, Optional[str]]]:
+        """(literal, slot, format_spec, conversion) parts; slot is None for trailing text."""
+        if style == FORMAT:
+            return [(literal, field, spec or "", conversion)
+                    for literal, field, spec, conversion in string.Formatter().parse(template)]
+        if style != REPLACE:
+            raise ValueError(f"Unknown prompt style: {style}")
+        parts = []
+        position = 0
+        for match in _SLOT_PATTERN.finditer(template):
+            parts.append((template[position:match.start()], match.group(1), "", None))
+            position = match.end()
+        parts.append((template[position:], None, "", None))
+        return parts
+
+    def render(self, **values: Any) -> str:
+        """
+        Fill the slots.
+
+        FORMAT prompts raise KeyError for a missing slot, like str.format.
+        REPLACE prompts leave a slot without a value as literal {slot} text.
+        """
+        out = []
+        for literal, field, spec, conversion in self._parts:
+            out.append(literal)
+            if field is None:
+                continue
+            if self.style == REPLACE:
+                out.append(str(values[field]) if field in values else "{" + field + "}")
+                continue
+            value = values[field]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "a":
+                value = ascii(value)
+            elif conversion == "s":
+                value = str(value)
+            out.append(format(value, spec))
+        return "".join(out)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "hash": self.hash,
+            "source": os.path.basename(self.source) if self.source else None,
+            "slots": list(self.slots),
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Registry
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class PromptRegistry:
+    """
+    Loads every prompt file once and serves compiled prompts by name.
+
+    Names:
+    - prompts.json keys as-is (e.g. "system_prompt", "g_selection_prompt")
+    - prompts/<name>_prompt.json as <name> (e.g. "classification")
+    """
+
+    def __init__(self, prompts_file: Optional[str] = PROMPTS_FILE,
+                 prompts_dir: Optional[str] = PROMPTS_DIR, verbose: bool = True):
+        self.prompts_file = prompts_file
+        self.prompts_dir = prompts_dir
+        self.verbose = verbose
+        self._prompts: Dict[str, CompiledPrompt] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _warn(self, message: str) -> None:
+        if self.verbose:
+            print(f"Warning: {message}")
+
+    def _read_json(self, path: str) -> Optional[Dict]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as e:
+            self._warn(f"Error parsing {path}: {e}")
+            return None
+
+    def load(self) -> "PromptRegistry":
+        """Read and compile all prompt files (only the first call does I/O)."""
+        if self._loaded:
+            return self
+        with self._lock:
+            if self._loaded:
+                return self
+            prompts: Dict[str, CompiledPrompt] = {}
+
+            if self.prompts_file:
+                data = self._read_json(self.prompts_file)
+                if data is None:
+                    if not os.path.exists(self.prompts_file):
+                        self._warn(f"{self.prompts_file} not found, using built-in prompts")
+                    data = {}
+                version = data.get("_version")
+                for key, value in data.items():
+                    if key.startswith("_") or not isinstance(value, str):
+                        continue
+                    prompts[key] = CompiledPrompt(key, value, FORMAT, version=version,
+                                                  source=self.prompts_file)
+
+            if self.prompts_dir and os.path.isdir(self.prompts_dir):
+                for filename in sorted(os.listdir(self.prompts_dir)):
+                    if not filename.endswith("_prompt.json"):
+                        continue
+                    path = os.path.join(self.prompts_dir, filename)
+                    config = self._read_json(path)
+                    if not config or "user_prompt_template" not in config:
+                        continue
+                    name = filename[:-len("_prompt.json")]
+                    extra = {k: v for k, v in config.items()
+                             if k not in ("user_prompt_template", "system_prompt", "temperature")}
+                    prompts[name] = CompiledPrompt(
+                        name, config["user_prompt_template"], REPLACE,
+                        system_prompt=config.get("system_prompt", ""),
+                        temperature=config.get("temperature"),
+                        version=config.get("version"),
+                        source=path,
+                        config=extra,
+                    )
+
+            self._prompts = prompts
+            self._loaded = True
+        return self
+
+    def get(self, name: str) -> Optional[CompiledPrompt]:
+        """Compiled prompt by name, or None if no file provides it."""
+        return self.load()._prompts.get(name)
+
+    def text(self, name: str, fallback: str = "") -> str:
+        """Raw template text by name, with fallback."""
+        prompt = self.get(name)
+        return prompt.template if prompt else fallback
+
+    def names(self) -> List[str]:
+        return sorted(self.load()._prompts)
+
+    def manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Version and hash of every loaded prompt, for run summaries."""
+        return {name: prompt.describe() for name, prompt in sorted(self.load()._prompts.items())}
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash over all loaded prompt hashes (changes when any prompt changes)."""
+        return content_hash({name: prompt.hash for name, prompt in self.load()._prompts.items()})
+
+
+_registry: Optional[PromptRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> PromptRegistry:
+    """Process-wide registry for the analyzer's bundled prompt files."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PromptRegistry().load()
+    return _registry
@@ -27,12 +27,25 @@
 .PARAMETER OutputDir
     Directory to save results.
 
+.PARAMETER Workers
+    Batch mode: number of assertions to process concurrently (default: 1).
+    Serve mode: number of concurrent analyses.
+
+.PARAMETER Serve
+    Start the warm local analyzer service; single-assertion runs forward to it.
+
 .EXAMPLE
     .\run.ps1 "The plan includes task deadlines"
 
 .EXAMPLE
     .\run.ps1 -Batch "assertions.txt" -OutputDir "./results"
 
+.EXAMPLE
+    .\run.ps1 -Batch "assertions.txt" -Workers 8
+
+.EXAMPLE
+    .\run.ps1 -Serve
+
 .EXAMPLE
     .\run.ps1 "Tasks have owners" -NoExamples -Quiet
 
@@ -56,7 +69,12 @@ param(
     [switch]$Quiet,
     
     [Alias("o")]
-    [string]$OutputDir
+    [string]$OutputDir,
+    
+    [Alias("w")]
+    [int]$Workers = 1,
+    
+    [switch]$Serve
 )
 
 $ScriptDir = Split-Path -Parent $MyInvocation.MyCommand.Path
@@ -89,7 +107,10 @@ if (-not (Test-Path $VenvPython)) {
 # Build command arguments
 $Args = @("-m", "assertion_analyzer")
 
-if ($Batch) {
+if ($Serve) {
+    # -Workers and -Quiet below also apply to the service
+    $Args += "serve"
+} elseif ($Batch) {
     $Args += "--batch"
     $Args += $Batch
 } elseif ($Assertion) {
@@ -118,6 +139,11 @@ if ($OutputDir) {
     $Args += $OutputDir
 }
 
+if ($Workers -gt 1) {
+    $Args += "--workers"
+    $Args += $Workers
+}
+
 # Set encoding for proper output
 $env:PYTHONIOENCODING = "utf-8"
 
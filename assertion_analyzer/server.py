@@ -0,0 +1,337 @@
+"""
+Warm local service for the Assertion Analyzer.
+
+Each `python -m assertion_analyzer "..."` launch pays interpreter startup,
+imports, prompt loading and a fresh MSAL token. `serve` keeps one process warm
+(prompts loaded, live token, pooled HTTPS connections, in-memory result cache)
+behind a local HTTP/JSON API, and the CLI forwards single-assertion requests to
+it when it is running.
+
+Usage:
+    # Start the service (127.0.0.1:8766, 4 concurrent analyses)
+    python -m assertion_analyzer serve
+    python -m assertion_analyzer serve --port 9000 --workers 8 --max-queue 64
+
+    # The CLI forwards automatically when the service is up
+    python -m assertion_analyzer "Tasks have owners"
+    python -m assertion_analyzer "Tasks have owners" --no-server   # always run in-process
+
+Endpoints:
+    GET  /health    Liveness and load (in flight, queued, cached results)
+    GET  /stats     Request, cache and error counters
+    POST /analyze   {"assertion", "context", "index", "assertion_id", "output_dir",
+                     "no_examples", "no_report"} -> same result dict as the CLI
+
+Environment:
+    MIRA_ANALYZER_URL   Service URL the CLI forwards to (default http://127.0.0.1:8766)
+"""
+
+import os
+import json
+import time
+import copy
+import argparse
+import threading
+import urllib.request
+import urllib.error
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from .analyzer import analyze_assertion, generate_sg_assertions, generate_report
+from .config import get_substrate_token
+from .prompt_registry import get_registry
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SERVER_URL_ENV = "MIRA_ANALYZER_URL"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_CACHE_SIZE = 256
+
+PROBE_TIMEOUT = 0.5      # seconds; the CLI falls back to in-process when exceeded
+REQUEST_TIMEOUT = 900    # seconds; a full analysis is 5 sequential GPT-5 calls
+
+
+class ServiceBusy(Exception):
+    """The request queue is full."""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Service
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class AnalyzerService:
+    """Runs analyses with bounded concurrency, a bounded queue and a result cache."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_queue: int = DEFAULT_MAX_QUEUE,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.cache_size = cache_size
+        self.started = time.time()
+        self._slots = threading.Semaphore(self.workers)
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[tuple, list]" = OrderedDict()
+        self.in_flight = 0
+        self.queued = 0
+        self.stats = {"requests": 0, "cache_hits": 0, "errors": 0, "rejected": 0}
+
+    def health(self) -> Dict:
+        with self._lock:
+            return {
+                "status": "ok",
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self.started, 1),
+                "workers": self.workers,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "cached_results": len(self._cache),
+                "prompts": get_registry().fingerprint,
+            }
+
+    def analyze(self, request: Dict) -> Dict:
+        """
+        Analyze one assertion, waiting for a free worker slot.
+
+        Raises:
+            ValueError: If the request has no assertion text
+            ServiceBusy: If max_queue requests are already waiting
+        """
+        assertion = (request.get("assertion") or "").strip()
+        if not assertion:
+            raise ValueError("Missing 'assertion'")
+
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.queued >= self.max_queue and self.in_flight >= self.workers:
+                self.stats["rejected"] += 1
+                raise ServiceBusy(f"{self.queued} requests already queued")
+            self.queued += 1
+        self._slots.acquire()
+        with self._lock:
+            self.queued -= 1
+            self.in_flight += 1
+        try:
+            result = self._run(assertion, request)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+        if not result["success"]:
+            with self._lock:
+                self.stats["errors"] += 1
+        return result
+
+    def _run(self, assertion: str, request: Dict) -> Dict:
+        """Classification + S+G generation (cached), then the report files."""
+        index = int(request.get("index") or 0)
+        context = request.get("context")
+        no_examples = bool(request.get("no_examples"))
+        assertion_id = request.get("assertion_id") or f"A{index:04d}"
+        result = {
+            "success": False,
+            "assertion": assertion,
+            "index": index,
+            "assertion_id": assertion_id,
+            "assertions": [],
+            "error": None,
+            "file_path": None,
+            "cached": False,
+        }
+
+        # Assertion IDs embed the index, so it is part of the key; the prompt
+        # fingerprint ties cached results to the prompt versions that made them
+        key = (get_registry().fingerprint, assertion, context, index, no_examples)
+        with self._lock:
+            assertions = self._cache.get(key)
+            if assertions is not None:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                result["cached"] = True
+
+        try:
+            if assertions is None:
+                gpt5_result = analyze_assertion(assertion, context)
+                if "error" in gpt5_result:
+                    result["error"] = gpt5_result.get("error")
+                    return result
+                assertions = generate_sg_assertions(
+                    gpt5_result, assertion, index,
+                    generate_examples=not no_examples, verbose=False
+                )
+                with self._lock:
+                    self._cache[key] = assertions
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+
+            result["assertions"] = copy.deepcopy(assertions)
+            if not request.get("no_report"):
+                report_result = generate_report(result["assertions"], assertion,
+                                                request.get("output_dir"), assertion_id)
+                result["file_path"] = report_result.get("json_file_path")
+                result["summary_table"] = report_result.get("summary_table")
+            result["success"] = True
+        except Exception as e:
+            result["error"] = str(e)
+        return result
+
+
+class AnalyzerHandler(BaseHTTPRequestHandler):
+    """HTTP/JSON front end of an AnalyzerService."""
+
+    server_version = "AssertionAnalyzer/1.0"
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: Dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        service = self.server.service
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/health":
+            self._send_json(200, service.health())
+        elif path == "/stats":
+            with service._lock:
+                stats = dict(service.stats)
+            self._send_json(200, {**stats, **service.health()})
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path != "/analyze":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            self._send_json(200, self.server.service.analyze(request))
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": str(e)})
+        except ServiceBusy as e:
+            self._send_json(503, {"error": str(e)})
+
+
+def create_server(service: AnalyzerService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                  quiet: bool = False) -> ThreadingHTTPServer:
+    """Bind the HTTP server (port 0 picks a free port)."""
+    server = ThreadingHTTPServer((host, port), AnalyzerHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.quiet = quiet
+    return server
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Client (used by the CLI)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def get_server_url() -> str:
+    return (os.environ.get(SERVER_URL_ENV) or f"http://{DEFAULT_HOST}:{DEFAULT_PORT}").rstrip("/")
+
+
+def is_server_running(url: Optional[str] = None) -> bool:
+    """Probe /health; False if nothing answers within PROBE_TIMEOUT."""
+    try:
+        with urllib.request.urlopen(f"{url or get_server_url()}/health", timeout=PROBE_TIMEOUT) as response:
+            return json.loads(response.read()).get("status") == "ok"
+    except (OSError, ValueError):
+        return False
+
+
+def forward_analysis(request: Dict, url: Optional[str] = None) -> Optional[Dict]:
+    """
+    Run an analysis on the warm service.
+
+    Args:
+        request: /analyze payload (see module docstring)
+        url: Service URL (default: MIRA_ANALYZER_URL or http://127.0.0.1:8766)
+
+    Returns:
+        The result dict, or None if no service is running or it is saturated
+        (the caller then runs the analysis in-process)
+    """
+    url = url or get_server_url()
+    if not is_server_running(url):
+        return None
+    body = json.dumps(request, ensure_ascii=False).encode("utf-8")
+    http_request = urllib.request.Request(f"{url}/analyze", data=body,
+                                          headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(http_request, timeout=REQUEST_TIMEOUT) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        if e.code == 503:
+            return None
+        try:
+            error = json.loads(e.read()).get("error")
+        except ValueError:
+            error = None
+        return {"success": False, "error": error or f"Analyzer service error {e.code}", "assertions": []}
+    except (OSError, ValueError):
+        return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Main
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Serve the Assertion Analyzer from a warm local process",
+        prog="python -m assertion_analyzer serve"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Bind address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Concurrent analyses (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+                        help=f"Requests allowed to wait for a worker before 503 (default: {DEFAULT_MAX_QUEUE})")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"Analyses kept in memory (default: {DEFAULT_CACHE_SIZE})")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Do not log requests")
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("WBP Assertion Analyzer - SERVICE")
+    print("=" * 70)
+    print(f"  [OK] {len(get_registry().names())} prompts loaded (fingerprint {get_registry().fingerprint})")
+    try:
+        get_substrate_token()
+        print("  [OK] Authentication token acquired")
+    except Exception as e:
+        print(f"  [FAIL] Authentication failed: {e}")
+        return 2
+
+    service = AnalyzerService(args.workers, args.max_queue, args.cache_size)
+    try:
+        server = create_server(service, args.host, args.port, args.quiet)
+    except OSError as e:
+        print(f"  [FAIL] Cannot listen on {args.host}:{args.port}: {e}")
+        return 2
+    host, port = server.server_address[:2]
+    print(f"  [OK] Listening on http://{host}:{port} ({service.workers} workers, "
+          f"queue {service.max_queue}, cache {service.cache_size})")
+    if port != DEFAULT_PORT or host != DEFAULT_HOST:
+        print(f"  Set {SERVER_URL_ENV}=http://{host}:{port} for the CLI to forward here")
+    print("=" * 70)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+    return 0
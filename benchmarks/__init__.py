@@ -0,0 +1,22 @@
+"""
+End-to-end Throughput Benchmarks
+
+Runs the evaluation scripts against the local mock LLM server
+(tools/mock_llm_server.py) with configurable latency and rate limits, and
+records throughput, latency percentiles, LLM calls/tokens per assertion and
+peak memory as JSON so results can be compared across commits.
+
+Modules:
+    workloads.py      - Workload definitions (which script, which data, how to count)
+    runner.py         - Child process that runs one workload and reports peak RSS
+    run_benchmarks.py - CLI: prepare scaled datasets, start the mock, run, report
+
+Usage:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --meetings 1000 --latency-ms 800 --rate-429 0.02
+
+Author: Chin-Yew Lin
+"""
+
+__version__ = "1.0.0"
+__author__ = "Chin-Yew Lin"
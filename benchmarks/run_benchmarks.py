@@ -0,0 +1,401 @@
+"""
+Run the End-to-end Throughput Benchmarks.
+
+Starts the mock LLM server in-process, scales the bundled datasets to the
+requested number of meetings, runs each workload in its own child process
+pointed at the mock (MIRA_LLM_MOCK_URL), and writes one JSON result file.
+
+Per workload it reports:
+    - units/sec (assertions/sec for the scoring scripts)
+    - p50/p95/p99 LLM call latency (service time at the mock)
+    - LLM calls and tokens per unit, injected 429s
+    - peak RSS of the child process
+
+Usage:
+    # Bundled 103-meeting scale, no injected latency (pure client overhead)
+    python -m benchmarks.run_benchmarks
+
+    # Realistic service behaviour: 800ms median with a tail, 2% 429s
+    python -m benchmarks.run_benchmarks --latency-ms 800 --latency-sigma 0.6 --rate-429 0.02
+
+    # 10k synthetic meetings (tools/generate_synthetic_lod.py) instead of cycled copies
+    python -m benchmarks.run_benchmarks --meetings 10000 --synthetic
+
+    # Scale sweep, scripts only, compared against a previous result
+    python -m benchmarks.run_benchmarks --scales 103,1000,10000 --workloads scripts \\
+        --compare benchmarks/results/bench_20251201_120000_abc1234.json
+"""
+
+import os
+import sys
+import json
+import math
+import shutil
+import platform
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from tools.mock_llm_server import MOCK_URL_ENV, MockLLMState, build_arg_parser, create_server
+from benchmarks.workloads import DATASETS, BenchContext, Workload, get_workloads
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+DEFAULT_MEETINGS = 103
+DEFAULT_TIMEOUT = 3600  # seconds per workload
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Datasets
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _tag_item(item: Dict, copy_index: int) -> Dict:
+    """Make a cycled copy distinct so replay/caching cannot collapse it."""
+    if copy_index == 0:
+        return item
+    tag = f" [copy {copy_index}]"
+    if isinstance(item.get("utterance"), str):
+        item["utterance"] += tag
+    elif isinstance(item.get("UTTERANCE"), dict):
+        item["UTTERANCE"]["text"] = item["UTTERANCE"].get("text", "") + tag
+    return item
+
+
+def scale_dataset(source: str, target: str, meetings: int) -> Tuple[int, int]:
+    """
+    Write `meetings` lines of a JSONL dataset, cycling the source if needed.
+
+    Streams the source (re-reading it per cycle), so memory stays constant
+    at any scale.
+
+    Returns:
+        Tuple of (meetings written, assertions written)
+    """
+    written = 0
+    assertions = 0
+    copy_index = 0
+    with open(target, 'w', encoding='utf-8') as out:
+        while written < meetings:
+            before = written
+            with open(source, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if written >= meetings:
+                        break
+                    if not line.strip():
+                        continue
+                    item = _tag_item(json.loads(line), copy_index)
+                    assertions += len(item.get("assertions", []))
+                    out.write(json.dumps(item, ensure_ascii=False) + "\n")
+                    written += 1
+            if written == before:
+                raise ValueError(f"Dataset is empty: {source}")
+            copy_index += 1
+    return written, assertions
+
+
+def prepare_synthetic_datasets(ctx: BenchContext, workloads: List[Workload], seed: int) -> None:
+    """
+    Generate a synthetic LOD + output dataset and point every workload at it.
+
+    The output-shaped datasets (output, kening, matches) all read the
+    synthetic output file; the pipeline reads the synthetic LOD file.
+    """
+    from tools.generate_synthetic_lod import generate_dataset, load_or_learn_profile
+
+    paths = generate_dataset(load_or_learn_profile(None, seed=seed), ctx.meetings,
+                             ctx.path("data"), seed=seed, progress_every=0)
+    assertions = 0
+    with open(paths["output"], 'r', encoding='utf-8') as f:
+        for line in f:
+            assertions += len(json.loads(line).get("assertions", []))
+    for dataset in sorted({w.dataset for w in workloads}):
+        ctx.data_files[dataset] = paths["lod"] if dataset == "lod" else paths["output"]
+        ctx.data_assertions[dataset] = 0 if dataset == "lod" else assertions
+        print(f"   🧪 {dataset}: {ctx.meetings} synthetic meetings, {ctx.data_assertions[dataset]} assertions")
+
+
+def prepare_datasets(ctx: BenchContext, workloads: List[Workload]) -> None:
+    """Scale every dataset the selected workloads need into the workspace."""
+    data_dir = ctx.path("data")
+    os.makedirs(data_dir, exist_ok=True)
+    for dataset in sorted({w.dataset for w in workloads}):
+        source = os.path.join(PROJECT_ROOT, DATASETS[dataset])
+        target = os.path.join(data_dir, f"{dataset}.jsonl")
+        _, assertions = scale_dataset(source, target, ctx.meetings)
+        ctx.data_files[dataset] = target
+        ctx.data_assertions[dataset] = assertions
+        print(f"   📂 {dataset}: {ctx.meetings} meetings, {assertions} assertions")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Metrics
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (None for an empty list)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return round(ordered[rank - 1], 1)
+
+
+def _per_unit(value: float, units: int) -> Optional[float]:
+    return round(value / units, 3) if units else None
+
+
+def collect_metrics(workload: Workload, ctx: BenchContext, child: Dict,
+                    stats: Dict, latencies: List[float]) -> Dict:
+    """Combine child result, mock counters and unit count into one record."""
+    unit_name, units = workload.count_units(ctx)
+    wall = child.get("wall_seconds") or 0.0
+    status, error = child.get("status", "error"), child.get("error")
+    if status == "ok" and workload.llm and not stats["requests"]:
+        # The script swallowed its API errors (or never reached the mock)
+        status, error = "error", "Made no LLM calls (see log)"
+    elif status == "ok" and not units:
+        # A stage that quietly produced nothing did no measurable work
+        status, error = "error", f"Produced no {unit_name} (see log)"
+    ok = status == "ok"
+    calls = stats["requests"] - stats["rate_limited"] - stats["upstream_errors"]
+    tokens = stats["prompt_tokens"] + stats["completion_tokens"]
+    return {
+        "name": workload.name,
+        "description": workload.description,
+        "group": workload.group,
+        "status": status,
+        "error": error,
+        "unit": unit_name,
+        "units": units,
+        "wall_seconds": wall,
+        "units_per_sec": round(units / wall, 3) if ok and wall and units else None,
+        "llm_calls": calls,
+        "llm_attempts": stats["requests"],
+        "rate_limited": stats["rate_limited"],
+        "calls_per_unit": _per_unit(calls, units),
+        "prompt_tokens": stats["prompt_tokens"],
+        "completion_tokens": stats["completion_tokens"],
+        "tokens_per_unit": _per_unit(tokens, units),
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "mean": round(sum(latencies) / len(latencies), 1) if latencies else None,
+        },
+        "peak_in_flight": stats["peak_in_flight"],
+        "peak_rss_mb": round(child["peak_rss_mb"], 1) if child.get("peak_rss_mb") else None,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Execution
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def run_workload(workload: Workload, ctx: BenchContext, state: MockLLMState,
+                 mock_url: str, timeout: int) -> Dict:
+    """Run one workload in a child process and return its metrics."""
+    spec_file = ctx.path(f"{workload.name}.spec.json")
+    result_file = ctx.path(f"{workload.name}.result.json")
+    log_file = ctx.path(f"{workload.name}.log")
+    with open(spec_file, 'w', encoding='utf-8') as f:
+        json.dump(workload.build_spec(ctx), f, indent=2)
+
+    env = dict(os.environ)
+    env[MOCK_URL_ENV] = mock_url
+    env["PYTHONPATH"] = PROJECT_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    env["PYTHONIOENCODING"] = "utf-8"
+    # Client-side call telemetry (pipeline/telemetry.py) stays with the workspace
+    env["MIRA_TELEMETRY_DIR"] = ctx.path("telemetry", workload.name)
+
+    state.reset()
+    child = {"status": "error", "error": None}
+    try:
+        with open(log_file, 'w', encoding='utf-8') as log:
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.runner", "--spec", spec_file, "--result", result_file],
+                cwd=ctx.workspace, env=env, stdout=log, stderr=subprocess.STDOUT, timeout=timeout,
+            )
+        with open(result_file, 'r', encoding='utf-8') as f:
+            child = json.load(f)
+    except subprocess.TimeoutExpired:
+        child["error"] = f"Timed out after {timeout}s"
+    except (OSError, json.JSONDecodeError) as e:
+        child["error"] = f"Runner failed: {e} (see {log_file})"
+
+    with state._lock:
+        stats = dict(state.stats)
+        latencies = list(state.latencies_ms)
+    metrics = collect_metrics(workload, ctx, child, stats, latencies)
+    metrics["log"] = log_file
+    return metrics
+
+
+def print_results(meetings: int, results: List[Dict]) -> None:
+    """Print one scale's results as a table."""
+    print(f"\n{'─' * 110}")
+    print(f"  {meetings} meetings")
+    print(f"{'─' * 110}")
+    print(f"  {'Workload':<30} {'Status':<7} {'Units':>7} {'Units/s':>9} {'p50':>8} {'p95':>8} "
+          f"{'p99':>8} {'Calls/u':>8} {'Tok/u':>8} {'RSS MB':>8}")
+    for r in results:
+        lat = r["latency_ms"]
+        cells = [
+            r["units"],
+            r["units_per_sec"],
+            lat["p50"], lat["p95"], lat["p99"],
+            r["calls_per_unit"], r["tokens_per_unit"], r["peak_rss_mb"],
+        ]
+        cells = ["-" if c is None else c for c in cells]
+        print(f"  {r['name']:<30} {r['status']:<7} {cells[0]:>7} {cells[1]:>9} {cells[2]:>8} {cells[3]:>8} "
+              f"{cells[4]:>8} {cells[5]:>8} {cells[6]:>8} {cells[7]:>8}")
+        if r["error"]:
+            print(f"      ❌ {r['error']}")
+
+
+def compare_results(current: Dict, baseline_file: str) -> None:
+    """Print throughput and p95 changes against a previous result file."""
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {
+        (run["meetings"], w["name"]): w
+        for run in baseline.get("runs", []) for w in run["workloads"]
+    }
+    print(f"\n📊 Compared with {baseline_file} (commit {baseline.get('git_commit', '?')})")
+    for run in current["runs"]:
+        for w in run["workloads"]:
+            old = previous.get((run["meetings"], w["name"]))
+            if not old or not old.get("units_per_sec") or not w.get("units_per_sec"):
+                continue
+            change = (w["units_per_sec"] / old["units_per_sec"] - 1) * 100
+            p95_old, p95_new = old["latency_ms"]["p95"], w["latency_ms"]["p95"]
+            print(f"  {run['meetings']:>6} {w['name']:<30} units/s {old['units_per_sec']:>9} → "
+                  f"{w['units_per_sec']:<9} ({change:+.1f}%)  p95 {p95_old} → {p95_new}")
+
+
+def get_git_commit() -> Tuple[Optional[str], bool]:
+    """Current commit hash and whether the tree has uncommitted changes."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    cwd=PROJECT_ROOT, capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end throughput benchmarks against the mock LLM")
+    parser.add_argument("--meetings", type=int, default=DEFAULT_MEETINGS,
+                        help=f"Meetings per dataset (default: {DEFAULT_MEETINGS}, the bundled size)")
+    parser.add_argument("--scales", type=str, default=None,
+                        help="Comma-separated meeting counts to sweep (overrides --meetings), e.g. 103,1000,10000")
+    parser.add_argument("--workloads", type=str, default=None,
+                        help="Comma-separated workload names or groups (scripts, pipeline); default: all")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Use generated synthetic meetings instead of cycling the bundled data")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mock median latency per call (ms)")
+    parser.add_argument("--latency-sigma", type=float, default=0.0, help="Mock lognormal latency tail sigma")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Mock probability of HTTP 429 per call")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="Mock concurrency limit (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0, help="Mock seed for latency and 429 injection")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT, help="Timeout per workload (seconds)")
+    parser.add_argument("--output", type=str, default=None, help="Result JSON path (default: benchmarks/results/)")
+    parser.add_argument("--compare", type=str, default=None, help="Previous result JSON to compare against")
+    parser.add_argument("--keep-workspace", action="store_true", help="Keep generated data, outputs and logs")
+    parser.add_argument("--list", action="store_true", help="List workloads and exit")
+    args = parser.parse_args()
+
+    try:
+        workloads = get_workloads(args.workloads.split(",") if args.workloads else None)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.list:
+        for w in workloads:
+            print(f"  {w.name:<30} [{w.group}] {w.description}")
+        return
+
+    scales = [int(s) for s in args.scales.split(",")] if args.scales else [args.meetings]
+
+    mock_args = build_arg_parser().parse_args([
+        "--mode", "synthetic",
+        "--latency-ms", str(args.latency_ms),
+        "--latency-sigma", str(args.latency_sigma),
+        "--rate-429", str(args.rate_429),
+        "--max-concurrent", str(args.max_concurrent),
+        "--seed", str(args.seed),
+    ])
+    state = MockLLMState(mock_args)
+    server = create_server(state, "127.0.0.1", 0, quiet=True)
+    mock_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    commit, dirty = get_git_commit()
+    print("=" * 70)
+    print("🏁 Mira Throughput Benchmarks")
+    print("=" * 70)
+    print(f"   Commit: {commit or 'unknown'}{' (dirty)' if dirty else ''}")
+    print(f"   Mock: {mock_url} | latency {args.latency_ms:.0f}ms σ={args.latency_sigma} | 429 rate {args.rate_429:.1%}")
+    print(f"   Workloads: {', '.join(w.name for w in workloads)}")
+    print(f"   Scales: {', '.join(str(s) for s in scales)} meetings")
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "git_commit": commit,
+        "git_dirty": dirty,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "synthetic": args.synthetic,
+        "mock": {
+            "latency_ms": args.latency_ms,
+            "latency_sigma": args.latency_sigma,
+            "rate_429": args.rate_429,
+            "max_concurrent": args.max_concurrent,
+            "seed": args.seed,
+        },
+        "runs": [],
+    }
+
+    try:
+        for meetings in scales:
+            workspace = tempfile.mkdtemp(prefix=f"mira_bench_{meetings}_")
+            ctx = BenchContext(workspace=workspace, meetings=meetings)
+            print(f"\n🔧 Preparing {meetings}-meeting datasets in {workspace}")
+            if args.synthetic:
+                prepare_synthetic_datasets(ctx, workloads, args.seed)
+            else:
+                prepare_datasets(ctx, workloads)
+
+            results = []
+            for workload in workloads:
+                print(f"   ▶ {workload.name}...", flush=True)
+                results.append(run_workload(workload, ctx, state, mock_url, args.timeout))
+            print_results(meetings, results)
+            report["runs"].append({"meetings": meetings, "workloads": results})
+
+            if args.keep_workspace:
+                print(f"\n   📁 Workspace kept: {workspace}")
+            else:
+                shutil.rmtree(workspace, ignore_errors=True)
+    finally:
+        server.shutdown()
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit or 'nogit'}.json"
+    )
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Results saved to: {output}")
+
+    if args.compare:
+        compare_results(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
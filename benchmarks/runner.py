@@ -0,0 +1,116 @@
+"""
+Benchmark Runner - Runs one workload in a child process.
+
+Each workload runs in its own interpreter so peak RSS is attributable to it.
+The spec file says which module to import, which module-level constants to
+override (input/output paths), which argv to pass and whether to disable
+pacing sleeps (DELAY_BETWEEN_CALLS and friends, time.sleep and asyncio.sleep)
+inside the workload module.
+Retry backoff in the shared API helpers is left untouched.
+
+Usage:
+    python -m benchmarks.runner --spec spec.json --result result.json
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import importlib
+import traceback
+from typing import Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+
+class _NoSleepTime:
+    """Stand-in for the `time` module with sleep() turned into a no-op."""
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+    @staticmethod
+    def sleep(seconds: float) -> None:
+        return None
+
+
+class _NoSleepAsyncio:
+    """Stand-in for the `asyncio` module with sleep() returning at once."""
+
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
+
+    @staticmethod
+    async def sleep(delay: float, result=None):
+        return result
+
+
+def get_peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS reports bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def run_spec(spec: dict) -> None:
+    """Import the workload module, apply overrides and call its entry point."""
+    module = importlib.import_module(spec["module"])
+    for name, value in spec.get("overrides", {}).items():
+        setattr(module, name, value)
+    if spec.get("no_sleep"):
+        if getattr(module, "time", None) is time:
+            module.time = _NoSleepTime()
+        if getattr(module, "asyncio", None) is asyncio:
+            module.asyncio = _NoSleepAsyncio()
+
+    sys.argv = [spec["module"]] + [str(a) for a in spec.get("argv", [])]
+    result = getattr(module, spec.get("entry", "main"))()
+    if asyncio.iscoroutine(result):
+        asyncio.run(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run one benchmark workload")
+    parser.add_argument("--spec", required=True, help="Workload spec JSON")
+    parser.add_argument("--result", required=True, help="Where to write the result JSON")
+    args = parser.parse_args()
+
+    with open(args.spec, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+
+    status, error = "ok", None
+    start = time.time()
+    try:
+        run_spec(spec)
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            status, error = "error", f"SystemExit({e.code})"
+    except Exception as e:
+        status, error = "error", f"{type(e).__name__}: {e}"
+        traceback.print_exc()
+    elapsed = time.time() - start
+
+    with open(args.result, 'w', encoding='utf-8') as f:
+        json.dump({
+            "status": status,
+            "error": error,
+            "wall_seconds": round(elapsed, 3),
+            "peak_rss_mb": get_peak_rss_mb(),
+        }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
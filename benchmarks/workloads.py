@@ -0,0 +1,259 @@
+"""
+Benchmark Workloads - What each benchmark runs and how its work is counted.
+
+A workload names a script (or pipeline stage), the dataset it consumes, the
+module-level constants to redirect into the benchmark workspace, and a
+counter that reads back from the workload's output how many units (usually
+assertions) were processed successfully; records the scripts write for failed
+LLM calls (error placeholders, heuristic fallbacks) are not counted.
+"""
+
+import os
+import json
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Datasets
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Bundled source datasets, scaled up or down to --meetings by run_benchmarks
+DATASETS = {
+    "output": os.path.join("docs", "11_25_output.jsonl"),
+    "kening": os.path.join("docs", "ChinYew", "Assertions_genv2_for_LOD1126part1.jsonl"),
+    "matches": os.path.join("docs", "output_v2.jsonl"),
+    "lod": os.path.join("docs", "LOD_1125.jsonl"),
+}
+
+
+@dataclass
+class BenchContext:
+    """Paths and sizes shared by the workloads of one benchmark run."""
+    workspace: str
+    meetings: int
+    data_files: Dict[str, str] = field(default_factory=dict)
+    data_assertions: Dict[str, int] = field(default_factory=dict)
+
+    def path(self, *parts: str) -> str:
+        return os.path.join(self.workspace, *parts)
+
+
+@dataclass
+class Workload:
+    """One benchmarked script or pipeline stage."""
+    name: str
+    description: str
+    dataset: str
+    build_spec: Callable[[BenchContext], Dict]
+    count_units: Callable[[BenchContext], Tuple[str, int]]
+    group: str = "scripts"
+    llm: bool = True  # Expected to call the mock; a clean run with no calls is an error
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Unit Counters
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _load_json(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _load_jsonl(path: str) -> List[Dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _count_scored_assertions(ctx: BenchContext) -> Tuple[str, int]:
+    data = _load_json(ctx.path("assertion_scores.json")) or {}
+    total = sum(
+        1 for m in data.get("meetings", []) for r in m.get("assertion_results", [])
+        if not r.get("explanation", "").startswith(("API call failed", "Failed to parse evaluation response"))
+    )
+    return "assertions", total
+
+
+def _count_kening_evaluations(ctx: BenchContext) -> Tuple[str, int]:
+    data = _load_json(ctx.path("assertion_evaluation_gpt5.json")) or {}
+    total = sum(
+        1 for m in data.get("meetings", []) for e in m.get("assertion_evaluations", [])
+        if e.get("evaluation_method") == "gpt5"
+    )
+    return "assertions", total
+
+
+def _count_matched_assertions(ctx: BenchContext) -> Tuple[str, int]:
+    # A failed scoring call leaves an empty match list, like a genuine no-match;
+    # the no-LLM-calls check in run_benchmarks catches a run where every call failed
+    total = sum(
+        1 for item in _load_jsonl(ctx.path("output_with_matches.jsonl"))
+        for a in item.get("assertions", []) if "matched_segments" in a
+    )
+    return "assertions", total
+
+
+def _count_converted_assertions(ctx: BenchContext) -> Tuple[str, int]:
+    # One input assertion -> several S+G records sharing its M####_A### id prefix
+    converted = {
+        "_".join(r.get("assertion_id", "").split("_")[:2])
+        for r in _load_jsonl(ctx.path("assertions_sg_classified.jsonl"))
+        if r.get("s_dimension", r.get("dimension")) not in ("UNKNOWN", "DRY_RUN")
+    }
+    return "assertions", len(converted)
+
+
+def _count_scenarios(ctx: BenchContext) -> Tuple[str, int]:
+    data = _load_json(ctx.path("scenarios.json")) or {}
+    return "scenarios", len(data.get("scenarios", []))
+
+
+def _count_generated_assertions(ctx: BenchContext) -> Tuple[str, int]:
+    data = _load_json(ctx.path("assertions.json")) or {}
+    total = sum(
+        len(a.get("structural", [])) + len(a.get("grounding", []))
+        for a in data.get("assertions", [])
+    )
+    return "assertions", total
+
+
+def _count_plans(ctx: BenchContext) -> Tuple[str, int]:
+    data = _load_json(ctx.path("plans.json")) or {}
+    return "plans", sum(1 for p in data.get("plans", []) if not p.get("content", "").startswith("ERROR:"))
+
+
+def _count_evaluated_assertions(ctx: BenchContext) -> Tuple[str, int]:
+    data = _load_json(ctx.path("evaluation_results.json")) or {}
+    total = sum(
+        1 for r in data.get("results", [])
+        for a in r.get("structural_results", []) + r.get("grounding_results", [])
+        if not a.get("explanation", "").startswith("Evaluation error:")
+    )
+    return "assertion evaluations", total
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Workload Specs
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _score_assertions(ctx: BenchContext) -> Dict:
+    return {
+        "module": "score_assertions",
+        "overrides": {
+            "OUTPUT_FILE": ctx.data_files["output"],
+            "RESULTS_FILE": ctx.path("assertion_scores.json"),
+            "NUM_SAMPLES": ctx.meetings,
+            "START_INDEX": 0,
+        },
+        "no_sleep": True,
+    }
+
+
+def _evaluate_kening(ctx: BenchContext) -> Dict:
+    return {
+        "module": "evaluate_kening_gpt5",
+        "argv": ["--end", ctx.meetings],
+        "overrides": {
+            "INPUT_FILE": ctx.data_files["kening"],
+            "OUTPUT_FILE": ctx.path("assertion_evaluation_gpt5.json"),
+            "CHECKPOINT_FILE": ctx.path(".gpt5_eval_checkpoint.json"),
+        },
+        "no_sleep": True,
+    }
+
+
+def _compute_matches(ctx: BenchContext) -> Dict:
+    # Default Ollama backend; the mock serves /api/generate
+    return {
+        "module": "compute_assertion_matches",
+        "argv": [
+            "--input", ctx.data_files["matches"],
+            "--output", ctx.path("output_with_matches.jsonl"),
+            "--limit", ctx.meetings,
+        ],
+    }
+
+
+def _convert_v2(ctx: BenchContext) -> Dict:
+    return {
+        "module": "convert_kening_assertions_v2",
+        "argv": ["--end", ctx.meetings],
+        "overrides": {
+            "INPUT_FILE": ctx.data_files["kening"],
+            "OUTPUT_FILE": ctx.path("assertions_sg_classified.jsonl"),
+            "OUTPUT_DIR": ctx.path("sg_stages"),
+            "CHECKPOINT_FILE": ctx.path(".sg_classification_checkpoint.json"),
+            "REPORT_FILE": ctx.path("sg_classification_report.json"),
+        },
+        "no_sleep": True,
+    }
+
+
+def _stage(module: str, argv: Callable[[BenchContext], List]) -> Callable[[BenchContext], Dict]:
+    """Spec builder for a pipeline stage (mirrors run_pipeline.run_stage)."""
+    return lambda ctx: {
+        "module": f"pipeline.{module}",
+        "argv": argv(ctx),
+        "no_sleep": True,
+    }
+
+
+WORKLOADS: List[Workload] = [
+    Workload("score_assertions", "Per-assertion pass/fail scoring (async)",
+             "output", _score_assertions, _count_scored_assertions),
+    Workload("evaluate_kening_gpt5", "Batched rubric evaluation",
+             "kening", _evaluate_kening, _count_kening_evaluations),
+    Workload("compute_assertion_matches", "Assertion-to-passage matching (Ollama)",
+             "matches", _compute_matches, _count_matched_assertions),
+    Workload("convert_kening_assertions_v2", "S+G decomposition and slot extraction",
+             "kening", _convert_v2, _count_converted_assertions),
+    Workload("pipeline.1_scenarios", "Stage 1: Scenario Generation",
+             "lod", _stage("scenario_generation", lambda ctx: [
+                 "--from-data", ctx.data_files["lod"], "--limit", ctx.meetings,
+                 "--output", ctx.path("scenarios.json"), "--force"]),
+             _count_scenarios, group="pipeline", llm=False),
+    Workload("pipeline.2_assertions", "Stage 2: Assertion Generation",
+             "lod", _stage("assertion_generation", lambda ctx: [
+                 "--scenarios", ctx.path("scenarios.json"),
+                 "--output", ctx.path("assertions.json")]),
+             _count_generated_assertions, group="pipeline"),
+    Workload("pipeline.3_plans", "Stage 3: Plan Generation",
+             "lod", _stage("plan_generation", lambda ctx: [
+                 "--scenarios", ctx.path("scenarios.json"),
+                 "--output", ctx.path("plans.json")]),
+             _count_plans, group="pipeline"),
+    Workload("pipeline.4_evaluation", "Stage 4: Plan Evaluation",
+             "lod", _stage("plan_evaluation", lambda ctx: [
+                 "--scenarios", ctx.path("scenarios.json"),
+                 "--assertions", ctx.path("assertions.json"),
+                 "--plans", ctx.path("plans.json"),
+                 "--output", ctx.path("evaluation_results.json")]),
+             _count_evaluated_assertions, group="pipeline"),
+    Workload("pipeline.5_report", "Stage 5: Report Generation",
+             "lod", _stage("report_generation", lambda ctx: [
+                 "--scenarios", ctx.path("scenarios.json"),
+                 "--assertions", ctx.path("assertions.json"),
+                 "--plans", ctx.path("plans.json"),
+                 "--evaluation", ctx.path("evaluation_results.json"),
+                 "--output", ctx.path("evaluation_report.md")]),
+             _count_generated_assertions, group="pipeline", llm=False),
+]
+
+
+def get_workloads(names: Optional[List[str]] = None) -> List[Workload]:
+    """
+    Select workloads by name or group ("scripts", "pipeline"), in suite order.
+
+    Raises:
+        ValueError: If a name matches no workload or group.
+    """
+    if not names:
+        return list(WORKLOADS)
+    known = {w.name for w in WORKLOADS} | {w.group for w in WORKLOADS}
+    unknown = [n for n in names if n not in known]
+    if unknown:
+        raise ValueError(f"Unknown workload(s): {', '.join(unknown)}. Known: {', '.join(sorted(known))}")
+    return [w for w in WORKLOADS if w.name in names or w.group in names]
@@ -15,6 +15,15 @@ from typing import List, Dict, Optional
 import argparse
 import requests
 
+from pipeline.config import (
+    get_mock_llm_url,
+    resolve_substrate_endpoint,
+    resolve_ollama_url,
+    MOCK_LLM_TOKEN,
+)
+from pipeline.router import route
+from pipeline.telemetry import track_call
+
 # Substrate API Configuration
 SUBSTRATE_ENDPOINT = "https://fe-26.qas.bing.net/chat/completions"
 SUBSTRATE_RESOURCE = "https://substrate.office.com"
@@ -37,6 +46,9 @@ def get_substrate_token():
     """Get authentication token for Substrate API using MSAL broker."""
     global _jj_token_cache
     
+    if get_mock_llm_url():
+        return MOCK_LLM_TOKEN
+    
     if _jj_token_cache:
         return _jj_token_cache
     
@@ -100,27 +112,32 @@ def call_jj_api(prompt: str, temperature: float = 0.1, max_retries: int = 3) ->
         "max_tokens": 1000,
     }
     
-    for attempt in range(max_retries):
-        response = requests.post(
-            SUBSTRATE_ENDPOINT,
-            headers=headers,
-            json=payload,
-            timeout=60
-        )
+    with track_call("substrate", model=_jj_model_type, prompt=prompt) as call:
+        for attempt in range(max_retries):
+            call.attempt()
+            response = requests.post(
+                resolve_substrate_endpoint(SUBSTRATE_ENDPOINT),
+                headers=headers,
+                json=payload,
+                timeout=60
+            )
         
-        if response.status_code == 200:
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
-        elif response.status_code == 429:
-            # Rate limited - wait and retry
-            wait_time = (attempt + 1) * 5  # 5s, 10s, 15s
-            print(f"      Rate limited, waiting {wait_time}s...", end="")
-            time.sleep(wait_time)
-            print(" retrying")
-        else:
-            raise Exception(f"JJ API error {response.status_code}: {response.text[:200]}")
-    
-    raise Exception(f"JJ API rate limited after {max_retries} retries")
+            if response.status_code == 200:
+                result = response.json()
+                text = result["choices"][0]["message"]["content"]
+                call.usage(result.get("usage"), completion=text)
+                return text
+            elif response.status_code == 429:
+                call.rate_limited()
+                # Rate limited - wait and retry
+                wait_time = (attempt + 1) * 5  # 5s, 10s, 15s
+                print(f"      Rate limited, waiting {wait_time}s...", end="")
+                time.sleep(wait_time)
+                print(" retrying")
+            else:
+                raise Exception(f"JJ API error {response.status_code}: {response.text[:200]}")
+    
+        raise Exception(f"JJ API rate limited after {max_retries} retries")
 
 def init_jj_backend(delay: float = 2.0):
     """Initialize JJ backend by testing authentication."""
@@ -146,9 +163,10 @@ def load_qwen_model():
     model_name = "gpt-oss:20b"  # Default model, can be changed via --model argument
     
     # Test connection
+    ollama_url = resolve_ollama_url()
     try:
         response = requests.post(
-            'http://192.168.2.163:11434/api/generate',
+            ollama_url,
             json={
                 'model': model_name,
                 'prompt': 'test',
@@ -161,7 +179,7 @@ def load_qwen_model():
         else:
             print(f"Warning: Ollama returned status {response.status_code}")
     except requests.exceptions.RequestException as e:
-        print(f"Error: Could not connect to Ollama at http://192.168.2.163:11434")
+        print(f"Error: Could not connect to Ollama at {ollama_url}")
         print(f"Make sure Ollama is running: 'ollama serve'")
         print(f"And the model is pulled: 'ollama pull {model_name}'")
         raise
@@ -174,9 +192,19 @@ def split_into_sentences(text: str) -> List[str]:
     sentences = re.split(r'(?<=[.!?])\s+|\n+', text)
     return [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
 
+def parse_span_scores(response_text: str) -> Dict[int, float]:
+    """Parse {"scores": {"1": 0.9, ...}} into 0-based sentence index -> score."""
+    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+    if not json_match:
+        raise ValueError("No JSON object in response")
+    scores = json.loads(json_match.group(0)).get("scores", {})
+    return {int(k) - 1: float(v) for k, v in scores.items()}
+
 def score_sentences_batch_jj(assertion_text: str, sentences: List[str], start_idx: int) -> Dict[int, float]:
     """
     Score a batch of sentences for relevance to the assertion using GPT-5 JJ API.
+    With MIRA_ROUTING on, the local model answers first and JJ is only called
+    when its best score is below the span_finding policy's min_confidence.
     
     Returns:
         Dict mapping sentence index to score (0.0-1.0)
@@ -193,16 +221,14 @@ Return ONLY a JSON object with scores (0.0-1.0) for relevant passages (>= 0.3):
 {{"scores": {{"1": 0.9, "5": 0.7}}}}"""
 
     try:
-        response_text = call_jj_api(prompt, temperature=0.1)
-        
-        # Parse JSON response
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            scores_data = json.loads(json_match.group(0))
-            scores = scores_data.get("scores", {})
-            
-            # Convert string keys to int and return
-            return {int(k) - 1: float(v) for k, v in scores.items()}
+        decision = route(
+            "span_finding", prompt,
+            escalate=lambda: call_jj_api(prompt, temperature=0.1),
+            parse=parse_span_scores,
+            vote_key=lambda scores: sorted(idx for idx, score in scores.items() if score >= 0.5),
+            confidence=lambda scores: max(scores.values(), default=0.0),
+        )
+        return parse_span_scores(decision.text)
             
     except Exception as e:
         print(f"    Warning: JJ batch scoring failed: {e}")
@@ -228,24 +254,27 @@ Return ONLY a JSON object with scores (0.0-1.0) for relevant passages (>= 0.3):
 {{"scores": {{"1": 0.9, "5": 0.7}}}}"""
 
     try:
-        response = requests.post(
-            'http://192.168.2.163:11434/api/generate',
-            json={
-                'model': model_name,
-                'prompt': prompt,
-                'stream': False,
-                'options': {
-                    'temperature': 0.1,
-                    'top_p': 0.95
-                }
-            },
-            timeout=60
-        )
+        with track_call("ollama", model=model_name, prompt=prompt) as call:
+            call.attempt()
+            response = requests.post(
+                resolve_ollama_url(),
+                json={
+                    'model': model_name,
+                    'prompt': prompt,
+                    'stream': False,
+                    'options': {
+                        'temperature': 0.1,
+                        'top_p': 0.95
+                    }
+                },
+                timeout=60
+            )
+            if response.status_code == 200:
+                result = response.json()
+                response_text = result.get('response', '')
+                call.usage(result, completion=response_text)
         
         if response.status_code == 200:
-            result = response.json()
-            response_text = result.get('response', '')
-            
             # Parse JSON response
             json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
             if json_match:
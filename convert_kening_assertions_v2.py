@@ -26,13 +26,17 @@ Usage:
     python convert_kening_assertions_v2.py --start 0 --end 10 # Range
     python convert_kening_assertions_v2.py --resume           # Resume from checkpoint
     python convert_kening_assertions_v2.py --dry-run          # Preview without GPT-5
+    python convert_kening_assertions_v2.py --plan             # Projected calls/tokens/duration
+    python convert_kening_assertions_v2.py --cluster          # Decompose once per near-duplicate template
 
 Author: Chin-Yew Lin
 Date: November 30, 2025
 """
 
 import os
+import re
 import sys
+import copy
 import json
 import time
 import argparse
@@ -43,8 +47,13 @@ from typing import Dict, List, Optional, Any
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "assertion_analyzer"))
 
 from assertion_analyzer import S_TO_G_MAP, DIMENSION_NAMES
-from assertion_analyzer.config import get_substrate_token, call_gpt5_api, extract_json_from_response
+from assertion_analyzer.config import get_substrate_token, call_gpt5_api, extract_json_from_response, telemetry_context
 from assertion_analyzer.dimensions import G_RATIONALE_FOR_S
+from assertion_analyzer.prompt_registry import CompiledPrompt, get_registry
+from pipeline import hedging
+from pipeline.estimate import RunEstimate
+from pipeline.near_duplicates import DEFAULT_THRESHOLD, cluster_near_duplicates
+from pipeline.router import route
 
 # =============================================================================
 # CONFIGURATION
@@ -59,7 +68,7 @@ REPORT_FILE = "docs/ChinYew/sg_classification_report_v2.3.json"
 # Rate limiting
 DELAY_BETWEEN_CALLS = 0.5  # seconds between GPT-5 calls
 BATCH_SAVE_SIZE = 10       # Save checkpoint every N assertions
-STAGE_SIZE = 50            # Meetings per stage (refresh token between stages)
+STAGE_SIZE = 50            # Meetings per stage (one output file per stage)
 
 # G Dimension slot descriptions
 G_SLOT_DESCRIPTIONS = {
@@ -75,30 +84,20 @@ G_SLOT_DESCRIPTIONS = {
     "G10": "relations - DEPENDS_ON, OWNS, BLOCKS, PRODUCES relationships mentioned",
 }
 
+# [SLOT_NAME] placeholders in a decomposition's s_template
+SLOT_PLACEHOLDER = re.compile(r"\[([A-Z][A-Z0-9_]*)\]")
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
-# Load decomposition prompt once at module level
-DECOMPOSITION_PROMPT_FILE = os.path.join(
-    os.path.dirname(__file__), 
-    "assertion_analyzer", "prompts", "decomposition_prompt.json"
-)
-
-def load_decomposition_prompt() -> dict:
-    """Load the decomposition prompt configuration."""
-    with open(DECOMPOSITION_PROMPT_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-# Cache the prompt config
-_DECOMPOSITION_CONFIG = None
-
-def get_decomposition_config() -> dict:
-    """Get cached decomposition prompt config."""
-    global _DECOMPOSITION_CONFIG
-    if _DECOMPOSITION_CONFIG is None:
-        _DECOMPOSITION_CONFIG = load_decomposition_prompt()
-    return _DECOMPOSITION_CONFIG
+# Prompt files are loaded and compiled once by the assertion_analyzer registry
+def get_decomposition_config() -> CompiledPrompt:
+    """Get the compiled decomposition prompt (assertion_analyzer/prompts/decomposition_prompt.json)."""
+    config = get_registry().get("decomposition")
+    if config is None:
+        raise FileNotFoundError("assertion_analyzer/prompts/decomposition_prompt.json not found")
+    return config
 
 
 def decompose_assertion(assertion_text: str) -> List[dict]:
@@ -116,17 +115,21 @@ def decompose_assertion(assertion_text: str) -> List[dict]:
         - linked_g: List of {g_dimension, slot_value} dicts
     """
     config = get_decomposition_config()
-    prompt = config['user_prompt_template'].replace('{assertion_text}', assertion_text)
-    
-    result_text = call_gpt5_api(
-        prompt,
-        system_prompt=config['system_prompt'],
-        temperature=config.get('temperature', 0.2)
-    )
+    with telemetry_context(prompt=config.hash):
+        result_text = call_gpt5_api(
+            build_decomposition_prompt(assertion_text),
+            system_prompt=config.system_prompt,
+            temperature=config.temperature if config.temperature is not None else 0.2
+        )
     
     return extract_json_from_response(result_text)
 
 
+def build_decomposition_prompt(assertion_text: str) -> str:
+    """Fill the decomposition prompt template for one assertion."""
+    return get_decomposition_config().render(assertion_text=assertion_text)
+
+
 def load_checkpoint() -> dict:
     """Load checkpoint if exists."""
     if os.path.exists(CHECKPOINT_FILE):
@@ -258,40 +261,27 @@ def generate_sg_unit(
     return results
 
 
-def extract_slot_values(assertion_text: str, linked_g_dims: List[str]) -> dict:
+def build_slot_extraction_prompt(assertion_text: str, linked_g_dims: List[str]) -> tuple:
     """
-    Use GPT-5 to extract slot values from assertion text for each G dimension.
-    Uses optimized IE prompt from prompts/ie_slot_extraction_prompt.json.
+    Fill the IE slot extraction prompt for one assertion.
     
-    Args:
-        assertion_text: The original assertion text
-        linked_g_dims: List of G dimensions to extract values for
-        
     Returns:
-        dict mapping g_dim -> extracted value (or None if not found)
+        tuple: (prompt, system_prompt, temperature, prompt_hash)
     """
-    if not linked_g_dims:
-        return {}
-    
-    # Load optimized IE prompt from file
-    prompt_file = os.path.join(
-        os.path.dirname(__file__), 
-        "assertion_analyzer", "prompts", "ie_slot_extraction_prompt.json"
-    )
-    try:
-        with open(prompt_file, 'r', encoding='utf-8') as f:
-            prompt_config = json.load(f)
-        prompt_template = prompt_config.get("user_prompt_template", "")
-        slot_descriptions = prompt_config.get("slot_descriptions", {})
-        system_prompt = prompt_config.get("system_prompt", "")
-        temperature = prompt_config.get("temperature", 0.1)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"      Warning: Could not load ie_slot_extraction_prompt.json: {e}, using fallback")
+    # Optimized IE prompt (compiled once by the prompt registry, no per-call file I/O)
+    prompt_config = get_registry().get("ie_slot_extraction")
+    if prompt_config is not None:
+        slot_descriptions = prompt_config.config.get("slot_descriptions", {})
+        system_prompt = prompt_config.system_prompt
+        temperature = prompt_config.temperature if prompt_config.temperature is not None else 0.1
+        prompt_hash = prompt_config.hash
+    else:
+        print("      Warning: Could not load ie_slot_extraction_prompt.json, using fallback")
         # Fallback to inline descriptions
         slot_descriptions = G_SLOT_DESCRIPTIONS
-        prompt_template = None
         system_prompt = "You extract specific values from assertions for grounding verification."
         temperature = 0.1
+        prompt_hash = None
     
     # Build slot descriptions for this extraction
     slots_desc = []
@@ -299,10 +289,10 @@ def extract_slot_values(assertion_text: str, linked_g_dims: List[str]) -> dict:
         desc = slot_descriptions.get(g_dim, G_SLOT_DESCRIPTIONS.get(g_dim, g_dim))
         slots_desc.append(f"- {g_dim}: {desc}")
     
-    if prompt_template:
+    if prompt_config is not None:
         # Use loaded template
-        prompt = prompt_template.replace("{assertion_text}", assertion_text)
-        prompt = prompt.replace("{slot_descriptions}", chr(10).join(slots_desc))
+        prompt = prompt_config.render(assertion_text=assertion_text,
+                                      slot_descriptions=chr(10).join(slots_desc))
     else:
         # Fallback prompt
         prompt = f'''Extract specific values from this assertion for grounding verification.
@@ -322,13 +312,41 @@ Return JSON:
 
 Return ONLY valid JSON with extracted values.
 '''
+    return prompt, system_prompt, temperature, prompt_hash
 
+
+def extract_slot_values(assertion_text: str, linked_g_dims: List[str]) -> dict:
+    """
+    Use GPT-5 to extract slot values from assertion text for each G dimension.
+    Uses optimized IE prompt from prompts/ie_slot_extraction_prompt.json.
+    With MIRA_ROUTING on, a local model answers first (see pipeline/router.py).
+    
+    Args:
+        assertion_text: The original assertion text
+        linked_g_dims: List of G dimensions to extract values for
+        
+    Returns:
+        dict mapping g_dim -> extracted value (or None if not found)
+    """
+    if not linked_g_dims:
+        return {}
+    
+    prompt, system_prompt, temperature, prompt_hash = build_slot_extraction_prompt(
+        assertion_text, linked_g_dims
+    )
     try:
-        result_text = call_gpt5_api(
-            prompt,
-            system_prompt=system_prompt,
-            temperature=temperature
-        )
+        with telemetry_context(prompt=prompt_hash):
+            result_text = route(
+                "slot_extraction", prompt,
+                escalate=lambda: call_gpt5_api(
+                    prompt,
+                    system_prompt=system_prompt,
+                    temperature=temperature
+                ),
+                system_prompt=system_prompt,
+                parse=extract_json_from_response,
+                vote_key=lambda data: {g_dim: data.get(g_dim) for g_dim in linked_g_dims},
+            ).text
         result = extract_json_from_response(result_text)
         
         # Clean up results - convert "null" strings to None, handle lists
@@ -352,13 +370,75 @@ Return ONLY valid JSON with extracted values.
         return {}
 
 
+def fill_slot_template(s_template: str, slots: dict) -> Optional[str]:
+    """
+    Literal form of an s_template: each [SLOT_NAME] replaced by its quoted value(s).
+    
+    Returns None if there is no template or a placeholder has no value.
+    """
+    if not s_template:
+        return None
+    if any(not slots.get(name) for name in SLOT_PLACEHOLDER.findall(s_template)):
+        return None
+    
+    def quote(match):
+        value = slots[match.group(1)]
+        values = value if isinstance(value, list) else [value]
+        return " and ".join(f"'{v}'" for v in values)
+    
+    return SLOT_PLACEHOLDER.sub(quote, s_template)
+
+
+def reslot_decomposition(atomic_units: List[dict], assertion_text: str) -> Optional[List[dict]]:
+    """
+    Reuse a cluster representative's decomposition for a near-duplicate member.
+    
+    The S/G structure is kept; G slot values are re-extracted from the member
+    text (one IE call, none if the template has no valued G slots) and each
+    unit's s_literal is rebuilt from its s_template. The representative's G1
+    constraint text is dropped.
+    
+    Returns None when the decomposition can't be carried over faithfully, and
+    the member is decomposed on its own: a G dimension valued in more than one
+    unit (extraction yields one value per dimension), or an S unit whose
+    template is missing or has a slot the member text doesn't fill.
+    """
+    g_dims = [
+        g.get('g_dimension') for unit in atomic_units
+        for g in unit.get('linked_g', []) if g.get('g_dimension') and g.get('slot_value') is not None
+    ]
+    if len(g_dims) != len(set(g_dims)):
+        return None
+    values = extract_slot_values(assertion_text, g_dims)
+    
+    reslotted = []
+    for unit in atomic_units:
+        unit = copy.deepcopy(unit)
+        slots = {}
+        for g_info in unit.get('linked_g', []):
+            g_info.pop('constraint', None)
+            if g_info.get('slot_value') is not None:
+                g_info['slot_value'] = values.get(g_info.get('g_dimension'))
+                slots[g_info.get('slot_name') or g_info.get('g_dimension')] = g_info['slot_value']
+        if unit.get('s_dimension'):
+            s_literal = fill_slot_template(unit.get('s_template'), slots)
+            if s_literal is None:
+                return None
+            unit['s_literal'] = s_literal
+            unit.pop('s_assertion', None)
+        reslotted.append(unit)
+    return reslotted
+
+
 def decompose_and_expand(
     assertion_text: str,
     assertion_level: str,
     meeting_idx: int,
     assertion_idx: int,
     utterance: str,
-    dry_run: bool = False
+    dry_run: bool = False,
+    decompositions: Optional[Dict] = None,
+    cluster_key: Optional[tuple] = None
 ) -> List[dict]:
     """
     Decompose a free-form assertion into atomic S+G units and expand.
@@ -366,6 +446,11 @@ def decompose_and_expand(
     Uses decomposition_prompt.json to break down assertions that may 
     contain multiple structural requirements into separate atomic units.
     
+    With --cluster, cluster_key names the assertion's near-duplicate cluster:
+    the first member decomposes with GPT-5 and stores the result in
+    decompositions; later members only re-extract slot values (or decompose
+    on their own when reslot_decomposition can't reuse the result).
+    
     Returns list of assertions (multiple S assertions, each with linked Gs)
     """
     if dry_run:
@@ -385,11 +470,18 @@ def decompose_and_expand(
         }]
     
     try:
-        # Decompose into atomic units using GPT-5
-        atomic_units = decompose_assertion(assertion_text)
+        # Decompose into atomic units using GPT-5 (once per near-duplicate cluster)
+        template_units = decompositions.get(cluster_key) if decompositions is not None and cluster_key else None
+        atomic_units = reslot_decomposition(template_units, assertion_text) if template_units is not None else None
+        conversion_method = "cluster_template"
+        if atomic_units is None:
+            atomic_units = decompose_assertion(assertion_text)
+            conversion_method = "decomposition"
         
         if not atomic_units or not isinstance(atomic_units, list):
             raise ValueError("Decomposition returned empty or invalid result")
+        if template_units is None and decompositions is not None and cluster_key:
+            decompositions[cluster_key] = atomic_units
         
         results = []
         s_unit_idx = 0
@@ -428,7 +520,7 @@ def decompose_and_expand(
                         "linked_g_dims": [],
                         "rationale": {
                             "mapping_reason": "Pure grounding assertion (no structural requirement)",
-                            "conversion_method": "decomposition"
+                            "conversion_method": conversion_method
                         },
                         "quality_assessment": {
                             "is_well_formed": True,
@@ -485,7 +577,7 @@ def decompose_and_expand(
                 "g_slots": g_slots,
                 "rationale": {
                     "mapping_reason": f"Decomposed from: {assertion_text[:80]}...",
-                    "conversion_method": "decomposition"
+                    "conversion_method": conversion_method
                 },
                 "utterance_preview": utterance[:100] + "..." if len(utterance) > 100 else utterance
             }
@@ -522,11 +614,28 @@ def decompose_and_expand(
         }]
 
 
-def refresh_gpt5_token():
-    """Force refresh the GPT-5 token by clearing cached token."""
-    from assertion_analyzer.config import clear_token_cache
-    clear_token_cache()
-    print("  [Token cleared, will re-authenticate on next call]")
+def cluster_assertions(
+    data: List[dict],
+    start_meeting: int,
+    end_meeting: int,
+    threshold: float = DEFAULT_THRESHOLD
+) -> Dict[tuple, tuple]:
+    """
+    Group the assertions of a meeting range into near-duplicate templates.
+    
+    Returns:
+        dict mapping (meeting_idx, assertion_idx) -> (meeting_idx, assertion_idx)
+        of its cluster representative, for assertions in multi-member clusters
+    """
+    positions = [(m, a) for m in range(start_meeting, end_meeting)
+                 for a in range(len(data[m].get("assertions", [])))]
+    texts = [data[m]["assertions"][a].get("text", "") for m, a in positions]
+    mapping = {}
+    for cluster in cluster_near_duplicates(texts, threshold):
+        if len(cluster) > 1:
+            for member in cluster:
+                mapping[positions[member]] = positions[cluster[0]]
+    return mapping
 
 
 def process_stage(
@@ -534,11 +643,16 @@ def process_stage(
     stage_start: int,
     stage_end: int,
     stage_num: int,
-    dry_run: bool = False
+    dry_run: bool = False,
+    clusters: Optional[Dict[tuple, tuple]] = None,
+    decompositions: Optional[Dict] = None
 ) -> tuple:
     """
     Process a single stage of meetings and save to a stage-specific file.
     
+    clusters/decompositions (from --cluster) let near-duplicate assertions
+    reuse their representative's decomposition across stages.
+    
     Returns:
         tuple: (stage_stats, output_file_path)
     """
@@ -572,14 +686,17 @@ def process_stage(
                 assertion_level = assertion.get("level", "expected")
                 
                 # Decompose and expand to atomic S+G units
-                sg_units = decompose_and_expand(
-                    assertion_text=assertion_text,
-                    assertion_level=assertion_level,
-                    meeting_idx=meeting_idx,
-                    assertion_idx=assertion_idx,
-                    utterance=utterance,
-                    dry_run=dry_run
-                )
+                with telemetry_context(dimension=assertion.get("anchors", {}).get("Dim")):
+                    sg_units = decompose_and_expand(
+                        assertion_text=assertion_text,
+                        assertion_level=assertion_level,
+                        meeting_idx=meeting_idx,
+                        assertion_idx=assertion_idx,
+                        utterance=utterance,
+                        dry_run=dry_run,
+                        decompositions=decompositions,
+                        cluster_key=(clusters or {}).get((meeting_idx, assertion_idx))
+                    )
                 
                 # Write all S+G units
                 for unit in sg_units:
@@ -659,7 +776,8 @@ def process_assertions(
     end_meeting: Optional[int] = None,
     resume: bool = False,
     dry_run: bool = False,
-    stage_size: int = STAGE_SIZE
+    stage_size: int = STAGE_SIZE,
+    cluster_threshold: Optional[float] = None
 ) -> dict:
     """
     Process all assertions from Kening's data.
@@ -670,6 +788,9 @@ def process_assertions(
         resume: Whether to resume from checkpoint
         dry_run: If True, don't call GPT-5
         stage_size: Number of meetings per stage (default 50)
+        cluster_threshold: If set, decompose once per near-duplicate cluster
+            (MinHash similarity >= threshold) and only re-extract slot values
+            for the other members
         
     Returns:
         Summary statistics
@@ -702,6 +823,14 @@ def process_assertions(
     num_stages = (end_meeting - start_meeting + stage_size - 1) // stage_size
     print(f"Total stages: {num_stages}")
     
+    # Near-duplicate templates: decompose each once
+    clusters, decompositions = None, None
+    if cluster_threshold is not None:
+        clusters, decompositions = cluster_assertions(data, start_meeting, end_meeting, cluster_threshold), {}
+        representatives = len(set(clusters.values()))
+        print(f"Near-duplicate clusters: {len(clusters)} assertions share {representatives} templates "
+              f"(saves {len(clusters) - representatives} decompositions)")
+    
     # Initialize total statistics
     total_stats = {
         "total_input_assertions": 0,
@@ -727,12 +856,10 @@ def process_assertions(
         print(f"STAGE {stage_num}/{num_stages}: Meetings {current_start} to {current_end - 1}")
         print(f"{'=' * 70}")
         
-        # Authenticate/re-authenticate for this stage
+        # The token provider refreshes ahead of expiry, so this only
+        # authenticates on the first stage
         if not dry_run:
-            print("\nAuthenticating with GPT-5...")
-            refresh_gpt5_token()  # Clear cached token
-            get_substrate_token()  # Get fresh token
-            print("Authentication successful (fresh token)")
+            get_substrate_token()
         
         # Process the stage
         stage_stats, stage_file = process_stage(
@@ -740,7 +867,9 @@ def process_assertions(
             stage_start=current_start,
             stage_end=current_end,
             stage_num=stage_num,
-            dry_run=dry_run
+            dry_run=dry_run,
+            clusters=clusters,
+            decompositions=decompositions
         )
         
         # Merge statistics
@@ -786,6 +915,8 @@ def process_assertions(
         "num_stages": num_stages,
         "stage_files": stage_files,
         "statistics": total_stats,
+        "prompts": get_registry().manifest(),
+        "cluster_threshold": cluster_threshold,
         "dry_run": dry_run
     }
     with open(REPORT_FILE, 'w', encoding='utf-8') as f:
@@ -794,6 +925,56 @@ def process_assertions(
     return total_stats
 
 
+def plan_assertions(
+    start_meeting: int = 0,
+    end_meeting: Optional[int] = None,
+    resume: bool = False,
+    cluster_threshold: Optional[float] = None
+) -> RunEstimate:
+    """
+    Build every decomposition prompt a run would send, without sending it.
+    
+    Mirrors the range, resume and clustering handling of process_assertions().
+    Cluster members are counted as one slot extraction call over all G slots
+    (the real slots come from the representative's decomposition; members it
+    doesn't fit are decomposed on their own, which is not counted here).
+    """
+    data = load_input_data()
+    if end_meeting is None:
+        end_meeting = len(data)
+    stage = os.path.splitext(os.path.basename(__file__))[0]
+    estimate = RunEstimate(stage)
+    
+    checkpoint = load_checkpoint() if resume else {}
+    if checkpoint.get("processed_count", 0) > 0:
+        resumed_start = checkpoint.get("last_meeting_idx", 0) + 1
+        for meeting in data[start_meeting:resumed_start]:
+            estimate.add_skipped(stage, len(meeting.get("assertions", [])))
+        start_meeting = resumed_start
+    
+    clusters = {}
+    if cluster_threshold is not None:
+        clusters = cluster_assertions(data, start_meeting, end_meeting, cluster_threshold)
+    
+    system_prompt = get_decomposition_config().system_prompt
+    for meeting_idx in range(start_meeting, end_meeting):
+        assertions = data[meeting_idx].get("assertions", [])
+        estimate.add_units("meetings")
+        estimate.add_units("assertions", len(assertions))
+        for assertion_idx, assertion in enumerate(assertions):
+            representative = clusters.get((meeting_idx, assertion_idx))
+            if representative is not None and representative != (meeting_idx, assertion_idx):
+                prompt, slot_system_prompt, _, _ = build_slot_extraction_prompt(
+                    assertion.get("text", ""), list(G_SLOT_DESCRIPTIONS)
+                )
+                estimate.add_call(stage, prompt, system_prompt=slot_system_prompt)
+            else:
+                estimate.add_call(stage, build_decomposition_prompt(assertion.get("text", "")),
+                                  system_prompt=system_prompt)
+            estimate.add_delay(DELAY_BETWEEN_CALLS)
+    return estimate
+
+
 def print_summary(stats: dict):
     """Print summary statistics."""
     print("\n" + "=" * 70)
@@ -833,20 +1014,43 @@ def main():
     parser.add_argument("--end", type=int, default=None, help="Ending meeting index (exclusive)")
     parser.add_argument("--resume", action="store_true", help="Resume from checkpoint")
     parser.add_argument("--dry-run", action="store_true", help="Preview without GPT-5 calls")
+    parser.add_argument("--plan", "--dry-run-estimate", dest="plan", action="store_true",
+                        help="Print projected calls, tokens and duration without calling GPT-5")
     parser.add_argument("--stage-size", type=int, default=STAGE_SIZE, 
-                        help=f"Meetings per stage (default: {STAGE_SIZE}). Token refreshed between stages.")
+                        help=f"Meetings per stage (default: {STAGE_SIZE})")
+    parser.add_argument("--cluster", action="store_true",
+                        help="Decompose once per near-duplicate template; other members only get slot extraction")
+    parser.add_argument("--cluster-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"MinHash similarity for --cluster (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Duplicate GPT-5 calls that outlive the observed p95 latency")
+    parser.add_argument("--hedge-budget", type=float, default=None,
+                        help=f"Max duplicate calls as a fraction of calls (default: {hedging.DEFAULT_BUDGET})")
     
     args = parser.parse_args()
+    cluster_threshold = args.cluster_threshold if args.cluster else None
+    if args.hedge:
+        hedging.configure(enabled=True, budget=args.hedge_budget)
+    
+    if args.plan:
+        plan_assertions(start_meeting=args.start, end_meeting=args.end, resume=args.resume,
+                        cluster_threshold=cluster_threshold).print_plan()
+        return
     
     stats = process_assertions(
         start_meeting=args.start,
         end_meeting=args.end,
         resume=args.resume,
         dry_run=args.dry_run,
-        stage_size=args.stage_size
+        stage_size=args.stage_size,
+        cluster_threshold=cluster_threshold
     )
     
     print_summary(stats)
+    if hedging.is_enabled():
+        hedge_stats = hedging.get_stats()
+        print(f"Hedged calls: {hedge_stats['hedges']} of {hedge_stats['calls']} "
+              f"({hedge_stats['hedge_wins']} answered first)")
 
 
 if __name__ == "__main__":
@@ -40,6 +40,9 @@ import argparse
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 
+from pipeline.config import get_mock_llm_url, resolve_substrate_endpoint, MOCK_LLM_TOKEN
+from pipeline.telemetry import prefix_key, telemetry_context, track_call
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Configuration
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -66,6 +69,82 @@ JJ_MODEL = "dev-gpt-5-chat-jj"
 # Global token cache
 _jj_token_cache = None
 
+# Evaluation prompt, laid out as system rubric -> response -> assertion
+EVALUATION_SYSTEM_PROMPT = """You are evaluating whether a response correctly satisfies an assertion.
+The response comes first in the message; the assertion to check is at the end.
+
+## TWO-LAYER EVALUATION FRAMEWORK
+
+Assertions fall into two categories that require DIFFERENT evaluation approaches:
+
+**STRUCTURAL Assertions (S1-S10)** - Check PRESENCE/SHAPE:
+- Question: "Does the plan HAVE X?"
+- Checks: Does the element exist? Is the format correct?
+- Examples: "Has a meeting date", "Lists attendees", "Has task owners"
+- Evaluation: Look for PRESENCE of the structural element, NOT its correctness
+- ✅ PASS if the element exists, even if the value might be wrong
+- ❌ FAIL only if the element is completely missing
+
+**GROUNDING Assertions (G1-G5)** - Check FACTUAL ACCURACY:
+- Question: "Is X CORRECT vs source?"
+- Checks: Does the value match the authoritative source?
+- Examples: "Date matches source.MEETING.StartTime", "Attendees exist in source.ATTENDEES"
+- Evaluation: Compare the value against the ground truth source
+- ✅ PASS if value matches source
+- ❌ FAIL if value doesn't match (hallucination)
+
+## CRITICAL DISTINCTION
+| Type | Checks For | Example Pass | Example Fail |
+|------|-----------|--------------|---------------|
+| Structural | PRESENCE | Plan has a date field | No date mentioned |
+| Grounding | ACCURACY | Date is Jan 15 (matches source) | Date is Jan 16 (source says Jan 15) |
+
+Analyze the response and determine:
+1. Is this a STRUCTURAL assertion (checking presence) or GROUNDING assertion (checking accuracy)?
+2. Does the response satisfy this assertion based on the correct evaluation type?
+3. What parts of the response support or contradict the assertion?
+4. Which section/header of the response contains each piece of evidence?
+5. How confident is the support for each relevant part?
+
+Return your analysis as JSON in this exact format:
+{
+    "assertion_type": "structural" or "grounding",
+    "passed": true or false,
+    "explanation": "Brief explanation of your evaluation",
+    "evaluation_basis": "For structural: what element was found/missing. For grounding: what value was compared to what source.",
+    "supporting_spans": [
+        {
+            "text": "exact quote from the response that supports/contradicts the assertion",
+            "section": "The section header or title where this text appears (e.g., 'Context & Assumptions', 'Quick Timeline Overview', 'Task Details')",
+            "confidence": 0.0 to 1.0 (how strongly this span supports the assertion),
+            "supports": true or false (true if supports, false if contradicts)
+        }
+    ]
+}
+
+Important:
+- FIRST determine if this is a structural (presence) or grounding (accuracy) assertion
+- For STRUCTURAL: Pass if the element EXISTS, regardless of its value
+- For GROUNDING: Pass only if the value is CORRECT vs source
+- Extract 1-5 most relevant text spans from the response
+- Use EXACT quotes from the response (copy-paste the text)
+- Include the section/header name where each quote appears (look for markdown headers like ##, ###, or labeled sections)
+- Confidence should be 0.0-1.0 where 1.0 means very strong support
+- If the assertion is NOT satisfied, still identify any partial/contradicting evidence
+- Keep explanations concise but informative
+
+Return ONLY the JSON object, no other text."""
+
+RESPONSE_BLOCK_TEMPLATE = """RESPONSE TO EVALUATE:
+{response_text}
+
+"""
+
+ASSERTION_BLOCK_TEMPLATE = """ASSERTION:
+"{assertion_text}"
+
+Return ONLY the JSON object, no other text."""
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # Authentication
@@ -75,6 +154,9 @@ def get_substrate_token():
     """Get authentication token for Substrate API using MSAL broker."""
     global _jj_token_cache
     
+    if get_mock_llm_url():
+        return MOCK_LLM_TOKEN
+    
     if _jj_token_cache:
         return _jj_token_cache
     
@@ -118,7 +200,8 @@ def get_substrate_token():
         raise Exception(f"Authentication failed: {result.get('error_description', result)}")
 
 
-def call_gpt5_api(prompt: str, temperature: float = 0.1, max_tokens: int = 2000, max_retries: int = 3) -> str:
+def call_gpt5_api(prompt: str, temperature: float = 0.1, max_tokens: int = 2000, max_retries: int = 3,
+                  system_prompt: Optional[str] = None) -> str:
     """Call Substrate GPT-5 JJ API with retry logic."""
     import requests
     
@@ -130,34 +213,42 @@ def call_gpt5_api(prompt: str, temperature: float = 0.1, max_tokens: int = 2000,
         "X-ModelType": JJ_MODEL,
     }
     
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    
     payload = {
-        "messages": [
-            {"role": "user", "content": prompt}
-        ],
+        "messages": messages,
         "temperature": temperature,
         "max_tokens": max_tokens,
     }
     
-    for attempt in range(max_retries):
-        response = requests.post(
-            SUBSTRATE_ENDPOINT,
-            headers=headers,
-            json=payload,
-            timeout=120
-        )
+    with track_call("substrate", model=JJ_MODEL, prompt=prompt, system_prompt=system_prompt) as call:
+        for attempt in range(max_retries):
+            call.attempt()
+            response = requests.post(
+                resolve_substrate_endpoint(SUBSTRATE_ENDPOINT),
+                headers=headers,
+                json=payload,
+                timeout=120
+            )
         
-        if response.status_code == 200:
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
-        elif response.status_code == 429:
-            wait_time = (attempt + 1) * 10
-            print(f"      Rate limited, waiting {wait_time}s...", end="", flush=True)
-            time.sleep(wait_time)
-            print(" retrying")
-        else:
-            raise Exception(f"GPT-5 API error {response.status_code}: {response.text[:200]}")
-    
-    raise Exception(f"GPT-5 API rate limited after {max_retries} retries")
+            if response.status_code == 200:
+                result = response.json()
+                text = result["choices"][0]["message"]["content"]
+                call.usage(result.get("usage"), completion=text)
+                return text
+            elif response.status_code == 429:
+                call.rate_limited()
+                wait_time = (attempt + 1) * 10
+                print(f"      Rate limited, waiting {wait_time}s...", end="", flush=True)
+                time.sleep(wait_time)
+                print(" retrying")
+            else:
+                raise Exception(f"GPT-5 API error {response.status_code}: {response.text[:200]}")
+    
+        raise Exception(f"GPT-5 API rate limited after {max_retries} retries")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -218,10 +309,15 @@ def save_checkpoint(checkpoint: Dict):
 # Core Evaluation Logic
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def evaluate_assertion(assertion: Dict, response_text: str) -> Dict:
+def evaluate_assertion(assertion: Dict, response_text: str, raise_errors: bool = False) -> Dict:
     """
     Evaluate a single assertion against the response using GPT-5.
     
+    Args:
+        assertion: Assertion dict (text, level, justification/reasoning)
+        response_text: The generated response
+        raise_errors: Raise API/parse errors instead of returning a failed evaluation
+    
     Returns:
         Dict with:
         - assertion_text: The assertion text
@@ -238,79 +334,15 @@ def evaluate_assertion(assertion: Dict, response_text: str) -> Dict:
     justification = assertion.get('justification', assertion.get('reasoning', {}))
     source_id = justification.get('sourceID', justification.get('source', ''))
     
-    # Prompt for GPT-5 evaluation with Two-Layer Framework
-    prompt = f"""You are evaluating whether a response correctly satisfies an assertion.
-
-## TWO-LAYER EVALUATION FRAMEWORK
-
-Assertions fall into two categories that require DIFFERENT evaluation approaches:
-
-**STRUCTURAL Assertions (S1-S10)** - Check PRESENCE/SHAPE:
-- Question: "Does the plan HAVE X?"
-- Checks: Does the element exist? Is the format correct?
-- Examples: "Has a meeting date", "Lists attendees", "Has task owners"
-- Evaluation: Look for PRESENCE of the structural element, NOT its correctness
-- ✅ PASS if the element exists, even if the value might be wrong
-- ❌ FAIL only if the element is completely missing
-
-**GROUNDING Assertions (G1-G5)** - Check FACTUAL ACCURACY:
-- Question: "Is X CORRECT vs source?"
-- Checks: Does the value match the authoritative source?
-- Examples: "Date matches source.MEETING.StartTime", "Attendees exist in source.ATTENDEES"
-- Evaluation: Compare the value against the ground truth source
-- ✅ PASS if value matches source
-- ❌ FAIL if value doesn't match (hallucination)
-
-## CRITICAL DISTINCTION
-| Type | Checks For | Example Pass | Example Fail |
-|------|-----------|--------------|---------------|
-| Structural | PRESENCE | Plan has a date field | No date mentioned |
-| Grounding | ACCURACY | Date is Jan 15 (matches source) | Date is Jan 16 (source says Jan 15) |
-
-ASSERTION:
-"{assertion_text}"
-
-RESPONSE TO EVALUATE:
-{response_text}
-
-Analyze the response and determine:
-1. Is this a STRUCTURAL assertion (checking presence) or GROUNDING assertion (checking accuracy)?
-2. Does the response satisfy this assertion based on the correct evaluation type?
-3. What parts of the response support or contradict the assertion?
-4. Which section/header of the response contains each piece of evidence?
-5. How confident is the support for each relevant part?
-
-Return your analysis as JSON in this exact format:
-{{
-    "assertion_type": "structural" or "grounding",
-    "passed": true or false,
-    "explanation": "Brief explanation of your evaluation",
-    "evaluation_basis": "For structural: what element was found/missing. For grounding: what value was compared to what source.",
-    "supporting_spans": [
-        {{
-            "text": "exact quote from the response that supports/contradicts the assertion",
-            "section": "The section header or title where this text appears (e.g., 'Context & Assumptions', 'Quick Timeline Overview', 'Task Details')",
-            "confidence": 0.0 to 1.0 (how strongly this span supports the assertion),
-            "supports": true or false (true if supports, false if contradicts)
-        }}
-    ]
-}}
-
-Important:
-- FIRST determine if this is a structural (presence) or grounding (accuracy) assertion
-- For STRUCTURAL: Pass if the element EXISTS, regardless of its value
-- For GROUNDING: Pass only if the value is CORRECT vs source
-- Extract 1-5 most relevant text spans from the response
-- Use EXACT quotes from the response (copy-paste the text)
-- Include the section/header name where each quote appears (look for markdown headers like ##, ###, or labeled sections)
-- Confidence should be 0.0-1.0 where 1.0 means very strong support
-- If the assertion is NOT satisfied, still identify any partial/contradicting evidence
-- Keep explanations concise but informative
-
-Return ONLY the JSON object, no other text."""
+    # Stable prefix (system rubric, then the response) before the per-assertion
+    # part, so consecutive calls for one meeting hit the provider's prompt cache
+    response_block = RESPONSE_BLOCK_TEMPLATE.format(response_text=response_text)
+    prompt = response_block + ASSERTION_BLOCK_TEMPLATE.format(assertion_text=assertion_text)
 
     try:
-        response = call_gpt5_api(prompt, temperature=0.1, max_tokens=2000)
+        with telemetry_context(prefix=prefix_key(EVALUATION_SYSTEM_PROMPT, response_block)):
+            response = call_gpt5_api(prompt, system_prompt=EVALUATION_SYSTEM_PROMPT,
+                                     temperature=0.1, max_tokens=2000)
         
         # Parse JSON response
         json_match = re.search(r'\{[\s\S]*\}', response)
@@ -348,8 +380,13 @@ Return ONLY the JSON object, no other text."""
                 "supporting_spans": spans_with_positions
             }
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"      Error evaluating assertion: {e}")
     
+    if raise_errors:
+        raise ValueError(f"No JSON object in GPT-5 response for assertion: {assertion_text[:80]}")
+    
     # Return failed evaluation on error
     return {
         "assertion_text": assertion_text,
@@ -24,6 +24,9 @@ Usage:
     
     # Force reprocess all
     python evaluate_kening_gpt5.py --force
+    
+    # Projected calls, tokens and duration without calling GPT-5
+    python evaluate_kening_gpt5.py --start 0 --end 100 --plan
 
 Author: Chin-Yew Lin
 Date: November 28, 2025
@@ -48,6 +51,8 @@ from pipeline.config import (
     STRUCTURAL_DIMENSIONS,
     GROUNDING_DIMENSIONS,
 )
+from pipeline.telemetry import telemetry_context
+from pipeline.estimate import RunEstimate
 
 # =============================================================================
 # CONFIGURATION
@@ -614,7 +619,8 @@ def evaluate_assertion_gpt5(assertion: Dict, response: str) -> Dict:
     
     try:
         prompt = get_evaluation_prompt(assertion, response, mapped_dim)
-        result_text = call_gpt5_api(prompt, system_prompt=SYSTEM_PROMPT, temperature=0.1, max_tokens=1000)
+        with telemetry_context(dimension=mapped_dim):
+            result_text = call_gpt5_api(prompt, system_prompt=SYSTEM_PROMPT, temperature=0.1, max_tokens=1000)
         
         # Parse JSON
         result = extract_json_from_response(result_text)
@@ -644,7 +650,9 @@ def evaluate_batch_gpt5(assertions: List[Dict], response: str) -> List[Dict]:
     """Evaluate a batch of assertions using GPT-5."""
     try:
         prompt = get_batch_evaluation_prompt(assertions, response)
-        result_text = call_gpt5_api(prompt, system_prompt=SYSTEM_PROMPT, temperature=0.1, max_tokens=4000)
+        batch_dims = {map_dimension(a.get('anchors', {}).get('Dim', '')) for a in assertions}
+        with telemetry_context(dimension=batch_dims.pop() if len(batch_dims) == 1 else "mixed"):
+            result_text = call_gpt5_api(prompt, system_prompt=SYSTEM_PROMPT, temperature=0.1, max_tokens=4000)
         
         # Parse JSON
         result = extract_json_from_response(result_text)
@@ -793,6 +801,39 @@ def calculate_weighted_score(results: List[Dict]) -> float:
 # MAIN FUNCTION
 # =============================================================================
 
+def plan_run(data: List[Dict], start_idx: int, end_idx: int, batch_size: int,
+             resumed_from: int) -> RunEstimate:
+    """
+    Build every batch prompt the run would send, without sending it.
+    
+    Args:
+        data: Loaded meetings
+        start_idx: First meeting the run would evaluate (after resume)
+        end_idx: End meeting index (exclusive)
+        batch_size: Assertions per GPT-5 call
+        resumed_from: Requested start index; meetings before start_idx are
+            already in the checkpoint
+    """
+    stage = os.path.splitext(os.path.basename(__file__))[0]
+    estimate = RunEstimate(stage)
+    for i in range(resumed_from, start_idx):
+        assertions = data[i].get('assertions', [])
+        estimate.add_skipped(stage, (len(assertions) + batch_size - 1) // batch_size)
+    
+    for i in range(start_idx, end_idx):
+        item = data[i]
+        assertions = item.get('assertions', [])
+        response = item.get('response', '')
+        estimate.add_units("meetings")
+        estimate.add_units("assertions", len(assertions))
+        for j in range(0, len(assertions), batch_size):
+            prompt = get_batch_evaluation_prompt(assertions[j:j + batch_size], response)
+            estimate.add_call(stage, prompt, system_prompt=SYSTEM_PROMPT, max_tokens=4000)
+            estimate.add_delay(DELAY_BETWEEN_CALLS)
+        estimate.add_delay(DELAY_BETWEEN_MEETINGS)
+    return estimate
+
+
 def main():
     """Main evaluation function."""
     parser = argparse.ArgumentParser(description="GPT-5 evaluation of Kening's assertions")
@@ -801,6 +842,8 @@ def main():
     parser.add_argument("--resume", action="store_true", help="Resume from checkpoint")
     parser.add_argument("--force", action="store_true", help="Force reprocess all")
     parser.add_argument("--batch-size", type=int, default=5, help="Assertions per GPT-5 call")
+    parser.add_argument("--plan", "--dry-run-estimate", dest="plan", action="store_true",
+                        help="Print projected calls, tokens and duration without calling GPT-5")
     args = parser.parse_args()
     
     print("=" * 70)
@@ -832,11 +875,15 @@ def main():
             start_idx = last_processed + 1
     else:
         all_results = []
-        if args.force and os.path.exists(CHECKPOINT_FILE):
+        if args.force and os.path.exists(CHECKPOINT_FILE) and not args.plan:
             os.remove(CHECKPOINT_FILE)
             print("   Cleared previous checkpoint")
     
     print()
+    if args.plan:
+        plan_run(data, start_idx, end_idx, args.batch_size, resumed_from=args.start).print_plan()
+        return
+    
     print("🔐 Initializing GPT-5 JJ API...")
     
     # Pre-authenticate
@@ -0,0 +1,634 @@
+"""
+Static judging bundle: prebuilt per-meeting JSON plus a client-side viewer.
+
+Mira reruns its whole script on the server for every click. The bundle moves
+that work to export time: each meeting's response sections, entity cards,
+resolved sourceIDs, GPT-5 hints and evidence highlights (as character offsets)
+are written once to their own JSON shard, and a static HTML/JS viewer loads
+shards on demand. Judging happens entirely in the browser; annotation changes
+are kept in localStorage and synced to the annotation store in batches, so the
+server only serves static files and a small write endpoint.
+
+Layout of the bundle directory:
+
+    index.html              viewer
+    index.json              meeting list (subject, size, GPT-5 hints, shard file)
+    meetings/0001.json      one shard per meeting
+
+Usage:
+    # Build the bundle (same inputs as Mira)
+    python judging_bundle.py export --out docs/judging_bundle
+
+    # Serve it and accept annotation batches into docs/annotations.db
+    python judging_bundle.py serve --bundle docs/judging_bundle --db docs/annotations.db --port 8600
+
+    # The write endpoint is unauthenticated: it listens on localhost unless told otherwise
+    python judging_bundle.py serve --host 0.0.0.0   # every interface (trusted networks only)
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from annotation_store import AnnotationStore
+from scores_store import ScoresStore, text_key
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_OUTPUT_PATH = os.path.join("docs", "11_25_output.jsonl")
+DEFAULT_INPUT_PATH = os.path.join("docs", "LOD_1121.WithUserUrl.jsonl")
+DEFAULT_SCORES_PATH = os.path.join("docs", "assertion_scores.json")
+DEFAULT_SCORES_DB_PATH = os.path.join("docs", "assertion_scores.db")
+DEFAULT_BUNDLE_DIR = os.path.join("docs", "judging_bundle")
+DEFAULT_DB_PATH = os.path.join("docs", "annotations.db")
+DEFAULT_HOST = "127.0.0.1"  # The annotation endpoint has no auth; binding wider is opt-in
+DEFAULT_PORT = 8600
+
+LOW_CONFIDENCE = 0.5  # Same threshold as Mira's assignment hints
+MAX_FIELD_CHARS = 4000  # Entity fields are truncated in cards
+MAX_BATCH = 500  # Annotation changes accepted per request
+
+ENTITY_ID_FIELDS = [
+    'FileId', 'ChatId', 'EventId', 'ChannelMessageId', 'ChannelId',
+    'ChannelMessageReplyId', 'OnlineMeetingId', 'EmailId', 'MessageId',
+    'id', 'Id', 'ID', 'entityId', 'EntityId', 'MailNickName'
+]
+ENTITY_NAME_FIELDS = ['Subject', 'FileName', 'DisplayName', 'Name', 'Title']
+
+
+# =============================================================================
+# MEETING DATA
+# =============================================================================
+
+def load_jsonl(path: str) -> List[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def meeting_subject(utterance: str, entities: List[Dict[str, Any]]) -> str:
+    """Meeting subject: quoted text in the utterance, else the Event subject, else the utterance."""
+    match = re.search(r"'([^']*)'", utterance)
+    if match:
+        return match.group(1)
+    for entity in entities:
+        if entity.get('type') == 'Event' and entity.get('Subject'):
+            return entity['Subject']
+    return utterance[:50] + "..." if len(utterance) > 50 else utterance
+
+
+def split_sections(response_text: str) -> List[Dict[str, str]]:
+    """Split a response into titled sections, with the same rules as Mira's parse_response_sections."""
+    if not response_text:
+        return []
+    sections = []
+    title, content = "Introduction", []
+    for line in response_text.split('\n'):
+        stripped = line.strip()
+        heading = None
+        if stripped.startswith('#'):
+            heading, first = stripped.lstrip('#').strip(), []
+        elif len(stripped) > 2 and stripped[0].isdigit() and stripped[1] == '.':
+            heading, first = (stripped[:50] + "..." if len(stripped) > 50 else stripped), [stripped]
+        elif stripped.startswith('**') and '**' in stripped[2:]:
+            heading, first = stripped[2:stripped.index('**', 2)], [stripped]
+        if heading is None:
+            content.append(line)
+            continue
+        if content:
+            sections.append({"title": title, "content": '\n'.join(content)})
+        title, content = heading, first
+    if content:
+        sections.append({"title": title, "content": '\n'.join(content)})
+    return sections or [{"title": "Response", "content": response_text}]
+
+
+def entity_card(entity: Dict[str, Any]) -> Dict[str, Any]:
+    """Display form of an entity: type, title and its fields as (truncated) text."""
+    title = next((str(entity[f]) for f in ENTITY_NAME_FIELDS if entity.get(f)), entity.get('type', 'Entity'))
+    fields = {}
+    for key, value in entity.items():
+        if key == 'type' or value in (None, "", [], {}):
+            continue
+        text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+        fields[key] = text[:MAX_FIELD_CHARS] + ("..." if len(text) > MAX_FIELD_CHARS else "")
+    return {"type": entity.get('type', 'Other'), "title": title, "fields": fields}
+
+
+def build_entity_ids(input_item: Dict[str, Any]) -> Dict[str, int]:
+    """IDs and names an assertion's sourceID may reference, mapped to card index (-1 is the user)."""
+    ids: Dict[str, int] = {}
+    user = input_item.get('USER', {})
+    for key in ['id', 'userId', 'userPrincipalName', 'MailNickName']:
+        if user.get(key):
+            ids[str(user[key])] = -1
+    for i, entity in enumerate(input_item.get('ENTITIES_TO_USE', [])):
+        for field in ENTITY_ID_FIELDS + ENTITY_NAME_FIELDS:
+            if entity.get(field):
+                ids[str(entity[field])] = i
+        for message in entity.get('ChatMessages', []) if entity.get('type') == 'Chat' else []:
+            if message.get('ChatMessageId'):
+                ids[str(message['ChatMessageId'])] = i
+    return ids
+
+
+def resolve_source(source_id: str, ids: Dict[str, int]) -> Optional[int]:
+    """Card index for a sourceID: exact match, else the first ID containing it or contained in it."""
+    if not source_id:
+        return None
+    if source_id in ids:
+        return ids[source_id]
+    return next((i for key, i in ids.items() if source_id in key or key in source_id), None)
+
+
+def locate_span(span: Dict[str, Any], contents: List[str], titles: List[str]) -> Optional[Tuple[int, int, int]]:
+    """
+    (section, start, end) of a supporting span: the first section quoting it
+    (case-insensitively, offsets into the original content), else a title match at -1, -1.
+    """
+    text = span.get('text', '').strip()
+    if text:
+        pattern = re.compile(re.escape(text), re.IGNORECASE)
+        for i, content in enumerate(contents):
+            match = pattern.search(content)
+            if match:
+                return i, match.start(), match.end()
+    label = span.get('section', '').strip().lower()
+    if label:
+        for i, title in enumerate(titles):
+            if title and (label in title or title in label):
+                return i, -1, -1
+    return None
+
+
+def build_meeting(meeting_id: int, output_item: Dict[str, Any], input_item: Optional[Dict[str, Any]],
+                  scores: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Everything the viewer needs for one meeting.
+
+    Args:
+        meeting_id: 1-based meeting number (as in Mira's sidebar)
+        output_item: Generated response and assertions
+        input_item: Meeting context (entities), if there is one
+        scores: GPT-5 results keyed like ScoresStore.get_meeting()
+
+    Returns:
+        Shard dict; section evidence is [{assertion, start, end, supports, confidence}]
+        with offsets into the section content (start -1: the span was not found verbatim)
+    """
+    utterance = output_item.get('utterance', '')
+    input_item = input_item or {}
+    entities = input_item.get('ENTITIES_TO_USE', [])
+    ids = build_entity_ids(input_item)
+    sections = [{**s, "evidence": []} for s in split_sections(output_item.get('response', ''))]
+    contents = [s["content"] for s in sections]
+    titles = [s["title"].lower() for s in sections]
+
+    assertions, hints = [], {"failed": 0, "low_confidence": 0}
+    for idx, assertion in enumerate(output_item.get('assertions', [])):
+        justification = assertion.get('justification', {})
+        source_id = justification.get('sourceID', '') if isinstance(justification, dict) else ''
+        result = scores.get(text_key(assertion.get('text', '')), {})
+        gpt5 = None
+        if result:
+            gpt5 = {
+                "passed": bool(result.get('passed', False)),
+                "explanation": result.get('explanation', result.get('reasoning', '')),
+            }
+            hints["failed"] += not gpt5["passed"]
+            support = [s.get('confidence', 0.5) for s in result.get('supporting_spans', []) if s.get('supports', True)]
+            hints["low_confidence"] += max(support, default=0.0) < LOW_CONFIDENCE
+            for span in result.get('supporting_spans', []):
+                found = locate_span(span, contents, titles)
+                if found is None:
+                    continue
+                section, start, end = found
+                sections[section]["evidence"].append({
+                    "assertion": idx,
+                    "start": start,
+                    "end": end,
+                    "supports": span.get('supports', True),
+                    "confidence": span.get('confidence', 0.5),
+                })
+        assertions.append({
+            "idx": idx,
+            "text": assertion.get('text', ''),
+            "level": assertion.get('level', 'expected'),
+            "reason": justification.get('reason', '') if isinstance(justification, dict) else assertion.get('reasoning', ''),
+            "source_id": source_id,
+            "entity": resolve_source(source_id, ids),
+            "gpt5": gpt5,
+        })
+
+    return {
+        "id": meeting_id,
+        "utterance": utterance,
+        "subject": meeting_subject(utterance, entities),
+        "sections": sections,
+        "user": entity_card({"type": "User", **input_item['USER']}) if input_item.get('USER') else None,
+        "entities": [entity_card(e) for e in entities],
+        "assertions": assertions,
+        "hints": hints,
+    }
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+def export_bundle(output_path: str, input_path: str, scores_path: str, scores_db_path: str,
+                  out_dir: str) -> Dict[str, int]:
+    """
+    Write index.json, one shard per meeting, and the viewer into out_dir.
+
+    Returns:
+        Counts of meetings, assertions and meetings with GPT-5 scores
+    """
+    output_data = load_jsonl(output_path)
+    inputs = {item.get('UTTERANCE', {}).get('text', ''): item for item in load_jsonl(input_path)}
+    store = None
+    if os.path.exists(scores_path):
+        store = ScoresStore(scores_db_path)
+        store.sync(scores_path)
+
+    os.makedirs(os.path.join(out_dir, "meetings"), exist_ok=True)
+    index, counts = [], {"meetings": 0, "assertions": 0, "scored": 0}
+    for i, item in enumerate(output_data):
+        utterance = item.get('utterance', '')
+        scores = store.get_meeting(utterance) if store else {}
+        meeting = build_meeting(i + 1, item, inputs.get(utterance), scores)
+        shard = f"meetings/{i + 1:04d}.json"
+        with open(os.path.join(out_dir, shard), 'w', encoding='utf-8') as f:
+            json.dump(meeting, f, ensure_ascii=False, separators=(',', ':'))
+        index.append({
+            "id": meeting["id"],
+            "file": shard,
+            "subject": meeting["subject"],
+            "utterance": utterance,
+            "assertions": len(meeting["assertions"]),
+            "hints": meeting["hints"],
+        })
+        counts["meetings"] += 1
+        counts["assertions"] += len(meeting["assertions"])
+        counts["scored"] += bool(scores)
+
+    with open(os.path.join(out_dir, "index.json"), 'w', encoding='utf-8') as f:
+        json.dump({"generated_at": datetime.now().isoformat(), "source": output_path, "meetings": index},
+                  f, ensure_ascii=False, indent=1)
+    with open(os.path.join(out_dir, "index.html"), 'w', encoding='utf-8') as f:
+        f.write(VIEWER_HTML)
+    return counts
+
+
+# =============================================================================
+# SYNC SERVER
+# =============================================================================
+
+class BundleHandler(SimpleHTTPRequestHandler):
+    """Serves the bundle directory plus GET/POST /api/annotations against an AnnotationStore."""
+
+    store: AnnotationStore = None
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/api/annotations":
+            return super().do_GET()
+        judge = parse_qs(url.query).get("judge", [""])[0]
+        if not judge:
+            return self._send_json(400, {"error": "judge is required"})
+        self._send_json(200, {"annotations": self.store.load_annotations(judge)})
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/api/annotations":
+            return self._send_json(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            batch = json.loads(self.rfile.read(length).decode('utf-8'))
+            judge, changes = batch["judge"], batch["changes"]
+            if not judge or not isinstance(changes, list) or len(changes) > MAX_BATCH:
+                raise ValueError(f"expected a judge and at most {MAX_BATCH} changes")
+            for change in changes:
+                if not (isinstance(change, dict) and isinstance(change.get("utterance"), str)
+                        and isinstance(change.get("assertion_idx"), (int, str))):
+                    raise ValueError("each change must be an object with utterance and assertion_idx")
+            applied = self.store.upsert_annotations(judge, changes)
+        except KeyError as e:
+            return self._send_json(400, {"error": f"missing field {e}"})
+        except (ValueError, TypeError) as e:
+            return self._send_json(400, {"error": str(e)})
+        self._send_json(200, {"applied": applied})
+
+
+def serve(bundle_dir: str, db_path: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """Serve a bundle and write synced annotations into the store at db_path."""
+    handler = type("Handler", (BundleHandler,), {"store": AnnotationStore(db_path)})
+    server = ThreadingHTTPServer((host, port), partial(handler, directory=bundle_dir))
+    print(f"Serving {bundle_dir} on http://{host}:{port}/ (annotations -> {db_path})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# =============================================================================
+# VIEWER
+# =============================================================================
+
+VIEWER_HTML = r'''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>Mira - Judging Bundle</title>
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 0; display: flex; height: 100vh; background: #f5f5f5; color: #333; }
+        #sidebar { width: 320px; flex-shrink: 0; overflow-y: auto; background: white; border-right: 1px solid #e0e0e0; padding: 12px; box-sizing: border-box; }
+        #main { flex: 1; overflow-y: auto; padding: 20px; }
+        #meetings { list-style: none; padding: 0; margin: 0; }
+        #meetings li { padding: 6px 8px; border-radius: 4px; cursor: pointer; font-size: 13px; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+        #meetings li:hover { background: #e8f4ff; }
+        #meetings li.selected { background: #0078d4; color: white; }
+        .sync { font-size: 12px; color: #666; margin: 8px 0; }
+        .columns { display: flex; gap: 20px; align-items: flex-start; }
+        .columns > div { flex: 1; min-width: 0; }
+        .card { background: white; border-radius: 8px; padding: 15px; margin-bottom: 15px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .utterance { background: #e8f4ff; padding: 12px; border-radius: 5px; border-left: 4px solid #0078d4; white-space: pre-wrap; }
+        .section-content { white-space: pre-wrap; font-size: 13px; line-height: 1.6; }
+        mark.supports { background: #c8e6c9; }
+        mark.contradicts { background: #ffcdd2; }
+        .level { padding: 2px 8px; border-radius: 3px; font-size: 11px; font-weight: 600; }
+        .level-critical { background: #ffcdd2; color: #c62828; }
+        .level-expected { background: #fff3e0; color: #e65100; }
+        .level-aspirational { background: #e8f5e9; color: #2e7d32; }
+        .assertion.focused { outline: 2px solid #0078d4; }
+        .gpt5 { font-size: 13px; padding: 8px; border-radius: 5px; margin: 8px 0; }
+        .gpt5.passed { background: #e8f5e9; }
+        .gpt5.failed { background: #ffebee; }
+        .controls label { margin-right: 12px; font-size: 13px; }
+        textarea { width: 100%; box-sizing: border-box; margin-top: 6px; font-family: inherit; }
+        table.fields { font-size: 12px; border-collapse: collapse; width: 100%; }
+        table.fields td { border-top: 1px solid #eee; padding: 4px; vertical-align: top; white-space: pre-wrap; word-break: break-word; }
+        table.fields td:first-child { font-weight: 600; width: 30%; }
+        button { cursor: pointer; }
+    </style>
+</head>
+<body>
+<div id="sidebar">
+    <h3>📚 Meetings</h3>
+    <label>Judge <input id="judge" placeholder="Your name"></label>
+    <div class="sync" id="sync">Not synced</div>
+    <ul id="meetings"></ul>
+</div>
+<div id="main"><p>Select a meeting.</p></div>
+<script>
+const FLUSH_MS = 5000;
+const PREFETCH_AHEAD = 3;
+const state = {
+    index: [], shards: new Map(), current: null, focus: null,
+    judge: localStorage.getItem('mira.judge') || '',
+    annotations: {},   // {utterance: {idx: {...}}}, server copy plus local edits
+    pending: {},       // {utterance \u0000 idx: change}, not yet synced
+};
+const DEFAULTS = {is_good: true, is_confident: true, is_judged: false, note: '', revision: '', original: ''};
+
+function el(tag, attrs, ...children) {
+    const node = document.createElement(tag);
+    for (const [k, v] of Object.entries(attrs || {})) {
+        if (k.startsWith('on')) node.addEventListener(k.slice(2), v);
+        else if (k in node) node[k] = v;
+        else node.setAttribute(k, v);
+    }
+    for (const child of children) if (child != null) node.append(child);
+    return node;
+}
+
+function pendingKey() { return 'mira.pending.' + state.judge; }
+function savePending() { localStorage.setItem(pendingKey(), JSON.stringify(state.pending)); }
+
+function getAnnotation(utterance, idx) {
+    return Object.assign({}, DEFAULTS, (state.annotations[utterance] || {})[idx]);
+}
+
+function setAnnotation(utterance, idx, fields) {
+    const merged = Object.assign(getAnnotation(utterance, idx), fields);
+    (state.annotations[utterance] = state.annotations[utterance] || {})[idx] = merged;
+    const key = utterance + '\u0000' + idx;
+    state.pending[key] = Object.assign({}, state.pending[key], fields, {utterance: utterance, assertion_idx: String(idx)});
+    savePending();
+    setSync(Object.keys(state.pending).length + ' change(s) waiting to sync');
+    renderList();
+}
+
+function setSync(text) { document.getElementById('sync').textContent = text; }
+
+async function flush() {
+    const keys = Object.keys(state.pending);
+    if (!state.judge || !keys.length) return;
+    const sent = keys.slice(0, 500).map(k => [k, state.pending[k]]);
+    try {
+        const response = await fetch('api/annotations', {
+            method: 'POST', headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({judge: state.judge, changes: sent.map(([, c]) => c)}),
+        });
+        if (!response.ok) throw new Error((await response.json()).error || response.status);
+        // Keep changes made while the request was in flight
+        for (const [k, c] of sent) if (state.pending[k] === c) delete state.pending[k];
+        savePending();
+        setSync('Synced ' + new Date().toLocaleTimeString());
+    } catch (e) {
+        setSync('Not synced (' + e.message + '), kept locally');
+    }
+}
+
+async function loadJudge() {
+    state.pending = JSON.parse(localStorage.getItem(pendingKey()) || '{}');
+    state.annotations = {};
+    if (state.judge) {
+        try {
+            const response = await fetch('api/annotations?judge=' + encodeURIComponent(state.judge));
+            if (response.ok) state.annotations = (await response.json()).annotations;
+        } catch (e) { /* static hosting: local edits only */ }
+    }
+    for (const change of Object.values(state.pending)) {
+        const {utterance, assertion_idx, ...fields} = change;
+        (state.annotations[utterance] = state.annotations[utterance] || {})[assertion_idx] =
+            Object.assign(getAnnotation(utterance, assertion_idx), fields);
+    }
+    renderList();
+    if (state.current) showMeeting(state.current);
+}
+
+function shard(meeting) {
+    if (!state.shards.has(meeting.id)) state.shards.set(meeting.id, fetch(meeting.file).then(r => r.json()));
+    return state.shards.get(meeting.id);
+}
+
+function statusIcon(meeting) {
+    const anns = state.annotations[meeting.utterance] || {};
+    const judged = Object.values(anns).filter(a => a.is_judged).length;
+    return judged >= meeting.assertions && meeting.assertions ? '📗' : judged ? '📙' : '📕';
+}
+
+function renderList() {
+    const list = document.getElementById('meetings');
+    list.replaceChildren(...state.index.map(m => {
+        const flag = m.hints.failed || m.hints.low_confidence ? ' ⚠️' : '';
+        return el('li', {
+            className: state.current && state.current.id === m.id ? 'selected' : '',
+            title: m.utterance, onclick: () => showMeeting(m),
+        }, `#${m.id} ${statusIcon(m)} ${m.subject}${flag}`);
+    }));
+}
+
+function highlighted(section) {
+    const spans = section.evidence
+        .filter(e => e.assertion === state.focus && e.start >= 0)
+        .sort((a, b) => a.start - b.start);
+    const nodes = [];
+    let at = 0;
+    for (const span of spans) {
+        if (span.start < at) continue;
+        nodes.push(section.content.slice(at, span.start));
+        nodes.push(el('mark', {className: span.supports ? 'supports' : 'contradicts',
+                               title: 'confidence ' + span.confidence}, section.content.slice(span.start, span.end)));
+        at = span.end;
+    }
+    nodes.push(section.content.slice(at));
+    return nodes;
+}
+
+function entityCard(card) {
+    return el('details', {className: 'card'},
+        el('summary', {}, `${card.type}: ${card.title}`),
+        el('table', {className: 'fields'}, ...Object.entries(card.fields).map(([k, v]) =>
+            el('tr', {}, el('td', {}, k), el('td', {}, v)))));
+}
+
+function assertionCard(meeting, assertion) {
+    const ann = getAnnotation(meeting.utterance, assertion.idx);
+    const set = fields => setAnnotation(meeting.utterance, assertion.idx, fields);
+    const checkbox = (field, label) => el('label', {},
+        el('input', {type: 'checkbox', checked: ann[field], onchange: e => set({[field]: e.target.checked})}), ' ' + label);
+    const gpt5 = assertion.gpt5 && el('div', {className: 'gpt5 ' + (assertion.gpt5.passed ? 'passed' : 'failed')},
+        (assertion.gpt5.passed ? '✅ GPT-5: passed. ' : '❌ GPT-5: failed. ') + assertion.gpt5.explanation);
+    const entity = assertion.entity === -1 ? meeting.user : meeting.entities[assertion.entity];
+    return el('div', {className: 'card assertion' + (state.focus === assertion.idx ? ' focused' : '')},
+        el('div', {}, el('span', {className: 'level level-' + assertion.level}, assertion.level.toUpperCase()),
+           ' ', el('strong', {}, assertion.text)),
+        assertion.reason ? el('p', {}, el('em', {}, assertion.reason)) : null,
+        gpt5,
+        assertion.source_id ? el('div', {}, 'Source: ', el('code', {}, assertion.source_id),
+                                 entity ? null : ' (not found)') : null,
+        entity ? entityCard(entity) : null,
+        el('button', {onclick: () => { state.focus = state.focus === assertion.idx ? null : assertion.idx; renderMeeting(meeting); }},
+           state.focus === assertion.idx ? 'Hide evidence' : '🔎 Show evidence'),
+        el('div', {className: 'controls'}, checkbox('is_judged', 'Judged'), checkbox('is_good', 'Good'),
+           checkbox('is_confident', 'Confident')),
+        el('textarea', {placeholder: 'Note', value: ann.note, rows: 2, onchange: e => set({note: e.target.value})}),
+        el('textarea', {placeholder: 'Revised assertion text', value: ann.revision, rows: 2,
+                        onchange: e => set({revision: e.target.value, original: assertion.text})}));
+}
+
+function renderMeeting(meeting) {
+    document.getElementById('main').replaceChildren(
+        el('h2', {}, `#${meeting.id} ${meeting.subject}`),
+        el('div', {className: 'utterance'}, meeting.utterance),
+        el('p', {}, `${meeting.assertions.length} assertions · GPT-5: ${meeting.hints.failed} failed, ` +
+                    `${meeting.hints.low_confidence} low confidence`),
+        el('div', {className: 'columns'},
+            el('div', {}, el('h3', {}, '🤖 Generated Response'), ...meeting.sections.map(s =>
+                el('div', {className: 'card'}, el('h4', {}, s.title), el('div', {className: 'section-content'}, ...highlighted(s))))),
+            el('div', {}, el('h3', {}, '✅ Assertions'), ...meeting.assertions.map(a => assertionCard(meeting, a)),
+               el('h3', {}, '📦 Entities'), ...(meeting.user ? [entityCard(meeting.user)] : []),
+               ...meeting.entities.map(entityCard))));
+}
+
+async function showMeeting(entry) {
+    state.current = entry;
+    state.focus = null;
+    renderList();
+    const position = state.index.indexOf(entry);
+    state.index.slice(position + 1, position + 1 + PREFETCH_AHEAD).forEach(shard);
+    const meeting = await shard(entry);
+    if (state.current === entry) renderMeeting(meeting);
+}
+
+async function init() {
+    const judgeInput = document.getElementById('judge');
+    judgeInput.value = state.judge;
+    judgeInput.addEventListener('change', async () => {
+        await flush();
+        state.judge = judgeInput.value.trim();
+        localStorage.setItem('mira.judge', state.judge);
+        await loadJudge();
+    });
+    state.index = (await (await fetch('index.json')).json()).meetings;
+    await loadJudge();
+    setInterval(flush, FLUSH_MS);
+    document.addEventListener('visibilitychange', () => { if (document.hidden) flush(); });
+}
+init();
+</script>
+</body>
+</html>
+'''
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Static judging bundle for Mira")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export = subparsers.add_parser("export", help="Build the bundle")
+    export.add_argument("--output", default=DEFAULT_OUTPUT_PATH, help="Assertions file (JSONL)")
+    export.add_argument("--input", default=DEFAULT_INPUT_PATH, help="Meeting context file (JSONL)")
+    export.add_argument("--scores", default=DEFAULT_SCORES_PATH, help="GPT-5 scores file")
+    export.add_argument("--scores-db", default=DEFAULT_SCORES_DB_PATH, help="Scores store built from it")
+    export.add_argument("--out", default=DEFAULT_BUNDLE_DIR, help="Bundle directory")
+    server = subparsers.add_parser("serve", help="Serve a bundle and accept annotation batches")
+    server.add_argument("--bundle", default=DEFAULT_BUNDLE_DIR)
+    server.add_argument("--db", default=DEFAULT_DB_PATH, help="Annotation store")
+    server.add_argument("--host", default=DEFAULT_HOST,
+                        help="Interface to listen on; pass 0.0.0.0 to accept annotations from other machines")
+    server.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        if not os.path.exists(os.path.join(args.bundle, "index.json")):
+            print(f"No bundle in {args.bundle}; run: python judging_bundle.py export --out {args.bundle}")
+            return 1
+        serve(args.bundle, args.db, args.host, args.port)
+        return 0
+
+    for path in (args.output, args.input):
+        if not os.path.exists(path):
+            print(f"File not found: {path}")
+            return 1
+    counts = export_bundle(args.output, args.input, args.scores, args.scores_db, args.out)
+    print(f"Exported {counts['meetings']} meetings ({counts['assertions']} assertions, "
+          f"{counts['scored']} with GPT-5 scores) to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Background preparation of per-meeting view data for Mira.
+
+Judges move through meetings in sidebar order. While one meeting is on screen,
+a worker thread builds the bundle for the next few (entity index, resolved
+sourceIDs, response sections, evidence map, score rows), so selecting the next
+meeting finds everything ready instead of recomputing it in the rerun.
+
+Bundles are held in a bounded LRU keyed by the caller (e.g. meeting index and
+scores version) and shared by every session, so they must be treated as
+read-only. Queued work for meetings the judge has moved away from is dropped,
+unless another session (owner) queued the same meeting too.
+
+Usage:
+    prefetcher = MeetingPrefetcher(build_meeting_bundle)
+    bundle = prefetcher.get(key, *args)                                # ready, in flight, or built now
+    prefetcher.prefetch([(next_key, next_args), ...], owner=session)  # queue upcoming meetings
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_CAPACITY = 16  # Bundles kept in memory
+DEFAULT_WORKERS = 1  # Prefetch threads (one keeps the rerun thread responsive)
+
+
+# =============================================================================
+# PREFETCHER
+# =============================================================================
+
+class MeetingPrefetcher:
+    """Builds bundles ahead of navigation on a background thread, with a bounded LRU."""
+
+    def __init__(self, build: Callable[..., Any], capacity: int = DEFAULT_CAPACITY,
+                 workers: int = DEFAULT_WORKERS):
+        self.build = build
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._bundles: "OrderedDict[Hashable, Future]" = OrderedDict()
+        self._queued: Dict[Hashable, Set[Hashable]] = {}  # owner -> keys it queued, not yet claimed
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mira-prefetch")
+        self.stats: Dict[str, int] = {"hits": 0, "waits": 0, "misses": 0, "prefetched": 0, "cancelled": 0, "errors": 0}
+
+    def _remember(self, key: Hashable, future: Future) -> None:
+        """Store a bundle future, evicting the least recently used (caller holds the lock)."""
+        self._bundles[key] = future
+        self._bundles.move_to_end(key)
+        while len(self._bundles) > self.capacity:
+            evicted, _ = self._bundles.popitem(last=False)
+            self._unqueue(evicted)
+
+    def _unqueue(self, key: Hashable) -> None:
+        """Forget key as queued by any owner, and owners with nothing queued (caller holds the lock)."""
+        for owner, queued in list(self._queued.items()):
+            queued.discard(key)
+            if not queued:
+                del self._queued[owner]
+
+    def get(self, key: Hashable, *args: Any) -> Any:
+        """
+        The bundle for key: prefetched, awaited if in flight, or built now.
+
+        Args:
+            key: Bundle key
+            *args: Arguments for build(), used if the bundle is not available
+
+        Returns:
+            The built bundle
+
+        Raises:
+            Whatever build() raised when building synchronously
+        """
+        with self._lock:
+            future = self._bundles.get(key)
+            if future is not None:
+                self._bundles.move_to_end(key)
+                self._unqueue(key)
+                self.stats["hits" if future.done() else "waits"] += 1
+        if future is not None and not future.cancelled():
+            try:
+                return future.result()
+            except Exception:
+                # A failed prefetch is retried here so the error surfaces in the rerun
+                pass
+
+        bundle = self.build(*args)
+        done: Future = Future()
+        done.set_result(bundle)
+        with self._lock:
+            self.stats["misses"] += 1
+            self._remember(key, done)
+        return bundle
+
+    def prefetch(self, items: Iterable[Tuple[Hashable, Tuple[Any, ...]]],
+                 owner: Optional[Hashable] = None) -> None:
+        """
+        Queue bundles for upcoming meetings, dropping owner's queued ones no longer upcoming.
+
+        Args:
+            items: (key, build args) pairs, nearest meeting first
+            owner: Who is navigating (e.g. a session id); other owners' queued work is kept
+        """
+        items = list(items)
+        wanted = {key for key, _ in items}
+        with self._lock:
+            queued = self._queued.setdefault(owner, set())
+            for key in list(queued - wanted):
+                queued.discard(key)
+                if any(key in other for other in self._queued.values()):
+                    continue
+                future = self._bundles.get(key)
+                if future is not None and future.cancel():
+                    del self._bundles[key]
+                    self.stats["cancelled"] += 1
+
+            for key, args in items:
+                if key in self._bundles:
+                    if not self._bundles[key].done():
+                        queued.add(key)
+                    continue
+                self._remember(key, self._executor.submit(self._build_quietly, args))
+                queued.add(key)
+                self.stats["prefetched"] += 1
+            if queued:
+                self._queued[owner] = queued
+            else:
+                self._queued.pop(owner, None)
+
+    def _build_quietly(self, args: Tuple[Any, ...]) -> Any:
+        try:
+            return self.build(*args)
+        except Exception:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+
+    def clear(self) -> None:
+        """Drop every bundle and cancel queued work (e.g. after the data changed)."""
+        with self._lock:
+            for future in self._bundles.values():
+                future.cancel()
+            self._bundles.clear()
+            self._queued.clear()
@@ -3,8 +3,15 @@ import json
 import os
 import re
 import time
+import uuid
 from datetime import datetime
 
+from annotation_store import AnnotationStore, PROGRESS_FIELDS
+from annotation_export import export_annotated, filtered_export_path
+from scores_store import ScoresStore, JOB_ACTIVE_STATUSES
+from verification_jobs import VerificationQueue
+from meeting_prefetch import MeetingPrefetcher
+
 # Page Config
 st.set_page_config(
     page_title="Mira 2.0 - WBP Assertion Viewer",
@@ -22,30 +29,49 @@ INPUT_FILE_PATH = os.path.join("docs", "Weiwei", "UseUserEntity_Part1.WithUserUr
 REFERENCE_FILE_PATH = os.path.join("docs", "ChinYew", "Assertions_genv2_for_LOD1126part1.jsonl")  # For responses
 MAPPING_DB_PATH = os.path.join("docs", "ChinYew", "utterance_entity_mapping.json")  # Utterance mapping
 ANNOTATION_SAVE_PATH = os.path.join("docs", "annotations_mira2_temp.json")
+ANNOTATION_DB_PATH = os.path.join("docs", "annotations_mira2.db")  # Per-change annotation store (SQLite, WAL)
 ANNOTATION_EXPORT_PATH = os.path.join("docs", "annotated_output_mira2.jsonl")
+EXPORT_FILTER_OPTIONS = {"All meetings": "all", "Judged only": "judged", "Changed since last export": "changed"}
 ASSERTION_SCORES_PATH = os.path.join("docs", "assertion_scores.json")  # GPT-5 JJ scoring results
+ASSERTION_SCORES_DB_PATH = os.path.join("docs", "assertion_scores.db")  # Per-meeting scores store, built from the JSON
+
+# Work assignment: meetings are leased to judges so they never duplicate effort
+ASSIGNMENT_LEASE_SECONDS = 20 * 60  # A lease lapses after this long without a rerun on the meeting
+ASSIGNMENT_OVERLAP_RATE = 0.1  # Fraction of meetings given to two judges, for agreement
+
+# Rendering windows: heavy meetings only build widgets for one page at a time
+ASSERTIONS_PAGE_SIZE = 10  # Assertion cards per page
+ENTITIES_PAGE_SIZE = 10  # Entity cards per page within a group
+CHAT_MESSAGES_PAGE_SIZE = 20  # Chat messages per card, more via "Load more"
+PREFETCH_AHEAD = 3  # Meetings after the selected one (in sidebar order) prepared in the background
 
 # ====== GPT-5 SCORING SYSTEM ======
+def get_scores_version():
+    """Version of the scores file (its mtime), or None if there is none."""
+    try:
+        return os.path.getmtime(ASSERTION_SCORES_PATH)
+    except OSError:
+        return None
+
+
+@st.cache_resource
+def get_scores_store():
+    """Per-meeting scores store, shared read-only by every session of this server."""
+    return ScoresStore(ASSERTION_SCORES_DB_PATH)
+
+
 def load_assertion_scores():
-    """Load GPT-5 JJ assertion scoring results."""
-    if "assertion_scores" not in st.session_state:
-        st.session_state.assertion_scores = None
-        st.session_state.assertion_scores_index = {}  # {utterance: {assertion_text: score_data}}
+    """Load the GPT-5 JJ scoring summary; meeting results are read on demand."""
+    version = get_scores_version()
+    if "assertion_scores" not in st.session_state or st.session_state.get("assertion_scores_version") != version:
+        st.session_state.assertion_scores = None  # {timestamp, num_samples, overall_stats}
+        st.session_state.assertion_scores_version = version
         
-        if os.path.exists(ASSERTION_SCORES_PATH):
+        if version is not None:
             try:
-                with open(ASSERTION_SCORES_PATH, 'r', encoding='utf-8') as f:
-                    scores = json.load(f)
-                    st.session_state.assertion_scores = scores
-                    
-                    # Build index for fast lookup
-                    for meeting in scores.get('meetings', []):
-                        utterance = meeting.get('utterance', '')
-                        if utterance not in st.session_state.assertion_scores_index:
-                            st.session_state.assertion_scores_index[utterance] = {}
-                        for result in meeting.get('assertion_results', []):
-                            assertion_text = result.get('assertion_text', '')
-                            st.session_state.assertion_scores_index[utterance][assertion_text] = result
+                store = get_scores_store()
+                store.sync(ASSERTION_SCORES_PATH)
+                st.session_state.assertion_scores = store.summary()
             except Exception as e:
                 st.session_state.assertion_scores = None
     
@@ -57,13 +83,54 @@ def get_assertion_score(utterance: str, assertion_text: str) -> dict:
     
     Returns dict with: passed (bool), explanation (str), or empty dict if not found.
     """
-    if "assertion_scores_index" not in st.session_state:
-        load_assertion_scores()
-    
-    index = st.session_state.get('assertion_scores_index', {})
-    if utterance in index and assertion_text in index[utterance]:
-        return index[utterance][assertion_text]
-    return {}
+    if st.session_state.get("assertion_scores") is None:
+        return {}
+    return get_scores_store().get_score(utterance, assertion_text)
+
+
+VERIFICATION_POLL_SECONDS = 3  # How often a pending re-verification's status is re-read
+
+
+@st.cache_resource
+def get_verification_queue():
+    """Background GPT-5 re-verification queue, shared by every session of this server."""
+    from functools import partial
+    from evaluate_assertions_gpt5 import evaluate_assertion
+    return VerificationQueue(get_scores_store(), partial(evaluate_assertion, raise_errors=True), owner="mira2")
+
+
+def submit_verification(utterance: str, assertion: dict, response_text: str):
+    """Queue a GPT-5 re-verification of an assertion; the result lands in the scores store."""
+    try:
+        get_verification_queue().submit(utterance, assertion, response_text, judge=st.session_state.judge_name)
+    except Exception as e:
+        st.error(f"Could not queue GPT-5 verification: {e}")
+
+
+@st.fragment(run_every=VERIFICATION_POLL_SECONDS)
+def poll_verification_status(utterance: str, assertion_text: str):
+    """Status of a pending re-verification, re-read until the job finishes."""
+    job = get_scores_store().latest_job(utterance, assertion_text)
+    if job and job["status"] in JOB_ACTIVE_STATUSES:
+        st.info(f"⏳ GPT-5 verification {job['status']}...")
+    else:
+        # Finished: rerun the page so score cards and the final status pick it up
+        st.rerun()
+
+
+def render_verification_status(utterance: str, assertion_text: str):
+    """Inline status of the latest re-verification of an assertion text; only a pending job is polled."""
+    job = get_scores_store().latest_job(utterance, assertion_text)
+    if job is None:
+        return
+    if job["status"] in JOB_ACTIVE_STATUSES:
+        poll_verification_status(utterance, assertion_text)
+    elif job["status"] == "failed":
+        st.warning(f"⚠️ GPT-5 verification failed: {job['error']}")
+    else:
+        result = get_scores_store().get_score(utterance, assertion_text)
+        verdict = "✅ **PASSED**" if result.get('passed') else "❌ **FAILED**"
+        st.markdown(f"🤖 GPT-5 re-verification: {verdict} - {result.get('explanation', '')}")
 
 # ====== ANNOTATION SYSTEM ======
 def init_annotation_state():
@@ -78,28 +145,42 @@ def init_annotation_state():
         st.session_state.last_save_time = time.time()
     if "annotation_modified" not in st.session_state:
         st.session_state.annotation_modified = False
+    if "meeting_progress" not in st.session_state:
+        st.session_state.meeting_progress = {}  # {utterance: {judged, confident, not_confident, not_good}}
+        st.session_state.meeting_sizes = {}  # {utterance: number of assertions}
+        st.session_state.meeting_copies = {}  # {utterance: number of items with that utterance}
+        st.session_state.progress_totals = None  # Dataset-wide counts, rebuilt lazily in main()
     if "judge_name" not in st.session_state:
-        st.session_state.judge_name = os.environ.get('USERNAME', os.environ.get('USER', ''))
+        # Legacy JSON files are imported once, attributed to their judge_name
+        store = get_annotation_store()
+        default_judge = os.environ.get('USERNAME', os.environ.get('USER', ''))
+        try:
+            store.migrate_json(ANNOTATION_SAVE_PATH, default_judge)
+        except (OSError, ValueError):
+            pass
+        st.session_state.judge_name = store.migration_judge(ANNOTATION_SAVE_PATH) or default_judge
+        load_judge_annotations()
     if "expanded_assertions" not in st.session_state:
         st.session_state.expanded_assertions = set()  # Track which assertion expanders are open
     if "show_meeting_card" not in st.session_state:
         st.session_state.show_meeting_card = False  # Toggle for meeting card display
-    
-    # Try to load existing annotations from temp file
-    if os.path.exists(ANNOTATION_SAVE_PATH):
-        try:
-            with open(ANNOTATION_SAVE_PATH, 'r', encoding='utf-8') as f:
-                saved = json.load(f)
-                if "annotations" in saved:
-                    st.session_state.annotations = saved["annotations"]
-                if "new_assertions" in saved:
-                    st.session_state.new_assertions = saved["new_assertions"]
-                if "response_annotations" in saved:
-                    st.session_state.response_annotations = saved["response_annotations"]
-                if "judge_name" in saved:
-                    st.session_state.judge_name = saved["judge_name"]
-        except:
-            pass
+
+
+@st.cache_resource
+def get_annotation_store():
+    """Annotation store shared by every session of this server."""
+    return AnnotationStore(ANNOTATION_DB_PATH)
+
+
+def load_judge_annotations():
+    """Load the current judge's annotations from the store into session state."""
+    store = get_annotation_store()
+    judge = st.session_state.judge_name
+    st.session_state.annotations = store.load_annotations(judge)
+    st.session_state.new_assertions = store.load_new_assertions(judge)
+    st.session_state.response_annotations = store.load_response_annotations(judge)
+    st.session_state.meeting_progress = store.load_progress(judge)
+    st.session_state.progress_totals = None
 
 
 def auto_save_annotations():
@@ -114,16 +195,9 @@ def auto_save_annotations():
 
 
 def save_annotations():
-    """Save current annotations to temporary file."""
-    save_data = {
-        "annotations": st.session_state.annotations,
-        "new_assertions": st.session_state.new_assertions,
-        "response_annotations": st.session_state.response_annotations,
-        "judge_name": st.session_state.judge_name,
-        "last_saved": datetime.now().isoformat()
-    }
-    with open(ANNOTATION_SAVE_PATH, 'w', encoding='utf-8') as f:
-        json.dump(save_data, f, indent=2, ensure_ascii=False)
+    """Mark annotations as saved (each change is already written to the store)."""
+    st.session_state.last_save_time = time.time()
+    st.session_state.annotation_modified = False
 
 
 def get_annotation(utterance, assertion_idx):
@@ -141,6 +215,7 @@ def set_annotation(utterance, assertion_idx, is_good=None, revision=None, origin
     key = str(assertion_idx)
     if key not in st.session_state.annotations[utterance]:
         st.session_state.annotations[utterance][key] = {"is_good": True, "revision": "", "original": "", "note": "", "is_confident": True, "is_judged": False, "gpt5_verification": {}}
+    before = _progress_counts(st.session_state.annotations[utterance][key])
     
     if is_good is not None:
         st.session_state.annotations[utterance][key]["is_good"] = is_good
@@ -157,9 +232,83 @@ def set_annotation(utterance, assertion_idx, is_good=None, revision=None, origin
     if gpt5_verification is not None:
         st.session_state.annotations[utterance][key]["gpt5_verification"] = gpt5_verification
     
+    get_annotation_store().upsert_annotation(
+        st.session_state.judge_name, utterance, key,
+        is_good=is_good, revision=revision, original=original, note=note,
+        is_confident=is_confident, is_judged=is_judged, gpt5_verification=gpt5_verification
+    )
+    update_progress(utterance, before, _progress_counts(st.session_state.annotations[utterance][key]))
     st.session_state.annotation_modified = True
 
 
+def _progress_counts(ann):
+    """One assertion annotation's contribution to its meeting's progress counts."""
+    judged = bool(ann.get('is_judged', False))
+    confident = bool(ann.get('is_confident', True))
+    return {
+        "judged": int(judged),
+        "confident": int(judged and confident),
+        "not_confident": int(judged and not confident),
+        "not_good": int(not ann.get('is_good', True)),
+    }
+
+
+def meeting_status(utterance):
+    """'complete' | 'partial' | 'none' for a meeting, from its progress counts."""
+    if utterance not in st.session_state.meeting_sizes:
+        return 'none'
+    judged = st.session_state.meeting_progress.get(utterance, {}).get("judged", 0)
+    num_assertions = st.session_state.meeting_sizes[utterance]
+    if num_assertions > 0 and judged == num_assertions:
+        return 'complete'
+    if judged > 0:
+        return 'partial'
+    return 'none'
+
+
+def rebuild_progress(output_data):
+    """Recompute dataset-wide progress totals from the per-meeting counts."""
+    sizes, copies = {}, {}
+    for item in output_data:
+        utterance = item.get('utterance', '')
+        sizes[utterance] = len(item.get('assertions', []))
+        copies[utterance] = copies.get(utterance, 0) + 1  # Items sharing an utterance share annotations
+    st.session_state.meeting_sizes = sizes
+    st.session_state.meeting_copies = copies
+    
+    totals = {"meetings": len(output_data), "assertions": sum(len(item.get('assertions', [])) for item in output_data),
+              "judged": 0, "confident": 0, "not_confident": 0, "complete": 0, "partial": 0}
+    for utterance, n in copies.items():
+        counts = st.session_state.meeting_progress.get(utterance, {})
+        for field in ("judged", "confident", "not_confident"):
+            totals[field] += n * counts.get(field, 0)
+        status = meeting_status(utterance)
+        if status != 'none':
+            totals[status] += n
+    st.session_state.progress_totals = totals
+
+
+def update_progress(utterance, before, after):
+    """Apply one annotation change to its meeting's counts and the dataset totals."""
+    old_status = meeting_status(utterance)
+    counts = st.session_state.meeting_progress.setdefault(utterance, dict.fromkeys(PROGRESS_FIELDS, 0))
+    for field in PROGRESS_FIELDS:
+        counts[field] += after[field] - before[field]
+    
+    totals = st.session_state.progress_totals
+    if totals is None or utterance not in st.session_state.meeting_sizes:
+        return
+    n = st.session_state.meeting_copies[utterance]
+    for field in ("judged", "confident", "not_confident"):
+        totals[field] += n * (after[field] - before[field])
+    new_status = meeting_status(utterance)
+    if new_status != old_status:
+        if old_status != 'none':
+            totals[old_status] -= n
+        if new_status != 'none':
+            totals[new_status] += n
+
+
 def get_response_annotation(utterance, section_key):
     """Get annotation for a specific response section or overall."""
     if utterance in st.session_state.response_annotations:
@@ -172,6 +321,7 @@ def set_response_annotation(utterance, section_key, note):
     if utterance not in st.session_state.response_annotations:
         st.session_state.response_annotations[utterance] = {}
     st.session_state.response_annotations[utterance][section_key] = note
+    get_annotation_store().set_response_annotation(st.session_state.judge_name, utterance, section_key, note)
     st.session_state.annotation_modified = True
 
 
@@ -249,11 +399,74 @@ def parse_response_sections(response_text):
     return sections
 
 
+@st.cache_data(show_spinner=False)
+def highlight_section_html(section_content, highlight_matches, highlight_term):
+    """Section content with evidence passages (strongest first) or a search term marked up."""
+    display_content = section_content
+    if highlight_matches:
+        colors = [
+            "rgba(255, 193, 7, 1.0)",
+            "rgba(255, 193, 7, 0.6)",
+            "rgba(255, 193, 7, 0.3)"
+        ]
+        for i, match_text in enumerate(highlight_matches):
+            if i < len(colors):
+                color = colors[i]
+                pattern = re.compile(re.escape(match_text), re.IGNORECASE)
+                display_content = pattern.sub(
+                    lambda m: f"<mark style='background-color: {color}; color: black; border-radius: 3px;'>{m.group(0)}</mark>", 
+                    display_content
+                )
+    elif highlight_term:
+        pattern = re.compile(re.escape(highlight_term), re.IGNORECASE)
+        display_content = pattern.sub(
+            lambda m: f"<mark style='background-color: #fff3cd; color: black;'>{m.group(0)}</mark>", 
+            display_content
+        )
+    return display_content
+
+
+def map_section_evidence(sections, results):
+    """
+    Map response sections to the GPT-5 supporting spans that quote them.
+    
+    A span belongs to the first section containing its text, else to the
+    section whose title matches the span's section label.
+    
+    Args:
+        sections: Output of parse_response_sections
+        results: The meeting's scores ({assertion_key: result})
+    
+    Returns:
+        {section_idx: [{"assertion_text", "span_idx", "supports", "confidence"}]}
+    """
+    contents = [str(s["content"]).lower() for s in sections]
+    titles = [s["title"].lower() for s in sections]
+    
+    evidence = {}
+    for result in results.values():
+        assertion_text = result.get('assertion_text', '')
+        for span_idx, span in enumerate(result.get('supporting_spans', [])):
+            span_text = span.get('text', '').strip().lower()
+            span_section = span.get('section', '').strip().lower()
+            match = next((i for i, c in enumerate(contents) if span_text and span_text in c), None)
+            if match is None and span_section:
+                match = next((i for i, t in enumerate(titles) if t and (span_section in t or t in span_section)), None)
+            if match is not None:
+                evidence.setdefault(match, []).append({
+                    "assertion_text": assertion_text,
+                    "span_idx": span_idx,
+                    "supports": span.get('supports', True),
+                    "confidence": span.get('confidence', 0.5),
+                })
+    return evidence
+
 def add_new_assertion(utterance, assertion_data):
     """Add a new user-created assertion."""
     if utterance not in st.session_state.new_assertions:
         st.session_state.new_assertions[utterance] = []
     st.session_state.new_assertions[utterance].append(assertion_data)
+    get_annotation_store().add_new_assertion(st.session_state.judge_name, utterance, assertion_data)
     st.session_state.annotation_modified = True
 
 
@@ -262,80 +475,67 @@ def get_new_assertions(utterance):
     return st.session_state.new_assertions.get(utterance, [])
 
 
-def export_annotated_data(output_data):
-    """Export annotated data in Kening's format with annotations field."""
-    exported = []
-    
+def export_annotated_data(output_data, only="all"):
+    """Stream the judge's annotated data to the export file; returns (path, counts)."""
+    path = filtered_export_path(ANNOTATION_EXPORT_PATH, only)
+    total = max(len(output_data), 1)
+    bar = st.progress(0.0, text=f"Exporting to {path}...")
+    def progress(done):
+        if done % 20 == 0 or done == total:
+            bar.progress(done / total, text=f"Exporting to {path}... {done}/{total}")
+    counts = export_annotated(output_data, get_annotation_store(), st.session_state.judge_name, path,
+                              only=only, progress=progress)
+    bar.empty()
+    return path, counts
+
+
+# ====== WORK ASSIGNMENT ======
+@st.cache_data(show_spinner=False)
+def get_meeting_hints(scores_version):
+    """GPT-5 failure and low-confidence counts per meeting (shared by all sessions)."""
+    return get_scores_store().meeting_hints()
+
+
+def register_work_items(output_data):
+    """Hand the dataset's meetings to the assignment queue, GPT-5 failures and weak evidence first."""
+    version = (st.session_state.get("assertion_scores_version"), len(output_data))
+    if st.session_state.get("work_items_version") == version:
+        return
+    hints = get_meeting_hints(version[0]) if st.session_state.get("assertion_scores") else {}
+    items = {}
     for item in output_data:
         utterance = item.get('utterance', '')
-        new_item = item.copy()
-        
-        # Add annotations field
-        annotations_for_item = []
-        original_assertions = item.get('assertions', [])
-        
-        for i, assertion in enumerate(original_assertions):
-            ann = get_annotation(utterance, i)
-            annotation_entry = {
-                "assertion_index": i,
-                "original_text": assertion.get('text', ''),
-                "is_good": ann.get('is_good', True),  # Default is good
-                "is_confident": ann.get('is_confident', True),  # Default is confident
-                "is_judged": ann.get('is_judged', False),  # Default is not judged
-            }
-            
-            # Add revision if exists
-            if ann.get('revision'):
-                annotation_entry["revised_text"] = ann.get('revision')
-            
-            # Add note if exists
-            if ann.get('note'):
-                annotation_entry["note"] = ann.get('note')
-            
-            annotations_for_item.append(annotation_entry)
-        
-        # Add new assertions created by user
-        new_asserts = get_new_assertions(utterance)
-        for new_assert in new_asserts:
-            annotations_for_item.append({
-                "is_new": True,
-                "text": new_assert.get('text', ''),
-                "level": new_assert.get('level', 'expected'),
-                "justification": new_assert.get('justification', {}),
-                "is_good": True,
-                "is_confident": True,
-                "is_judged": True  # New assertions are considered judged
-            })
-        
-        new_item['annotations'] = annotations_for_item
-        
-        # Add response annotations
-        if utterance in st.session_state.response_annotations:
-            new_item['response_annotations'] = st.session_state.response_annotations[utterance]
-        
-        # Add judge information
-        new_item['judge'] = st.session_state.judge_name
-        
-        # Calculate statistics
-        good_count = sum(1 for a in annotations_for_item if a.get('is_good', True))
-        confident_count = sum(1 for a in annotations_for_item if a.get('is_confident', True))
-        judged_count = sum(1 for a in annotations_for_item if a.get('is_judged', False))
-        total_count = len(annotations_for_item)
-        new_item['annotation_stats'] = {
-            "total": total_count,
-            "good": good_count,
-            "not_good": total_count - good_count,
-            "confident": confident_count,
-            "not_confident": total_count - confident_count,
-            "judged": judged_count,
-            "not_judged": total_count - judged_count,
-            "revised": sum(1 for a in annotations_for_item if a.get('revised_text')),
-            "new_added": len(new_asserts)
-        }
-        
-        exported.append(new_item)
+        hint = hints.get(utterance, {})
+        items[utterance] = (utterance, len(item.get('assertions', [])),
+                            hint.get('failed', 0) + hint.get('low_confidence', 0))
+    get_annotation_store().register_work_items(items.values(), overlap_rate=ASSIGNMENT_OVERLAP_RATE)
+    st.session_state.work_items_version = version
+
+
+def lease_next_meeting():
+    """Lease the next meeting to this judge; returns its utterance, or None if none is left."""
+    utterance = get_annotation_store().lease_next(st.session_state.judge_name, ASSIGNMENT_LEASE_SECONDS)
+    st.session_state.assigned_meeting = utterance
+    return utterance
+
+
+def keep_assignment(utterance):
+    """
+    Renew the judge's lease while they work on the assigned meeting; release it once fully judged.
     
-    return exported
+    Returns:
+        'held', 'expired' or 'done' for the assigned meeting, None for any other meeting
+    """
+    if not utterance or utterance != st.session_state.get("assigned_meeting"):
+        return None
+    store = get_annotation_store()
+    if meeting_status(utterance) == 'complete':
+        store.release_lease(st.session_state.judge_name)
+        st.session_state.assigned_meeting = None
+        return 'done'
+    if store.renew_lease(st.session_state.judge_name, utterance, ASSIGNMENT_LEASE_SECONDS):
+        return 'held'
+    return 'expired'
 
 
 # Initialize annotation state
@@ -485,6 +685,46 @@ def find_entity_by_source_id(source_id, entity_index):
     
     return None
 
+
+def build_meeting_bundle(output_item, input_item, scores_store):
+    """Precompute what the main view derives from one meeting.
+    
+    Makes no Streamlit calls, so it can run on the prefetch thread. Bundles are
+    shared across sessions and must not be modified.
+    
+    Returns dict with: entity_index, resolved_sources ({sourceID: entity_info or None}),
+    sections, section_evidence, scores ({assertion_idx: GPT-5 score or {}}).
+    """
+    utterance = output_item.get('utterance', '')
+    assertions = output_item.get('assertions', [])
+    entity_index = build_entity_index(input_item) if input_item else {}
+    
+    resolved_sources = {}
+    for assertion in assertions:
+        source = get_assertion_source(assertion)
+        if source and is_source_id_format(assertion) and source not in resolved_sources:
+            resolved_sources[source] = find_entity_by_source_id(source, entity_index)
+    
+    # Scores are indexed by OUTPUT utterance
+    results = scores_store.get_meeting(utterance) if scores_store else {}
+    scores = {i: scores_store.get_score(utterance, assertion.get('text', '')) if scores_store else {}
+              for i, assertion in enumerate(assertions)}
+    
+    sections = parse_response_sections(output_item.get('response', '*No response content*'))
+    return {
+        "entity_index": entity_index,
+        "resolved_sources": resolved_sources,
+        "sections": sections,
+        "section_evidence": map_section_evidence(sections, results),
+        "scores": scores,
+    }
+
+
+@st.cache_resource
+def get_meeting_prefetcher():
+    """Meeting bundles prepared ahead of navigation, shared by every session of this server."""
+    return MeetingPrefetcher(build_meeting_bundle)
+
 # Entity Styling Configuration
 ENTITY_STYLES = {
     "User": {"color": "#3498db", "icon": "👤"},
@@ -518,6 +758,55 @@ def get_entity_card_header(etype, title):
     </div>
     """
 
+def paginate(items, key, page_size, focus_index=None):
+    """
+    Render a pager for a long list and return the current page of it.
+
+    Args:
+        items: Full list
+        key: Unique widget key for this list
+        page_size: Items per page
+        focus_index: Item to jump to (once per distinct value), e.g. a linked entity
+
+    Returns:
+        (offset of the first item on the page, items on the page)
+    """
+    num_pages = max(1, -(-len(items) // page_size))
+    if num_pages == 1:
+        return 0, items
+    
+    if focus_index is not None and st.session_state.get(f"{key}_focus") != focus_index:
+        st.session_state[f"{key}_focus"] = focus_index
+        st.session_state[key] = focus_index // page_size + 1
+    if st.session_state.get(key, 1) > num_pages:
+        st.session_state[key] = num_pages
+    
+    page_col, info_col = st.columns([1, 2])
+    with page_col:
+        page = st.number_input(
+            "Page",
+            min_value=1,
+            max_value=num_pages,
+            step=1,
+            key=key,
+            label_visibility="collapsed"
+        )
+    start = (page - 1) * page_size
+    end = min(start + page_size, len(items))
+    with info_col:
+        st.caption(f"📄 Page {page}/{num_pages} · showing {start + 1}–{end} of {len(items)}")
+    return start, items[start:end]
+
+
+def is_linked_entity(item, linked_entity_data):
+    """Whether an entity is the one an assertion's sourceID points at (matched by ID fields)."""
+    for id_field in ['EventId', 'FileId', 'ChatId', 'MessageId', 'id', 'Id']:
+        if id_field in item and id_field in linked_entity_data:
+            if item[id_field] == linked_entity_data[id_field]:
+                return True
+    return False
+
+
 def render_user_card(item):
     """Render a professional card for a User entity."""
     display_name = item.get('DisplayName', 'Unknown')
@@ -640,9 +929,11 @@ def render_chat_card(item, key_suffix=""):
         
     with col2:
         st.markdown(f"#### 📨 Messages ({len(chat_messages)})")
+        limit_key = f"chat_limit_{key_suffix}"
+        limit = st.session_state.get(limit_key, CHAT_MESSAGES_PAGE_SIZE)
         with st.container(border=True, height=400):
             if chat_messages:
-                for i, msg in enumerate(chat_messages):
+                for i, msg in enumerate(chat_messages[:limit]):
                     sender = msg.get('From', 'Unknown')
                     content = msg.get('Content', '')
                     timestamp = msg.get('SentDateTime', '')
@@ -655,6 +946,11 @@ def render_chat_card(item, key_suffix=""):
                         <div style="font-size: 0.75em; color: #888; text-align: right;">{timestamp}</div>
                     </div>
                     """, unsafe_allow_html=True)
+                remaining = len(chat_messages) - limit
+                if remaining > 0:
+                    if st.button(f"⬇️ Load {min(remaining, CHAT_MESSAGES_PAGE_SIZE)} more ({remaining} not shown)", key=f"chat_more_{key_suffix}"):
+                        st.session_state[limit_key] = limit + CHAT_MESSAGES_PAGE_SIZE
+                        st.rerun()
             else:
                 st.caption("No messages in this chat.")
 
@@ -849,62 +1145,36 @@ def main():
     # === SYNC CHECKBOX STATES TO ANNOTATIONS ===
     # This ensures progress calculation reflects current checkbox states
     # (Streamlit checkboxes update session_state immediately, but our annotations
-    # need to be synced before we calculate progress)
-    for idx, item in enumerate(output_data):
-        utterance = item.get('utterance', '')
-        assertions = item.get('assertions', [])
-        for i in range(len(assertions)):
-            checkbox_key = f"judged_{idx}_{i}"
-            if checkbox_key in st.session_state:
-                # Get current annotation value
-                ann = get_annotation(utterance, i)
-                stored_judged = ann.get('is_judged', False)
-                checkbox_judged = st.session_state[checkbox_key]
-                # Sync if different
-                if checkbox_judged != stored_judged:
-                    set_annotation(utterance, i, is_judged=checkbox_judged)
-
-    # === CALCULATE PROGRESS STATISTICS ===
-    total_meetings = len(output_data)
-    fully_judged_meetings = 0
-    partially_judged_meetings = 0
-    total_assertions_judged = 0
-    total_assertions = 0
-    confident_judgments = 0
-    not_confident_judgments = 0
-    
-    # Build a map of meeting judgment status for sidebar use
-    meeting_judgment_status = {}  # utterance -> 'complete' | 'partial' | 'none'
-    
-    for item in output_data:
-        utterance = item.get('utterance', '')
-        assertions = item.get('assertions', [])
-        num_assertions = len(assertions)
-        total_assertions += num_assertions
-        
-        # Count judged assertions for this meeting
-        judged_count = 0
-        if utterance in st.session_state.annotations:
-            meeting_annotations = st.session_state.annotations[utterance]
-            for ann in meeting_annotations.values():
-                if ann.get('is_judged', False):
-                    judged_count += 1
-                    total_assertions_judged += 1
-                    # Count confidence only for judged assertions
-                    if ann.get('is_confident', True):
-                        confident_judgments += 1
-                    else:
-                        not_confident_judgments += 1
-        
-        # Determine meeting status
-        if num_assertions > 0 and judged_count == num_assertions:
-            meeting_judgment_status[utterance] = 'complete'
-            fully_judged_meetings += 1
-        elif judged_count > 0:
-            meeting_judgment_status[utterance] = 'partial'
-            partially_judged_meetings += 1
-        else:
-            meeting_judgment_status[utterance] = 'none'
+    # need to be synced before we calculate progress). Only rendered checkboxes
+    # have state, so this visits the open meeting's keys, not the whole dataset.
+    for checkbox_key in [k for k in st.session_state.keys() if k.startswith("judged_")]:
+        match = re.match(r"judged_(\d+)_(\d+)$", checkbox_key)
+        if not match or int(match.group(1)) >= len(output_data):
+            continue
+        utterance = output_data[int(match.group(1))].get('utterance', '')
+        i = int(match.group(2))
+        # Get current annotation value
+        ann = get_annotation(utterance, i)
+        stored_judged = ann.get('is_judged', False)
+        checkbox_judged = st.session_state[checkbox_key]
+        # Sync if different
+        if checkbox_judged != stored_judged:
+            set_annotation(utterance, i, is_judged=checkbox_judged)
+
+    # === PROGRESS STATISTICS ===
+    # set_annotation keeps these up to date; they are only rebuilt from the
+    # per-meeting counts when the data or the judge changes
+    totals = st.session_state.progress_totals
+    if totals is None or totals["meetings"] != len(output_data):
+        rebuild_progress(output_data)
+        totals = st.session_state.progress_totals
+    total_meetings = totals["meetings"]
+    fully_judged_meetings = totals["complete"]
+    partially_judged_meetings = totals["partial"]
+    total_assertions_judged = totals["judged"]
+    total_assertions = totals["assertions"]
+    confident_judgments = totals["confident"]
+    not_confident_judgments = totals["not_confident"]
     
     progress_pct = (fully_judged_meetings / total_meetings * 100) if total_meetings > 0 else 0
     assertions_pct = (total_assertions_judged / total_assertions * 100) if total_assertions > 0 else 0
@@ -928,7 +1198,7 @@ def main():
         )
         if judge_name != st.session_state.judge_name:
             st.session_state.judge_name = judge_name
-            save_annotations()
+            load_judge_annotations()
     
     with cmd_col2:
         # Filter by annotation status
@@ -951,11 +1221,15 @@ def main():
                 st.toast("✅ Annotations saved!")
         with btn_col2:
             if st.button("📤 Export", help="Export annotated data", use_container_width=True):
-                exported = export_annotated_data(output_data)
-                with open(ANNOTATION_EXPORT_PATH, 'w', encoding='utf-8') as f:
-                    for item in exported:
-                        f.write(json.dumps(item, ensure_ascii=False) + '\n')
-                st.toast(f"✅ Exported to {ANNOTATION_EXPORT_PATH}")
+                path, counts = export_annotated_data(output_data, EXPORT_FILTER_OPTIONS[st.session_state.get("export_filter", "All meetings")])
+                st.toast(f"✅ Exported {counts['written']} meetings to {path}")
+        st.selectbox(
+            "Export filter",
+            list(EXPORT_FILTER_OPTIONS),
+            key="export_filter",
+            help="Export every meeting, only meetings with judged assertions, or only meetings changed since your last export",
+            label_visibility="collapsed"
+        )
     
     with cmd_col4:
         st.markdown("##### ⚠️ Reset")
@@ -1050,7 +1324,7 @@ An assertion is **automatically marked as judged** when you:
 ### Tips
 
 - **Use the filter** in the command center to find meetings that need attention
-- **Save frequently** - click "💾 Save" or annotations auto-save every minute
+- **Every change is saved** - annotations are stored per judge in the annotation database as you go
 - **Export** your work by clicking "📤 Export" to save to `annotated_output.jsonl`
         """)
 
@@ -1112,7 +1386,7 @@ An assertion is **automatically marked as judged** when you:
             dup_marker = ""
         
         # Determine status indicator based on judgment
-        judgment_status = meeting_judgment_status.get(utterance_text, 'none')
+        judgment_status = meeting_status(utterance_text)
         if judgment_status == 'complete':
             status = "📗"  # Fully judged (green book)
         elif judgment_status == 'partial':
@@ -1155,16 +1429,46 @@ An assertion is **automatically marked as judged** when you:
         st.info("No meetings match the selected filter. Please change the filter in the command center to see meetings.")
         return
     
+    # === WORK ASSIGNMENT ===
+    # Take the most useful meeting no other judge holds instead of picking by hand
+    register_work_items(output_data)
+    if st.sidebar.button("🎯 Next Assigned Meeting", key="lease_next_meeting",
+                         help="Lease the highest-priority meeting no other judge is working on"):
+        assigned = lease_next_meeting()
+        if assigned is None:
+            st.sidebar.success("🎉 No meetings left to assign to you")
+        else:
+            position = next((p for p, i in enumerate(filtered_indices) if output_data[i].get('utterance', '') == assigned), None)
+            if position is None:
+                st.sidebar.warning("The assigned meeting is hidden by the current filter")
+            else:
+                st.session_state.meeting_selector = options[position]
+    if st.session_state.get("meeting_selector") not in options:
+        st.session_state.pop("meeting_selector", None)
+    
     # Use radio buttons for selection
     selected_option = st.sidebar.radio(
         "Choose an assertion set:",
         options,
-        index=0
+        key="meeting_selector"
     )
     
     # Extract index from the selected option string "#6 📕 🔗 Subject..."
     selected_index = int(selected_option.split()[0].replace('#', '')) - 1
 
+    # === WORK ASSIGNMENT STATUS ===
+    assignment = keep_assignment(output_data[selected_index].get('utterance', ''))
+    if assignment == 'done':
+        st.sidebar.success("✅ Assigned meeting done - take the next one")
+    elif assignment == 'expired':
+        st.sidebar.warning("⏰ Your lease on this meeting expired - take the next assigned meeting")
+    queue_status = get_annotation_store().assignment_status()
+    st.sidebar.caption(
+        f"🎯 {queue_status['covered']}/{queue_status['meetings']} meetings judged · "
+        f"{queue_status['overlap_done']}/{queue_status['overlap']} agreement pairs · "
+        f"{queue_status['leased']} in progress"
+    )
+
     # === RESET CONFIRMATION DIALOGS (triggered from command center) ===
     if st.session_state.get('show_reset_current_confirm', False):
         st.sidebar.warning("⚠️ Reset annotations for current meeting?")
@@ -1177,6 +1481,9 @@ An assertion is **automatically marked as judged** when you:
                     del st.session_state.annotations[current_utterance]
                 if current_utterance in st.session_state.new_assertions:
                     del st.session_state.new_assertions[current_utterance]
+                get_annotation_store().delete_annotations(st.session_state.judge_name, current_utterance)
+                st.session_state.meeting_progress.pop(current_utterance, None)
+                st.session_state.progress_totals = None
                 # Clear expanded state for this meeting
                 keys_to_remove = [k for k in st.session_state.expanded_assertions if k.startswith(f"{selected_index}_")]
                 for k in keys_to_remove:
@@ -1196,6 +1503,9 @@ An assertion is **automatically marked as judged** when you:
             if st.sidebar.button("✅ Yes, Reset ALL", key="confirm_reset_all", type="primary"):
                 st.session_state.annotations = {}
                 st.session_state.new_assertions = {}
+                get_annotation_store().delete_annotations(st.session_state.judge_name)
+                st.session_state.meeting_progress = {}
+                st.session_state.progress_totals = None
                 st.session_state.expanded_assertions = set()
                 save_annotations()
                 st.session_state.show_reset_all_confirm = False
@@ -1220,6 +1530,25 @@ An assertion is **automatically marked as judged** when you:
     input_indices = input_utterance_map.get(utterance_text, [])
     input_idx = input_indices[0] if input_indices else -1
     input_item = input_data[input_idx] if input_idx >= 0 else None
+    
+    # Render-ready data for this meeting (usually prefetched), then queue the
+    # next meetings in sidebar order so moving on does not recompute anything
+    scores_store = get_scores_store() if st.session_state.get("assertion_scores") else None
+    # Re-verified scores bump the store revision, so bundles holding old ones are not reused
+    scores_version = (st.session_state.get("assertion_scores_version"), scores_store.revision if scores_store else 0)
+    
+    def bundle_args(idx):
+        indices = input_utterance_map.get(output_data[idx].get('utterance', ''), [])
+        return (output_data[idx], input_data[indices[0]] if indices else None, scores_store)
+    
+    prefetcher = get_meeting_prefetcher()
+    bundle = prefetcher.get((selected_index, scores_version), output_item, input_item, scores_store)
+    position = filtered_indices.index(selected_index)
+    upcoming = filtered_indices[position + 1:position + 1 + PREFETCH_AHEAD]
+    if "prefetch_owner" not in st.session_state:
+        st.session_state.prefetch_owner = uuid.uuid4().hex  # Other sessions' queued meetings are left alone
+    prefetcher.prefetch([((idx, scores_version), bundle_args(idx)) for idx in upcoming],
+                        owner=st.session_state.prefetch_owner)
 
     # ═══════════════════════════════════════════════════════════════════════════════
     # 📄 MAIN CONTENT AREA
@@ -1495,17 +1824,13 @@ An assertion is **automatically marked as judged** when you:
                         label = f"🔗 **{etype}** ({len(group_items)} items) - Contains linked entity"
                     
                     with st.expander(label, expanded=group_should_expand):
-                        for i, item in enumerate(group_items):
-                            # Check if this specific item is the linked entity
-                            is_linked = False
-                            if linked_entity_data:
-                                # Match by multiple ID fields
-                                for id_field in ['EventId', 'FileId', 'ChatId', 'MessageId', 'id', 'Id']:
-                                    if id_field in item and id_field in linked_entity_data:
-                                        if item[id_field] == linked_entity_data[id_field]:
-                                            is_linked = True
-                                            break
-                            
+                        # Jump to the page holding the linked entity
+                        linked_index = None
+                        if contains_linked and linked_entity_data:
+                            linked_index = next((i for i, item in enumerate(group_items) if is_linked_entity(item, linked_entity_data)), None)
+                        offset, page_items = paginate(group_items, f"entity_page_{selected_index}_{etype}", ENTITIES_PAGE_SIZE, focus_index=linked_index)
+                        for i, item in enumerate(page_items, start=offset):
+                            is_linked = linked_index == i
                             # Individual Card
                             with st.container(border=True):
                                 # Show linked indicator
@@ -1521,21 +1846,25 @@ An assertion is **automatically marked as judged** when you:
                                 st.markdown(header, unsafe_allow_html=True)
                                 
                                 if view_mode == "Card View":
-                                    # Render entity card based on type
-                                    if etype == "User":
-                                        render_user_card(item)
-                                    elif etype == "File":
-                                        render_file_card(item, key_suffix=f"{etype}_{i}")
-                                    elif etype == "Chat":
-                                        render_chat_card(item, key_suffix=f"{etype}_{i}")
-                                    elif etype == "Email":
-                                        render_email_card(item, key_suffix=f"{etype}_{i}")
-                                    elif etype in ["ChannelMessage", "ChannelMessageReply"]:
-                                        render_channel_message_card(item, key_suffix=f"{etype}_{i}")
-                                    else:
-                                        render_generic_card(item)
-                                    with st.expander("Raw JSON"):
-                                        st.json(item)
+                                    # Card bodies are only built when opened (the linked entity always is)
+                                    show_body = is_linked or st.toggle("Show details", key=f"entity_body_{selected_index}_{etype}_{i}")
+                                    if show_body:
+                                        key_suffix = f"{selected_index}_{etype}_{i}"
+                                        # Render entity card based on type
+                                        if etype == "User":
+                                            render_user_card(item)
+                                        elif etype == "File":
+                                            render_file_card(item, key_suffix=key_suffix)
+                                        elif etype == "Chat":
+                                            render_chat_card(item, key_suffix=key_suffix)
+                                        elif etype == "Email":
+                                            render_email_card(item, key_suffix=key_suffix)
+                                        elif etype in ["ChannelMessage", "ChannelMessageReply"]:
+                                            render_channel_message_card(item, key_suffix=key_suffix)
+                                        else:
+                                            render_generic_card(item)
+                                        with st.expander("Raw JSON"):
+                                            st.json(item)
                                 else:
                                     st.json(item, expanded=json_expanded)
             else:
@@ -1551,10 +1880,10 @@ An assertion is **automatically marked as judged** when you:
 
         with col1:
             st.subheader("🤖 Generated Response")
-            response_content_raw = output_item.get('response', '*No response content*')
             
-            # Parse response into sections
-            response_sections = parse_response_sections(response_content_raw)
+            # Response sections and their GPT-5 evidence come from the meeting bundle
+            response_sections = bundle["sections"]
+            section_evidence = bundle["section_evidence"]
             
             # Count sections with annotations
             sections_with_notes = sum(1 for i in range(len(response_sections)) 
@@ -1580,36 +1909,24 @@ An assertion is **automatically marked as judged** when you:
                     note_indicator = "📝" if has_note else ""
                     st.markdown(f'<div style="background-color: #e3f2fd; padding: 4px 8px; border-radius: 4px; margin-bottom: 8px;"><strong>{section_idx + 1}. {section_title}</strong> {note_indicator}</div>', unsafe_allow_html=True)
                     
-                    # Apply highlighting to section content
-                    display_content = section_content
-                    highlight_matches = st.session_state.get("highlight_matches")
-                    highlight_term = st.session_state.get("highlight_term")
+                    spans = section_evidence.get(section_idx, [])
+                    if spans:
+                        supporting = sum(1 for s in spans if s["supports"])
+                        num_assertions = len({s["assertion_text"] for s in spans})
+                        st.caption(f"🔎 GPT-5 evidence for {num_assertions} assertion(s): {supporting} supporting, {len(spans) - supporting} contradicting")
                     
-                    if highlight_matches:
-                        colors = [
-                            "rgba(255, 193, 7, 1.0)",
-                            "rgba(255, 193, 7, 0.6)",
-                            "rgba(255, 193, 7, 0.3)"
-                        ]
-                        for i, match_text in enumerate(highlight_matches):
-                            if i < len(colors):
-                                color = colors[i]
-                                pattern = re.compile(re.escape(match_text), re.IGNORECASE)
-                                display_content = pattern.sub(
-                                    lambda m: f"<mark style='background-color: {color}; color: black; border-radius: 3px;'>{m.group(0)}</mark>", 
-                                    display_content
-                                )
-                    elif highlight_term:
-                        pattern = re.compile(re.escape(highlight_term), re.IGNORECASE)
-                        display_content = pattern.sub(
-                            lambda m: f"<mark style='background-color: #fff3cd; color: black;'>{m.group(0)}</mark>", 
-                            display_content
-                        )
+                    # Apply highlighting to section content (cached per section and highlight)
+                    highlight_matches = st.session_state.get("highlight_matches")
+                    display_content = highlight_section_html(
+                        section_content,
+                        tuple(highlight_matches) if highlight_matches else None,
+                        st.session_state.get("highlight_term")
+                    )
                     
                     st.markdown(display_content, unsafe_allow_html=True)
                     
-                    # Annotation expander for this section
-                    with st.expander(f"📝 Add annotation for this section", expanded=has_note):
+                    # Annotation box for this section, only built when opened
+                    if st.toggle("📝 Annotate this section", value=has_note, key=f"response_note_open_{selected_index}_{section_idx}"):
                         new_note = st.text_area(
                             "Section annotation",
                             value=existing_note,
@@ -1650,10 +1967,9 @@ An assertion is **automatically marked as judged** when you:
             
             # Calculate annotation statistics
             total_assertions_count = len(assertions) + len(get_new_assertions(utterance_text))
-            good_count = sum(1 for i in range(len(assertions)) 
-                           if get_annotation(utterance_text, i).get('is_good', True))
-            judged_count = sum(1 for i in range(len(assertions)) 
-                           if get_annotation(utterance_text, i).get('is_judged', False))
+            meeting_counts = st.session_state.meeting_progress.get(utterance_text, {})
+            good_count = len(assertions) - meeting_counts.get("not_good", 0)
+            judged_count = meeting_counts.get("judged", 0)
             new_count = len(get_new_assertions(utterance_text))
             
             # Stats row
@@ -1684,8 +2000,8 @@ An assertion is **automatically marked as judged** when you:
             if not assertions:
                 st.warning("No assertions found for this entry.")
             else:
-                # Build entity index once for all assertions
-                entity_index = build_entity_index(input_item) if input_item else {}
+                # Entity index and resolved sourceIDs are built once per meeting (in the bundle)
+                resolved_sources = bundle["resolved_sources"]
                 
                 # Sort assertions: Structural (S) first, then Grounding (G), then others
                 # Preserve original index for annotation lookup
@@ -1725,7 +2041,8 @@ An assertion is **automatically marked as judged** when you:
                 for _, asrt in sorted_assertions:
                     dim_totals[asrt.get('dimension', '')] += 1
                 
-                for original_idx, assertion in sorted_assertions:
+                _, page_assertions = paginate(sorted_assertions, f"assertion_page_{selected_index}", ASSERTIONS_PAGE_SIZE)
+                for original_idx, assertion in page_assertions:
                     level = assertion.get('level', 'unknown').lower()
                     
                     # Get dimension info for badge
@@ -1763,8 +2080,7 @@ An assertion is **automatically marked as judged** when you:
                     source = get_assertion_source(assertion)
                     has_reference = False
                     if source and is_source_id_format(assertion):
-                        entity_info = find_entity_by_source_id(source, entity_index)
-                        has_reference = entity_info is not None
+                        has_reference = resolved_sources.get(source) is not None
                     
                     # Add evidence icon: 🟢 for matched, 🔴 for unmatched/missing
                     if source and is_source_id_format(assertion):
@@ -1772,10 +2088,8 @@ An assertion is **automatically marked as judged** when you:
                     else:
                         evidence_icon = ""  # No icon for old format (text sources)
                     
-                    # Get GPT-5 JJ score for this assertion
-                    # Use OUTPUT utterance (not INPUT) because scores are indexed by output data
-                    output_utterance = output_item.get('utterance', '')
-                    gpt5_score = get_assertion_score(output_utterance, assertion.get('text', ''))
+                    # Get GPT-5 JJ score for this assertion (looked up by OUTPUT utterance in the bundle)
+                    gpt5_score = bundle["scores"].get(original_idx, {})
                     if gpt5_score:
                         gpt5_icon = "✅" if gpt5_score.get('passed', False) else "❌"
                     else:
@@ -1898,6 +2212,11 @@ An assertion is **automatically marked as judged** when you:
                         )
                         if new_revision != revision:
                             set_annotation(utterance_text, original_idx, revision=new_revision, original=assertion.get('text', ''))
+                        if new_revision:
+                            if st.button("🤖 Re-verify revision with GPT-5", key=f"reverify_{selected_index}_{original_idx}"):
+                                submit_verification(output_item.get('utterance', ''), {**assertion, "text": new_revision},
+                                                    output_item.get('response', ''))
+                            render_verification_status(output_item.get('utterance', ''), new_revision)
                         
                         # Collapse button to close this expander when done
                         if st.button("🔼 Done - Collapse", key=f"collapse_{selected_index}_{original_idx}", help="Close this assertion card"):
@@ -2063,8 +2382,8 @@ An assertion is **automatically marked as judged** when you:
                                 if is_source_id_format(assertion):
                                     st.markdown("**Source ID:**")
                                     
-                                    # Use the pre-built entity index (already built above)
-                                    entity_info = find_entity_by_source_id(source, entity_index)
+                                    # Use the sourceID resolved in the meeting bundle
+                                    entity_info = resolved_sources.get(source)
                                     
                                     if entity_info:
                                         entity_type, entity_idx, entity_data = entity_info
@@ -2108,13 +2427,13 @@ An assertion is **automatically marked as judged** when you:
                                                 render_user_card(entity_data)
                                                 st.caption(f"🔗 `{source}`")
                                             elif actual_entity_type == 'File':
-                                                render_file_card(entity_data, key_suffix=f"inline_{original_idx}")
+                                                render_file_card(entity_data, key_suffix=f"inline_{selected_index}_{original_idx}")
                                             elif actual_entity_type == 'Chat':
-                                                render_chat_card(entity_data, key_suffix=f"inline_{original_idx}")
+                                                render_chat_card(entity_data, key_suffix=f"inline_{selected_index}_{original_idx}")
                                             elif actual_entity_type == 'Email':
-                                                render_email_card(entity_data, key_suffix=f"inline_{original_idx}")
+                                                render_email_card(entity_data, key_suffix=f"inline_{selected_index}_{original_idx}")
                                             elif actual_entity_type in ['ChannelMessage', 'ChannelMessageReply']:
-                                                render_channel_message_card(entity_data, key_suffix=f"inline_{original_idx}")
+                                                render_channel_message_card(entity_data, key_suffix=f"inline_{selected_index}_{original_idx}")
                                             else:
                                                 # For other entity types, render a generic styled card
                                                 render_generic_card(entity_data)
@@ -2232,6 +2551,7 @@ An assertion is **automatically marked as judged** when you:
                             st.markdown(f"**Justification:** {new_assert['justification']['reason']}")
                         if new_assert.get('justification', {}).get('sourceID'):
                             st.markdown(f"**Source ID:** `{new_assert['justification']['sourceID']}`")
+                        render_verification_status(output_item.get('utterance', ''), new_assert.get('text', ''))
             
             # === ADD NEW ASSERTION FORM ===
             st.markdown("---")
@@ -2276,6 +2596,8 @@ An assertion is **automatically marked as judged** when you:
                             }
                         }
                         add_new_assertion(utterance_text, new_assertion_data)
+                        submit_verification(output_item.get('utterance', ''), new_assertion_data,
+                                            output_item.get('response', ''))
                         st.success("✅ New assertion added!")
                         st.rerun()
                     else:
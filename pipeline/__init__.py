@@ -21,6 +21,18 @@ Usage:
     python -m pipeline.plan_generation
     python -m pipeline.plan_evaluation
     python -m pipeline.report_generation
+    
+    # LLM call cost/latency breakdown of a run (see telemetry.py)
+    python -m pipeline.telemetry summarize docs/pipeline_runs/<run_id>
+    
+    # Near-duplicate assertion templates (see near_duplicates.py)
+    python -m pipeline.near_duplicates docs/ChinYew/Assertions_genv2_for_LOD1126part1.jsonl
+    
+    # Local-model-first routing (MIRA_ROUTING=on) and its calibration (see router.py)
+    python -m pipeline.router calibrate docs/pipeline_runs/<run_id>
+    
+    # Duplicate GPT-5 calls stuck past the observed p95 latency (see hedging.py)
+    python -m pipeline.run_pipeline --hedge --hedge-budget 0.05
 
 Author: Chin-Yew Lin
 Date: November 28, 2025
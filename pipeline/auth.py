@@ -0,0 +1,276 @@
+"""
+Substrate token provider.
+
+One provider per (client, tenant, resource) is shared by every caller in the
+process. It keeps the access token together with its expiry, is safe to call
+from many threads (one acquisition at a time, everyone else reuses it), and
+refreshes on a daemon thread shortly before expiry so long runs never stop to
+re-authenticate mid-stage.
+
+Token sources, in order:
+1. MIRA_SUBSTRATE_TOKEN        a bearer token (headless runs, CI)
+2. MIRA_SUBSTRATE_TOKEN_FILE   a file holding a token, either raw text or
+                               {"access_token": ..., "expires_on": <epoch>};
+                               re-read when it changes, so a sidecar can rotate it
+3. MSAL silent, from the persisted token cache (MIRA_MSAL_CACHE, default
+   ~/.mira/msal_token_cache.json) so a refresh token survives restarts
+4. MSAL interactive: the broker/browser on Windows, device code elsewhere.
+   MIRA_AUTH_NONINTERACTIVE=1 makes this an error instead of a prompt.
+
+Expiry comes from MSAL's expires_in, the file's expires_on, or the JWT exp claim.
+
+Usage:
+    from pipeline.auth import get_token_provider
+
+    provider = get_token_provider(CLIENT_ID, TENANT_ID, SUBSTRATE_RESOURCE)
+    token = provider.get_token()
+    provider.invalidate()   # after a 401
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+TOKEN_ENV = "MIRA_SUBSTRATE_TOKEN"
+TOKEN_FILE_ENV = "MIRA_SUBSTRATE_TOKEN_FILE"
+MSAL_CACHE_ENV = "MIRA_MSAL_CACHE"
+NONINTERACTIVE_ENV = "MIRA_AUTH_NONINTERACTIVE"
+
+DEFAULT_MSAL_CACHE = os.path.join(os.path.expanduser("~"), ".mira", "msal_token_cache.json")
+
+REFRESH_MARGIN = 300       # seconds before expiry to refresh
+RETRY_INTERVAL = 30        # seconds between failed background refreshes
+UNKNOWN_LIFETIME = 3600    # assumed lifetime when a token carries no expiry
+
+
+class AuthenticationError(Exception):
+    """No token could be acquired without user interaction."""
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """Expiry (epoch seconds) from a JWT's exp claim, or None if not a JWT."""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = parts[1] + "=" * (-len(parts[1]) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Provider
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class SubstrateTokenProvider:
+    """Thread-safe access token cache with expiry tracking and background refresh."""
+
+    def __init__(self, client_id: str, tenant_id: str, resource: str,
+                 cache_path: Optional[str] = None, refresh_margin: float = REFRESH_MARGIN):
+        self.client_id = client_id
+        self.tenant_id = tenant_id
+        self.scopes = [f"{resource}/.default"]
+        self.cache_path = cache_path or os.environ.get(MSAL_CACHE_ENV) or DEFAULT_MSAL_CACHE
+        self.refresh_margin = refresh_margin
+        self.token: Optional[str] = None
+        self.expires_on = 0.0
+        self.source: Optional[str] = None
+        self._lock = threading.Lock()
+        self._app = None
+        self._msal_cache = None
+        self._file_mtime: Optional[float] = None
+        self._refresher: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+
+    def _fresh(self) -> bool:
+        return self.token is not None and time.time() < self.expires_on - self.refresh_margin
+
+    def get_token(self) -> str:
+        """
+        A valid access token, acquiring one only if the cached one is near expiry.
+
+        Raises:
+            AuthenticationError: If interaction is needed but disabled
+            Exception: If authentication fails
+        """
+        # Read into locals: a concurrent invalidate() may clear self.token at any time
+        token = self.token
+        if token is not None and self._fresh() and not self._file_changed():
+            return token
+        with self._lock:
+            if not (self._fresh() and not self._file_changed()):
+                self._acquire(interactive=True)
+            token = self.token
+        self._start_refresher()
+        return token
+
+    def invalidate(self) -> None:
+        """Drop the in-memory token (e.g. after a 401); the next call re-acquires."""
+        with self._lock:
+            self.token = None
+            self.expires_on = 0.0
+
+    def _set(self, token: str, expires_on: Optional[float], source: str) -> None:
+        self.token = token
+        self.expires_on = expires_on or token_expiry(token) or time.time() + UNKNOWN_LIFETIME
+        self.source = source
+
+    # ── Sources ─────────────────────────────────────────────────────────────────
+
+    def _acquire(self, interactive: bool) -> None:
+        """Fill self.token from the first source that has one (caller holds the lock)."""
+        token = os.environ.get(TOKEN_ENV, "").strip()
+        if token:
+            self._set(token, None, "env")
+            return
+        if os.environ.get(TOKEN_FILE_ENV):
+            self._read_token_file()
+            return
+
+        result = self._acquire_silent()
+        if result is None:
+            if not interactive or os.environ.get(NONINTERACTIVE_ENV, "").strip() in ("1", "true", "on"):
+                raise AuthenticationError(
+                    f"No cached Substrate credentials; set {TOKEN_ENV} or {TOKEN_FILE_ENV}, "
+                    "or authenticate once interactively"
+                )
+            result = self._acquire_interactive()
+        self._save_msal_cache()
+        if "access_token" not in result:
+            raise Exception(f"Authentication failed: {result.get('error_description', result)}")
+        self._set(result["access_token"], time.time() + int(result.get("expires_in", UNKNOWN_LIFETIME)), "msal")
+
+    def _file_changed(self) -> bool:
+        path = os.environ.get(TOKEN_FILE_ENV)
+        if not path or self.source != "file":
+            return False
+        try:
+            return os.path.getmtime(path) != self._file_mtime
+        except OSError:
+            return False
+
+    def _read_token_file(self) -> None:
+        path = os.environ[TOKEN_FILE_ENV]
+        mtime = os.path.getmtime(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+        expires_on = None
+        if content.startswith("{"):
+            data = json.loads(content)
+            content = data["access_token"]
+            expires_on = data.get("expires_on")
+        if not content:
+            raise AuthenticationError(f"Token file is empty: {path}")
+        self._file_mtime = mtime
+        self._set(content, float(expires_on) if expires_on else None, "file")
+
+    def _get_app(self):
+        if self._app is None:
+            try:
+                import msal
+            except ImportError:
+                raise ImportError("msal[broker] not installed. Run: pip install msal[broker]")
+            self._msal_cache = msal.SerializableTokenCache()
+            if os.path.exists(self.cache_path):
+                try:
+                    with open(self.cache_path, 'r', encoding='utf-8') as f:
+                        self._msal_cache.deserialize(f.read())
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ Ignoring unreadable MSAL cache {self.cache_path}: {e}")
+            self._app = msal.PublicClientApplication(
+                self.client_id,
+                authority=f"https://login.microsoftonline.com/{self.tenant_id}",
+                enable_broker_on_windows=True,
+                token_cache=self._msal_cache,
+            )
+        return self._app
+
+    def _save_msal_cache(self) -> None:
+        """Persist MSAL's cache atomically (other workers may read it concurrently)."""
+        if self._msal_cache is None or not self._msal_cache.has_state_changed:
+            return
+        directory = os.path.dirname(self.cache_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".msal_cache_")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(self._msal_cache.serialize())
+        os.replace(tmp_path, self.cache_path)
+        self._msal_cache.has_state_changed = False
+
+    def _acquire_silent(self) -> Optional[Dict]:
+        app = self._get_app()
+        for account in app.get_accounts():
+            result = app.acquire_token_silent(self.scopes, account=account)
+            if result and "access_token" in result:
+                return result
+        return None
+
+    def _acquire_interactive(self) -> Dict:
+        app = self._get_app()
+        if sys.platform == "win32":
+            import ctypes
+            print("🔐 Authenticating with Microsoft (browser may open)...")
+            return app.acquire_token_interactive(
+                self.scopes,
+                parent_window_handle=ctypes.windll.kernel32.GetConsoleWindow(),
+            )
+        flow = app.initiate_device_flow(scopes=self.scopes)
+        if "user_code" not in flow:
+            raise Exception(f"Device code flow failed: {flow.get('error_description', flow)}")
+        print(f"🔐 {flow['message']}")
+        return app.acquire_token_by_device_flow(flow)
+
+    # ── Background refresh ──────────────────────────────────────────────────────
+
+    def _start_refresher(self) -> None:
+        if self._refresher is not None or self.source == "env":
+            return
+        with self._lock:
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._refresh_loop, daemon=True,
+                                                   name="substrate-token-refresh")
+                self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        """Re-acquire silently refresh_margin before expiry; never prompts."""
+        while True:
+            delay = self.expires_on - self.refresh_margin - time.time()
+            if delay > 0:
+                self._wake.wait(delay)
+                self._wake.clear()
+                continue
+            try:
+                with self._lock:
+                    if not self._fresh():
+                        self._acquire(interactive=False)
+                if self._fresh():
+                    continue
+            except Exception as e:
+                print(f"⚠️ Background token refresh failed ({e}); retrying in {RETRY_INTERVAL}s")
+            # Failed, or the source only has a token close to expiry (e.g. a file
+            # not yet rotated): try again later instead of spinning
+            self._wake.wait(RETRY_INTERVAL)
+            self._wake.clear()
+
+
+_providers: Dict[Tuple[str, str, str], SubstrateTokenProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_token_provider(client_id: str, tenant_id: str, resource: str) -> SubstrateTokenProvider:
+    """Process-wide provider for a client/tenant/resource."""
+    key = (client_id, tenant_id, resource)
+    with _providers_lock:
+        if key not in _providers:
+            _providers[key] = SubstrateTokenProvider(client_id, tenant_id, resource)
+        return _providers[key]
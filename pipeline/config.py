@@ -12,12 +12,15 @@ This module provides:
 import os
 import json
 import time
-import ctypes
 import uuid
 from dataclasses import dataclass, field, asdict
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from .auth import get_token_provider
+from .hedging import hedged_request
+from .telemetry import track_call
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # API Configuration
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -32,8 +35,15 @@ JJ_MODEL = "dev-gpt-5-chat-jj"
 DELAY_BETWEEN_CALLS = 2  # seconds
 MAX_RETRIES = 3
 
-# Global token cache
-_jj_token_cache = None
+# Local Ollama server (used by compute_assertion_matches.py and the router)
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://192.168.2.163:11434")
+OLLAMA_MODEL = "gpt-oss:20b"
+
+# Offline mock server (tools/mock_llm_server.py). When MIRA_LLM_MOCK_URL is set
+# (e.g. http://127.0.0.1:8765), every call_*_api helper talks to the local
+# stand-in instead of Substrate/Ollama and MSAL authentication is skipped.
+MOCK_LLM_URL_ENV = "MIRA_LLM_MOCK_URL"
+MOCK_LLM_TOKEN = "mock-token"
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -449,55 +459,47 @@ def calculate_weighted_score(results: List[AssertionResult]) -> float:
     return round(total_weighted / max_possible, 3) if max_possible > 0 else 0.0
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# Endpoint Resolution (real service or offline mock)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def get_mock_llm_url() -> Optional[str]:
+    """Get the mock LLM server base URL from the environment, or None."""
+    url = os.environ.get(MOCK_LLM_URL_ENV, "").strip()
+    return url.rstrip("/") or None
+
+
+def resolve_substrate_endpoint(endpoint: str = SUBSTRATE_ENDPOINT) -> str:
+    """Return the chat completions URL to call (mock server if configured)."""
+    mock_url = get_mock_llm_url()
+    return f"{mock_url}/chat/completions" if mock_url else endpoint
+
+
+def resolve_ollama_url(path: str = "/api/generate") -> str:
+    """Return the Ollama API URL to call (mock server if configured)."""
+    base = get_mock_llm_url() or OLLAMA_HOST.rstrip("/")
+    return f"{base}{path}"
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Authentication
 # ═══════════════════════════════════════════════════════════════════════════════
 
 def get_substrate_token() -> str:
-    """Get authentication token for Substrate API using MSAL broker."""
-    global _jj_token_cache
-    
-    if _jj_token_cache:
-        return _jj_token_cache
-    
-    try:
-        import msal
-    except ImportError:
-        print("Error: msal[broker] not installed. Run: pip install msal[broker]")
-        raise
-    
-    app = msal.PublicClientApplication(
-        CLIENT_ID,
-        authority=f"https://login.microsoftonline.com/{TENANT_ID}",
-        enable_broker_on_windows=True,
-    )
-    
-    scopes = [f"{SUBSTRATE_RESOURCE}/.default"]
-    
-    # Try silent auth first
-    accounts = app.get_accounts()
-    if accounts:
-        result = app.acquire_token_silent(scopes, account=accounts[0])
-        if result and "access_token" in result:
-            _jj_token_cache = result["access_token"]
-            return _jj_token_cache
-    
-    # Fall back to interactive
-    print("🔐 Authenticating with Microsoft (browser may open)...")
-    
-    kernel32 = ctypes.windll.kernel32
-    hwnd = kernel32.GetConsoleWindow()
-    
-    result = app.acquire_token_interactive(
-        scopes,
-        parent_window_handle=hwnd,
-    )
-    
-    if "access_token" in result:
-        _jj_token_cache = result["access_token"]
-        return _jj_token_cache
-    else:
-        raise Exception(f"Authentication failed: {result.get('error_description', result)}")
+    """
+    Get authentication token for Substrate API.
+    
+    Served by the shared token provider (pipeline/auth.py): env/file tokens for
+    headless runs, else MSAL with a persisted cache, refreshed before expiry.
+    """
+    if get_mock_llm_url():
+        return MOCK_LLM_TOKEN
+    return get_token_provider(CLIENT_ID, TENANT_ID, SUBSTRATE_RESOURCE).get_token()
+
+
+def clear_token_cache():
+    """Drop the cached token (e.g. after a 401); the next call re-acquires."""
+    get_token_provider(CLIENT_ID, TENANT_ID, SUBSTRATE_RESOURCE).invalidate()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -546,30 +548,86 @@ def call_gpt5_api(
         "max_tokens": max_tokens
     }
     
-    for attempt in range(max_retries):
-        try:
-            response = requests.post(
-                SUBSTRATE_ENDPOINT,
-                headers=headers,
-                json=payload,
-                timeout=120
-            )
+    with track_call("substrate", model=JJ_MODEL, prompt=prompt, system_prompt=system_prompt) as call:
+        for attempt in range(max_retries):
+            call.attempt()
+            try:
+                response = hedged_request(
+                    lambda: requests.post(
+                        resolve_substrate_endpoint(),
+                        headers=headers,
+                        json=payload,
+                        timeout=120
+                    ),
+                    key=JJ_MODEL,
+                    call=call
+                )
             
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
-            elif response.status_code == 429:
-                wait_time = (attempt + 1) * 10
-                print(f"  ⏳ Rate limited, waiting {wait_time}s...")
-                time.sleep(wait_time)
-            else:
-                raise Exception(f"GPT-5 API error {response.status_code}: {response.text[:200]}")
+                if response.status_code == 200:
+                    result = response.json()
+                    text = result["choices"][0]["message"]["content"]
+                    call.usage(result.get("usage"), completion=text)
+                    return text
+                elif response.status_code == 401 and attempt + 1 < max_retries:
+                    clear_token_cache()
+                    headers["Authorization"] = f"Bearer {get_substrate_token()}"
+                elif response.status_code == 429:
+                    call.rate_limited()
+                    wait_time = (attempt + 1) * 10
+                    print(f"  ⏳ Rate limited, waiting {wait_time}s...")
+                    time.sleep(wait_time)
+                else:
+                    raise Exception(f"GPT-5 API error {response.status_code}: {response.text[:200]}")
                 
-        except requests.exceptions.Timeout:
-            print(f"  ⏳ Request timeout, retrying...")
-            time.sleep(5)
+            except requests.exceptions.Timeout:
+                print(f"  ⏳ Request timeout, retrying...")
+                time.sleep(5)
     
-    raise Exception(f"GPT-5 API failed after {max_retries} retries")
+        raise Exception(f"GPT-5 API failed after {max_retries} retries")
+
+
+def call_ollama_api(
+    prompt: str,
+    model: str = OLLAMA_MODEL,
+    system_prompt: str = None,
+    temperature: float = 0.1,
+    max_tokens: int = 2000,
+    timeout: int = 60
+) -> str:
+    """
+    Call the local Ollama server (non-streaming /api/generate).
+    
+    Args:
+        prompt: User prompt
+        model: Ollama model name
+        system_prompt: Optional system prompt
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens in response
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Response text from the model
+    """
+    import requests
+    
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": False,
+        "options": {"temperature": temperature, "num_predict": max_tokens},
+    }
+    if system_prompt:
+        payload["system"] = system_prompt
+    
+    with track_call("ollama", model=model, prompt=prompt, system_prompt=system_prompt) as call:
+        call.attempt()
+        response = requests.post(resolve_ollama_url(), json=payload, timeout=timeout)
+        if response.status_code != 200:
+            raise Exception(f"Ollama API error {response.status_code}: {response.text[:200]}")
+        result = response.json()
+        text = result.get("response", "")
+        call.usage(result, completion=text)
+        return text
 
 
 def extract_json_from_response(response: str) -> Dict:
@@ -0,0 +1,302 @@
+"""
+Pre-flight cost and duration estimates for batch LLM runs.
+
+Scripts with a --plan (alias --dry-run-estimate) flag walk their inputs, build
+every prompt they would send, and feed them to a RunEstimate instead of the API.
+Tokens are counted locally (tiktoken if installed, else ~4 chars/token); the
+completion size, latency and prompt-cache hit rate of each stage come from
+prior telemetry (see telemetry.py) when available, with conservative defaults
+otherwise. Work already covered by a checkpoint is reported as skipped.
+
+Environment:
+    MIRA_TELEMETRY_DIR     Telemetry of earlier runs to calibrate against
+    MIRA_QUOTA_TPM         Token-per-minute quota of the endpoint (optional)
+    MIRA_QUOTA_RPM         Request-per-minute quota of the endpoint (optional)
+    MIRA_PROMPT_PRICE      Price per 1M prompt tokens (optional)
+    MIRA_COMPLETION_PRICE  Price per 1M completion tokens (optional)
+
+Usage:
+    estimate = RunEstimate("evaluate_kening_gpt5", concurrency=1)
+    for prompt in prompts:
+        estimate.add_call("evaluate_kening_gpt5", prompt, system_prompt=SYSTEM_PROMPT, max_tokens=4000)
+        estimate.add_delay(DELAY_BETWEEN_CALLS)
+    estimate.print_plan()
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+from .telemetry import CHARS_PER_TOKEN, TELEMETRY_DIR_ENV, load_events
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+QUOTA_TPM_ENV = "MIRA_QUOTA_TPM"
+QUOTA_RPM_ENV = "MIRA_QUOTA_RPM"
+PROMPT_PRICE_ENV = "MIRA_PROMPT_PRICE"
+COMPLETION_PRICE_ENV = "MIRA_COMPLETION_PRICE"
+
+# Defaults when no telemetry exists for a stage
+DEFAULT_COMPLETION_TOKENS = 600      # typical JSON verdict / classification
+DEFAULT_COMPLETION_FRACTION = 0.5    # share of max_tokens used when max_tokens is given
+DEFAULT_CALL_OVERHEAD_S = 2.0        # queueing + time to first token
+DEFAULT_OUTPUT_TOKENS_PER_S = 40.0   # GPT-5 decode speed
+MESSAGE_OVERHEAD_TOKENS = 4          # chat-format tokens per message
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.environ.get(name)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Token Counting
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _get_encoding():
+    """tiktoken's o200k_base encoding, or None if tiktoken is unavailable."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            # Not installed, or the encoding file cannot be fetched offline
+            _encoding = None
+    return _encoding
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """Count tokens locally (exact with tiktoken, ~chars/4 otherwise)."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // CHARS_PER_TOKEN
+
+
+def token_counter_name() -> str:
+    return "tiktoken o200k_base" if _get_encoding() is not None else f"~{CHARS_PER_TOKEN} chars/token"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Calibration From Prior Telemetry
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class CallHistory:
+    """Per-stage averages observed in earlier runs' telemetry."""
+
+    def __init__(self, events: Optional[List[Dict]] = None, source: Optional[str] = None):
+        self.source = source
+        self.stages: Dict[str, Dict[str, float]] = {}
+        groups: Dict[str, List[Dict]] = {}
+        for e in events or []:
+            if e.get("status") == "ok" and not e.get("cache_hit"):
+                groups.setdefault(e.get("stage") or "-", []).append(e)
+        for stage, items in groups.items():
+            n = len(items)
+            prompt = sum(e.get("prompt_tokens", 0) for e in items)
+            self.stages[stage] = {
+                "calls": n,
+                "prompt_tokens": prompt / n,
+                "completion_tokens": sum(e.get("completion_tokens", 0) for e in items) / n,
+                "latency_s": sum(e.get("latency_ms", 0) for e in items) / n / 1000,
+                "cached_ratio": sum(e.get("cached_tokens", 0) for e in items) / prompt if prompt else 0.0,
+                "rate_limited": sum(e.get("rate_limited", 0) for e in items) / n,
+            }
+
+    def get(self, stage: str, field: str) -> Optional[float]:
+        return self.stages.get(stage, {}).get(field)
+
+    def call_ratio(self, stage: str, per_stage: str, default: float = 1.0) -> float:
+        """Observed calls of `stage` per call of `per_stage` (e.g. optional sub-steps)."""
+        calls = self.get(stage, "calls")
+        base = self.get(per_stage, "calls")
+        if calls is None or not base:
+            return default
+        return min(1.0, calls / base)
+
+
+def load_history(path: Optional[str] = None) -> CallHistory:
+    """
+    Load calibration data from a telemetry file or directory.
+
+    Args:
+        path: llm_calls.jsonl or a directory containing them
+              (default: $MIRA_TELEMETRY_DIR)
+    """
+    path = path or os.environ.get(TELEMETRY_DIR_ENV)
+    if not path or not os.path.exists(path):
+        return CallHistory()
+    return CallHistory(load_events(path), source=path)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Run Estimate
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class RunEstimate:
+    """Accumulates the calls a run would make and projects its cost and duration."""
+
+    def __init__(self, title: str, concurrency: int = 1, history: Optional[CallHistory] = None):
+        self.title = title
+        self.concurrency = max(1, concurrency)
+        self.history = history if history is not None else load_history()
+        self.units: Dict[str, int] = {}
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.delay_s = 0.0
+
+    def _stage(self, stage: str) -> Dict[str, float]:
+        return self.stages.setdefault(stage, {
+            "calls": 0.0, "prompt_tokens": 0.0, "completion_tokens": 0.0,
+            "cached_tokens": 0.0, "latency_s": 0.0, "skipped_calls": 0.0,
+        })
+
+    def add_units(self, name: str, count: int = 1) -> None:
+        """Count work items (meetings, assertions) for the per-unit figures."""
+        self.units[name] = self.units.get(name, 0) + count
+
+    def add_call(
+        self,
+        stage: str,
+        prompt: str = "",
+        system_prompt: str = "",
+        max_tokens: Optional[int] = None,
+        weight: float = 1.0,
+        partial_prompt: bool = False
+    ) -> None:
+        """
+        Add one LLM call the run would make.
+
+        Args:
+            stage: Telemetry stage the call is attributed to
+            prompt: User prompt exactly as it would be sent
+            system_prompt: System prompt
+            max_tokens: Completion cap passed to the API, if any
+            weight: Expected number of such calls (< 1 for conditional steps)
+            partial_prompt: The prompt is only the static part (variable slots
+                depend on earlier responses); prior telemetry may raise it
+        """
+        prompt_tokens = count_tokens(prompt) + count_tokens(system_prompt) + 2 * MESSAGE_OVERHEAD_TOKENS
+        observed_prompt = self.history.get(stage, "prompt_tokens")
+        if partial_prompt and observed_prompt:
+            prompt_tokens = max(prompt_tokens, observed_prompt)
+
+        completion = self.history.get(stage, "completion_tokens")
+        if completion is None:
+            completion = max_tokens * DEFAULT_COMPLETION_FRACTION if max_tokens else DEFAULT_COMPLETION_TOKENS
+        if max_tokens:
+            completion = min(completion, max_tokens)
+
+        latency = self.history.get(stage, "latency_s")
+        if latency is None:
+            latency = DEFAULT_CALL_OVERHEAD_S + completion / DEFAULT_OUTPUT_TOKENS_PER_S
+
+        s = self._stage(stage)
+        s["calls"] += weight
+        s["prompt_tokens"] += weight * prompt_tokens
+        s["completion_tokens"] += weight * completion
+        s["cached_tokens"] += weight * prompt_tokens * (self.history.get(stage, "cached_ratio") or 0.0)
+        s["latency_s"] += weight * latency
+
+    def add_skipped(self, stage: str, calls: float = 1) -> None:
+        """Record calls a prior run already completed (checkpoint/resume)."""
+        self._stage(stage)["skipped_calls"] += calls
+
+    def add_delay(self, seconds: float) -> None:
+        """Add pacing sleep on a worker's critical path (e.g. DELAY_BETWEEN_CALLS)."""
+        self.delay_s += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Projected totals, per-stage breakdown and quota usage."""
+        calls = sum(s["calls"] for s in self.stages.values())
+        prompt = sum(s["prompt_tokens"] for s in self.stages.values())
+        completion = sum(s["completion_tokens"] for s in self.stages.values())
+        cached = sum(s["cached_tokens"] for s in self.stages.values())
+        latency = sum(s["latency_s"] for s in self.stages.values())
+
+        # Concurrency-bound duration, then quota-bound if a quota is configured
+        wall_s = (latency + self.delay_s) / self.concurrency
+        tpm, rpm = _env_float(QUOTA_TPM_ENV), _env_float(QUOTA_RPM_ENV)
+        quota = {}
+        minutes = wall_s / 60 if wall_s else 0
+        if tpm:
+            quota["tpm_limit"] = tpm
+            quota["tpm_usage_pct"] = round((prompt + completion) / minutes / tpm * 100, 1) if minutes else 0.0
+            wall_s = max(wall_s, (prompt + completion) / tpm * 60)
+        if rpm:
+            quota["rpm_limit"] = rpm
+            quota["rpm_usage_pct"] = round(calls / minutes / rpm * 100, 1) if minutes else 0.0
+            wall_s = max(wall_s, calls / rpm * 60)
+
+        prompt_price = _env_float(PROMPT_PRICE_ENV) or 0.0
+        completion_price = _env_float(COMPLETION_PRICE_ENV) or 0.0
+        return {
+            "title": self.title,
+            "concurrency": self.concurrency,
+            "token_counter": token_counter_name(),
+            "calibration": self.history.source,
+            "units": dict(self.units),
+            "calls": round(calls),
+            "skipped_calls": round(sum(s["skipped_calls"] for s in self.stages.values())),
+            "prompt_tokens": round(prompt),
+            "completion_tokens": round(completion),
+            "cached_tokens": round(cached),
+            "pacing_delay_s": round(self.delay_s, 1),
+            "wall_clock_s": round(wall_s, 1),
+            "quota": quota,
+            "cost": round((prompt * prompt_price + completion * completion_price) / 1_000_000, 2)
+                    if prompt_price or completion_price else None,
+            "stages": {
+                name: {k: round(v, 1) for k, v in s.items()}
+                for name, s in self.stages.items()
+            },
+        }
+
+    def print_plan(self) -> None:
+        """Print the projection as a table."""
+        plan = self.to_dict()
+        print("=" * 70)
+        print(f"📋 RUN PLAN: {plan['title']} (nothing will be sent)")
+        print("=" * 70)
+        for name, count in plan["units"].items():
+            print(f"  {name.capitalize():<18} {count:,}")
+        print(f"  {'Concurrency':<18} {plan['concurrency']}")
+        print(f"  {'Token counter':<18} {plan['token_counter']}")
+        print(f"  {'Calibration':<18} {plan['calibration'] or 'defaults (no prior telemetry)'}")
+        print()
+        header = f"  {'Stage':<34}{'Calls':>8}{'Skipped':>9}{'Prompt tok':>12}{'Compl tok':>11}{'Cached':>10}"
+        print(header)
+        print("  " + "─" * (len(header) - 2))
+        for name, s in plan["stages"].items():
+            print(f"  {name[:33]:<34}{s['calls']:>8,.0f}{s['skipped_calls']:>9,.0f}{s['prompt_tokens']:>12,.0f}"
+                  f"{s['completion_tokens']:>11,.0f}{s['cached_tokens']:>10,.0f}")
+        print()
+        print(f"  Projected calls:        {plan['calls']:,} ({plan['skipped_calls']:,} already done by a prior run)")
+        print(f"  Projected tokens:       {plan['prompt_tokens']:,} prompt + {plan['completion_tokens']:,} completion"
+              f" ({plan['cached_tokens']:,} prompt tokens expected from cache)")
+        for name, count in plan["units"].items():
+            if count:
+                label = f"Per {name.rstrip('s')}:"
+                print(f"  {label:<24}{plan['calls'] / count:.2f} calls, "
+                      f"{(plan['prompt_tokens'] + plan['completion_tokens']) / count:,.0f} tokens")
+        quota = plan["quota"]
+        if quota.get("tpm_limit"):
+            print(f"  Token quota usage:      {quota['tpm_usage_pct']}% of {quota['tpm_limit']:,.0f} TPM")
+        if quota.get("rpm_limit"):
+            print(f"  Request quota usage:    {quota['rpm_usage_pct']}% of {quota['rpm_limit']:,.0f} RPM")
+        if plan["cost"] is not None:
+            print(f"  Projected cost:         ${plan['cost']:,.2f}")
+        hours = plan["wall_clock_s"] / 3600
+        print(f"  Projected wall clock:   {plan['wall_clock_s']:,.0f}s ({hours:.1f}h), "
+              f"incl. {plan['pacing_delay_s']:,.0f}s pacing delays")
+        print("=" * 70)
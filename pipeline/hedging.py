@@ -0,0 +1,261 @@
+"""
+Hedged HTTP requests for slow LLM calls.
+
+A few stuck GPT-5 calls dominate batch makespan (each may wait up to the 120s
+timeout). With hedging on, an attempt that has not returned after the observed
+p95 latency gets a duplicate, and whichever succeeds first is used: an error or
+non-2xx response (a fast 429) does not beat an attempt still in flight. The
+loser keeps running in a daemon thread; its answer is discarded, but its token
+usage is recorded as a separate telemetry event (hedge_duplicate).
+
+Extra spend is capped per run: at most MIRA_HEDGE_BUDGET duplicates per call
+made (and MIRA_HEDGE_MAX in total, if set). No hedges are sent until enough
+latencies have been observed for a meaningful p95.
+
+Environment:
+    MIRA_HEDGE          "on" to enable (default off)
+    MIRA_HEDGE_BUDGET   Max duplicates as a fraction of calls (default 0.05)
+    MIRA_HEDGE_MAX      Max duplicates per run (optional)
+
+Usage:
+    response = hedged_request(
+        lambda: session.post(url, headers=headers, json=payload, timeout=120),
+        key=JJ_MODEL, call=call,
+    )
+
+    python -m pipeline.run_pipeline --hedge
+    python convert_kening_assertions_v2.py --hedge
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+HEDGE_ENV = "MIRA_HEDGE"
+HEDGE_BUDGET_ENV = "MIRA_HEDGE_BUDGET"
+HEDGE_MAX_ENV = "MIRA_HEDGE_MAX"
+
+DEFAULT_BUDGET = 0.05     # duplicates per call
+HEDGE_QUANTILE = 0.95
+MIN_SAMPLES = 20          # observed latencies before the first hedge
+LATENCY_WINDOW = 200      # most recent latencies per key
+MIN_HEDGE_DELAY = 1.0     # seconds; never hedge faster than this
+
+_lock = threading.Lock()
+_enabled: Optional[bool] = None
+_budget = DEFAULT_BUDGET
+_max_hedges: Optional[int] = None
+_latencies: Dict[str, Deque[float]] = {}
+_stats = {"calls": 0, "hedges": 0, "hedge_wins": 0}
+
+
+def _load_env() -> None:
+    global _enabled, _budget, _max_hedges
+    if _enabled is not None:
+        return
+    with _lock:
+        if _enabled is not None:
+            return
+        _budget = float(os.environ.get(HEDGE_BUDGET_ENV) or DEFAULT_BUDGET)
+        max_hedges = os.environ.get(HEDGE_MAX_ENV)
+        _max_hedges = int(max_hedges) if max_hedges else None
+        _enabled = os.environ.get(HEDGE_ENV, "").strip().lower() in ("on", "1", "true")
+
+
+def configure(enabled: Optional[bool] = None, budget: Optional[float] = None,
+              max_hedges: Optional[int] = None) -> None:
+    """
+    Override the environment settings (None leaves a setting unchanged).
+
+    Args:
+        enabled: Turn hedging on or off
+        budget: Max duplicates as a fraction of calls
+        max_hedges: Max duplicates per run
+    """
+    global _enabled, _budget, _max_hedges
+    _load_env()
+    with _lock:
+        if enabled is not None:
+            _enabled = enabled
+        if budget is not None:
+            _budget = budget
+        if max_hedges is not None:
+            _max_hedges = max_hedges
+
+
+def is_enabled() -> bool:
+    _load_env()
+    return bool(_enabled)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Latency Tracking and Budget
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def observe(key: str, latency_s: float) -> None:
+    """Record the latency of a completed attempt."""
+    with _lock:
+        _latencies.setdefault(key, deque(maxlen=LATENCY_WINDOW)).append(latency_s)
+
+
+def hedge_delay(key: str) -> Optional[float]:
+    """Seconds to wait before hedging (observed p95), or None until MIN_SAMPLES are seen."""
+    with _lock:
+        samples = sorted(_latencies.get(key, ()))
+    if len(samples) < MIN_SAMPLES:
+        return None
+    index = min(len(samples) - 1, int(HEDGE_QUANTILE * len(samples)))
+    return max(MIN_HEDGE_DELAY, samples[index])
+
+
+def _take_hedge() -> bool:
+    """Spend one duplicate from the run's budget, if any is left."""
+    with _lock:
+        if _stats["hedges"] + 1 > _budget * _stats["calls"]:
+            return False
+        if _max_hedges is not None and _stats["hedges"] >= _max_hedges:
+            return False
+        _stats["hedges"] += 1
+        return True
+
+
+def get_stats() -> Dict[str, Any]:
+    """Calls, duplicates sent and duplicates that answered first in this run."""
+    with _lock:
+        stats = dict(_stats)
+        keys = list(_latencies)
+    delays = {key: hedge_delay(key) for key in keys}
+    stats["hedge_delay_s"] = {key: round(d, 2) if d is not None else None for key, d in delays.items()}
+    return stats
+
+
+def reset() -> None:
+    """Forget latencies and spent budget (start of a new run)."""
+    with _lock:
+        _latencies.clear()
+        _stats.update(calls=0, hedges=0, hedge_wins=0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Hedged Request
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _start(send: Callable[[], T], key: str) -> Future:
+    """Run send() on a daemon thread (a stuck loser must not block exit)."""
+    future: Future = Future()
+    start = future.started_at = time.time()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = send()
+        except BaseException as e:
+            future.set_exception(e)
+            return
+        observe(key, time.time() - start)
+        future.set_result(result)
+
+    threading.Thread(target=run, daemon=True, name=f"hedge-{key}").start()
+    return future
+
+
+def _succeeded(response: Any) -> bool:
+    """False for an HTTP response with a non-2xx status."""
+    status = getattr(response, "status_code", None)
+    return status is None or 200 <= status < 300
+
+
+def _record_discarded(future: Future, call: Any) -> None:
+    """Once a losing attempt finishes, record its token usage as its own telemetry event."""
+    from .telemetry import LLMCall, get_context, record_event, telemetry_context
+
+    context = get_context()  # The callback runs on the loser's thread
+
+    def record(done: Future) -> None:
+        if done.cancelled() or done.exception() is not None or not _succeeded(done.result()):
+            return
+        try:
+            data = done.result().json()
+        except (AttributeError, ValueError):
+            return
+        duplicate = LLMCall(call.api, call.model, None)
+        duplicate.start = done.started_at
+        duplicate.prompt_chars = call.prompt_chars
+        duplicate.attempt()
+        duplicate.usage(data.get("usage", data) if isinstance(data, dict) else None)
+        duplicate.set(hedge_duplicate=True)
+        with telemetry_context(**context):
+            record_event(duplicate.to_event())
+
+    future.add_done_callback(record)
+
+
+def hedged_request(send: Callable[[], T], key: str = "default", call: Any = None) -> T:
+    """
+    Run one HTTP attempt, duplicating it if it outlives the observed p95.
+
+    Args:
+        send: Makes the request and returns the response (must be thread-safe)
+        key: Latency pool (e.g. the model name)
+        call: Optional telemetry LLMCall; gets hedged/hedge_won fields, and the
+              discarded attempt's usage is recorded as a separate event
+
+    Returns:
+        The first successful (2xx) response; if neither attempt succeeds, the
+        first failed response to arrive
+
+    Raises:
+        Whatever send() raised, when every attempt failed
+    """
+    if not is_enabled():
+        return send()
+
+    with _lock:
+        _stats["calls"] += 1
+    delay = hedge_delay(key)
+    if delay is None:
+        start = time.time()
+        result = send()
+        observe(key, time.time() - start)
+        return result
+
+    primary = _start(send, key)
+    done, _ = wait([primary], timeout=delay)
+    if done or not _take_hedge():
+        return primary.result()
+
+    if call is not None:
+        call.set(hedged=True, hedge_won=False)
+    hedge = _start(send, key)
+    pending = {primary, hedge}
+    failed_response: Optional[Future] = None
+    first_error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is None and _succeeded(future.result()):
+                if future is hedge:
+                    with _lock:
+                        _stats["hedge_wins"] += 1
+                if call is not None:
+                    call.set(hedge_won=future is hedge)
+                    _record_discarded(primary if future is hedge else hedge, call)
+                return future.result()
+            if error is None:
+                failed_response = failed_response or future
+            else:
+                first_error = first_error or error
+    if failed_response is not None:
+        return failed_response.result()
+    raise first_error
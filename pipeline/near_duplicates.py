@@ -0,0 +1,295 @@
+"""
+Near-duplicate clustering of assertions (shingling + MinHash + LSH).
+
+Many assertions differ only in meeting-specific slot values ("...the meeting is
+on July 26" vs "...on August 3"). Clustering them by template lets conversion
+and classification run once per cluster representative, with only slot
+extraction per member, so LLM calls scale with distinct templates rather than
+raw assertion count.
+
+Pipeline (all NumPy-vectorized):
+1. Normalize: mask slot-like values (proper names, quoted titles, numbers,
+   times, time zones, months/weekdays) and lowercase, so instances of one
+   template look alike
+2. Shingle: word 3-grams, hashed to 32 bits
+3. MinHash: num_perm universal hashes (a*x + b) mod p, min-reduced per text
+4. LSH: bands of rows bucket candidates; pairs are kept when their estimated
+   Jaccard similarity reaches the threshold, then merged with union-find
+
+Usage:
+    clusters = cluster_near_duplicates(texts, threshold=0.8)
+    representative = representative_map(clusters)   # index -> representative index
+
+    # Report clusters of assertion files (JSONL meetings with "assertions", or plain text)
+    python -m pipeline.near_duplicates docs/ChinYew/Assertions_genv2_for_LOD1126part1.jsonl
+    python -m pipeline.near_duplicates docs/*.jsonl --threshold 0.7 --top 20 --json clusters.json
+"""
+
+import re
+import sys
+import json
+import zlib
+import argparse
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DEFAULT_THRESHOLD = 0.8   # estimated Jaccard similarity to merge two assertions
+DEFAULT_NUM_PERM = 128    # MinHash permutations (signature length)
+SHINGLE_SIZE = 3          # words per shingle
+HASH_PRIME = 4294967311   # smallest prime above 2^32; a*x + b stays below 2^64
+CHUNK_SHINGLES = 1 << 18  # shingles per vectorized MinHash block (bounds memory)
+
+_MONTHS = r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|" \
+          r"sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+_WEEKDAYS = r"(?:mon|tues|wednes|thurs|fri|satur|sun)day"
+_TIMEZONES = r"utc|gmt|[pmce][sd]t|ist|cest|cet|bst|aest|jst"
+
+# Proper names (capitalized word runs after the first word), masked before lowercasing
+_NAME_PATTERN = re.compile(r"(?<=\w[ ,])(?:[A-Z][\w&.-]*)(?:\s+(?:[A-Z][\w&.-]*|of|and|&|for))*(?:\s+[A-Z][\w&.-]*)?")
+
+# Applied in order; each replaces a slot value with a placeholder token
+_SLOT_PATTERNS = [
+    (re.compile(r"['\"‘’“”][^'\"‘’“”]{2,80}['\"‘’“”]"), " <quoted> "),
+    (re.compile(rf"\b(?:{_TIMEZONES})\b"), " <tz> "),
+    (re.compile(r"\b\d{1,2}:\d{2}\s*(?:am|pm)?\b|\b\d{1,2}\s*(?:am|pm)\b"), " <time> "),
+    (re.compile(rf"\b(?:{_MONTHS})\b\.?"), " <month> "),
+    (re.compile(rf"\b{_WEEKDAYS}\b"), " <weekday> "),
+    (re.compile(r"\b\d+(?:[.,/-]\d+)*(?:st|nd|rd|th)?\b"), " <num> "),
+]
+_WORD_PATTERN = re.compile(r"<\w+>|[a-z]+")
+
+
+def normalize_template(text: str) -> List[str]:
+    """Lowercased words with slot-like values masked."""
+    text = _NAME_PATTERN.sub(" <name> ", text or "").lower()
+    for pattern, placeholder in _SLOT_PATTERNS:
+        text = pattern.sub(placeholder, text)
+    return _WORD_PATTERN.findall(text)
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Unique 32-bit hashes of the word shingles of a normalized assertion."""
+    words = normalize_template(text)
+    if len(words) < size:
+        shingles = [" ".join(words)] if words else [""]
+    else:
+        shingles = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return np.unique(np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles),
+                                 dtype=np.uint64, count=len(shingles)))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# MinHash + LSH
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def minhash_signatures(texts: List[str], num_perm: int = DEFAULT_NUM_PERM, seed: int = 1) -> np.ndarray:
+    """
+    MinHash signatures for all texts.
+
+    Returns:
+        (len(texts), num_perm) uint64 array
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)[:, None]
+    b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)[:, None]
+
+    shingles = [shingle_hashes(text) for text in texts]
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    start = 0
+    while start < len(texts):
+        # Block of texts whose shingles fit in one (num_perm, n) matrix
+        end, size = start, 0
+        while end < len(texts) and (end == start or size + len(shingles[end]) <= CHUNK_SHINGLES):
+            size += len(shingles[end])
+            end += 1
+        block = np.concatenate(shingles[start:end])
+        offsets = np.cumsum([0] + [len(s) for s in shingles[start:end - 1]])
+        hashed = (a * block[None, :] + b) % np.uint64(HASH_PRIME)
+        signatures[start:end] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        start = end
+    return signatures
+
+
+def choose_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    (bands, rows) whose S-curve step (1/bands)^(1/rows) lies closest to threshold.
+
+    Candidates are confirmed against the threshold afterwards, so a slightly
+    low step only costs extra comparisons.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        step = (1.0 / bands) ** (1.0 / rows)
+        # Prefer steps at or below the threshold (recall first)
+        score = abs(step - threshold) + (0.05 if step > threshold else 0.0)
+        if best is None or score < best[0]:
+            best = (score, bands, rows)
+    return best[1], best[2]
+
+
+def candidate_pairs(signatures: np.ndarray, bands: int, rows: int) -> np.ndarray:
+    """
+    Index pairs (i < j) sharing at least one LSH band bucket.
+
+    Returns:
+        (n_pairs, 2) int64 array, unique
+    """
+    n = len(signatures)
+    pairs = []
+    for band in range(bands):
+        chunk = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = chunk.view(np.dtype((np.void, chunk.dtype.itemsize * rows))).ravel()
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        for bucket in np.split(order, boundaries):
+            if len(bucket) > 1:
+                # Star pairs to the first member are enough for union-find
+                pairs.append(np.stack([np.full(len(bucket) - 1, bucket[0]), bucket[1:]], axis=1))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    return np.unique(pairs, axis=0) if n else pairs
+
+
+def _find(parent: np.ndarray, i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_near_duplicates(texts: List[str], threshold: float = DEFAULT_THRESHOLD,
+                            num_perm: int = DEFAULT_NUM_PERM, seed: int = 1) -> List[List[int]]:
+    """
+    Group texts whose slot-masked shingles are near-duplicates.
+
+    Args:
+        texts: Assertion texts
+        threshold: Estimated Jaccard similarity required to merge two texts
+        num_perm: MinHash signature length (more = more accurate, slower)
+        seed: Hash family seed (fixed for reproducible clusters)
+
+    Returns:
+        Clusters as lists of indices into texts, each sorted ascending; the
+        first index is the representative. Clusters are ordered by their
+        representative, singletons included.
+    """
+    if not texts:
+        return []
+    signatures = minhash_signatures(texts, num_perm, seed)
+    bands, rows = choose_bands(threshold, num_perm)
+    pairs = candidate_pairs(signatures, bands, rows)
+    if len(pairs):
+        similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+        pairs = pairs[similarity >= threshold]
+
+    parent = np.arange(len(texts))
+    for i, j in pairs:
+        root_i, root_j = _find(parent, int(i)), _find(parent, int(j))
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(texts)):
+        clusters.setdefault(_find(parent, i), []).append(i)
+    return [clusters[root] for root in sorted(clusters)]
+
+
+def representative_map(clusters: List[List[int]]) -> Dict[int, int]:
+    """index -> index of its cluster representative (itself for representatives)."""
+    return {member: cluster[0] for cluster in clusters for member in cluster}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Input Helpers
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def iter_assertion_texts(path: str) -> Iterable[str]:
+    """
+    Assertion texts of a file.
+
+    JSONL meetings ({"assertions": [{"text": ...}]}), JSONL assertion records
+    ({"text": ...}), or plain text with one assertion per line.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if path.endswith(".jsonl"):
+                record = json.loads(line)
+                if isinstance(record.get("assertions"), list):
+                    for assertion in record["assertions"]:
+                        text = assertion.get("text") if isinstance(assertion, dict) else assertion
+                        if text:
+                            yield text
+                elif record.get("text"):
+                    yield record["text"]
+            elif not line.startswith("#"):
+                yield line
+
+
+def cluster_stats(clusters: List[List[int]]) -> Dict[str, float]:
+    total = sum(len(c) for c in clusters)
+    return {
+        "assertions": total,
+        "clusters": len(clusters),
+        "singletons": sum(1 for c in clusters if len(c) == 1),
+        "largest_cluster": max((len(c) for c in clusters), default=0),
+        "reduction": round(1 - len(clusters) / total, 4) if total else 0.0,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Main
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cluster near-duplicate assertions by template")
+    parser.add_argument("files", nargs="+", help="Assertion files (JSONL or plain text)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Jaccard similarity to merge (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--num-perm", type=int, default=DEFAULT_NUM_PERM,
+                        help=f"MinHash permutations (default: {DEFAULT_NUM_PERM})")
+    parser.add_argument("--top", type=int, default=10, help="Largest clusters to print (default: 10)")
+    parser.add_argument("--json", dest="json_output", default=None, help="Write clusters to this JSON file")
+    args = parser.parse_args(argv)
+
+    texts = [text for path in args.files for text in iter_assertion_texts(path)]
+    clusters = cluster_near_duplicates(texts, args.threshold, args.num_perm)
+    stats = cluster_stats(clusters)
+
+    print(f"📊 {stats['assertions']} assertions → {stats['clusters']} clusters "
+          f"({stats['reduction']:.0%} fewer LLM calls per-representative)")
+    print(f"   Singletons: {stats['singletons']}, largest cluster: {stats['largest_cluster']}")
+    for cluster in sorted(clusters, key=len, reverse=True)[:args.top]:
+        if len(cluster) < 2:
+            break
+        print(f"\n  [{len(cluster)}] {texts[cluster[0]][:100]}")
+        for member in cluster[1:3]:
+            print(f"       ~ {texts[member][:100]}")
+
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump({
+                "threshold": args.threshold,
+                "num_perm": args.num_perm,
+                "statistics": stats,
+                "clusters": [{"representative": texts[c[0]], "members": [texts[i] for i in c]}
+                             for c in clusters],
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Saved: {args.json_output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
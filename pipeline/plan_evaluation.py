@@ -38,16 +38,23 @@ from .config import (
     extract_json_from_response,
     DELAY_BETWEEN_CALLS
 )
+from .router import route
+from .telemetry import prefix_key, telemetry_context
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # Two-Layer Evaluation Framework
 # ═══════════════════════════════════════════════════════════════════════════════
 
-STRUCTURAL_EVALUATION_PROMPT = """
+# Prompts are laid out for provider-side prefix caching: a static system rubric,
+# then the plan (and source data), then the assertion. Consecutive calls for the
+# same plan share everything but the last block.
+
+STRUCTURAL_SYSTEM_PROMPT = """
 ## TWO-LAYER EVALUATION: STRUCTURAL CHECK
 
 You are evaluating whether a workback plan satisfies a STRUCTURAL assertion.
+The plan comes first; the assertion to check is at the end of the message.
 
 **STRUCTURAL EVALUATION RULES:**
 - Question: "Does the plan HAVE this element?"
@@ -59,37 +66,22 @@ You are evaluating whether a workback plan satisfies a STRUCTURAL assertion.
 - "Plan has a meeting date" → PASS if ANY date is mentioned (even if wrong)
 - "Plan has task owners" → PASS if ANY names are assigned (even if fabricated)
 
----
-
-**PLAN TO EVALUATE:**
-{plan_content}
-
----
-
-**STRUCTURAL ASSERTION:**
-ID: {assertion_id}
-Pattern: {pattern_id}
-Text: "{assertion_text}"
-Checks For: {checks_for}
-Level: {level}
-
----
-
 Evaluate and return JSON:
-{{
+{
     "passed": true or false,
     "explanation": "Brief explanation of what was found or missing",
     "evidence_found": "Quote from plan showing the element exists (or 'NOT FOUND')"
-}}
+}
 
 Remember: Check PRESENCE only, not correctness!
 Return ONLY valid JSON."""
 
 
-GROUNDING_EVALUATION_PROMPT = """
+GROUNDING_SYSTEM_PROMPT = """
 ## TWO-LAYER EVALUATION: GROUNDING CHECK
 
 You are evaluating whether a workback plan satisfies a GROUNDING assertion.
+The source data and plan come first; the assertion to check is at the end of the message.
 
 **GROUNDING EVALUATION RULES:**
 - Question: "Is this value CORRECT vs source?"
@@ -97,7 +89,27 @@ You are evaluating whether a workback plan satisfies a GROUNDING assertion.
 - ✅ PASS if: Values MATCH the source data
 - ❌ FAIL if: Values are HALLUCINATED or don't match source
 
-**SOURCE DATA (Ground Truth):**
+Evaluate and return JSON:
+{
+    "passed": true or false,
+    "explanation": "What was compared and whether it matches",
+    "values_in_plan": ["List of relevant values found in the plan"],
+    "values_in_source": ["List of expected values from source"],
+    "mismatches": ["Any hallucinated or incorrect values (empty if passed)"]
+}
+
+Be strict about grounding - any fabricated content should FAIL.
+Return ONLY valid JSON."""
+
+
+PLAN_CONTEXT_TEMPLATE = """**PLAN TO EVALUATE:**
+{plan_content}
+
+---
+"""
+
+
+GROUNDING_CONTEXT_TEMPLATE = """**SOURCE DATA (Ground Truth):**
 ```json
 {source_data}
 ```
@@ -108,7 +120,21 @@ You are evaluating whether a workback plan satisfies a GROUNDING assertion.
 {plan_content}
 
 ---
+"""
+
+
+STRUCTURAL_ASSERTION_TEMPLATE = """
+**STRUCTURAL ASSERTION:**
+ID: {assertion_id}
+Pattern: {pattern_id}
+Text: "{assertion_text}"
+Checks For: {checks_for}
+Level: {level}
 
+Return ONLY valid JSON."""
+
+
+GROUNDING_ASSERTION_TEMPLATE = """
 **GROUNDING ASSERTION:**
 ID: {assertion_id}
 Pattern: {pattern_id}
@@ -117,18 +143,6 @@ Source Field: {source_field}
 Verification Method: {verification_method}
 Level: {level}
 
----
-
-Evaluate and return JSON:
-{{
-    "passed": true or false,
-    "explanation": "What was compared and whether it matches",
-    "values_in_plan": ["List of relevant values found in the plan"],
-    "values_in_source": ["List of expected values from source"],
-    "mismatches": ["Any hallucinated or incorrect values (empty if passed)"]
-}}
-
-Be strict about grounding - any fabricated content should FAIL.
 Return ONLY valid JSON."""
 
 
@@ -142,8 +156,8 @@ def evaluate_structural_assertion(
 ) -> AssertionResult:
     """Evaluate a single structural assertion against a plan."""
     
-    prompt = STRUCTURAL_EVALUATION_PROMPT.format(
-        plan_content=plan.content[:4000],  # Truncate if too long
+    context = PLAN_CONTEXT_TEMPLATE.format(plan_content=plan.content[:4000])  # Truncate if too long
+    prompt = context + STRUCTURAL_ASSERTION_TEMPLATE.format(
         assertion_id=assertion.id,
         pattern_id=assertion.pattern_id,
         assertion_text=assertion.text,
@@ -152,7 +166,16 @@ def evaluate_structural_assertion(
     )
     
     try:
-        response = call_gpt5_api(prompt, temperature=0.1, max_tokens=500)
+        with telemetry_context(prefix=prefix_key(STRUCTURAL_SYSTEM_PROMPT, context)):
+            response = route(
+                "scoring", prompt,
+                escalate=lambda: call_gpt5_api(prompt, system_prompt=STRUCTURAL_SYSTEM_PROMPT,
+                                               temperature=0.1, max_tokens=500),
+                system_prompt=STRUCTURAL_SYSTEM_PROMPT,
+                parse=extract_json_from_response,
+                vote_key=lambda data: bool(data.get("passed")),
+                max_tokens=500,
+            ).text
         data = extract_json_from_response(response)
         
         return AssertionResult(
@@ -186,9 +209,11 @@ def evaluate_grounding_assertion(
 ) -> AssertionResult:
     """Evaluate a single grounding assertion against a plan."""
     
-    prompt = GROUNDING_EVALUATION_PROMPT.format(
+    context = GROUNDING_CONTEXT_TEMPLATE.format(
         source_data=json.dumps(source_data, indent=2),
-        plan_content=plan.content[:4000],
+        plan_content=plan.content[:4000]
+    )
+    prompt = context + GROUNDING_ASSERTION_TEMPLATE.format(
         assertion_id=assertion.id,
         pattern_id=assertion.pattern_id,
         assertion_text=assertion.text,
@@ -198,7 +223,16 @@ def evaluate_grounding_assertion(
     )
     
     try:
-        response = call_gpt5_api(prompt, temperature=0.1, max_tokens=600)
+        with telemetry_context(prefix=prefix_key(GROUNDING_SYSTEM_PROMPT, context)):
+            response = route(
+                "scoring", prompt,
+                escalate=lambda: call_gpt5_api(prompt, system_prompt=GROUNDING_SYSTEM_PROMPT,
+                                               temperature=0.1, max_tokens=600),
+                system_prompt=GROUNDING_SYSTEM_PROMPT,
+                parse=extract_json_from_response,
+                vote_key=lambda data: bool(data.get("passed")),
+                max_tokens=600,
+            ).text
         data = extract_json_from_response(response)
         
         mismatches = data.get("mismatches", [])
@@ -241,14 +275,16 @@ def evaluate_plan(
     # Evaluate structural assertions
     structural_results = []
     for assertion in assertion_set.structural:
-        result = evaluate_structural_assertion(plan, assertion)
+        with telemetry_context(dimension=assertion.pattern_id):
+            result = evaluate_structural_assertion(plan, assertion)
         structural_results.append(result)
         time.sleep(0.5)  # Brief delay between assertions
     
     # Evaluate grounding assertions
     grounding_results = []
     for assertion in assertion_set.grounding:
-        result = evaluate_grounding_assertion(plan, assertion, source_data)
+        with telemetry_context(dimension=assertion.pattern_id):
+            result = evaluate_grounding_assertion(plan, assertion, source_data)
         grounding_results.append(result)
         time.sleep(0.5)
     
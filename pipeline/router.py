@@ -0,0 +1,360 @@
+"""
+Model cascade router: a cheap local model first, GPT-5 only when it is unsure.
+
+Each task type (classification, slot extraction, pass/fail scoring, span
+finding) has one routing policy. With routing on, a call is first answered by
+the policy's local backend (Ollama); the answer is kept when
+- self-consistency: the share of `samples` local answers that agree (by
+  `vote_key`) reaches `min_agreement`, and
+- confidence: the caller's `confidence(value)` (default: the agreement itself)
+  reaches `min_confidence`.
+Otherwise, or when the local backend fails, the call escalates to GPT-5 through
+the caller's own GPT-5 function, so retries, tokens and telemetry are unchanged.
+
+Every decision is appended to routing_decisions.jsonl next to the telemetry
+sink (MIRA_TELEMETRY_DIR / run directory). Escalated decisions record the local
+and GPT-5 answers side by side, which `calibrate` turns into per-threshold
+agreement so policies can be tuned from real traffic.
+
+Environment:
+    MIRA_ROUTING   "off" (default: every task goes to GPT-5), "on" (DEFAULT_POLICIES),
+                   or a JSON file of per-task overrides, e.g.
+                   {"scoring": {"min_confidence": 0.9, "samples": 5}, "span_finding": {"local": null}}
+
+Usage:
+    decision = route(
+        "scoring", prompt,
+        escalate=lambda: call_gpt5_api(prompt, system_prompt=SYSTEM_PROMPT),
+        system_prompt=SYSTEM_PROMPT,
+        parse=extract_json_from_response,
+        vote_key=lambda value: value.get("passed"),
+    )
+    result = extract_json_from_response(decision.text)
+
+    # Acceptance/escalation and local-vs-GPT-5 agreement per task and confidence
+    python -m pipeline.router calibrate docs/pipeline_runs/<run_id>
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from .config import OLLAMA_MODEL, call_ollama_api
+from .telemetry import TELEMETRY_DIR_ENV, get_context, get_sink_file
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Policies
+# ═══════════════════════════════════════════════════════════════════════════════
+
+ROUTING_ENV = "MIRA_ROUTING"
+DECISIONS_FILENAME = "routing_decisions.jsonl"
+
+# One place for all task routing. local=None sends the task straight to GPT-5.
+DEFAULT_POLICIES: Dict[str, Dict[str, Any]] = {
+    "classification": {
+        "local": "ollama", "model": OLLAMA_MODEL,
+        "samples": 3, "min_agreement": 1.0, "min_confidence": 0.0, "temperature": 0.3,
+    },
+    "slot_extraction": {
+        "local": "ollama", "model": OLLAMA_MODEL,
+        "samples": 2, "min_agreement": 1.0, "min_confidence": 0.0, "temperature": 0.2,
+    },
+    "scoring": {
+        "local": "ollama", "model": OLLAMA_MODEL,
+        "samples": 3, "min_agreement": 1.0, "min_confidence": 0.0, "temperature": 0.3,
+    },
+    "span_finding": {
+        "local": "ollama", "model": OLLAMA_MODEL,
+        "samples": 1, "min_agreement": 1.0, "min_confidence": 0.6, "temperature": 0.1,
+    },
+}
+
+# Local backends: fn(prompt, model, system_prompt, temperature, max_tokens) -> text
+BACKENDS: Dict[str, Callable[..., str]] = {
+    "ollama": lambda prompt, model, system_prompt, temperature, max_tokens: call_ollama_api(
+        prompt, model=model, system_prompt=system_prompt, temperature=temperature, max_tokens=max_tokens
+    ),
+}
+
+_policies: Optional[Dict[str, Dict[str, Any]]] = None
+_policy_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+
+def load_policies() -> Dict[str, Dict[str, Any]]:
+    """
+    Routing policies in effect (cached; MIRA_ROUTING is read once).
+
+    Returns:
+        {} when routing is off, else DEFAULT_POLICIES merged with file overrides
+    """
+    global _policies
+    if _policies is None:
+        with _policy_lock:
+            if _policies is None:
+                setting = os.environ.get(ROUTING_ENV, "").strip()
+                policies: Dict[str, Dict[str, Any]] = {}
+                if setting.lower() in ("on", "1", "true"):
+                    policies = {task: dict(policy) for task, policy in DEFAULT_POLICIES.items()}
+                elif setting and setting.lower() not in ("off", "0", "false"):
+                    policies = {task: dict(policy) for task, policy in DEFAULT_POLICIES.items()}
+                    with open(setting, 'r', encoding='utf-8') as f:
+                        for task, overrides in json.load(f).items():
+                            policies.setdefault(task, {}).update(overrides)
+                _policies = policies
+    return _policies
+
+
+def get_policy(task: str) -> Optional[Dict[str, Any]]:
+    """Policy of a task, or None if it goes straight to GPT-5."""
+    policy = load_policies().get(task)
+    return policy if policy and policy.get("local") else None
+
+
+def set_policies(policies: Optional[Dict[str, Dict[str, Any]]]) -> None:
+    """Replace the policies in effect (None re-reads MIRA_ROUTING)."""
+    global _policies
+    with _policy_lock:
+        _policies = policies
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Routing
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class RouteDecision:
+    """Outcome of one routed call."""
+
+    def __init__(self, task: str, text: str, backend: str, escalated: bool, reason: str,
+                 confidence: Optional[float] = None, agreement: Optional[float] = None,
+                 samples: int = 0, local_key: Any = None):
+        self.task = task
+        self.text = text
+        self.backend = backend
+        self.escalated = escalated
+        self.reason = reason
+        self.confidence = confidence
+        self.agreement = agreement
+        self.samples = samples
+        self.local_key = local_key
+
+
+def _decisions_file() -> Optional[str]:
+    sink = get_sink_file()
+    return os.path.join(os.path.dirname(sink), DECISIONS_FILENAME) if sink else None
+
+
+def _log_decision(event: Dict[str, Any]) -> None:
+    path = _decisions_file()
+    if not path:
+        return
+    line = json.dumps(event, ensure_ascii=False, default=str)
+    with _log_lock:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
+
+
+def _key(value: Any) -> Hashable:
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def route(
+    task: str,
+    prompt: str,
+    escalate: Callable[[], str],
+    system_prompt: Optional[str] = None,
+    parse: Optional[Callable[[str], Any]] = None,
+    vote_key: Optional[Callable[[Any], Any]] = None,
+    confidence: Optional[Callable[[Any], float]] = None,
+    max_tokens: int = 2000,
+) -> RouteDecision:
+    """
+    Answer a call with the task's local backend, escalating to GPT-5 when unsure.
+
+    Args:
+        task: Policy name (classification, slot_extraction, scoring, span_finding)
+        prompt: User prompt (same one GPT-5 would get)
+        escalate: Makes the GPT-5 call and returns its text
+        system_prompt: System prompt for the local backend
+        parse: Turns response text into a value; raising counts as a failed sample
+        vote_key: What must agree across samples (default: the whole parsed value)
+        confidence: Confidence in [0, 1] of a parsed value (default: agreement)
+        max_tokens: Local completion limit
+
+    Returns:
+        RouteDecision whose .text is the accepted local answer or GPT-5's
+    """
+    policy = get_policy(task)
+    if policy is None:
+        return RouteDecision(task, escalate(), "gpt5", False, "no_local_policy")
+
+    parse = parse or (lambda text: text)
+    vote_key = vote_key or (lambda value: value)
+    backend = BACKENDS[policy["local"]]
+    samples = max(1, int(policy.get("samples", 1)))
+
+    start = time.time()
+    answers = []  # (text, value, key)
+    error = None
+    for _ in range(samples):
+        try:
+            text = backend(prompt, policy.get("model", OLLAMA_MODEL), system_prompt,
+                           policy.get("temperature", 0.1), max_tokens)
+            value = parse(text)
+            answers.append((text, value, _key(vote_key(value))))
+        except Exception as e:
+            error = str(e)
+    local_ms = (time.time() - start) * 1000
+
+    agreement, score, local_key, chosen = 0.0, None, None, None
+    if answers:
+        local_key, votes = Counter(key for _, _, key in answers).most_common(1)[0]
+        agreement = votes / samples
+        agreeing = [(text, value) for text, value, key in answers if key == local_key]
+        chosen = agreeing[0][0]
+        if confidence is not None:
+            try:
+                score = sum(float(confidence(value)) for _, value in agreeing) / len(agreeing)
+            except Exception:
+                score = 0.0
+        else:
+            score = agreement
+
+    if not answers:
+        reason = f"local_error: {error}"
+    elif agreement < policy.get("min_agreement", 1.0):
+        reason = "low_agreement"
+    elif score < policy.get("min_confidence", 0.0):
+        reason = "low_confidence"
+    else:
+        reason = "accepted"
+
+    event = {
+        "ts": datetime.now().isoformat(),
+        "task": task,
+        "local_backend": policy["local"],
+        "local_model": policy.get("model"),
+        "samples": samples,
+        "answered": len(answers),
+        "agreement": round(agreement, 4),
+        "confidence": round(score, 4) if score is not None else None,
+        "min_agreement": policy.get("min_agreement", 1.0),
+        "min_confidence": policy.get("min_confidence", 0.0),
+        "decision": "local" if reason == "accepted" else "gpt5",
+        "reason": reason,
+        "local_ms": round(local_ms, 1),
+        "local_answer": local_key,
+        "prompt_hash": hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12],
+    }
+    event.update(get_context())
+
+    if reason == "accepted":
+        _log_decision(event)
+        return RouteDecision(task, chosen, policy["local"], False, reason, score, agreement, samples, local_key)
+
+    text = escalate()
+    try:
+        event["gpt5_answer"] = _key(vote_key(parse(text)))
+        event["agrees"] = event["gpt5_answer"] == local_key if local_key is not None else None
+    except Exception:
+        event["gpt5_answer"] = None
+    _log_decision(event)
+    return RouteDecision(task, text, "gpt5", True, reason, score, agreement, samples, local_key)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Calibration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def load_decisions(path: str) -> List[Dict]:
+    """Routing decisions from a run directory or a routing_decisions.jsonl file."""
+    if os.path.isdir(path):
+        path = os.path.join(path, DECISIONS_FILENAME)
+    decisions = []
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    decisions.append(json.loads(line))
+    return decisions
+
+
+def calibrate(decisions: List[Dict], buckets: int = 5) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-task acceptance and, for escalated calls, how often the local answer
+    matched GPT-5 at each confidence level (the agreement a lower threshold
+    would have bought).
+    """
+    report: Dict[str, Dict[str, Any]] = {}
+    for task in sorted({d["task"] for d in decisions}):
+        items = [d for d in decisions if d["task"] == task]
+        compared = [d for d in items if d.get("agrees") is not None]
+        rows = []
+        for b in range(buckets):
+            low, high = b / buckets, (b + 1) / buckets
+            in_bucket = [d for d in compared
+                         if low <= (d.get("confidence") or 0.0) < high or (b == buckets - 1 and d.get("confidence") == 1.0)]
+            if in_bucket:
+                rows.append({
+                    "confidence": f"{low:.1f}-{high:.1f}",
+                    "compared": len(in_bucket),
+                    "local_matches_gpt5": round(sum(d["agrees"] for d in in_bucket) / len(in_bucket), 4),
+                })
+        report[task] = {
+            "decisions": len(items),
+            "local": sum(1 for d in items if d["decision"] == "local"),
+            "escalated": sum(1 for d in items if d["decision"] == "gpt5"),
+            "reasons": dict(Counter(d["reason"].split(":")[0] for d in items)),
+            "local_ms_avg": round(sum(d.get("local_ms", 0) for d in items) / len(items), 1),
+            "agreement_by_confidence": rows,
+        }
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Model cascade routing decisions")
+    commands = parser.add_subparsers(dest="command", required=True)
+    calibrate_parser = commands.add_parser("calibrate", help="Acceptance and local-vs-GPT-5 agreement per task")
+    calibrate_parser.add_argument("path", nargs="?", default=os.environ.get(TELEMETRY_DIR_ENV),
+                                  help="Run directory or routing_decisions.jsonl (default: MIRA_TELEMETRY_DIR)")
+    calibrate_parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    commands.add_parser("policies", help="Print the policies in effect")
+    args = parser.parse_args(argv)
+
+    if args.command == "policies":
+        print(json.dumps(load_policies() or {"routing": "off"}, indent=2))
+        return 0
+
+    if not args.path:
+        print("❌ No path given and MIRA_TELEMETRY_DIR is not set")
+        return 1
+    decisions = load_decisions(args.path)
+    if not decisions:
+        print(f"❌ No routing decisions in {args.path}")
+        return 1
+    report = calibrate(decisions)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"📊 Routing decisions: {len(decisions)}")
+    for task, stats in report.items():
+        share = stats["local"] / stats["decisions"]
+        print(f"\n  {task}: {stats['decisions']} calls, {stats['local']} local ({share:.0%}), "
+              f"{stats['escalated']} escalated, local avg {stats['local_ms_avg']:.0f}ms")
+        print(f"    Reasons: {', '.join(f'{k}={v}' for k, v in stats['reasons'].items())}")
+        for row in stats["agreement_by_confidence"]:
+            print(f"    confidence {row['confidence']}: local matched GPT-5 on "
+                  f"{row['local_matches_gpt5']:.0%} of {row['compared']} escalated calls")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -49,6 +49,8 @@ from .config import (
     EVALUATION_FILENAME,
     REPORT_FILENAME,
 )
+from . import hedging
+from . import telemetry
 
 from . import scenario_generation
 from . import assertion_generation
@@ -128,6 +130,7 @@ def run_stage(stage_num: int, args: argparse.Namespace) -> bool:
     # Run the stage with current run directory
     start_time = time.time()
     run_dir = get_current_run_dir()
+    telemetry.set_context(stage=info["module"].__name__.split(".")[-1])
     
     try:
         if stage_num == 1:
@@ -257,6 +260,10 @@ def main():
     parser.add_argument("--stages", type=str, help="Comma-separated list of stages to run (e.g., '1,2,3')")
     parser.add_argument("--resume-from", type=int, help="Resume pipeline from this stage")
     parser.add_argument("--skip-existing", action="store_true", help="Skip stages with existing output")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Duplicate GPT-5 calls that outlive the observed p95 latency (see hedging.py)")
+    parser.add_argument("--hedge-budget", type=float, default=None,
+                        help=f"Max duplicate calls as a fraction of calls (default: {hedging.DEFAULT_BUDGET})")
     args = parser.parse_args()
     
     # Handle --list-runs
@@ -276,6 +283,11 @@ def main():
         run_id = initialize_run(args.run_id)
         print(f"📂 New run created: {run_id}")
     
+    # LLM call telemetry goes next to the run's artifacts
+    telemetry.configure(sink_dir=get_current_run_dir())
+    if args.hedge:
+        hedging.configure(enabled=True, budget=args.hedge_budget)
+    
     print_banner(run_id)
     
     # Determine which stages to run
@@ -334,6 +346,10 @@ def main():
 """)
     
     print(f"⏱️ Total Time: {pipeline_elapsed:.1f}s")
+    if hedging.is_enabled():
+        hedge_stats = hedging.get_stats()
+        print(f"🔀 Hedged calls: {hedge_stats['hedges']} of {hedge_stats['calls']} "
+              f"({hedge_stats['hedge_wins']} answered first)")
     print()
     
     for stage_num, status in results.items():
@@ -0,0 +1,498 @@
+"""
+Per-call LLM telemetry.
+
+Every LLM call made through the shared API helpers is recorded as one
+structured event: latency, prompt/completion/cached tokens, attempts,
+429s, status, and the stage/dimension that issued the call.
+
+Sinks:
+- JSONL: <dir>/llm_calls.jsonl, where <dir> comes from MIRA_TELEMETRY_DIR or
+  configure(). run_pipeline points it at the run directory automatically.
+- Prometheus text file (optional): MIRA_TELEMETRY_PROM or configure(prom_file=...),
+  rewritten periodically and at exit for node_exporter's textfile collector.
+
+Instrumenting a call:
+    with track_call("substrate", model=JJ_MODEL, prompt=prompt, system_prompt=system_prompt) as call:
+        for attempt in range(max_retries):
+            call.attempt()
+            response = requests.post(...)
+            if response.status_code == 200:
+                result = response.json()
+                call.usage(result.get("usage"), completion=text)
+                return text
+            elif response.status_code == 429:
+                call.rate_limited()
+
+Attributing calls:
+    with telemetry_context(stage="plan_evaluation", dimension="S2"):
+        evaluate_assertion(...)
+
+Measuring provider-side prefix caching (prompts laid out as a stable prefix,
+then the per-call suffix; cached_pct is cached / prompt tokens):
+    with telemetry_context(prefix=prefix_key(SYSTEM_PROMPT, response_text)):
+        call_gpt5_api(response_block + assertion_block, system_prompt=SYSTEM_PROMPT)
+
+Usage:
+    # Per-stage and per-dimension breakdown of a run directory (or JSONL file)
+    python -m pipeline.telemetry summarize docs/pipeline_runs/<run_id>
+    python -m pipeline.telemetry summarize docs/pipeline_runs/<run_id> --by stage,prefix
+    python -m pipeline.telemetry summarize docs/pipeline_runs/<run_id> --by stage,dimension --json
+"""
+
+import os
+import sys
+import json
+import hashlib
+import time
+import atexit
+import argparse
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Configuration
+# ═══════════════════════════════════════════════════════════════════════════════
+
+TELEMETRY_DIR_ENV = "MIRA_TELEMETRY_DIR"
+TELEMETRY_PROM_ENV = "MIRA_TELEMETRY_PROM"
+TELEMETRY_FILENAME = "llm_calls.jsonl"
+
+PROM_WRITE_INTERVAL = 5.0  # seconds between Prometheus file rewrites
+LATENCY_BUCKETS = [0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120]  # seconds
+CHARS_PER_TOKEN = 4  # fallback estimate when the API returns no usage
+
+_lock = threading.Lock()
+_sink_dir: Optional[str] = None
+_prom_file: Optional[str] = None
+_configured = False
+_last_prom_write = 0.0
+
+# Aggregates for the Prometheus file, keyed by label tuples
+_calls: Dict[tuple, int] = {}
+_tokens: Dict[tuple, int] = {}
+_retries: Dict[tuple, int] = {}
+_rate_limited: Dict[tuple, int] = {}
+_latency_buckets: Dict[tuple, List[int]] = {}
+_latency_sum: Dict[tuple, float] = {}
+
+_context: contextvars.ContextVar = contextvars.ContextVar("mira_telemetry_context", default={})
+
+
+def configure(sink_dir: Optional[str] = None, prom_file: Optional[str] = None) -> None:
+    """
+    Set the telemetry sinks (overrides the environment variables).
+
+    Args:
+        sink_dir: Directory for llm_calls.jsonl (None leaves it unchanged)
+        prom_file: Path of the Prometheus text file (None leaves it unchanged)
+    """
+    global _sink_dir, _prom_file, _configured
+    _load_env()
+    with _lock:
+        if sink_dir is not None:
+            os.makedirs(sink_dir, exist_ok=True)
+            _sink_dir = sink_dir
+        if prom_file is not None:
+            _prom_file = prom_file
+        _configured = True
+
+
+def _load_env() -> None:
+    """Pick up sinks from the environment on first use."""
+    global _sink_dir, _prom_file, _configured
+    if _configured:
+        return
+    with _lock:
+        if _configured:
+            return
+        _sink_dir = os.environ.get(TELEMETRY_DIR_ENV) or None
+        _prom_file = os.environ.get(TELEMETRY_PROM_ENV) or None
+        if _sink_dir:
+            os.makedirs(_sink_dir, exist_ok=True)
+        _configured = True
+
+
+def get_sink_file() -> Optional[str]:
+    """Path of the JSONL sink, or None if telemetry is not being written."""
+    _load_env()
+    return os.path.join(_sink_dir, TELEMETRY_FILENAME) if _sink_dir else None
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Context (stage / dimension attribution)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@contextmanager
+def telemetry_context(**fields: Any) -> Iterator[None]:
+    """
+    Attach fields (stage, dimension, ...) to every call made inside the block.
+
+    Nested contexts merge; inner values win. Safe across threads and asyncio
+    tasks (contextvars).
+    """
+    token = _context.set({**_context.get(), **{k: v for k, v in fields.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def set_context(**fields: Any) -> None:
+    """Set default context fields for the rest of this thread/task."""
+    _context.set({**_context.get(), **{k: v for k, v in fields.items() if v is not None}})
+
+
+def get_context() -> Dict[str, Any]:
+    return dict(_context.get())
+
+
+def prefix_key(*parts: Optional[str]) -> str:
+    """Short hash of the static prefix shared by a run of calls (the `prefix` field)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:12]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Call Tracking
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def estimate_tokens(text: Optional[str]) -> int:
+    return len(text or "") // CHARS_PER_TOKEN
+
+
+class LLMCall:
+    """Mutable record of one logical LLM call (all retries included)."""
+
+    def __init__(self, api: str, model: Optional[str], prompt: Optional[str],
+                 system_prompt: Optional[str] = None):
+        self.api = api
+        self.model = model
+        self.prompt_chars = len(prompt or "") + len(system_prompt or "")
+        self.start = time.time()
+        self.attempts = 0
+        self.rate_limits = 0
+        self.prompt_tokens: Optional[int] = None
+        self.completion_tokens: Optional[int] = None
+        self.cached_tokens = 0
+        self.completion_chars = 0
+        self.cache_hit = False
+        self.status = None
+        self.error: Optional[str] = None
+        self.extra: Dict[str, Any] = {}
+
+    def attempt(self) -> None:
+        """Mark the start of an HTTP attempt."""
+        self.attempts += 1
+
+    def rate_limited(self) -> None:
+        """Mark an HTTP 429 response."""
+        self.rate_limits += 1
+
+    def usage(self, usage: Optional[Dict] = None, completion: Optional[str] = None) -> None:
+        """
+        Record token usage from an API response and mark the call successful.
+
+        Accepts the chat completions `usage` block (incl.
+        prompt_tokens_details.cached_tokens) or Ollama's
+        prompt_eval_count/eval_count. Pass the response text as completion so
+        tokens can be estimated when the API reports no usage.
+        """
+        usage = usage or {}
+        self.prompt_tokens = usage.get("prompt_tokens", usage.get("prompt_eval_count"))
+        self.completion_tokens = usage.get("completion_tokens", usage.get("eval_count"))
+        details = usage.get("prompt_tokens_details") or {}
+        self.cached_tokens = details.get("cached_tokens", 0) or 0
+        self.completion_chars = len(completion or "")
+        self.status = "ok"
+
+    def hit_cache(self) -> None:
+        """Mark the call as served from a local response cache (no HTTP)."""
+        self.cache_hit = True
+        self.status = "ok"
+
+    def set(self, **fields: Any) -> None:
+        """Attach extra fields to the event."""
+        self.extra.update(fields)
+
+    def to_event(self) -> Dict[str, Any]:
+        estimated = self.prompt_tokens is None and self.status == "ok" and not self.cache_hit
+        prompt_tokens = self.prompt_tokens
+        completion_tokens = self.completion_tokens
+        if estimated:
+            prompt_tokens = self.prompt_chars // CHARS_PER_TOKEN
+            completion_tokens = self.completion_chars // CHARS_PER_TOKEN
+        event = {
+            "ts": datetime.now().isoformat(),
+            "script": os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else None,
+            "pid": os.getpid(),
+            "api": self.api,
+            "model": self.model,
+            "status": self.status or "error",
+            "latency_ms": round((time.time() - self.start) * 1000, 1),
+            "attempts": self.attempts,
+            "retries": max(0, self.attempts - 1),
+            "rate_limited": self.rate_limits,
+            "prompt_tokens": prompt_tokens or 0,
+            "completion_tokens": completion_tokens or 0,
+            "cached_tokens": self.cached_tokens,
+            "tokens_estimated": estimated,
+            "cache_hit": self.cache_hit,
+        }
+        if self.error:
+            event["error"] = self.error
+        event.update(get_context())
+        event.update(self.extra)
+        if not event.get("stage") and event["script"]:
+            # Unattributed calls are grouped under the script that made them
+            event["stage"] = os.path.splitext(event["script"])[0]
+        return event
+
+
+@contextmanager
+def track_call(api: str, model: Optional[str] = None, prompt: Optional[str] = None,
+               system_prompt: Optional[str] = None) -> Iterator[LLMCall]:
+    """
+    Track one logical LLM call; the event is recorded when the block exits.
+
+    prompt and system_prompt are only measured, for the token estimate used
+    when the API reports no usage.
+
+    Exceptions propagate unchanged and are recorded as status "error".
+    """
+    call = LLMCall(api, model, prompt, system_prompt)
+    try:
+        yield call
+    except BaseException as e:
+        call.status = "error"
+        call.error = f"{type(e).__name__}: {str(e)[:200]}"
+        raise
+    finally:
+        record_event(call.to_event())
+
+
+def record_event(event: Dict[str, Any]) -> None:
+    """Append an event to the sinks and update the aggregates."""
+    sink = get_sink_file()
+    labels = (event["api"], event.get("stage") or "", event.get("dimension") or "", event["status"])
+    latency_s = event["latency_ms"] / 1000
+    with _lock:
+        _calls[labels] = _calls.get(labels, 0) + 1
+        for kind in ("prompt", "completion", "cached"):
+            key = labels[:3] + (kind,)
+            _tokens[key] = _tokens.get(key, 0) + event[f"{kind}_tokens"]
+        _retries[labels[:3]] = _retries.get(labels[:3], 0) + event["retries"]
+        _rate_limited[labels[:3]] = _rate_limited.get(labels[:3], 0) + event["rate_limited"]
+        buckets = _latency_buckets.setdefault(labels[:3], [0] * (len(LATENCY_BUCKETS) + 1))
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency_s <= bound:
+                buckets[i] += 1
+        buckets[-1] += 1
+        _latency_sum[labels[:3]] = _latency_sum.get(labels[:3], 0.0) + latency_s
+
+        if sink:
+            with open(sink, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+
+    if _prom_file and time.time() - _last_prom_write >= PROM_WRITE_INTERVAL:
+        write_prometheus()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Prometheus Text File
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _prom_labels(names: List[str], values: tuple) -> str:
+    pairs = [f'{n}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+             for n, v in zip(names, values)]
+    return "{" + ",".join(pairs) + "}"
+
+
+def write_prometheus(path: Optional[str] = None) -> None:
+    """Rewrite the Prometheus text file from the in-process aggregates."""
+    global _last_prom_write
+    path = path or _prom_file
+    if not path:
+        return
+    base = ["api", "stage", "dimension"]
+    lines = [
+        "# HELP mira_llm_calls_total LLM calls by outcome.",
+        "# TYPE mira_llm_calls_total counter",
+    ]
+    with _lock:
+        lines += [f"mira_llm_calls_total{_prom_labels(base + ['status'], k)} {v}" for k, v in _calls.items()]
+        lines += ["# HELP mira_llm_tokens_total Tokens by kind (prompt, completion, cached).",
+                  "# TYPE mira_llm_tokens_total counter"]
+        lines += [f"mira_llm_tokens_total{_prom_labels(base + ['kind'], k)} {v}" for k, v in _tokens.items()]
+        lines += ["# HELP mira_llm_retries_total Retried HTTP attempts.",
+                  "# TYPE mira_llm_retries_total counter"]
+        lines += [f"mira_llm_retries_total{_prom_labels(base, k)} {v}" for k, v in _retries.items()]
+        lines += ["# HELP mira_llm_rate_limited_total HTTP 429 responses.",
+                  "# TYPE mira_llm_rate_limited_total counter"]
+        lines += [f"mira_llm_rate_limited_total{_prom_labels(base, k)} {v}" for k, v in _rate_limited.items()]
+        lines += ["# HELP mira_llm_latency_seconds Call latency including retries.",
+                  "# TYPE mira_llm_latency_seconds histogram"]
+        for k, buckets in _latency_buckets.items():
+            for bound, count in zip(LATENCY_BUCKETS, buckets):
+                lines.append(f"mira_llm_latency_seconds_bucket{_prom_labels(base + ['le'], k + (bound,))} {count}")
+            lines.append(f"mira_llm_latency_seconds_bucket{_prom_labels(base + ['le'], k + ('+Inf',))} {buckets[-1]}")
+            lines.append(f"mira_llm_latency_seconds_sum{_prom_labels(base, k)} {_latency_sum[k]:.3f}")
+            lines.append(f"mira_llm_latency_seconds_count{_prom_labels(base, k)} {buckets[-1]}")
+        _last_prom_write = time.time()
+
+    tmp_path = f"{path}.tmp"
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
+
+
+@atexit.register
+def _flush_prometheus() -> None:
+    if _prom_file and _calls:
+        try:
+            write_prometheus()
+        except OSError:
+            pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Summaries
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def load_events(path: str) -> List[Dict]:
+    """Load events from a JSONL file, or every llm_calls.jsonl under a directory."""
+    files = []
+    if os.path.isdir(path):
+        for root, _, names in os.walk(path):
+            files += [os.path.join(root, n) for n in names if n == TELEMETRY_FILENAME]
+    else:
+        files = [path]
+    events = []
+    for file_path in sorted(files):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+    return events
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize_events(events: List[Dict], group_by: List[str],
+                     prompt_price: float = 0.0, completion_price: float = 0.0) -> List[Dict]:
+    """
+    Aggregate events by the given fields.
+
+    Args:
+        events: Telemetry events
+        group_by: Event fields to group on (e.g. ["stage"], ["stage", "dimension"])
+        prompt_price: Price per 1M prompt tokens (0 = report tokens only)
+        completion_price: Price per 1M completion tokens
+
+    Returns:
+        One row per group, sorted by total latency (descending)
+    """
+    groups: Dict[tuple, List[Dict]] = {}
+    for e in events:
+        key = tuple(e.get(field) or "-" for field in group_by)
+        groups.setdefault(key, []).append(e)
+
+    rows = []
+    for key, items in groups.items():
+        latencies = [e.get("latency_ms", 0) for e in items if not e.get("cache_hit")]
+        prompt = sum(e.get("prompt_tokens", 0) for e in items)
+        completion = sum(e.get("completion_tokens", 0) for e in items)
+        cached = sum(e.get("cached_tokens", 0) for e in items)
+        row = dict(zip(group_by, key))
+        row.update({
+            "calls": len(items),
+            "errors": sum(1 for e in items if e.get("status") != "ok"),
+            "cache_hits": sum(1 for e in items if e.get("cache_hit")),
+            "retries": sum(e.get("retries", 0) for e in items),
+            "rate_limited": sum(e.get("rate_limited", 0) for e in items),
+            "prompt_tokens": prompt,
+            "completion_tokens": completion,
+            "cached_tokens": cached,
+            "cached_pct": round(100 * cached / prompt, 1) if prompt else 0.0,
+            "total_latency_s": round(sum(latencies) / 1000, 1),
+            "p50_ms": round(_percentile(latencies, 50), 1),
+            "p95_ms": round(_percentile(latencies, 95), 1),
+            "cost": round((prompt * prompt_price + completion * completion_price) / 1_000_000, 4),
+        })
+        rows.append(row)
+    rows.sort(key=lambda r: r["total_latency_s"], reverse=True)
+    return rows
+
+
+def print_summary(rows: List[Dict], group_by: List[str], show_cost: bool) -> None:
+    """Print summary rows as a table."""
+    header = "".join(f"{g:<24}" for g in group_by)
+    header += f"{'Calls':>7} {'Err':>5} {'Retry':>6} {'429':>5} {'Prompt tok':>11} {'Compl tok':>10} " \
+              f"{'Cached':>8} {'Cache%':>7} {'Total s':>9} {'p50 ms':>8} {'p95 ms':>8}"
+    if show_cost:
+        header += f" {'Cost':>9}"
+    print(header)
+    print("─" * len(header))
+    for r in rows:
+        line = "".join(f"{str(r[g])[:23]:<24}" for g in group_by)
+        line += f"{r['calls']:>7} {r['errors']:>5} {r['retries']:>6} {r['rate_limited']:>5} " \
+                f"{r['prompt_tokens']:>11,} {r['completion_tokens']:>10,} {r['cached_tokens']:>8,} {r['cached_pct']:>7} " \
+                f"{r['total_latency_s']:>9} {r['p50_ms']:>8} {r['p95_ms']:>8}"
+        if show_cost:
+            line += f" {r['cost']:>9.4f}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM call telemetry tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    summarize = subparsers.add_parser("summarize", help="Per-stage / per-dimension cost and latency breakdown")
+    summarize.add_argument("path", help="Run directory (searched for llm_calls.jsonl) or a JSONL file")
+    summarize.add_argument("--by", default="stage,dimension",
+                           help="Comma-separated grouping fields (default: stage,dimension)")
+    summarize.add_argument("--prompt-price", type=float, default=0.0, help="Price per 1M prompt tokens")
+    summarize.add_argument("--completion-price", type=float, default=0.0, help="Price per 1M completion tokens")
+    summarize.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    events = load_events(args.path)
+    if not events:
+        print(f"No telemetry events found in {args.path}")
+        return
+
+    show_cost = bool(args.prompt_price or args.completion_price)
+    groupings = [["stage"], [f.strip() for f in args.by.split(",") if f.strip()]]
+    if groupings[0] == groupings[1]:
+        groupings = groupings[:1]
+
+    if args.json:
+        print(json.dumps({
+            ",".join(g): summarize_events(events, g, args.prompt_price, args.completion_price)
+            for g in groupings
+        }, indent=2))
+        return
+
+    print(f"📊 {len(events)} LLM calls from {args.path}\n")
+    for group_by in groupings:
+        print(f"By {', '.join(group_by)}:")
+        print_summary(summarize_events(events, group_by, args.prompt_price, args.completion_price),
+                      group_by, show_cost)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,9 @@ from dataclasses import dataclass
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
+from pipeline.config import get_mock_llm_url, resolve_substrate_endpoint, MOCK_LLM_TOKEN
+from pipeline.telemetry import prefix_key, telemetry_context, track_call
+
 # ============== CONFIGURATION ==============
 # Substrate LLM API (Primary)
 SUBSTRATE_ENDPOINT = "https://fe-26.qas.bing.net/chat/completions"
@@ -45,6 +48,95 @@ NUM_SAMPLES = 10
 START_INDEX = 5  # Start from index 5 (skip first 5 used for training)
 
 
+# Evaluation prompt, laid out as system rubric -> response -> assertion
+SCORING_SYSTEM_PROMPT = """You are an expert evaluator for AI-generated workback plans. You have deep expertise in:
+• Project management and meeting preparation workflows
+• Calendar scheduling, task dependencies, and timeline planning  
+• Identifying actionable items, owners, deadlines, and deliverables
+• Recognizing implicit vs explicit information in planning documents
+
+## TWO-LAYER EVALUATION FRAMEWORK
+
+Assertions belong to TWO distinct types requiring DIFFERENT evaluation logic:
+
+### Layer 1: STRUCTURAL Assertions (Patterns S1-S10)
+**Question:** "Does the plan HAVE X?" (Checks PRESENCE/SHAPE)
+
+| Pattern | What It Checks |
+|---------|----------------|
+| S1 | Has explicit meeting details (date, time, attendees) |
+| S2 | Has timeline aligned to meeting date |
+| S3 | Has named task owners (not generic "someone") |
+| S4 | Lists specific artifacts/files |
+| S5 | States reasonable completion dates |
+| S6 | Identifies blockers and dependencies |
+| S7 | Links tasks to specific source entities |
+| S8 | Mentions appropriate communication channels |
+| S9 | Meta-check: passes when G1-G5 all pass |
+| S10 | Prioritizes tasks appropriately |
+
+**Evaluation Rule:** ✅ PASS if element EXISTS, ❌ FAIL if element MISSING
+**Do NOT fail because value is wrong** - that's grounding's job!
+
+### Layer 2: GROUNDING Assertions (Patterns G1-G5)  
+**Question:** "Is X CORRECT vs source?" (Checks FACTUAL ACCURACY)
+
+| Pattern | What It Checks |
+|---------|----------------|
+| G1 | People match source.ATTENDEES |
+| G2 | Dates match source.MEETING.StartTime |
+| G3 | Files match source.ENTITIES_TO_USE |
+| G4 | Topics align with source.UTTERANCE |
+| G5 | No fabricated/hallucinated entities |
+
+**Evaluation Rule:** ✅ PASS if value MATCHES source, ❌ FAIL if HALLUCINATION
+
+## Evaluation Criteria by Level:
+
+🔴 **CRITICAL** (Must Pass):
+- For Structural: Core structure MUST be present
+- For Grounding: Critical facts MUST be accurate
+- FAIL only if clearly missing (structural) or factually wrong (grounding)
+
+🟡 **EXPECTED** (Should Pass):
+- Standard best practices for structure and accuracy
+- PASS if the concept is addressed appropriately
+
+🟢 **ASPIRATIONAL** (Nice to Have):
+- Enhancements beyond basic requirements
+- PASS if there's ANY reasonable attempt
+
+## Key Principle:
+First determine if this is STRUCTURAL (presence) or GROUNDING (accuracy), then evaluate accordingly.
+
+## Output Format (JSON only):
+{"passed": true, "explanation": "Brief evidence from response"}
+{"passed": false, "explanation": "What's specifically missing/wrong"}"""
+
+RESPONSE_BLOCK_TEMPLATE = """## Workback Plan Response:
+
+{response_text}
+
+---
+
+"""
+
+ASSERTION_BLOCK_TEMPLATE = """## Assertion [{level}]:
+"{assertion_text}"
+
+## Context:
+{context}
+
+---
+
+Think step-by-step:
+1. What is this assertion asking for?
+2. Does the response contain this information (explicitly or implicitly)?
+3. Given the {level} level, should this pass?
+
+Output JSON only:"""
+
+
 @dataclass
 class AssertionResult:
     """Result of evaluating a single assertion."""
@@ -68,6 +160,8 @@ class MeetingScore:
 
 def get_azure_token() -> str:
     """Get Azure AD token using Azure CLI credentials."""
+    if get_mock_llm_url():
+        return MOCK_LLM_TOKEN
     try:
         from azure.identity import AzureCliCredential
         credential = AzureCliCredential()
@@ -90,6 +184,8 @@ def get_substrate_token() -> str:
     Get Substrate token using MSAL with Windows Broker (WAM).
     Uses the same pattern as SilverFlow bizchat_search.py.
     """
+    if get_mock_llm_url():
+        return MOCK_LLM_TOKEN
     try:
         import msal
         
@@ -177,14 +273,21 @@ async def call_substrate_api(session: aiohttp.ClientSession, messages: List[Dict
     }
     
     try:
-        async with session.post(SUBSTRATE_ENDPOINT, json=payload, headers=headers, timeout=60) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                return data["choices"][0]["message"]["content"]
-            else:
-                error = await resp.text()
-                print(f"Substrate API error {resp.status}: {error}")
-                return None
+        with track_call("substrate", model=SUBSTRATE_MODEL, prompt=messages[-1]["content"],
+                        system_prompt="".join(m["content"] for m in messages[:-1])) as call:
+            call.attempt()
+            async with session.post(resolve_substrate_endpoint(SUBSTRATE_ENDPOINT), json=payload, headers=headers, timeout=60) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    text = data["choices"][0]["message"]["content"]
+                    call.usage(data.get("usage"), completion=text)
+                    return text
+                else:
+                    if resp.status == 429:
+                        call.rate_limited()
+                    error = await resp.text()
+                    print(f"Substrate API error {resp.status}: {error}")
+                    return None
     except Exception as e:
         print(f"Substrate API call failed: {e}")
         return None
@@ -193,6 +296,7 @@ async def call_substrate_api(session: aiohttp.ClientSession, messages: List[Dict
 async def call_azure_api(session: aiohttp.ClientSession, messages: List[Dict], token: str) -> Optional[str]:
     """Call Azure OpenAI API."""
     url = f"{AZURE_ENDPOINT}openai/deployments/{AZURE_DEPLOYMENT}/chat/completions?api-version={AZURE_API_VERSION}"
+    url = resolve_substrate_endpoint(url)
     
     headers = {
         "Authorization": f"Bearer {token}",
@@ -206,14 +310,21 @@ async def call_azure_api(session: aiohttp.ClientSession, messages: List[Dict], t
     }
     
     try:
-        async with session.post(url, json=payload, headers=headers, timeout=60) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                return data["choices"][0]["message"]["content"]
-            else:
-                error = await resp.text()
-                print(f"Azure API error {resp.status}: {error}")
-                return None
+        with track_call("azure", model=AZURE_DEPLOYMENT, prompt=messages[-1]["content"],
+                        system_prompt="".join(m["content"] for m in messages[:-1])) as call:
+            call.attempt()
+            async with session.post(url, json=payload, headers=headers, timeout=60) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    text = data["choices"][0]["message"]["content"]
+                    call.usage(data.get("usage"), completion=text)
+                    return text
+                else:
+                    if resp.status == 429:
+                        call.rate_limited()
+                    error = await resp.text()
+                    print(f"Azure API error {resp.status}: {error}")
+                    return None
     except Exception as e:
         print(f"Azure API call failed: {e}")
         return None
@@ -234,101 +345,26 @@ async def evaluate_assertion(
     reason = justification.get("reason", "")
     source_id = justification.get("sourceID", "")
     
-    system_prompt = """You are an expert evaluator for AI-generated workback plans. You have deep expertise in:
-• Project management and meeting preparation workflows
-• Calendar scheduling, task dependencies, and timeline planning  
-• Identifying actionable items, owners, deadlines, and deliverables
-• Recognizing implicit vs explicit information in planning documents
-
-## TWO-LAYER EVALUATION FRAMEWORK
-
-Assertions belong to TWO distinct types requiring DIFFERENT evaluation logic:
-
-### Layer 1: STRUCTURAL Assertions (Patterns S1-S10)
-**Question:** "Does the plan HAVE X?" (Checks PRESENCE/SHAPE)
-
-| Pattern | What It Checks |
-|---------|----------------|
-| S1 | Has explicit meeting details (date, time, attendees) |
-| S2 | Has timeline aligned to meeting date |
-| S3 | Has named task owners (not generic "someone") |
-| S4 | Lists specific artifacts/files |
-| S5 | States reasonable completion dates |
-| S6 | Identifies blockers and dependencies |
-| S7 | Links tasks to specific source entities |
-| S8 | Mentions appropriate communication channels |
-| S9 | Meta-check: passes when G1-G5 all pass |
-| S10 | Prioritizes tasks appropriately |
-
-**Evaluation Rule:** ✅ PASS if element EXISTS, ❌ FAIL if element MISSING
-**Do NOT fail because value is wrong** - that's grounding's job!
-
-### Layer 2: GROUNDING Assertions (Patterns G1-G5)  
-**Question:** "Is X CORRECT vs source?" (Checks FACTUAL ACCURACY)
-
-| Pattern | What It Checks |
-|---------|----------------|
-| G1 | People match source.ATTENDEES |
-| G2 | Dates match source.MEETING.StartTime |
-| G3 | Files match source.ENTITIES_TO_USE |
-| G4 | Topics align with source.UTTERANCE |
-| G5 | No fabricated/hallucinated entities |
-
-**Evaluation Rule:** ✅ PASS if value MATCHES source, ❌ FAIL if HALLUCINATION
-
-## Evaluation Criteria by Level:
-
-🔴 **CRITICAL** (Must Pass):
-- For Structural: Core structure MUST be present
-- For Grounding: Critical facts MUST be accurate
-- FAIL only if clearly missing (structural) or factually wrong (grounding)
-
-🟡 **EXPECTED** (Should Pass):
-- Standard best practices for structure and accuracy
-- PASS if the concept is addressed appropriately
-
-🟢 **ASPIRATIONAL** (Nice to Have):
-- Enhancements beyond basic requirements
-- PASS if there's ANY reasonable attempt
-
-## Key Principle:
-First determine if this is STRUCTURAL (presence) or GROUNDING (accuracy), then evaluate accordingly.
-
-## Output Format (JSON only):
-{"passed": true, "explanation": "Brief evidence from response"}
-{"passed": false, "explanation": "What's specifically missing/wrong"}"""
-
-    user_prompt = f"""## Workback Plan Response:
-
-{response_text[:5000]}
-
----
-
-## Assertion [{level.upper()}]:
-"{assertion_text}"
-
-## Context:
-{reason if reason else "Standard quality check."}
-
----
-
-Think step-by-step:
-1. What is this assertion asking for?
-2. Does the response contain this information (explicitly or implicitly)?
-3. Given the {level.upper()} level, should this pass?
-
-Output JSON only:"""
+    # Stable prefix (system rubric, then the response) before the per-assertion
+    # part, so consecutive calls for one meeting hit the provider's prompt cache
+    response_block = RESPONSE_BLOCK_TEMPLATE.format(response_text=response_text[:5000])
+    user_prompt = response_block + ASSERTION_BLOCK_TEMPLATE.format(
+        level=level.upper(),
+        assertion_text=assertion_text,
+        context=reason if reason else "Standard quality check."
+    )
 
     messages = [
-        {"role": "system", "content": system_prompt},
+        {"role": "system", "content": SCORING_SYSTEM_PROMPT},
         {"role": "user", "content": user_prompt}
     ]
     
     # Call the appropriate API
-    if provider == "substrate":
-        result = await call_substrate_api(session, messages, token)
-    else:
-        result = await call_azure_api(session, messages, token)
+    with telemetry_context(prefix=prefix_key(SCORING_SYSTEM_PROMPT, response_block)):
+        if provider == "substrate":
+            result = await call_substrate_api(session, messages, token)
+        else:
+            result = await call_azure_api(session, messages, token)
     
     # Parse the result
     if result:
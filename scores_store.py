@@ -0,0 +1,352 @@
+"""
+Per-meeting, hash-keyed store for GPT-5 JJ assertion scores.
+
+assertion_scores.json holds every meeting's results in one document, and
+parsing it into each browser session duplicates every utterance and assertion
+text per judge. The store converts the file once into SQLite, keyed by hashes
+of the utterance and of the assertion text:
+
+- meetings           meeting_key -> utterance, per-meeting summary
+- assertion_scores   (meeting_key, assertion_key) -> result JSON
+- meta               source signature (path, mtime, size) and the file's summary
+- verified_scores    results of in-app re-verification (see verification_jobs.py),
+                     overlaid on the file's results; dropped once the file is
+                     re-scored after them
+- verification_jobs  status of those re-verification jobs
+
+A meeting's results are read on demand and kept in a small LRU, so memory grows
+with the meetings being viewed, not with the dataset. One store object is meant
+to be shared read-only by every session (st.cache_resource). The database is
+rebuilt whenever the source file changes.
+
+Usage:
+    store = ScoresStore(os.path.join("docs", "assertion_scores.db"))
+    store.sync(os.path.join("docs", "assertion_scores.json"))
+    store.get_score(utterance, assertion_text)   # {} if not scored
+    store.summary()                               # timestamp, num_samples, overall_stats
+    store.latest_job(utterance, assertion_text)   # re-verification status, or None
+
+    # Build the store from the command line
+    python scores_store.py docs/assertion_scores.json docs/assertion_scores.db
+"""
+
+import os
+import sys
+import json
+import hashlib
+import sqlite3
+import argparse
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# =============================================================================
+# SCHEMA
+# =============================================================================
+
+MEETING_CACHE_SIZE = 32  # Meetings kept in memory per store
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    meeting_key TEXT PRIMARY KEY,
+    utterance TEXT NOT NULL,
+    summary TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS assertion_scores (
+    meeting_key TEXT NOT NULL,
+    assertion_key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (meeting_key, assertion_key)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS verified_scores (
+    meeting_key TEXT NOT NULL,
+    assertion_key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    scored_at REAL NOT NULL,
+    PRIMARY KEY (meeting_key, assertion_key)
+);
+CREATE TABLE IF NOT EXISTS verification_jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    meeting_key TEXT NOT NULL,
+    assertion_key TEXT NOT NULL,
+    judge TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT NOT NULL DEFAULT '',
+    submitted_at REAL NOT NULL,
+    finished_at REAL,
+    owner TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_verification_jobs_assertion ON verification_jobs (meeting_key, assertion_key);
+"""
+
+JOB_ACTIVE_STATUSES = ("queued", "running")
+JOB_STALE_SECONDS = 3600  # Active jobs older than this are presumed dead, whoever owns them
+
+
+def text_key(text: str) -> str:
+    """Stable short key for an utterance or assertion text."""
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()[:16]
+
+
+def source_signature(json_path: str) -> Optional[str]:
+    """Identity of a scores file version (path, mtime, size), or None if it is missing."""
+    try:
+        stat = os.stat(json_path)
+    except OSError:
+        return None
+    return json.dumps([os.path.abspath(json_path), stat.st_mtime, stat.st_size])
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class ScoresStore:
+    """Read-mostly, per-meeting view of a scores file, safe to share across threads."""
+
+    def __init__(self, path: str, cache_size: int = MEETING_CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._meetings: "OrderedDict[str, Dict[str, Dict[str, Any]]]" = OrderedDict()
+        self._summary: Optional[Dict[str, Any]] = None
+        self._signature: Optional[str] = None
+        self.revision = 0  # Bumped whenever a meeting's results change in place
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn().executescript(SCHEMA)
+        self._migrate()
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not shareable across threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _migrate(self) -> None:
+        """Add columns that databases created by older versions lack."""
+        conn = self._conn()
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(verification_jobs)")}
+        if "owner" not in columns:
+            conn.execute("ALTER TABLE verification_jobs ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    # ---- Build ----
+
+    def sync(self, json_path: str) -> bool:
+        """
+        Make the store match a scores file, rebuilding it if the file changed.
+
+        Args:
+            json_path: Path of assertion_scores.json
+
+        Returns:
+            True if the store was rebuilt
+        """
+        signature = source_signature(json_path)
+        if signature is None or signature == self._signature:
+            return False
+        rebuilt = False
+        if self._meta("source") != signature:
+            rebuilt = self._rebuild(json_path, signature)
+        with self._lock:
+            self._signature = signature
+            self._summary = None
+            self._meetings.clear()
+            self.revision += 1
+        return rebuilt
+
+    def _rebuild(self, json_path: str, signature: str) -> bool:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            scores = json.load(f)
+        summary = {k: v for k, v in scores.items() if k != 'meetings'}
+
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Another process may have rebuilt while we read the file
+            if self._meta("source") == signature:
+                return False
+            conn.execute("DELETE FROM meetings")
+            conn.execute("DELETE FROM assertion_scores")
+            # Re-verifications older than the file are superseded by it
+            conn.execute("DELETE FROM verified_scores WHERE scored_at < ?", (json.loads(signature)[1],))
+            for meeting in scores.get('meetings', []):
+                utterance = meeting.get('utterance', '')
+                meeting_key = text_key(utterance)
+                meeting_summary = {k: v for k, v in meeting.items() if k != 'assertion_results'}
+                conn.execute(
+                    "INSERT OR REPLACE INTO meetings (meeting_key, utterance, summary) VALUES (?, ?, ?)",
+                    (meeting_key, utterance, json.dumps(meeting_summary, ensure_ascii=False)),
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO assertion_scores (meeting_key, assertion_key, data) VALUES (?, ?, ?)",
+                    [(meeting_key, text_key(result.get('assertion_text', '')), json.dumps(result, ensure_ascii=False))
+                     for result in meeting.get('assertion_results', [])],
+                )
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('summary', ?)",
+                         (json.dumps(summary, ensure_ascii=False),))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)", (signature,))
+        return True
+
+    # ---- Lookup ----
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        """File-level fields (timestamp, num_samples, overall_stats), or None if empty."""
+        if self._summary is None:
+            value = self._meta("summary")
+            self._summary = json.loads(value) if value else None
+        return self._summary
+
+    def get_meeting(self, utterance: str) -> Dict[str, Dict[str, Any]]:
+        """One meeting's results as {assertion_key: result}, loaded on first use."""
+        meeting_key = text_key(utterance)
+        with self._lock:
+            if meeting_key in self._meetings:
+                self._meetings.move_to_end(meeting_key)
+                return self._meetings[meeting_key]
+
+        conn = self._conn()
+        rows = conn.execute(
+            "SELECT assertion_key, data FROM assertion_scores WHERE meeting_key = ?", (meeting_key,)
+        )
+        results = {row["assertion_key"]: json.loads(row["data"]) for row in rows}
+        verified = conn.execute(
+            "SELECT assertion_key, data FROM verified_scores WHERE meeting_key = ?", (meeting_key,)
+        )
+        results.update({row["assertion_key"]: json.loads(row["data"]) for row in verified})
+
+        with self._lock:
+            self._meetings[meeting_key] = results
+            while len(self._meetings) > self.cache_size:
+                self._meetings.popitem(last=False)
+        return results
+
+    def get_score(self, utterance: str, assertion_text: str) -> Dict[str, Any]:
+        """Result for one assertion of a meeting, or {} if it was not scored."""
+        return self.get_meeting(utterance).get(text_key(assertion_text), {})
+
+    def meeting_hints(self, low_confidence: float = 0.5) -> Dict[str, Dict[str, int]]:
+        """
+        Per-meeting review hints as {utterance: {"failed", "low_confidence"}}.
+
+        An assertion is low-confidence when no supporting span reaches low_confidence.
+        """
+        conn = self._conn()
+        utterances = {row["meeting_key"]: row["utterance"]
+                      for row in conn.execute("SELECT meeting_key, utterance FROM meetings")}
+        hints = {utterance: {"failed": 0, "low_confidence": 0} for utterance in utterances.values()}
+        for row in conn.execute("SELECT meeting_key, data FROM assertion_scores"):
+            result = json.loads(row["data"])
+            counts = hints.get(utterances.get(row["meeting_key"]))
+            if counts is None:
+                continue
+            counts["failed"] += not result.get('passed', False)
+            support = [span.get('confidence', 0.5) for span in result.get('supporting_spans', [])
+                       if span.get('supports', True)]
+            counts["low_confidence"] += max(support, default=0.0) < low_confidence
+        return hints
+
+    # ---- Re-verification ----
+
+    def put_verified_score(self, utterance: str, result: Dict[str, Any]) -> None:
+        """Store a re-verification result (keyed by its assertion_text) over the file's."""
+        meeting_key = text_key(utterance)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO verified_scores (meeting_key, assertion_key, data, scored_at) VALUES (?, ?, ?, ?)",
+            (meeting_key, text_key(result.get('assertion_text', '')), json.dumps(result, ensure_ascii=False), time.time()),
+        )
+        with self._lock:
+            self._meetings.pop(meeting_key, None)
+            self.revision += 1
+
+    def add_job(self, utterance: str, assertion_text: str, judge: str = "", owner: str = "") -> int:
+        """Record a queued re-verification job, run by the server named owner, and return its id."""
+        cursor = self._conn().execute(
+            "INSERT INTO verification_jobs (meeting_key, assertion_key, judge, status, submitted_at, owner) "
+            "VALUES (?, ?, ?, 'queued', ?, ?)",
+            (text_key(utterance), text_key(assertion_text), judge or "", time.time(), owner or ""),
+        )
+        return cursor.lastrowid
+
+    def update_job(self, job_id: int, status: str, error: str = "") -> None:
+        """Move a job to running, done or failed."""
+        finished_at = None if status in JOB_ACTIVE_STATUSES else time.time()
+        self._conn().execute(
+            "UPDATE verification_jobs SET status = ?, error = ?, finished_at = ? WHERE job_id = ?",
+            (status, error, finished_at, job_id),
+        )
+
+    def latest_job(self, utterance: str, assertion_text: str) -> Optional[Dict[str, Any]]:
+        """Most recent re-verification job for an assertion text, or None."""
+        row = self._conn().execute(
+            "SELECT * FROM verification_jobs WHERE meeting_key = ? AND assertion_key = ? "
+            "ORDER BY job_id DESC LIMIT 1",
+            (text_key(utterance), text_key(assertion_text)),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def fail_interrupted_jobs(self, owner: str = "", stale_after: float = JOB_STALE_SECONDS) -> List[int]:
+        """
+        Mark jobs a previous process left queued or running as failed.
+
+        Other servers may share the database, so only owner's jobs are failed,
+        plus any active job older than stale_after seconds.
+        """
+        conn = self._conn()
+        now = time.time()
+        where = "status IN (?, ?) AND (owner = ? OR submitted_at < ?)"
+        params = JOB_ACTIVE_STATUSES + (owner or "", now - stale_after)
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(f"SELECT job_id FROM verification_jobs WHERE {where}", params).fetchall()
+            conn.execute(
+                "UPDATE verification_jobs SET status = 'failed', error = 'Interrupted (server restarted)', "
+                f"finished_at = ? WHERE {where}",
+                (now,) + params,
+            )
+        return [row["job_id"] for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        conn = self._conn()
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("meetings", "assertion_scores")}
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build the per-meeting scores store from assertion_scores.json")
+    parser.add_argument("json_path", help="Scores file (assertion_scores.json)")
+    parser.add_argument("db_path", help="SQLite store to create or update")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.json_path):
+        print(f"Scores file not found: {args.json_path}")
+        return 1
+    store = ScoresStore(args.db_path)
+    rebuilt = store.sync(args.json_path)
+    counts = store.counts()
+    print(f"{'Built' if rebuilt else 'Up to date'}: {counts['meetings']} meetings, "
+          f"{counts['assertion_scores']} assertion scores in {args.db_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,868 @@
+#!/usr/bin/env python3
+"""
+Synthetic LOD Generator - Scale test data beyond the 103-meeting sample
+
+This tool learns field distributions from the bundled LOD data and scoring
+outputs, then streams a consistent synthetic dataset of any size to disk:
+- LOD JSONL        (USER / UTTERANCE / ENTITIES_TO_USE, like LOD_1125.jsonl)
+- Output JSONL     (utterance / response / assertions, like 11_25_output.jsonl)
+- Scores JSON      (assertion_scores.json shape, written incrementally)
+
+Learned from the sources:
+- Entity counts per type per meeting, optional-field presence per type
+- Chat messages per chat, attendees per event, recipients per email
+- Text lengths (file content, event bodies, chat messages, responses, ...)
+- Assertions per meeting, level mix, pass rate per level, spans per assertion
+- sourceID formats (which entity type a sourceID points at, user aliases,
+  file paths, missing)
+
+The three files agree with each other: utterances match across files, every
+sourceID points at an entity of that meeting, and supporting spans are exact
+substrings of the response with correct start/end indices. Generation keeps
+only a fixed-size user roster and the learned profile in memory, so 1M
+meetings take the same memory as 1k.
+
+Usage:
+    # Learn a profile from the bundled data (optional; generate learns on the fly)
+    python tools/generate_synthetic_lod.py learn --profile docs/synthetic/lod_profile.json
+
+    # Generate 10k meetings
+    python tools/generate_synthetic_lod.py generate --meetings 10000 --out-dir docs/synthetic
+
+    # Generate 1M meetings from a saved profile, fixed seed
+    python tools/generate_synthetic_lod.py generate --meetings 1000000 --profile docs/synthetic/lod_profile.json --seed 7
+
+Author: Chin-Yew Lin
+"""
+
+import os
+import re
+import sys
+import json
+import uuid
+import random
+import argparse
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Add project root to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_LOD_FILES = [
+    os.path.join("docs", "LOD_1121.jsonl"),
+    os.path.join("docs", "LOD_1125.jsonl"),
+]
+DEFAULT_OUTPUT_FILE = os.path.join("docs", "11_25_output.jsonl")
+DEFAULT_SCORES_FILE = os.path.join("docs", "assertion_scores.json")
+DEFAULT_OUT_DIR = os.path.join("docs", "synthetic")
+
+PROFILE_VERSION = 1
+POOL_SIZE = 2000          # Max samples kept per text pool (reservoir)
+QUANTILES = 20            # Text lengths stored as 21 quantile points
+DEFAULT_USERS = 500       # Size of the synthetic tenant roster
+TENANT_DOMAIN = "lod"     # MailNickName prefix, as in the LOD data
+
+ENTITY_ID_FIELDS = {
+    "Event": "EventId",
+    "File": "FileId",
+    "Chat": "ChatId",
+    "Email": "EmailId",
+    "OnlineMeeting": "OnlineMeetingId",
+    "ChannelMessage": "ChannelMessageId",
+    "ChannelMessageReply": "ChannelMessageReplyId",
+}
+
+UUID_PATTERN = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+
+# =============================================================================
+# LEARNING
+# =============================================================================
+
+class _Reservoir:
+    """Fixed-size uniform sample of a stream (Algorithm R)."""
+
+    def __init__(self, size: int, rng: random.Random):
+        self.size = size
+        self.rng = rng
+        self.items: List[Any] = []
+        self.seen = 0
+
+    def add(self, item: Any) -> None:
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+        else:
+            j = self.rng.randrange(self.seen)
+            if j < self.size:
+                self.items[j] = item
+
+
+def _quantiles(values: List[float]) -> List[float]:
+    """Quantile points (0%, 5%, ..., 100%) of a list of numbers."""
+    if not values:
+        return [0.0] * (QUANTILES + 1)
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return [float(ordered[round(last * q / QUANTILES)]) for q in range(QUANTILES + 1)]
+
+
+def _histogram(values: List[int]) -> Dict[str, int]:
+    """Count histogram with string keys (JSON-friendly)."""
+    return {str(k): v for k, v in sorted(Counter(values).items())}
+
+
+def _classify_source_id(source_id: Any, id_types: Dict[str, str], user_aliases: set) -> str:
+    """Name the format of a sourceID: an entity type, 'user', 'file_path', 'uuid', 'none' or 'other'."""
+    if source_id in (None, ""):
+        return "none"
+    sid = str(source_id).strip()
+    if sid in id_types:
+        return id_types[sid]
+    if UUID_PATTERN.match(sid):
+        return "uuid"
+    if sid in user_aliases or sid.startswith(f"{TENANT_DOMAIN}_"):
+        return "user"
+    if "\\" in sid or "/" in sid or re.search(r'\.\w{2,5}$', sid):
+        return "file_path"
+    return "other"
+
+
+def _index_entity_ids(entities: List[Dict]) -> Dict[str, str]:
+    """Map every entity id in a meeting (incl. chat messages) to its type."""
+    id_types = {}
+    for e in entities:
+        etype = e.get("type", "")
+        id_field = ENTITY_ID_FIELDS.get(etype)
+        if id_field and e.get(id_field):
+            id_types[e[id_field]] = etype
+        for msg in e.get("ChatMessages", []) or []:
+            if msg.get("ChatMessageId"):
+                id_types[msg["ChatMessageId"]] = "ChatMessage"
+    return id_types
+
+
+def learn_profile(lod_files: List[str], output_file: str, scores_file: Optional[str],
+                  seed: int = 0) -> Dict:
+    """
+    Learn a generation profile from LOD, output and scores files.
+
+    Args:
+        lod_files: LOD JSONL files (USER / UTTERANCE / ENTITIES_TO_USE)
+        output_file: Output JSONL with responses and assertions
+        scores_file: Optional assertion_scores.json for pass rates and spans
+        seed: Seed for the text pool reservoirs
+
+    Returns:
+        Profile dict (JSON-serializable)
+    """
+    rng = random.Random(seed)
+    entity_counts: Dict[str, Counter] = defaultdict(Counter)  # non-zero counts only
+    field_presence: Dict[str, Counter] = defaultdict(Counter)
+    type_totals: Counter = Counter()
+    lengths: Dict[str, List[int]] = defaultdict(list)
+    sizes: Dict[str, List[int]] = defaultdict(list)
+    pools: Dict[str, _Reservoir] = defaultdict(lambda: _Reservoir(POOL_SIZE, rng))
+    lod_by_utterance: Dict[str, Dict[str, str]] = {}
+    user_aliases: set = set()
+    lod_meetings = 0
+
+    # ── LOD files ────────────────────────────────────────────────────────────
+    for path in lod_files:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                lod_meetings += 1
+                entities = item.get("ENTITIES_TO_USE", [])
+                for etype, n in Counter(e.get("type", "") for e in entities).items():
+                    entity_counts[etype][n] += 1
+                lod_by_utterance[item.get("UTTERANCE", {}).get("text", "")] = _index_entity_ids(entities)
+
+                for e in entities:
+                    etype = e.get("type", "")
+                    type_totals[etype] += 1
+                    field_presence[etype].update(k for k, v in e.items() if v not in (None, "", []))
+                    if etype == "User":
+                        user_aliases.add(e.get("MailNickName"))
+                        for key in ("FirstName", "LastName", "JobTitle", "Department", "CompanyName", "OfficeLocation"):
+                            if e.get(key):
+                                pools[key].add(e[key])
+                    elif etype == "Event":
+                        pools["subject"].add(e.get("Subject", ""))
+                        sizes["event_attendees"].append(len(e.get("RequiredAttendees") or []))
+                        sizes["event_optional_attendees"].append(len(e.get("OptionalAttendees") or []))
+                        pools["timezone"].add(e.get("TimeZone", "UTC"))
+                        pools["category"].add(e.get("Category") or "")
+                        try:
+                            start = datetime.fromisoformat(e["StartDateTime"].replace("Z", "+00:00"))
+                            end = datetime.fromisoformat(e["EndDateTime"].replace("Z", "+00:00"))
+                            sizes["event_minutes"].append(int((end - start).total_seconds() // 60))
+                        except (KeyError, ValueError):
+                            pass
+                        lengths["event_body"].append(len(e.get("Body") or ""))
+                        for sentence in SENTENCE_SPLIT.split(e.get("Body") or ""):
+                            if 20 <= len(sentence) <= 400:
+                                pools["sentence"].add(sentence)
+                    elif etype == "File":
+                        pools["file_name"].add(e.get("FileName", ""))
+                        pools["file_destination"].add(e.get("FileDestination", ""))
+                        sizes["file_shared_with"].append(len(e.get("SharedWith") or []))
+                        lengths["file_content"].append(len(e.get("Content") or ""))
+                        for sentence in SENTENCE_SPLIT.split(e.get("Content") or ""):
+                            if 20 <= len(sentence) <= 400:
+                                pools["sentence"].add(sentence)
+                    elif etype == "Chat":
+                        messages = e.get("ChatMessages") or []
+                        sizes["chat_messages"].append(len(messages))
+                        sizes["chat_members"].append(len(e.get("Members") or []))
+                        pools["chat_type"].add(e.get("ChatType", "Group"))
+                        if e.get("ChatName"):
+                            pools["chat_name"].add(e["ChatName"])
+                        for msg in messages:
+                            lengths["chat_message"].append(len(msg.get("Content") or ""))
+                            pools["chat_message"].add(msg.get("Content") or "")
+                    elif etype == "Email":
+                        sizes["email_to"].append(len(e.get("ToRecipients") or []))
+                        sizes["email_cc"].append(len(e.get("CcRecipients") or []))
+                        pools["email_subject"].add(e.get("Subject", ""))
+                        lengths["email_body"].append(len(e.get("Body") or ""))
+                    elif etype in ("ChannelMessage", "ChannelMessageReply"):
+                        lengths["channel_message"].append(len(e.get("Content") or ""))
+                        pools["chat_message"].add(e.get("Content") or "")
+
+    # ── Output file (responses and assertions) ───────────────────────────────
+    source_kinds: Counter = Counter()
+    levels: Counter = Counter()
+    with open(output_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response", "")
+            lengths["response"].append(len(response))
+            for response_line in response.split("\n"):
+                stripped = response_line.strip()
+                if not stripped or stripped == "---":
+                    continue
+                if stripped.startswith("#"):
+                    pools["response_header"].add(stripped)
+                elif len(stripped) >= 10:
+                    pools["response_line"].add(response_line.rstrip())
+
+            assertions = item.get("assertions", [])
+            sizes["assertions_per_meeting"].append(len(assertions))
+            id_types = lod_by_utterance.get(item.get("utterance", ""), {})
+            for a in assertions:
+                levels[a.get("level", "expected")] += 1
+                lengths["assertion"].append(len(a.get("text", "")))
+                pools["assertion"].add(a.get("text", ""))
+                justification = a.get("justification") or {}
+                pools["reason"].add(justification.get("reason", ""))
+                source_kinds[_classify_source_id(justification.get("sourceID"), id_types, user_aliases)] += 1
+
+    # ── Scores file (pass rates, explanations, spans) ────────────────────────
+    pass_counts: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    if scores_file and os.path.exists(scores_file):
+        with open(scores_file, 'r', encoding='utf-8') as f:
+            scores = json.load(f)
+        for meeting in scores.get("meetings", []):
+            for r in meeting.get("assertion_results", []):
+                counts = pass_counts[r.get("level", "expected")]
+                counts[0] += 1 if r.get("passed") else 0
+                counts[1] += 1
+                pools["explanation_pass" if r.get("passed") else "explanation_fail"].add(r.get("explanation", ""))
+                sizes["spans_per_assertion"].append(len(r.get("supporting_spans", [])))
+                for span in r.get("supporting_spans", []):
+                    lengths["span"].append(len(span.get("text", "")))
+
+    return {
+        "version": PROFILE_VERSION,
+        "learned_at": datetime.now().isoformat(),
+        "sources": {"lod": lod_files, "output": output_file, "scores": scores_file},
+        "source_meetings": lod_meetings,
+        "entity_counts": {
+            t: {str(k): v for k, v in sorted((c + Counter({0: lod_meetings - sum(c.values())})).items())}
+            for t, c in entity_counts.items() if t
+        },
+        "field_presence": {
+            t: {k: round(v / type_totals[t], 4) for k, v in fields.items()}
+            for t, fields in field_presence.items() if type_totals[t]
+        },
+        "sizes": {k: _histogram(v) for k, v in sizes.items()},
+        "lengths": {k: _quantiles(v) for k, v in lengths.items()},
+        "levels": dict(levels),
+        "pass_rate_by_level": {
+            level: round(c[0] / c[1], 4) for level, c in pass_counts.items() if c[1]
+        },
+        "source_id_kinds": dict(source_kinds),
+        "pools": {k: [x for x in r.items if x] for k, r in pools.items()},
+    }
+
+
+# =============================================================================
+# SAMPLING
+# =============================================================================
+
+class ProfileSampler:
+    """Draws values from a learned profile."""
+
+    def __init__(self, profile: Dict, rng: random.Random):
+        if profile.get("version") != PROFILE_VERSION:
+            raise ValueError(f"Unsupported profile version: {profile.get('version')}")
+        self.profile = profile
+        self.rng = rng
+        self._hists = {}
+        for name, hist in list(profile["sizes"].items()) + [
+            (f"entities:{t}", h) for t, h in profile["entity_counts"].items()
+        ]:
+            values = [int(k) for k in hist]
+            self._hists[name] = (values, list(hist.values()))
+
+    def count(self, name: str, default: int = 0) -> int:
+        """Sample an integer from a learned histogram."""
+        if name not in self._hists:
+            return default
+        values, weights = self._hists[name]
+        return self.rng.choices(values, weights)[0]
+
+    def entity_count(self, etype: str) -> int:
+        return self.count(f"entities:{etype}")
+
+    def length(self, name: str, default: int = 200) -> int:
+        """Sample a text length by interpolating the learned quantiles."""
+        points = self.profile["lengths"].get(name)
+        if not points:
+            return default
+        pos = self.rng.random() * QUANTILES
+        i = min(int(pos), QUANTILES - 1)
+        return int(points[i] + (points[i + 1] - points[i]) * (pos - i))
+
+    def pick(self, pool: str, default: str = "") -> str:
+        values = self.profile["pools"].get(pool)
+        return self.rng.choice(values) if values else default
+
+    def present(self, etype: str, field: str) -> bool:
+        """Whether an optional field should be emitted (learned presence rate)."""
+        rate = self.profile["field_presence"].get(etype, {}).get(field, 1.0)
+        return self.rng.random() < rate
+
+    def choice_weighted(self, weights: Dict[str, float]) -> str:
+        keys = list(weights)
+        return self.rng.choices(keys, [weights[k] for k in keys])[0]
+
+    def text(self, length: int, pool: str = "sentence") -> str:
+        """Build text of about `length` characters from pooled sentences."""
+        if length <= 0:
+            return ""
+        parts, total = [], 0
+        while total < length:
+            sentence = self.pick(pool, "Synthetic content.")
+            parts.append(sentence)
+            total += len(sentence) + 1
+        return " ".join(parts)[:length]
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+
+# =============================================================================
+# GENERATION
+# =============================================================================
+
+def build_roster(sampler: ProfileSampler, size: int) -> List[Dict]:
+    """Create the tenant's User entities (shared across meetings)."""
+    roster, aliases = [], set()
+    company = sampler.pick("CompanyName", "LiveOak Digital")
+    for _ in range(size):
+        first = sampler.pick("FirstName", "Alex")
+        last = sampler.pick("LastName", "Smith")
+        alias = f"{TENANT_DOMAIN}_{first[:6]}{last[:4]}".lower().replace(" ", "")
+        suffix = 2
+        base = alias
+        while alias in aliases:
+            alias = f"{base}{suffix}"
+            suffix += 1
+        aliases.add(alias)
+        office = sampler.pick("OfficeLocation", "Redmond, WA")
+        roster.append({
+            "type": "User",
+            "Address": {"City": office.split(",")[0], "Country": "USA"},
+            "CompanyName": company,
+            "Department": sampler.pick("Department", "Engineering"),
+            "DisplayName": f"{first} {last}",
+            "FirstName": first,
+            "JobTitle": sampler.pick("JobTitle", "Software Engineer"),
+            "LastName": last,
+            "MailNickName": alias,
+            "Manager": None,
+            "OfficeLocation": office,
+            "UsageLocation": "US",
+            "PhoneNumber": f"+1 425 555 {sampler.rng.randint(1000, 9999)}",
+            "Licenses": ["Microsoft 365 Copilot", "Microsoft Teams Enterprise"],
+        })
+    for user in roster:
+        user["Manager"] = sampler.rng.choice(roster)["MailNickName"]
+    return roster
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _drop_optional(sampler: ProfileSampler, entity: Dict) -> Dict:
+    """Remove optional fields according to the learned presence rates."""
+    return {
+        k: v for k, v in entity.items()
+        if k == "type" or sampler.present(entity["type"], k)
+    }
+
+
+def generate_meeting(sampler: ProfileSampler, roster: List[Dict], index: int,
+                     base_date: datetime) -> Tuple[Dict, Dict]:
+    """
+    Generate one meeting's LOD record and meeting facts used downstream.
+
+    Returns:
+        Tuple of (lod_record, facts) where facts holds the subject, times,
+        people and entity ids referenced by the response and assertions.
+    """
+    rng = sampler.rng
+    attendee_count = max(1, sampler.count("event_attendees", 3))
+    people = rng.sample(roster, min(len(roster), attendee_count + 1))
+    user, attendees = people[0], people[1:]
+    organizer = rng.choice(people)
+
+    subject = f"{sampler.pick('subject', 'Planning Sync')} #{index + 1}"
+    start = base_date + timedelta(days=rng.randrange(365), hours=rng.randrange(8, 18))
+    minutes = sampler.count("event_minutes", 30) or 30
+    end = start + timedelta(minutes=minutes)
+    current_time = start - timedelta(days=rng.randint(1, 7), hours=rng.randrange(24))
+    timezone = sampler.pick("timezone", "PST")
+    event_id = sampler.uuid()
+
+    entities: List[Dict] = []
+    ids_by_type: Dict[str, List[str]] = defaultdict(list)
+
+    def people_aliases(n: int) -> List[str]:
+        return [p["MailNickName"] for p in rng.sample(roster, min(len(roster), n))]
+
+    files = []
+    for _ in range(sampler.entity_count("File")):
+        file_id = sampler.uuid()
+        name = sampler.pick("file_name", "Document.docx")
+        created = current_time - timedelta(days=rng.randint(0, 14))
+        files.append(name)
+        ids_by_type["File"].append(file_id)
+        entities.append(_drop_optional(sampler, {
+            "type": "File",
+            "CreatedDate": _iso(created),
+            "FileId": file_id,
+            "FileLocation": f"files\\{name}",
+            "FileName": name,
+            "LastModifiedDate": _iso(created + timedelta(hours=rng.randint(0, 48))),
+            "Owner": organizer["MailNickName"],
+            "SharedWith": [
+                {"Email": a, "PermissionLevel": rng.choice(["view", "edit"])}
+                for a in people_aliases(sampler.count("file_shared_with", 2))
+            ],
+            "FileDestination": sampler.pick("file_destination", "Shared Documents"),
+            "DestinationType": "site",
+            "Content": sampler.text(sampler.length("file_content", 2000)),
+            "TimeStamp": _iso(created),
+        }))
+
+    event_count = sampler.entity_count("Event")
+    for k in range(event_count):
+        eid = event_id if k == 0 else sampler.uuid()
+        ids_by_type["Event"].append(eid)
+        entities.append(_drop_optional(sampler, {
+            "type": "Event",
+            "EventId": eid,
+            "Subject": subject if k == 0 else f"{sampler.pick('subject', 'Prep Sync')} #{index + 1}.{k}",
+            "StartDateTime": _iso(start if k == 0 else start - timedelta(days=k)),
+            "EndDateTime": _iso(end if k == 0 else end - timedelta(days=k)),
+            "TimeZone": timezone,
+            "Sender": organizer["MailNickName"],
+            "Locations": [f"Teams Meeting Link: https://teams.microsoft.com/l/meetup-join/{eid}"],
+            "RequiredAttendees": [{"Email": p["MailNickName"]} for p in people if p is not organizer],
+            "OptionalAttendees": [{"Email": a} for a in people_aliases(sampler.count("event_optional_attendees", 0))],
+            "ShowAs": "busy",
+            "IsOnlineMeeting": True,
+            "Category": sampler.pick("category", ""),
+            "Body": sampler.text(sampler.length("event_body", 600)),
+            "Attachments": files[:rng.randint(0, len(files))],
+        }))
+
+    for _ in range(sampler.entity_count("Chat")):
+        chat_id = sampler.uuid()
+        members = [p["MailNickName"] for p in people[:max(2, sampler.count("chat_members", 3))]]
+        sent = current_time - timedelta(days=rng.randint(1, 10))
+        messages = []
+        for _ in range(sampler.count("chat_messages", 4)):
+            msg_id = sampler.uuid()
+            ids_by_type["ChatMessage"].append(msg_id)
+            sent += timedelta(minutes=rng.randint(1, 180))
+            messages.append({
+                "ChatMessageId": msg_id,
+                "From": rng.choice(members),
+                "ContentType": "text",
+                "Content": sampler.text(sampler.length("chat_message", 250), pool="chat_message"),
+                "SentDateTime": _iso(sent),
+            })
+        ids_by_type["Chat"].append(chat_id)
+        entities.append(_drop_optional(sampler, {
+            "type": "Chat",
+            "ChatId": chat_id,
+            "ChatType": sampler.pick("chat_type", "Group"),
+            "ChatName": sampler.pick("chat_name", subject),
+            "Members": members,
+            "ChatMessages": messages,
+            "TimeStamp": _iso(sent),
+            "EventId": event_id,
+        }))
+
+    for _ in range(sampler.entity_count("Email")):
+        email_id = sampler.uuid()
+        ids_by_type["Email"].append(email_id)
+        sent = current_time - timedelta(days=rng.randint(0, 5))
+        entities.append(_drop_optional(sampler, {
+            "type": "Email",
+            "EmailAction": "Send",
+            "EmailId": email_id,
+            "Sender": organizer["MailNickName"],
+            "Subject": sampler.pick("email_subject", subject),
+            "Timestamp": _iso(sent),
+            "ToRecipients": [{"Recipient": a} for a in people_aliases(sampler.count("email_to", 2))],
+            "CcRecipients": [{"Recipient": a} for a in people_aliases(sampler.count("email_cc", 1))],
+            "Body": sampler.text(sampler.length("email_body", 800)),
+            "Folder": "SentItems",
+            "Importance": "normal",
+            "Flag": "notFlagged",
+            "IsDraft": False,
+            "Attachments": files[:1],
+            "TimeStamp": _iso(sent),
+        }))
+
+    for etype, id_field in (("ChannelMessage", "ChannelMessageId"), ("ChannelMessageReply", "ChannelMessageReplyId")):
+        for _ in range(sampler.entity_count(etype)):
+            entity_id = sampler.uuid()
+            ids_by_type[etype].append(entity_id)
+            sent = current_time - timedelta(days=rng.randint(0, 5))
+            entity = {
+                "type": etype,
+                id_field: entity_id,
+                "From": rng.choice(people)["MailNickName"],
+                "ContentType": "text",
+                "Content": sampler.text(sampler.length("channel_message", 400), pool="chat_message"),
+                "SentDateTime": _iso(sent),
+                "TimeStamp": _iso(sent),
+            }
+            if etype == "ChannelMessage":
+                entity["ChannelId"] = sampler.uuid()
+            else:
+                entity["ChannelMessageId"] = (ids_by_type["ChannelMessage"] or [sampler.uuid()])[0]
+            entities.append(entity)
+
+    for _ in range(sampler.entity_count("OnlineMeeting")):
+        meeting_id = sampler.uuid()
+        ids_by_type["OnlineMeeting"].append(meeting_id)
+        entities.append({
+            "type": "OnlineMeeting",
+            "OnlineMeetingId": meeting_id,
+            "OnlineMeetingType": "Event",
+            "EventId": event_id,
+            "StartDateTime": _iso(start),
+            "EndDateTime": _iso(end),
+            "Owner": organizer["MailNickName"],
+            "Participants": [p["MailNickName"] for p in people],
+            "Transcripts": [{"LanguageTag": "en", "TranscriptFile": f"transcripts/transcript-{meeting_id}.vtt"}],
+            "TimeStamp": _iso(start),
+        })
+
+    user_count = sampler.entity_count("User") or len(people)
+    extra = rng.sample(roster, min(len(roster), max(0, user_count - len(people))))
+    entities.extend(people + [u for u in extra if u not in people])
+
+    utterance_text = f"Help me make a workback plan for the upcoming meeting '{subject}'"
+    lod = {
+        "USER": {"id": user["MailNickName"], "displayName": user["DisplayName"],
+                 "mailNickName": user["MailNickName"]},
+        "UTTERANCE": {"text": utterance_text,
+                      "current_time": current_time.strftime("%Y-%m-%dT%H:%M:%S+00:00")},
+        "ENTITIES_TO_USE": entities,
+    }
+    facts = {
+        "utterance": utterance_text,
+        "subject": subject,
+        "start": start,
+        "end": end,
+        "current_time": current_time,
+        "timezone": timezone,
+        "organizer": organizer,
+        "attendees": attendees,
+        "people": people,
+        "files": files,
+        "ids_by_type": ids_by_type,
+    }
+    return lod, facts
+
+
+def generate_response(sampler: ProfileSampler, facts: Dict) -> str:
+    """Build a markdown workback-plan response of a learned length."""
+    start = facts["start"]
+    lines = [
+        "Here’s an actionable **workback plan** for the meeting based on the provided context and data.",
+        "",
+        "---",
+        "",
+        "### ✅ **Meeting Details**",
+        f"- **Subject:** {facts['subject']}",
+        f"- **Date/Time:** {start.strftime('%B %d, %Y')}, **{start.strftime('%I:%M %p')} – "
+        f"{facts['end'].strftime('%I:%M %p')} {facts['timezone']}**",
+        f"- **Organizer:** {facts['organizer']['DisplayName']}",
+        f"- **Attendees:** {', '.join(p['DisplayName'] for p in facts['attendees'])}",
+    ]
+    if facts["files"]:
+        lines.append(f"- **Related Files:** {', '.join(facts['files'][:3])}")
+    lines += ["", "---", "", f"## **Workback Plan for '{facts['subject']}'**"]
+
+    target = sampler.length("response", 4000)
+    total = sum(len(line) + 1 for line in lines)
+    while total < target:
+        block = [sampler.pick("response_header", "### Next Steps")]
+        for _ in range(sampler.rng.randint(3, 8)):
+            block.append(sampler.pick("response_line", "- Follow up on open items"))
+        lines += [""] + block
+        total += sum(len(line) + 1 for line in block) + 1
+    return "\n".join(lines)
+
+
+def _source_id(sampler: ProfileSampler, facts: Dict) -> Optional[str]:
+    """Pick a sourceID in a learned format that points into this meeting."""
+    kinds = sampler.profile.get("source_id_kinds") or {"Event": 1}
+    kind = sampler.choice_weighted(kinds)
+    ids = facts["ids_by_type"]
+    if kind == "none":
+        return None
+    if kind == "user":
+        return sampler.rng.choice(facts["people"])["MailNickName"]
+    if kind == "file_path" and facts["files"]:
+        return f"files\\{sampler.rng.choice(facts['files'])}"
+    if ids.get(kind):
+        return sampler.rng.choice(ids[kind])
+    any_ids = [i for values in ids.values() for i in values]
+    return sampler.rng.choice(any_ids) if any_ids else sampler.uuid()
+
+
+def _section_for(response: str, index: int) -> str:
+    """Nearest markdown header above a character position."""
+    for line in reversed(response[:index].split("\n")):
+        if line.strip().startswith("#"):
+            return line.strip()
+    return ""
+
+
+def generate_assertions(sampler: ProfileSampler, facts: Dict, response: str) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Generate output assertions and matching score results.
+
+    Returns:
+        Tuple of (assertions for the output file, assertion_results for scores)
+    """
+    rng = sampler.rng
+    levels = sampler.profile.get("levels") or {"critical": 1}
+    pass_rates = sampler.profile.get("pass_rate_by_level", {})
+    line_starts = [0] + [m.end() for m in re.finditer("\n", response)]
+
+    assertions, results = [], []
+    for _ in range(max(1, sampler.count("assertions_per_meeting", 12))):
+        level = sampler.choice_weighted(levels)
+        text = sampler.pick("assertion", "The response should state the meeting date and time.")
+        source_id = _source_id(sampler, facts)
+        assertions.append({
+            "text": text,
+            "level": level,
+            "justification": {"reason": sampler.pick("reason", ""), "sourceID": source_id},
+        })
+
+        passed = rng.random() < pass_rates.get(level, 0.95)
+        spans = []
+        for _ in range(sampler.count("spans_per_assertion", 1) if passed else 0):
+            line_index = rng.randrange(len(line_starts))
+            begin = line_starts[line_index]
+            end = response.find("\n", begin)
+            end = len(response) if end == -1 else end
+            if end - begin < 5:
+                continue
+            spans.append({
+                "text": response[begin:end],
+                "section": _section_for(response, begin),
+                "confidence": round(rng.uniform(0.8, 1.0), 2),
+                "supports": True,
+                "start_index": begin,
+                "end_index": end,
+            })
+        results.append({
+            "assertion_text": text,
+            "level": level,
+            "passed": passed,
+            "explanation": sampler.pick("explanation_pass" if passed else "explanation_fail", ""),
+            "source_id": source_id,
+            "supporting_spans": spans,
+        })
+    return assertions, results
+
+
+def _meeting_score(utterance: str, results: List[Dict]) -> Dict:
+    """Per-meeting score record in the assertion_scores.json shape."""
+    by_level: Dict[str, Dict] = {}
+    for r in results:
+        stats = by_level.setdefault(r["level"], {"total": 0, "passed": 0})
+        stats["total"] += 1
+        stats["passed"] += 1 if r["passed"] else 0
+    for stats in by_level.values():
+        stats["pass_rate"] = stats["passed"] / stats["total"]
+        stats["failed"] = stats["total"] - stats["passed"]
+    passed = sum(1 for r in results if r["passed"])
+    return {
+        "utterance": utterance,
+        "total_assertions": len(results),
+        "passed_assertions": passed,
+        "pass_rate": passed / len(results) if results else 0.0,
+        "results_by_level": by_level,
+        "assertion_results": results,
+    }
+
+
+def iter_meetings(profile: Dict, meetings: int, seed: int = 0,
+                  users: int = DEFAULT_USERS) -> Iterator[Tuple[Dict, Dict, Dict]]:
+    """
+    Yield (lod_record, output_record, score_record) per synthetic meeting.
+
+    Only the roster and the profile are held in memory.
+    """
+    sampler = ProfileSampler(profile, random.Random(seed))
+    roster = build_roster(sampler, users)
+    base_date = datetime(2025, 7, 1)
+    for i in range(meetings):
+        lod, facts = generate_meeting(sampler, roster, i, base_date)
+        response = generate_response(sampler, facts)
+        assertions, results = generate_assertions(sampler, facts, response)
+        output = {"utterance": facts["utterance"], "response": response, "assertions": assertions}
+        yield lod, output, _meeting_score(facts["utterance"], results)
+
+
+def generate_dataset(profile: Dict, meetings: int, out_dir: str, seed: int = 0,
+                     users: int = DEFAULT_USERS, prefix: Optional[str] = None,
+                     progress_every: int = 10000) -> Dict[str, str]:
+    """
+    Stream a synthetic LOD + output + scores dataset to disk.
+
+    The scores JSON is written incrementally (meetings array first, overall
+    stats last) so it never has to be held in memory.
+
+    Returns:
+        Dict with the paths of the "lod", "output" and "scores" files
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    prefix = prefix or f"synthetic_{meetings}"
+    paths = {
+        "lod": os.path.join(out_dir, f"LOD_{prefix}.jsonl"),
+        "output": os.path.join(out_dir, f"{prefix}_output.jsonl"),
+        "scores": os.path.join(out_dir, f"{prefix}_assertion_scores.json"),
+    }
+    total, passed = 0, 0
+    with open(paths["lod"], 'w', encoding='utf-8') as lod_f, \
+         open(paths["output"], 'w', encoding='utf-8') as out_f, \
+         open(paths["scores"], 'w', encoding='utf-8') as score_f:
+        score_f.write('{\n  "timestamp": %s,\n  "num_samples": %d,\n  "meetings": [\n'
+                      % (json.dumps(datetime.now().isoformat()), meetings))
+        for i, (lod, output, score) in enumerate(iter_meetings(profile, meetings, seed, users)):
+            lod_f.write(json.dumps(lod, ensure_ascii=False) + "\n")
+            out_f.write(json.dumps(output, ensure_ascii=False) + "\n")
+            score_f.write((",\n" if i else "") + "    " + json.dumps(score, ensure_ascii=False))
+            total += score["total_assertions"]
+            passed += score["passed_assertions"]
+            if progress_every and (i + 1) % progress_every == 0:
+                print(f"   ... {i + 1:,}/{meetings:,} meetings")
+        overall = {
+            "total_assertions": total,
+            "passed_assertions": passed,
+            "pass_rate": passed / total if total else 0.0,
+        }
+        score_f.write('\n  ],\n  "overall_stats": %s\n}\n' % json.dumps(overall))
+    return paths
+
+
+def load_or_learn_profile(profile_path: Optional[str], seed: int = 0) -> Dict:
+    """Load a saved profile, or learn one from the bundled data."""
+    if profile_path and os.path.exists(profile_path):
+        with open(profile_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return learn_profile(
+        [os.path.join(PROJECT_ROOT, p) for p in DEFAULT_LOD_FILES],
+        os.path.join(PROJECT_ROOT, DEFAULT_OUTPUT_FILE),
+        os.path.join(PROJECT_ROOT, DEFAULT_SCORES_FILE),
+        seed=seed,
+    )
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Learn LOD distributions and generate synthetic datasets")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    learn = subparsers.add_parser("learn", help="Learn a profile from LOD, output and scores files")
+    learn.add_argument("--lod", nargs="+", default=DEFAULT_LOD_FILES, help="LOD JSONL files")
+    learn.add_argument("--output-file", default=DEFAULT_OUTPUT_FILE, help="Output JSONL with assertions")
+    learn.add_argument("--scores", default=DEFAULT_SCORES_FILE, help="assertion_scores.json")
+    learn.add_argument("--profile", default=os.path.join(DEFAULT_OUT_DIR, "lod_profile.json"),
+                       help="Where to write the profile")
+    learn.add_argument("--seed", type=int, default=0, help="Seed for the text pools")
+
+    gen = subparsers.add_parser("generate", help="Generate a synthetic dataset")
+    gen.add_argument("--meetings", type=int, default=1000, help="Number of meetings (default: 1000)")
+    gen.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help=f"Output directory (default: {DEFAULT_OUT_DIR})")
+    gen.add_argument("--profile", default=None, help="Saved profile (default: learn from the bundled data)")
+    gen.add_argument("--prefix", default=None, help="File name prefix (default: synthetic_<meetings>)")
+    gen.add_argument("--users", type=int, default=DEFAULT_USERS, help=f"Tenant roster size (default: {DEFAULT_USERS})")
+    gen.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args()
+
+    if args.command == "learn":
+        print("📚 Learning distributions...")
+        profile = learn_profile(args.lod, args.output_file, args.scores, seed=args.seed)
+        os.makedirs(os.path.dirname(args.profile) or '.', exist_ok=True)
+        with open(args.profile, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, indent=2, ensure_ascii=False)
+        print(f"   Meetings learned from: {profile['source_meetings']}")
+        print(f"   Entity types: {', '.join(sorted(profile['entity_counts']))}")
+        print(f"   sourceID formats: {profile['source_id_kinds']}")
+        print(f"💾 Profile saved to: {args.profile}")
+        return
+
+    print(f"🧪 Generating {args.meetings:,} synthetic meetings (seed {args.seed})...")
+    profile = load_or_learn_profile(args.profile, seed=args.seed)
+    start = datetime.now()
+    paths = generate_dataset(profile, args.meetings, args.out_dir, seed=args.seed,
+                             users=args.users, prefix=args.prefix)
+    elapsed = (datetime.now() - start).total_seconds()
+    print(f"✅ Done in {elapsed:.1f}s")
+    for kind, path in paths.items():
+        print(f"   {kind:<7} {path} ({os.path.getsize(path) / (1024 * 1024):.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
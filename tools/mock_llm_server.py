@@ -0,0 +1,786 @@
+#!/usr/bin/env python3
+"""
+Mock LLM Server - Offline stand-in for Substrate GPT-5 JJ and Ollama
+
+This tool provides a local HTTP server implementing the two API shapes used
+by the evaluation scripts, so they can run (and be benchmarked) on a laptop
+with no network, no MSAL login and no Ollama host:
+- POST /chat/completions  (Substrate / OpenAI chat completions shape)
+- POST /api/generate      (Ollama generate shape, non-streaming)
+
+Modes:
+- synthetic: Canned JSON answers shaped for each prompt family (scoring,
+             classification, decomposition, passage scores, ...)
+- replay:    Serve responses recorded by a previous `record` run (cassette
+             JSONL) and/or seeded from a previous run's assertion_scores.json.
+             Cache misses fall back to synthetic answers.
+- record:    Pass requests through to the real Substrate/Ollama endpoints and
+             append every response to the cassette for later replay.
+
+Fault injection (all modes):
+- Synthetic latency (median + lognormal tail)
+- Random HTTP 429 responses
+- Concurrency limit (requests above the limit get HTTP 429)
+
+Client side: set MIRA_LLM_MOCK_URL and every call_*_api helper talks to this
+server instead of the real service (see pipeline/config.py).
+
+Usage:
+    # Synthetic answers, 800ms median latency with a long tail and 5% 429s
+    python tools/mock_llm_server.py --mode synthetic --latency-ms 800 --latency-sigma 0.6 --rate-429 0.05
+
+    # Replay recorded responses, seeded from previous GPT-5 scoring results
+    python tools/mock_llm_server.py --mode replay --cassette docs/mock_llm/cassette.jsonl --seed-scores docs/assertion_scores.json
+
+    # Record: pass through to the real endpoints and save every response
+    python tools/mock_llm_server.py --mode record --cassette docs/mock_llm/cassette.jsonl
+
+    # Point the scripts at the server
+    $env:MIRA_LLM_MOCK_URL = "http://127.0.0.1:8765"     # PowerShell
+    export MIRA_LLM_MOCK_URL=http://127.0.0.1:8765       # bash
+    python score_assertions.py
+
+    # Inspect counters (requests, hits, misses, 429s, peak concurrency)
+    curl http://127.0.0.1:8765/stats
+
+Author: Chin-Yew Lin
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+import urllib.request
+import urllib.error
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add project root to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CASSETTE = os.path.join("docs", "mock_llm", "cassette.jsonl")
+MOCK_MODEL = "mock-gpt-5-chat-jj"
+
+# Client-side switch (mirrors pipeline.config.MOCK_LLM_URL_ENV; kept literal so
+# the server starts without the pipeline dependencies)
+MOCK_URL_ENV = "MIRA_LLM_MOCK_URL"
+
+# Rough chars-per-token ratio used for the `usage` block
+CHARS_PER_TOKEN = 4
+
+# Shortest quoted string treated as a possible assertion text when seeding
+MIN_SEED_TEXT_LENGTH = 20
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text (chars / 4, at least 1)."""
+    return max(1, len(text or "") // CHARS_PER_TOKEN)
+
+
+# =============================================================================
+# REQUEST KEYS AND CASSETTE
+# =============================================================================
+
+def get_api_name(path: str) -> Optional[str]:
+    """Map a request path to 'chat' or 'generate' (None if unsupported)."""
+    path = path.split("?", 1)[0].rstrip("/")
+    if path.endswith("/chat/completions"):
+        return "chat"
+    if path.endswith("/api/generate"):
+        return "generate"
+    return None
+
+
+def get_prompt_text(api: str, body: Dict) -> str:
+    """Flatten the request body into the prompt text used for matching."""
+    if api == "generate":
+        return body.get("prompt", "")
+    return "\n\n".join(m.get("content", "") for m in body.get("messages", []))
+
+
+def request_key(api: str, body: Dict) -> str:
+    """
+    Build a stable cache key for a request.
+
+    Only the prompt content is keyed (not temperature or max_tokens), so a
+    recording stays valid when callers tweak sampling parameters.
+    """
+    if api == "generate":
+        material = {"api": api, "prompt": body.get("prompt", "")}
+    else:
+        material = {
+            "api": api,
+            "messages": [
+                {"role": m.get("role"), "content": m.get("content")}
+                for m in body.get("messages", [])
+            ],
+        }
+    canonical = json.dumps(material, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    Recorded responses keyed by request key.
+
+    A key can hold several recordings (the same prompt sent more than once);
+    replay cycles through them in recording order.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries: Dict[str, List[str]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def load(self, path: str) -> int:
+        """Load a cassette JSONL file. Returns the number of recordings read."""
+        count = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.entries.setdefault(entry["key"], []).append(entry["content"])
+                count += 1
+        return count
+
+    def seed_from_scores(self, scores_path: str) -> int:
+        """
+        Seed replay answers from a previous run's assertion_scores.json.
+
+        Each assertion result becomes the JSON answer for any prompt that
+        quotes the assertion text. Returns the number of seeded assertions.
+        """
+        with open(scores_path, 'r', encoding='utf-8') as f:
+            scores = json.load(f)
+        count = 0
+        for meeting in scores.get("meetings", []):
+            for result in meeting.get("assertion_results", []):
+                text = result.get("assertion_text", "")
+                if len(text) < MIN_SEED_TEXT_LENGTH:
+                    continue
+                answer = {
+                    "passed": result.get("passed", False),
+                    "explanation": result.get("explanation", ""),
+                    "supporting_spans": [
+                        {k: v for k, v in span.items() if k not in ("start_index", "end_index")}
+                        for span in result.get("supporting_spans", [])
+                    ],
+                }
+                self.entries.setdefault(
+                    self._seed_key(text), []
+                ).append(json.dumps(answer, ensure_ascii=False))
+                count += 1
+        return count
+
+    @staticmethod
+    def _seed_key(assertion_text: str) -> str:
+        """Key for answers seeded by assertion text."""
+        return "seed:" + hashlib.sha256(assertion_text.strip().encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str, prompt_text: str) -> Optional[str]:
+        """Find a recorded answer by exact key, then by quoted assertion text."""
+        with self._lock:
+            if key in self.entries:
+                return self._next(key)
+            for quoted in re.findall(r'"([^"\n]{%d,})"' % MIN_SEED_TEXT_LENGTH, prompt_text):
+                seed_key = self._seed_key(quoted)
+                if seed_key in self.entries:
+                    return self._next(seed_key)
+        return None
+
+    def _next(self, key: str) -> str:
+        """Return the next recording for a key (cycling)."""
+        recordings = self.entries[key]
+        index = self._cursor.get(key, 0)
+        self._cursor[key] = index + 1
+        return recordings[index % len(recordings)]
+
+    def record(self, key: str, api: str, prompt_text: str, content: str, latency_ms: float) -> None:
+        """Append a recording to memory and to the cassette file."""
+        entry = {
+            "key": key,
+            "api": api,
+            "prompt_preview": prompt_text[:200],
+            "content": content,
+            "latency_ms": round(latency_ms, 1),
+            "recorded_at": datetime.now().isoformat(),
+        }
+        with self._lock:
+            self.entries.setdefault(key, []).append(content)
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+# =============================================================================
+# SYNTHETIC RESPONSES
+# =============================================================================
+
+def _synthetic_passage_scores(prompt: str, rng: random.Random) -> Any:
+    """compute_assertion_matches: score a few of the numbered passages."""
+    numbers = re.findall(r'^(\d+)\. ', prompt, re.MULTILINE)
+    picked = numbers[:2] if len(numbers) <= 2 else rng.sample(numbers, 2)
+    return {"scores": {n: round(rng.uniform(0.5, 1.0), 2) for n in picked}}
+
+
+def _synthetic_batch_evaluations(prompt: str, rng: random.Random) -> Any:
+    """evaluate_kening_gpt5: one evaluation per numbered assertion."""
+    count = len(re.findall(r'^\d+\. \[', prompt, re.MULTILINE)) or 1
+    return {"evaluations": [
+        {
+            "index": i + 1,
+            "passed": True,
+            "quality_score": 2,
+            "explanation": "Synthetic mock evaluation",
+            "evidence": "",
+            "issues": [],
+            "suggestions": [],
+        }
+        for i in range(count)
+    ]}
+
+
+def _synthetic_decomposition(prompt: str, rng: random.Random) -> Any:
+    """convert_kening_assertions_v2: a single atomic S unit."""
+    return [{
+        "s_dimension": "S2",
+        "s_name": "Timeline Alignment",
+        "s_template": "The response should include [TASK] before [T0]",
+        "s_literal": "The response should include the task before the meeting",
+        "linked_g": [{"g_dimension": "G3", "slot_name": "DATE", "slot_value": None}],
+    }]
+
+
+def _synthetic_slot_extraction(prompt: str, rng: random.Random) -> Any:
+    """extract_slot_values: nothing found."""
+    return {}
+
+
+def _synthetic_g_selection(prompt: str, rng: random.Random) -> Any:
+    """select_relevant_g_dimensions: keep the date grounding only."""
+    return {"selected_g_dimensions": [{
+        "dimension_id": "G3",
+        "dimension_name": "Date/Time Grounding",
+        "relevance_reason": "Synthetic mock selection",
+        "grounding_text": "Dates must be consistent with the meeting context",
+    }], "excluded_g_dimensions": []}
+
+
+def _synthetic_scenario(prompt: str, rng: random.Random) -> Any:
+    """generate_scenario_for_assertion / scenario enrichment."""
+    return {"scenario": {
+        "title": "Mock Planning Sync",
+        "date": "2025-12-05",
+        "time": "2:00 PM PST",
+        "duration_minutes": 60,
+        "organizer": "Alice",
+        "attendees": ["Alice", "Bob", "Carol"],
+        "context": "Synthetic scenario produced by the mock LLM server.",
+        "artifacts": ["Plan.docx"],
+        "discussion_points": ["Timeline review"],
+        "action_items_discussed": ["Draft slides"],
+    }}
+
+
+def _synthetic_workback_plan(prompt: str, rng: random.Random) -> Any:
+    """generate_wbp_with_scenario / plan generation."""
+    return {"workback_plan": (
+        "## Workback Plan\n\n"
+        "| T-n | Date | Task | Owner | Deliverable |\n"
+        "|-----|------|------|-------|-------------|\n"
+        "| T-2 | 2025-12-03 | Draft slides | Bob | Slides v1 |\n"
+        "| T-1 | 2025-12-04 | Review slides | Carol | Slides v2 |\n"
+    )}
+
+
+def _synthetic_verification(prompt: str, rng: random.Random) -> Any:
+    """verify_wbp_against_scenario."""
+    ids = re.findall(r'^- \[([^\]]+)\]', prompt, re.MULTILINE)
+    return {"overall_passes": True, "assertion_results": [
+        {"assertion_id": aid, "passes": True, "evidence": "Synthetic mock evidence",
+         "ground_truth_check": "scenario", "reasoning": "Synthetic mock verification"}
+        for aid in ids
+    ]}
+
+
+def _synthetic_classification(prompt: str, rng: random.Random) -> Any:
+    """analyze_assertion / classify_assertion."""
+    return {
+        "dimension_id": "S2",
+        "dimension_name": "Timeline Alignment",
+        "layer": "structural",
+        "level": "expected",
+        "rationale": "Synthetic mock classification",
+        "converted_text": "The response should include a backward timeline from T0",
+    }
+
+
+def _synthetic_structural_assertions(prompt: str, rng: random.Random) -> Any:
+    """pipeline.assertion_generation: structural (presence) assertions."""
+    patterns = [
+        ("S1", "The workback plan includes explicit meeting details (date, time, and attendees)", "critical", 3),
+        ("S2", "The workback plan has a backward timeline anchored on the meeting date", "critical", 3),
+        ("S3", "The workback plan assigns an owner to each task", "critical", 3),
+        ("S4", "The workback plan lists the deliverables for each task", "expected", 2),
+        ("S5", "The workback plan specifies dependencies between tasks", "expected", 2),
+        ("S6", "The workback plan identifies risks and mitigations", "aspirational", 1),
+    ]
+    return {"structural_assertions": [
+        {
+            "id": f"A{i + 1}",
+            "pattern_id": pattern_id,
+            "text": text,
+            "level": level,
+            "checks_for": "Synthetic mock check",
+            "weight": weight,
+        }
+        for i, (pattern_id, text, level, weight) in enumerate(patterns)
+    ]}
+
+
+def _synthetic_grounding_assertions(prompt: str, rng: random.Random) -> Any:
+    """pipeline.assertion_generation: grounding (accuracy) assertions."""
+    patterns = [
+        ("G1", "All people mentioned in the plan exist in source.attendees", "source.attendees", "critical", 3),
+        ("G2", "The meeting date in the plan matches source.meeting_date", "source.meeting_date", "critical", 3),
+        ("G3", "Task dates fall before source.meeting_date", "source.meeting_date", "expected", 2),
+        ("G4", "Artifacts referenced in the plan exist in source.artifacts", "source.artifacts", "expected", 2),
+        ("G5", "The plan introduces no entities absent from the source", "source", "critical", 3),
+    ]
+    return {"grounding_assertions": [
+        {
+            "id": pattern_id,
+            "pattern_id": pattern_id,
+            "text": text,
+            "level": level,
+            "source_field": field,
+            "verification_method": "Synthetic mock comparison against the source",
+            "weight": weight,
+        }
+        for pattern_id, text, field, level, weight in patterns
+    ]}
+
+
+def _synthetic_default(prompt: str, rng: random.Random) -> Any:
+    """Pass/fail scoring prompts (score_assertions, evaluate_assertions_gpt5, pipeline)."""
+    passed = rng.random() < 0.9
+    return {
+        "assertion_type": "structural",
+        "passed": passed,
+        "explanation": "Synthetic mock evaluation",
+        "evidence_found": "NOT FOUND" if not passed else "Synthetic evidence",
+        "quality_score": 2 if passed else 0,
+        "supporting_spans": [],
+    }
+
+
+# Ordered (marker, builder) pairs: the first marker found in the prompt wins
+SYNTHETIC_RESPONDERS: List[Tuple[str, Any]] = [
+    ('"structural_assertions"', _synthetic_structural_assertions),
+    ('"grounding_assertions"', _synthetic_grounding_assertions),
+    ("Passages:", _synthetic_passage_scores),
+    ('"evaluations"', _synthetic_batch_evaluations),
+    ("NOW DECOMPOSE", _synthetic_decomposition),
+    ("NOW EXTRACT", _synthetic_slot_extraction),
+    ("selected_g_dimensions", _synthetic_g_selection),
+    ('"workback_plan"', _synthetic_workback_plan),
+    ('"assertion_results"', _synthetic_verification),
+    ('"scenario"', _synthetic_scenario),
+    ("dimension_id", _synthetic_classification),
+]
+
+
+def synthetic_response(prompt: str, rng: random.Random) -> str:
+    """Build a synthetic answer shaped for the prompt family."""
+    for marker, builder in SYNTHETIC_RESPONDERS:
+        if marker in prompt:
+            return json.dumps(builder(prompt, rng), ensure_ascii=False)
+    return json.dumps(_synthetic_default(prompt, rng), ensure_ascii=False)
+
+
+# =============================================================================
+# PASSTHROUGH (record mode)
+# =============================================================================
+
+def forward_request(api: str, body: Dict, headers: Dict[str, str], timeout: float) -> Tuple[int, Dict]:
+    """
+    Forward a request to the real Substrate/Ollama endpoint.
+
+    The server acquires its own Substrate token, since clients pointed at the
+    mock skip MSAL and only send a placeholder token. An unreachable upstream
+    or a timeout comes back as a 502.
+    """
+    from pipeline import config
+
+    if api == "generate":
+        url = config.OLLAMA_HOST.rstrip("/") + "/api/generate"
+        out_headers = {"Content-Type": "application/json"}
+    else:
+        url = config.SUBSTRATE_ENDPOINT
+        out_headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {config.get_substrate_token()}",
+            "X-ModelType": headers.get("X-ModelType") or config.JJ_MODEL,
+        }
+
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(body).encode("utf-8"),
+        headers=out_headers,
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            return resp.status, json.loads(resp.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        return e.code, {"error": e.read().decode("utf-8", errors="replace")[:500]}
+    except OSError as e:
+        # URLError (unreachable, DNS, refused) and socket timeouts
+        reason = getattr(e, "reason", None) or e
+        return 502, {"error": f"Upstream unreachable: {reason}"}
+
+
+# =============================================================================
+# SERVER
+# =============================================================================
+
+class MockLLMState:
+    """Shared server configuration, cassette and counters."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.mode = args.mode
+        self.latency_ms = args.latency_ms
+        self.latency_sigma = args.latency_sigma
+        self.rate_429 = args.rate_429
+        self.max_concurrent = args.max_concurrent
+        self.seed = args.seed
+        self.upstream_timeout = args.upstream_timeout
+        self.cassette = Cassette(args.cassette if args.mode in ("replay", "record") else None)
+        if args.seed_scores:
+            seeded = self.cassette.seed_from_scores(args.seed_scores)
+            print(f"  Seeded {seeded} assertion results from {args.seed_scores}")
+
+        self._lock = threading.Lock()
+        self._key_counts: Dict[str, int] = {}
+        self.in_flight = 0
+        self.stats = self._empty_stats()
+        self.latencies_ms: List[float] = []
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {
+            "requests": 0,
+            "by_api": {"chat": 0, "generate": 0},
+            "replay_hits": 0,
+            "replay_misses": 0,
+            "synthetic": 0,
+            "recorded": 0,
+            "rate_limited": 0,
+            "upstream_errors": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "peak_in_flight": 0,
+        }
+
+    def request_rng(self, key: str) -> random.Random:
+        """
+        Deterministic RNG per request.
+
+        Seeded from (seed, request key, occurrence number), so the same run
+        gets the same latencies and 429s regardless of thread interleaving.
+        """
+        with self._lock:
+            occurrence = self._key_counts.get(key, 0)
+            self._key_counts[key] = occurrence + 1
+        material = f"{self.seed}:{key}:{occurrence}".encode("utf-8")
+        return random.Random(int(hashlib.sha256(material).hexdigest()[:16], 16))
+
+    def enter(self) -> bool:
+        """Admit a request; False if the concurrency limit is exceeded."""
+        with self._lock:
+            if self.max_concurrent and self.in_flight >= self.max_concurrent:
+                return False
+            self.in_flight += 1
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.in_flight)
+            return True
+
+    def leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def count(self, **increments: int) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                self.stats[name] += value
+
+    def reset(self) -> None:
+        """Zero the counters and recorded latencies."""
+        with self._lock:
+            self.stats = self._empty_stats()
+            self.latencies_ms = []
+
+    def record_latency(self, latency_ms: float) -> None:
+        """Record the service time of a successful call."""
+        with self._lock:
+            self.latencies_ms.append(latency_ms)
+
+    def count_api(self, api: str) -> None:
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["by_api"][api] += 1
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Sample a synthetic latency in seconds (median * lognormal tail)."""
+        if self.latency_ms <= 0:
+            return 0.0
+        factor = rng.lognormvariate(0.0, self.latency_sigma) if self.latency_sigma > 0 else 1.0
+        return self.latency_ms * factor / 1000.0
+
+
+def build_chat_response(content: str, prompt_text: str, model: str) -> Dict:
+    """Wrap content in the chat completions response shape."""
+    prompt_tokens = estimate_tokens(prompt_text)
+    completion_tokens = estimate_tokens(content)
+    return {
+        "id": f"mock-{int(time.time() * 1000)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def build_generate_response(content: str, prompt_text: str, model: str) -> Dict:
+    """Wrap content in the Ollama generate response shape."""
+    return {
+        "model": model,
+        "created_at": datetime.now().isoformat(),
+        "response": content,
+        "done": True,
+        "prompt_eval_count": estimate_tokens(prompt_text),
+        "eval_count": estimate_tokens(content),
+    }
+
+
+def extract_content(api: str, data: Dict) -> str:
+    """Pull the answer text out of an upstream response."""
+    if api == "generate":
+        return data.get("response", "")
+    return data["choices"][0]["message"]["content"]
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """HTTP handler for the mock endpoints."""
+
+    server_version = "MockLLM/1.0"
+    state: MockLLMState = None  # set in main()
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: Dict, extra_headers: Optional[Dict] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/health":
+            self._send_json(200, {"status": "ok", "mode": self.state.mode})
+        elif path == "/stats":
+            with self.state._lock:
+                stats = json.loads(json.dumps(self.state.stats))
+            stats["mode"] = self.state.mode
+            self._send_json(200, stats)
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:
+        state = self.state
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/stats/reset":
+            state.reset()
+            self._send_json(200, {"status": "reset"})
+            return
+
+        api = get_api_name(self.path)
+        if api is None:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length).decode("utf-8") or "{}")
+        except json.JSONDecodeError as e:
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+
+        state.count_api(api)
+        start_time = time.time()
+        prompt_text = get_prompt_text(api, body)
+        key = request_key(api, body)
+        rng = state.request_rng(key)
+
+        if not state.enter():
+            state.count(rate_limited=1)
+            self._send_json(429, {"error": "Too many concurrent requests (mock limit)"},
+                            {"Retry-After": "1"})
+            return
+        try:
+            if state.rate_429 > 0 and rng.random() < state.rate_429:
+                state.count(rate_limited=1)
+                self._send_json(429, {"error": "Rate limited (mock injection)"},
+                                {"Retry-After": "1"})
+                return
+
+            model = self.headers.get("X-ModelType") or body.get("model") or MOCK_MODEL
+            content = None
+            if state.mode in ("replay", "record"):
+                content = state.cassette.lookup(key, prompt_text)
+                state.count(replay_hits=1 if content is not None else 0,
+                            replay_misses=1 if content is None else 0)
+
+            if content is None and state.mode == "record":
+                start = time.time()
+                status, data = forward_request(api, body, dict(self.headers), state.upstream_timeout)
+                if status != 200:
+                    state.count(upstream_errors=1)
+                    self._send_json(status, data)
+                    return
+                content = extract_content(api, data)
+                state.cassette.record(key, api, prompt_text, content, (time.time() - start) * 1000)
+                state.count(recorded=1)
+            else:
+                if content is None:
+                    content = synthetic_response(prompt_text, rng)
+                    state.count(synthetic=1)
+                time.sleep(state.sample_latency(rng))
+
+            if api == "generate":
+                payload = build_generate_response(content, prompt_text, model)
+            else:
+                payload = build_chat_response(content, prompt_text, model)
+            state.count(prompt_tokens=estimate_tokens(prompt_text),
+                        completion_tokens=estimate_tokens(content))
+            self._send_json(200, payload)
+            state.record_latency((time.time() - start_time) * 1000)
+        finally:
+            state.leave()
+
+
+def create_server(state: MockLLMState, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                  quiet: bool = False) -> ThreadingHTTPServer:
+    """
+    Create (but do not start) a mock server bound to host:port.
+
+    Port 0 picks a free port; read it back from server.server_address.
+    """
+    MockLLMHandler.state = state
+    server = ThreadingHTTPServer((host, port), MockLLMHandler)
+    server.daemon_threads = True
+    server.quiet = quiet
+    return server
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command-line options (also used to build MockLLMState programmatically)."""
+    parser = argparse.ArgumentParser(
+        description="Offline mock of the Substrate chat completions and Ollama generate APIs"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Bind address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("--mode", choices=["synthetic", "replay", "record"], default="synthetic",
+                        help="Response source (default: synthetic)")
+    parser.add_argument("--cassette", default=DEFAULT_CASSETTE,
+                        help=f"Cassette JSONL for replay/record (default: {DEFAULT_CASSETTE})")
+    parser.add_argument("--seed-scores", default=None, metavar="FILE",
+                        help="Seed replay answers from a previous assertion_scores.json")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Median synthetic latency per call in ms (default: 0)")
+    parser.add_argument("--latency-sigma", type=float, default=0.0,
+                        help="Lognormal sigma for the latency tail; 0 = constant (default: 0)")
+    parser.add_argument("--rate-429", type=float, default=0.0,
+                        help="Probability of an injected HTTP 429 per call (default: 0)")
+    parser.add_argument("--max-concurrent", type=int, default=0,
+                        help="Reject calls above this many in flight with 429; 0 = unlimited")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency and 429 injection")
+    parser.add_argument("--upstream-timeout", type=float, default=120.0,
+                        help="Timeout for passthrough calls in record mode (seconds)")
+    parser.add_argument("--quiet", "-q", action="store_true", help="Do not log each request")
+    return parser
+
+
+def main():
+    args = build_arg_parser().parse_args()
+
+    # The server itself must reach the real endpoints in record mode
+    os.environ.pop(MOCK_URL_ENV, None)
+
+    print("=" * 70)
+    print("Mock LLM Server")
+    print("=" * 70)
+    state = MockLLMState(args)
+    if args.mode in ("replay", "record"):
+        recordings = sum(len(v) for v in state.cassette.entries.values())
+        print(f"  Cassette: {args.cassette} ({recordings} recordings loaded)")
+    print(f"  Mode: {args.mode}")
+    print(f"  Latency: median {args.latency_ms:.0f}ms, sigma {args.latency_sigma}")
+    print(f"  Injected 429 rate: {args.rate_429:.1%}")
+    if args.max_concurrent:
+        print(f"  Max concurrent: {args.max_concurrent}")
+
+    server = create_server(state, args.host, args.port, args.quiet)
+    url = f"http://{args.host}:{server.server_address[1]}"
+    print(f"  Listening on {url}")
+    print()
+    print(f"  Set MIRA_LLM_MOCK_URL={url} to route the scripts here.")
+    print("=" * 70)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        print(json.dumps(state.stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Background GPT-5 re-verification of revised and judge-added assertions.
+
+Mira submits a job when a judge asks to re-score a revised assertion or adds a
+new one. A small worker pool runs the evaluator against the meeting's response
+and writes the result into the scores store, where the UI picks it up on its
+next rerun; no Streamlit rerun ever waits on the model call. Job rows live in
+the scores database, so every session sees the same status:
+
+    queued -> running -> done | failed
+
+Each job records the queue's owner, a name for the server running it (mira.py
+and mira2.py share one scores database). Jobs a previous process with the same
+owner left queued or running are marked failed at start-up, as are active jobs
+too old to still be running (re-submitting is cheap). A second submit for an
+assertion text that already has an active job returns that job.
+
+Usage:
+    from functools import partial
+    from evaluate_assertions_gpt5 import evaluate_assertion
+
+    queue = VerificationQueue(store, partial(evaluate_assertion, raise_errors=True), owner="mira")
+    queue.submit(utterance, {"text": revised_text, "level": "expected"}, response_text, judge="alice")
+    store.latest_job(utterance, revised_text)   # {"status": "running", ...}
+    store.get_score(utterance, revised_text)    # result, once done
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from scores_store import JOB_ACTIVE_STATUSES, ScoresStore
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_WORKERS = 2  # Concurrent model calls
+MAX_ERROR_LENGTH = 500
+
+
+# =============================================================================
+# QUEUE
+# =============================================================================
+
+class VerificationQueue:
+    """Runs assertion evaluations on worker threads and records them in a ScoresStore."""
+
+    def __init__(self, store: ScoresStore, evaluate: Callable[[Dict[str, Any], str], Dict[str, Any]],
+                 workers: int = DEFAULT_WORKERS, owner: str = ""):
+        """
+        Args:
+            store: Scores store that receives results and job status
+            evaluate: (assertion, response_text) -> result dict with assertion_text;
+                      must raise on failure
+            workers: Concurrent evaluations
+            owner: Name of the server running the queue, stable across restarts
+        """
+        self.store = store
+        self.evaluate = evaluate
+        self.owner = owner
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mira-verify")
+        interrupted = store.fail_interrupted_jobs(owner)
+        if interrupted:
+            print(f"⚠️ Marked {len(interrupted)} interrupted verification job(s) as failed")
+
+    def submit(self, utterance: str, assertion: Dict[str, Any], response_text: str, judge: str = "") -> int:
+        """
+        Queue a re-verification of an assertion against a meeting's response.
+
+        Args:
+            utterance: Meeting utterance the scores are keyed by
+            assertion: Assertion dict (text, level, justification) to evaluate
+            response_text: The meeting's generated response
+            judge: Judge who asked for it
+
+        Returns:
+            Job id (an existing one if this text is already queued or running)
+        """
+        assertion_text = assertion.get('text', '')
+        latest = self.store.latest_job(utterance, assertion_text)
+        if latest and latest["status"] in JOB_ACTIVE_STATUSES:
+            return latest["job_id"]
+        job_id = self.store.add_job(utterance, assertion_text, judge, owner=self.owner)
+        self._executor.submit(self._run, job_id, utterance, dict(assertion), response_text)
+        return job_id
+
+    def _run(self, job_id: int, utterance: str, assertion: Dict[str, Any], response_text: str) -> None:
+        self.store.update_job(job_id, "running")
+        try:
+            result = self.evaluate(assertion, response_text)
+            self.store.put_verified_score(utterance, result)
+        except Exception as e:
+            self.store.update_job(job_id, "failed", error=str(e)[:MAX_ERROR_LENGTH])
+            return
+        self.store.update_job(job_id, "done")